@@ -6,6 +6,7 @@
 #include "../xProtocol.h"
 #include "../xRobot.h"
 #include "xIrMenuController.h"
+#include "../peripherals/xNeopixel.h"
 
 // Globals owned by xMain.ino
 extern Robot robot;
@@ -94,7 +95,7 @@ static inline void handleJson(const String &line){
   if (line.indexOf("\"cmd\":\"rfid_last\"")>=0){
 #if RFID_ENABLED
     String out = String("{\"ok\":true,\"rfid\":\"") + Protocol::escape(g_lastRfid) + "\"}";
-    SERIAL_IO.println(out);
+    Protocol::reply(out);
 #else
     Protocol::sendErr("rfid_disabled");
 #endif
@@ -104,7 +105,7 @@ static inline void handleJson(const String &line){
   if (line.indexOf("\"cmd\":\"ultra_read\"")>=0){
 #if ULTRA_ENABLED
     String out = String("{\"ok\":true,\"cm\":") + (isnan(g_ultraCm)?String("null"):String(g_ultraCm,1)) + "}";
-    SERIAL_IO.println(out);
+    Protocol::reply(out);
 #else
     Protocol::sendErr("ultra_disabled");
 #endif
@@ -335,6 +336,7 @@ static inline void handleJson(const String &line){
       SERIAL_IO.print(F(",\"kp\":")); SERIAL_IO.print(kp);
       SERIAL_IO.print(F(",\"ki\":")); SERIAL_IO.print(ki);
       SERIAL_IO.print(F(",\"kd\":")); SERIAL_IO.print(kd);
+      SERIAL_IO.print(Protocol::ridField());
       SERIAL_IO.println(F("}"));
       return;
     }
@@ -491,7 +493,7 @@ static inline void handleJson(const String &line){
     out += ",";
     out += robot.steppers.pos2();
     out += "]}";
-    SERIAL_IO.println(out);
+    Protocol::reply(out);
     return;
   }
 
@@ -552,6 +554,26 @@ static inline void handleJson(const String &line){
     return;
   }
 
+  // NeoPixel frames streamed by the host; a frame line is only acknowledged when it carries a rid
+  if (line.indexOf("\"cmd\":\"np\"")>=0){
+#if NEOPIXEL_ENABLED
+    if (!neopixel_apply_frame_line(line)){ Protocol::sendErr("np_bad_frame"); return; }
+    if (Protocol::ridField().length()) Protocol::sendOk("np");
+#else
+    Protocol::sendErr("neopixel_disabled");
+#endif
+    return;
+  }
+
+  if (line.indexOf("\"cmd\":\"np_caps\"")>=0){
+#if NEOPIXEL_ENABLED
+    Protocol::reply(String("{\"ok\":true,\"msg\":\"np_caps\",\"np\":1,\"leds\":") + NEO_NUM_LEDS + ",\"line\":" + NEO_LINE_MAX + "}");
+#else
+    Protocol::sendErr("neopixel_disabled");
+#endif
+    return;
+  }
+
   Protocol::sendErr("unknown_cmd");
 }
 
@@ -1,12 +1,90 @@
 #ifndef ROBOT_NEOPIXEL_H
 #define ROBOT_NEOPIXEL_H
 
-// NeoPixel support removed — provide no-op stubs for compatibility.
+#include <Arduino.h>
+#include "../xConfig.h"
+
+// Host-driven strip: the Pi renders every frame and streams only the pixel
+// runs that changed (modules/neopixel/services/serial_frames.py):
+//   {"cmd":"np_caps"}                      -> {"ok":true,"msg":"np_caps","np":1,"leds":N,"line":256}
+//   {"cmd":"np","d":"<base64>"[,"s":1]}    -> silent unless the line carries a rid
+// The decoded payload is a list of runs [start_hi, start_lo, count, r,g,b * count];
+// "s":1 latches the frame (show()). Colour order is handled by NEO_CONFIG, so the
+// host sends plain RGB.
+
+#define NEO_LINE_MAX 256  // same guard as Protocol::readLine
+
+#if NEOPIXEL_ENABLED
+#include <Adafruit_NeoPixel.h>
+
+static Adafruit_NeoPixel g_neo(NEO_NUM_LEDS, PIN_NEOPIXEL, NEO_CONFIG);
+static uint8_t g_neoRaw[NEO_LINE_MAX * 3 / 4];
+
+inline void neopixel_begin() { g_neo.begin(); g_neo.clear(); g_neo.show(); }
+inline void neopixel_tick() {}
+inline void neopixel_stop() { g_neo.clear(); g_neo.show(); }
+inline void neopixel_start_animation(const String &name, int r, int g, int b, int iterations, unsigned int interval_ms) {}
+inline void neopixel_set_pixels_from_line(const String &line) {}
+
+static inline int8_t neo_b64(char c){
+  if (c>='A' && c<='Z') return c-'A';
+  if (c>='a' && c<='z') return c-'a'+26;
+  if (c>='0' && c<='9') return c-'0'+52;
+  if (c=='+') return 62;
+  if (c=='/') return 63;
+  return -1;
+}
+
+// Decode line[from, to) into out; byte count or -1 on bad input / overflow
+static inline int neo_b64_decode(const String &line, int from, int to, uint8_t *out, int cap){
+  int n=0; uint16_t acc=0; int bits=0;
+  for (int i=from; i<to; ++i){
+    char c=line[i];
+    if (c=='=') break;
+    int8_t v=neo_b64(c);
+    if (v<0) return -1;
+    acc=(uint16_t)((acc<<6) | (uint8_t)v); bits+=6;
+    if (bits>=8){
+      bits-=8;
+      if (n>=cap) return -1;
+      out[n++]=(uint8_t)(acc>>bits);
+    }
+  }
+  return n;
+}
+
+// Apply one "np" line; false when the payload is malformed (nothing is latched then)
+inline bool neopixel_apply_frame_line(const String &line){
+  int p=line.indexOf("\"d\":\"");
+  if (p<0) return false;
+  p+=5;
+  int e=line.indexOf('"', p);
+  if (e<0) return false;
+  int n=neo_b64_decode(line, p, e, g_neoRaw, sizeof(g_neoRaw));
+  if (n<0) return false;
+  int i=0;
+  while (i+3<=n){
+    uint16_t start=((uint16_t)g_neoRaw[i]<<8) | g_neoRaw[i+1];
+    uint8_t count=g_neoRaw[i+2];
+    i+=3;
+    if (i+3*(int)count>n) return false;
+    for (uint8_t k=0; k<count; ++k, i+=3){
+      uint16_t idx=start+k;
+      if (idx<g_neo.numPixels()) g_neo.setPixelColor(idx, g_neoRaw[i], g_neoRaw[i+1], g_neoRaw[i+2]);
+    }
+  }
+  if (line.indexOf("\"s\":1")>=0) g_neo.show();
+  return true;
+}
+
+#else
+// NeoPixel disabled in xConfig.h — no-op stubs for compatibility.
 
 inline void neopixel_begin() {}
 inline void neopixel_tick() {}
 inline void neopixel_stop() {}
 inline void neopixel_start_animation(const String &name, int r, int g, int b, int iterations, unsigned int interval_ms) {}
 inline void neopixel_set_pixels_from_line(const String &line) {}
+#endif
 
 #endif // ROBOT_NEOPIXEL_H
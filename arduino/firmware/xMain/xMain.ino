@@ -98,6 +98,7 @@ IrMenuController g_irMenu;
 void setup(){
   SERIAL_IO.begin(ROBOT_SERIAL_BAUD);
   robot.begin();
+  neopixel_begin();
   // Auto-load IMU offsets if present
   if (EEPROM.read(EEPROM_ADDR_MAGIC)==EEPROM_MAGIC){ float p,r; EEPROM.get(EEPROM_ADDR_IMU_OFF,p); EEPROM.get(EEPROM_ADDR_IMU_OFF+sizeof(float),r); robot.imu.setOffsets(p,r); }
   // Load persisted buzzer frequencies if present
@@ -279,7 +280,12 @@ void setup(){
 }
 
 void loop(){
-  String line; if (Protocol::readLine(SERIAL_IO, line)) handleJson(line);
+  String line;
+  if (Protocol::readLine(SERIAL_IO, line)){
+    Protocol::beginRequest(line);
+    handleJson(line);
+    Protocol::endRequest();
+  }
   robot.update();
     // Peripherals polling
   #if RFID_ENABLED
@@ -402,7 +408,7 @@ void loop(){
   g_song.update();
   g_buzzer.update();
 #endif
-  // NeoPixel support removed
+  // NeoPixel frames arrive as "np" lines (see app/xCommands.h); nothing to poll
   // Heartbeat timeout safety
   if (HEARTBEAT_TIMEOUT_MS>0 && (millis() - lastHeartbeatMs > HEARTBEAT_TIMEOUT_MS)){
     robot.estop();
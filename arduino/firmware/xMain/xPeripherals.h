@@ -11,6 +11,6 @@
 #include "peripherals/xLaserPair.h"
 #include "peripherals/xBuzzer.h"
 #include "peripherals/xIrKeyReader.h"
-// NeoPixel peripheral removed — feature disabled and code deleted
+// NeoPixel: peripherals/xNeopixel.h (host-streamed frames, included by app/xCommands.h)
 
 #endif // ROBOT_PERIPHERALS_H
\ No newline at end of file
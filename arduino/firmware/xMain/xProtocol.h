@@ -12,6 +12,8 @@
 // {"cmd":"stepper","id":0,"mode":"pos","value":1000}
 // {"cmd":"imu_cal"}
 // Replies are also JSON lines with {"ok":true/...} or {"err":"..."}
+// A request may carry "rid":N; every reply to it echoes the same "rid" so the
+// host can pipeline commands and match replies (events carry no rid).
 
 struct ProtoIn {
   String raw; // the full line
@@ -31,12 +33,36 @@ public:
     return false;
   }
 
+  // Request scope: remember the rid of the line being handled
+  static void beginRequest(const String &line) {
+    rid = 0;
+    int k = line.indexOf("\"rid\":");
+    if (k >= 0) rid = line.substring(k + 6).toInt();
+  }
+  static void endRequest() { rid = 0; }
+
+  // ",\"rid\":N" while handling a request that carried one, else ""
+  static String ridField() {
+    if (rid <= 0) return String();
+    return String(",\"rid\":") + String(rid);
+  }
+
+  // Print a reply object built elsewhere, adding the rid before the closing brace
+  static void reply(const String &json) {
+    if (rid <= 0) { SERIAL_IO.println(json); return; }
+    int end = json.lastIndexOf('}');
+    if (end < 0) { SERIAL_IO.println(json); return; }
+    SERIAL_IO.print(json.substring(0, end));
+    SERIAL_IO.print(ridField());
+    SERIAL_IO.println(json.substring(end));
+  }
+
   static void sendOk(const String &msg = "") {
-    if (msg.length()) SERIAL_IO.println(String("{\"ok\":true,\"msg\":\"") + escape(msg) + "\"}");
-    else SERIAL_IO.println(F("{\"ok\":true}"));
+    if (msg.length()) SERIAL_IO.println(String("{\"ok\":true,\"msg\":\"") + escape(msg) + "\"" + ridField() + "}");
+    else SERIAL_IO.println(String("{\"ok\":true") + ridField() + "}");
   }
   static void sendErr(const String &err) {
-    SERIAL_IO.println(String("{\"ok\":false,\"err\":\"") + escape(err) + "\"}");
+    SERIAL_IO.println(String("{\"ok\":false,\"err\":\"") + escape(err) + "\"" + ridField() + "}");
   }
 
   // Minimal JSON helper (escape only quotes and backslashes)
@@ -53,9 +79,11 @@ public:
 
 private:
   static String buf;
+  static long rid;
 };
 
-// Static member
+// Static members
 String Protocol::buf;
+long Protocol::rid = 0;
 
 #endif // ROBOT_PROTOCOL_H
\ No newline at end of file
@@ -11,11 +11,12 @@ except Exception:
 def get_router(svc: xArduinoSerialService) -> APIRouter:
     r = APIRouter(prefix="/arduino")
 
+    # Request/response routes await the reply on the event loop (no threadpool worker held)
     @r.get("/healthz")
-    def healthz():
+    async def healthz():
         # try ping
         try:
-            resp = svc.hello()
+            resp = await svc.arequest({"cmd": "hello"})
             ok = bool(resp.get("ok", False))
         except Exception:
             ok = False
@@ -28,27 +29,31 @@ def get_router(svc: xArduinoSerialService) -> APIRouter:
         return {"ok": True}
 
     @r.post("/request")
-    def request(obj: Dict[str, Any], timeout: float = 1.0):
+    async def request(obj: Dict[str, Any], timeout: float = 1.0):
         try:
-            resp = svc.request(obj, timeout=timeout)
+            resp = await svc.arequest(obj, timeout=timeout)
             return {"ok": True, "resp": resp}
         except Exception as e:
             return {"ok": False, "error": str(e)}
 
     @r.post("/telemetry/start")
-    def telemetry_start(interval_ms: int = 100):
+    async def telemetry_start(interval_ms: int = 100):
         try:
-            return svc.telemetry_start(interval_ms)
+            return await svc.arequest({"cmd": "telemetry_start", "interval_ms": interval_ms})
         except Exception as e:
             return {"ok": False, "error": str(e)}
 
     @r.post("/telemetry/stop")
-    def telemetry_stop():
+    async def telemetry_stop():
         try:
-            return svc.telemetry_stop()
+            return await svc.arequest({"cmd": "telemetry_stop"})
         except Exception as e:
             return {"ok": False, "error": str(e)}
 
+    @r.get("/stats")
+    def stats():
+        return svc.stats()
+
     @r.get("/rfid/last")
     def rfid_last():
         snap = svc.get_last_rfid()
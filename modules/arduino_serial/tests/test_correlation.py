@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import queue
+import threading
+import time
+
+from modules.arduino_serial.xArduinoSerialService import xArduinoSerialService
+
+
+class FakeBoard:
+    """Transport that answers each command after `delay_s`, in write order unless `reverse`."""
+
+    def __init__(self, echo_rid: bool = True, delay_s: float = 0.0, reverse: bool = False):
+        self.echo_rid = echo_rid
+        self.delay_s = delay_s
+        self.reverse = reverse
+        self.lines: "queue.Queue[bytes]" = queue.Queue()
+        self.held = []
+        self.writes = []
+        self._outbox: "queue.Queue[tuple[float, bytes]]" = queue.Queue()
+        threading.Thread(target=self._reply_loop, daemon=True).start()
+
+    def _reply_loop(self) -> None:
+        while True:
+            due, line = self._outbox.get()
+            time.sleep(max(0.0, due - time.monotonic()))
+            self.lines.put(line)
+
+    def write(self, data: bytes) -> int:
+        obj = json.loads(data)
+        self.writes.append(obj)
+        reply = {"ok": True, "msg": obj["cmd"]}
+        if self.echo_rid and "rid" in obj:
+            reply["rid"] = obj["rid"]
+        line = (json.dumps(reply) + "\n").encode()
+        if self.reverse:
+            self.held.append(line)
+        else:
+            self._outbox.put((time.monotonic() + self.delay_s, line))
+        return len(data)
+
+    def release_reversed(self) -> None:
+        for line in reversed(self.held):
+            self.lines.put(line)
+        self.held.clear()
+
+    def readline(self) -> bytes:
+        try:
+            return self.lines.get(timeout=0.05)
+        except queue.Empty:
+            return b""
+
+    def close(self) -> None:
+        pass
+
+
+def _service(board: FakeBoard) -> xArduinoSerialService:
+    svc = xArduinoSerialService({"auto_heartbeat": False, "port": "fake"}, transport_factory=lambda *a: board)
+    svc.start()
+    return svc
+
+
+def test_concurrent_requests_get_their_own_reply():
+    board = FakeBoard(reverse=True)
+    svc = _service(board)
+    out = {}
+
+    def call(cmd):
+        out[cmd] = svc.request({"cmd": cmd}, timeout=2.0)
+
+    threads = [threading.Thread(target=call, args=(c,)) for c in ("hello", "get_state", "imu_read")]
+    for t in threads:
+        t.start()
+    while len(board.held) < 3:
+        time.sleep(0.01)
+    board.release_reversed()  # replies arrive in the opposite order
+    for t in threads:
+        t.join()
+    svc.stop()
+    assert {k: v["msg"] for k, v in out.items()} == {"hello": "hello", "get_state": "get_state", "imu_read": "imu_read"}
+    assert svc.stats()["max_in_flight"] == 3
+
+
+def test_pipelined_batch_and_legacy_fifo_fallback():
+    svc = _service(FakeBoard(echo_rid=False, delay_s=0.02))
+    replies = svc.request_many([{"cmd": "hello"}, {"cmd": "stand"}, {"cmd": "sit"}], timeout=1.0)
+    svc.stop()
+    assert [r["msg"] for r in replies] == ["hello", "stand", "sit"]
+    assert svc.stats()["firmware_rids"] is False
+
+
+def test_legacy_timeout_keeps_its_slot_so_replies_do_not_shift():
+    board = FakeBoard(echo_rid=False, delay_s=0.3)
+    svc = _service(board)
+    try:
+        svc.request({"cmd": "slow"}, timeout=0.05)
+        raise AssertionError("expected timeout")
+    except TimeoutError:
+        pass
+    assert svc.stats()["tombstones"] == 1
+    board.delay_s = 0.0
+    assert svc.request({"cmd": "next"}, timeout=1.0)["msg"] == "next"
+    svc.stop()
+    st = svc.stats()
+    assert (st["timeouts"], st["late_replies"], st["tombstones"]) == (1, 1, 0)
+
+
+def test_arequest_and_timeout():
+    board = FakeBoard(delay_s=0.01)
+    svc = _service(board)
+
+    async def main():
+        return await asyncio.gather(*(svc.arequest({"cmd": c}, timeout=1.0) for c in ("a", "b", "c")))
+
+    assert [r["msg"] for r in asyncio.run(main())] == ["a", "b", "c"]
+    board.delay_s = 0.5
+    try:
+        svc.request({"cmd": "slow"}, timeout=0.05)
+        raise AssertionError("expected timeout")
+    except TimeoutError:
+        pass
+    time.sleep(0.6)  # late reply is dropped, not handed to the next caller
+    board.delay_s = 0.0
+    assert svc.request({"cmd": "next"}, timeout=1.0)["msg"] == "next"
+    svc.stop()
+    assert svc.stats()["late_replies"] == 1 and svc.stats()["timeouts"] == 1
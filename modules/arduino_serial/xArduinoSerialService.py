@@ -1,9 +1,12 @@
 from __future__ import annotations
 
+import asyncio
+import itertools
 import json
 import threading
 import time
 import os
+from collections import OrderedDict
 from queue import Queue, Empty
 from typing import Any, Dict, Optional, Callable, List
 
@@ -15,6 +18,9 @@ try:
 except Exception:  # pragma: no cover
     serial = None  # pyserial optional until installed
 
+# How long a timed-out request keeps its slot in the legacy (no rid) reply order
+_TOMBSTONE_S = 5.0
+
 
 class SerialTransport:
     """Thin wrapper around pyserial for dependency injection in tests."""
@@ -42,12 +48,50 @@ class SerialTransport:
             pass
 
 
+class _Pending:
+    """One in-flight request waiting for its reply (thread event or asyncio future)."""
+
+    __slots__ = ("rid", "cmd", "allow_ready", "event", "reply", "loop", "future", "abandoned_at")
+
+    def __init__(self, rid: int, cmd: Any, allow_ready: bool, loop: Optional[asyncio.AbstractEventLoop] = None):
+        self.rid = rid
+        self.cmd = cmd
+        self.allow_ready = allow_ready
+        self.event = threading.Event()
+        self.reply: Optional[Dict[str, Any]] = None
+        self.loop = loop
+        self.future: Optional["asyncio.Future[Dict[str, Any]]"] = loop.create_future() if loop else None
+        self.abandoned_at = 0.0  # set when the caller gave up but the reply may still come
+
+    def resolve(self, msg: Dict[str, Any]) -> None:
+        self.reply = msg
+        self.event.set()
+        if self.loop is not None:
+            try:
+                self.loop.call_soon_threadsafe(_set_future, self.future, msg)
+            except RuntimeError:
+                pass  # loop closed
+
+
+def _set_future(fut: "asyncio.Future[Dict[str, Any]]", msg: Any) -> None:
+    if fut.done():
+        return
+    if isinstance(msg, BaseException):
+        fut.set_exception(msg)
+    else:
+        fut.set_result(msg)
+
+
 class xArduinoSerialService:
     """NDJSON tabanlı Arduino seri haberleşme servisi.
 
     - Her satır bir JSON mesajıdır. `{ "cmd": ... }` gönderilir.
     - Cevaplar da satır sonu ile gelir; `{"ok":true/false,...}`.
     - Arkaplanda okuma thread'i ve opsiyonel heartbeat vardır.
+    - `request` her komuta bir `rid` ekler; firmware cevapta aynı `rid`'i
+      döndürür, böylece birden çok komut aynı anda yolda olabilir ve
+      eşzamanlı çağıranlar birbirinin cevabını alamaz. `rid` döndürmeyen eski
+      firmware için cevaplar gönderim sırasıyla (FIFO) eşleştirilir.
     """
 
     def __init__(self, config_overrides: Optional[Dict[str, Any]] = None, transport_factory: Optional[Callable[..., Any]] = None):
@@ -62,6 +106,12 @@ class xArduinoSerialService:
         self._rfid_lock = threading.Lock()
         self._last_rfid: Optional[tuple[str, float]] = None
         self._saw_boot_ready = False  # drop one-time boot line from request matching
+        self._write_lock = threading.Lock()
+        self._pending_lock = threading.Lock()
+        self._pending: "OrderedDict[int, _Pending]" = OrderedDict()  # send order == firmware reply order
+        self._rids = itertools.count(1)
+        self._firmware_rids = False  # set once a reply echoes `rid`
+        self._stats = {"requests": 0, "timeouts": 0, "late_replies": 0, "max_in_flight": 0}
 
     # -------- lifecycle --------
     def start(self) -> None:
@@ -82,43 +132,115 @@ class xArduinoSerialService:
         if self._hb_thread:
             self._hb_thread.join(timeout=1.0)
         self._disconnect()
+        with self._pending_lock:
+            pending, self._pending = list(self._pending.values()), OrderedDict()
+        for p in pending:
+            if p.loop is not None:
+                try:
+                    p.loop.call_soon_threadsafe(_set_future, p.future, ConnectionError("Arduino service stopped"))
+                except RuntimeError:
+                    pass
+            p.event.set()
 
     # -------- public api --------
     def send(self, obj: Dict[str, Any]) -> None:
         line = (json.dumps(obj, separators=(",", ":")) + "\n").encode("utf-8")
         self._ensure_connected()
         assert self._ser is not None
-        self._ser.write(line)
+        with self._write_lock:  # whole lines only when several threads pipeline commands
+            self._ser.write(line)
+
+    def send_lines(self, lines: List[bytes]) -> None:
+        """Write pre-encoded NDJSON lines (each ending in ``\\n``) in one go, fire-and-forget."""
+        if not lines:
+            return
+        self._ensure_connected()
+        assert self._ser is not None
+        with self._write_lock:
+            self._ser.write(b"".join(lines))
+
+    def _submit(self, obj: Dict[str, Any], loop: Optional[asyncio.AbstractEventLoop] = None) -> _Pending:
+        rid = next(self._rids)
+        pending = _Pending(rid, obj.get("cmd"), bool(obj.get("allow_ready", False)), loop)
+        payload = {k: v for k, v in obj.items() if k != "allow_ready"}
+        payload["rid"] = rid
+        with self._pending_lock:
+            self._pending[rid] = pending
+            self._stats["requests"] += 1
+            self._stats["max_in_flight"] = max(self._stats["max_in_flight"], len(self._pending))
+        try:
+            self.send(payload)
+        except Exception:
+            self._forget(rid)
+            raise
+        return pending
+
+    def _forget(self, rid: int) -> None:
+        with self._pending_lock:
+            self._pending.pop(rid, None)
+
+    def _abandon(self, rid: int, timed_out: bool = True) -> None:
+        """Give up on a request that was sent; its reply may still arrive."""
+        with self._pending_lock:
+            if timed_out:
+                self._stats["timeouts"] += 1
+            pending = self._pending.get(rid)
+            if pending is None:
+                return
+            if self._firmware_rids:
+                del self._pending[rid]  # a late reply is recognised by its rid
+            else:
+                # Legacy firmware answers in order: keep the slot as a tombstone
+                # so its late reply is swallowed, not handed to the next caller.
+                pending.abandoned_at = time.monotonic()
 
     def request(self, obj: Dict[str, Any], timeout: float = 1.0) -> Dict[str, Any]:
-        self.send(obj)
-        t0 = time.time()
-        want_cmd = obj.get("cmd")
-        while True:
-            elapsed = time.time() - t0
-            remaining = timeout - elapsed
-            if remaining <= 0:
-                break
-            try:
-                msg = self._rx_queue.get(timeout=remaining)
-                # Filter out initial boot "ready" message once, so it doesn't satisfy the first request.
-                if not obj.get("allow_ready", False) and isinstance(msg, dict) and msg.get("ok") is True and msg.get("msg") == "ready":
-                    # Only drop once per service lifecycle
-                    if not self._saw_boot_ready:
-                        self._saw_boot_ready = True
-                        continue
-                # Ignore heartbeat acks unless we explicitly requested hb
-                if want_cmd != "hb" and isinstance(msg, dict) and msg.get("ok") is True and msg.get("msg") == "hb":
-                    continue
-                # Prefer messages that look like a command reply: must contain 'ok' or 'err'
-                if isinstance(msg, dict) and ("ok" in msg or "err" in msg):
-                    return msg
-                # Otherwise ignore (likely telemetry) and keep waiting
-                continue
-            except Empty:
-                # timed out waiting for a message in remaining interval; loop will break if overall timeout expired
-                pass
-        raise TimeoutError("No response from Arduino")
+        """Send one command and block until its own reply arrives (per-call timeout)."""
+        pending = self._submit(obj)
+        if not pending.event.wait(timeout) or pending.reply is None:
+            self._abandon(pending.rid)
+            raise TimeoutError("No response from Arduino")
+        return pending.reply
+
+    def request_many(self, objs: List[Dict[str, Any]], timeout: float = 1.0) -> List[Any]:
+        """Pipeline several commands: all are written first, then replies are collected.
+
+        Each entry is the reply dict, or a TimeoutError instance for commands
+        that did not answer within `timeout` (measured from the batch start).
+        """
+        deadline = time.monotonic() + timeout
+        pendings = [self._submit(o) for o in objs]
+        out: List[Any] = []
+        for p in pendings:
+            if p.event.wait(max(0.0, deadline - time.monotonic())) and p.reply is not None:
+                out.append(p.reply)
+            else:
+                self._abandon(p.rid)
+                out.append(TimeoutError(f"No response from Arduino for {p.cmd!r}"))
+        return out
+
+    async def arequest(self, obj: Dict[str, Any], timeout: float = 1.0) -> Dict[str, Any]:
+        """Awaitable `request`: the event loop is not blocked and no worker thread is held."""
+        pending = self._submit(obj, loop=asyncio.get_running_loop())
+        assert pending.future is not None
+        try:
+            return await asyncio.wait_for(pending.future, timeout)
+        except asyncio.TimeoutError:
+            self._abandon(pending.rid)
+            raise TimeoutError("No response from Arduino") from None
+        except asyncio.CancelledError:
+            self._abandon(pending.rid, timed_out=False)
+            raise
+
+    def stats(self) -> Dict[str, Any]:
+        with self._pending_lock:
+            tombstones = sum(1 for p in self._pending.values() if p.abandoned_at)
+            return {
+                **self._stats,
+                "in_flight": len(self._pending) - tombstones,
+                "tombstones": tombstones,
+                "firmware_rids": self._firmware_rids,
+            }
 
     def try_get(self, timeout: float = 0.0) -> Optional[Dict[str, Any]]:
         try:
@@ -294,6 +416,8 @@ class xArduinoSerialService:
                 except Exception:
                     continue
                 self._ingest_message(msg)
+                if self._dispatch_reply(msg):
+                    continue
                 try:
                     self._rx_queue.put_nowait(msg)
                 except Exception:
@@ -307,6 +431,54 @@ class xArduinoSerialService:
                 time.sleep(0.05)
                 continue
 
+    def _dispatch_reply(self, msg: Any) -> bool:
+        """Route a reply to its pending request; False for telemetry/events/unmatched lines."""
+        if not isinstance(msg, dict):
+            return False
+        rid = msg.get("rid")
+        if rid is not None:
+            self._firmware_rids = True
+            with self._pending_lock:
+                pending = self._pending.pop(rid, None) if isinstance(rid, int) else None
+                if pending is None or pending.abandoned_at:
+                    self._stats["late_replies"] += 1
+                    return True
+            pending.resolve(msg)
+            return True
+        if "ok" not in msg and "err" not in msg:
+            return False
+        if msg.get("event") == "rfid" or msg.get("telemetry"):
+            return False
+        with self._pending_lock:
+            hb_waiting = any(p.cmd == "hb" for p in self._pending.values())
+        if msg.get("ok") is True and msg.get("msg") == "hb" and not hb_waiting:
+            return True  # ack of a fire-and-forget heartbeat
+        # Old firmware without rid echo: the board answers strictly in order,
+        # so the reply belongs to the oldest request still waiting.
+        with self._pending_lock:
+            now = time.monotonic()
+            while self._pending:  # a tombstone whose reply never came stops holding its slot
+                first = next(iter(self._pending.values()))
+                if not first.abandoned_at or now - first.abandoned_at < _TOMBSTONE_S:
+                    break
+                self._pending.popitem(last=False)
+            if self._firmware_rids or not self._pending:
+                return False
+            oldest = next(iter(self._pending.values()))
+            if msg.get("ok") is True and msg.get("msg") == "ready" and not oldest.allow_ready:
+                # boot banner, not a reply; only dropped once per service lifecycle
+                if not self._saw_boot_ready:
+                    self._saw_boot_ready = True
+                    return True
+            if oldest.cmd != "hb" and msg.get("ok") is True and msg.get("msg") == "hb":
+                return True
+            self._pending.popitem(last=False)
+            if oldest.abandoned_at:
+                self._stats["late_replies"] += 1
+                return True
+        oldest.resolve(msg)
+        return True
+
     def _heartbeat_loop(self) -> None:
         hb_ms = int(self.cfg.get("heartbeat_ms", 100))
         while not self._stop.is_set():
@@ -5,6 +5,8 @@ import random
 import datetime
 import json
 
+from modules.eventbus import UserInteraction
+
 from .client import ServiceClient
 from .mood import MoodManager
 from .memory import ShortTermMemory
@@ -66,6 +68,7 @@ class AutonomyBrain(
         self._owner_report_pending = False
         self._last_owner_scan = 0.0
         self._reset_daily_timeline()
+        self._bus_sub = None
 
     def start(self):
         if self.running:
@@ -77,12 +80,20 @@ class AutonomyBrain(
         except Exception:
             logger.warning("Failed to select persona 'sentry'")
 
+        # speech/vision report interactions in-process when mounted in the same gateway
+        if self._bus_sub is None:
+            self._bus_sub = self.client.bus.subscribe(
+                UserInteraction, lambda e: self.interaction_occurred(source=e.source), name="autonomy.brain"
+            )
         self.thread = threading.Thread(target=self._loop, daemon=True)
         self.thread.start()
         logger.info("Autonomy Brain started.")
 
     def stop(self):
         self.running = False
+        if self._bus_sub is not None:
+            self._bus_sub.close()
+            self._bus_sub = None
         if self.thread:
             self.thread.join()
         logger.info("Autonomy Brain stopped.")
@@ -1,11 +1,22 @@
 import requests
 import logging
 
+from modules.eventbus import InteractionEvent, NeoCommand, SpeakRequest, get_bus
+
 logger = logging.getLogger("autonomy.client")
 
 class ServiceClient:
-    def __init__(self, base_urls):
+    """Calls into the other modules.
+
+    Fire-and-forget commands (interaction events, LEDs, speech) go over the
+    in-process event bus when the target module is mounted in the same
+    gateway; the HTTP endpoint is only used as the fallback. Calls that need
+    a reply stay on HTTP.
+    """
+
+    def __init__(self, base_urls, bus=None):
         self.urls = base_urls
+        self.bus = bus or get_bus()
 
     def _post(self, service, endpoint, json=None, params=None):
         url = self.urls.get(service)
@@ -67,34 +78,39 @@ class ServiceClient:
         endpoint = f"/{action}"
         return self._post(service, endpoint)
 
-    def set_neopixel(self, effect, emotions=None, color=None):
-        params = {"name": effect}
-        if emotions:
-            params["emotions"] = emotions
-        if color and len(color) == 3:
-            params["r"], params["g"], params["b"] = color
-        return self._post("neopixel", "/animate", params=params)
+    def set_neopixel(self, effect, emotions=None, color=None, duration=None):
+        cmd = NeoCommand(
+            op="animate",
+            name=effect,
+            emotions=tuple(emotions) if emotions else None,
+            color=tuple(int(c) for c in color) if color and len(color) == 3 else None,
+            duration=duration,
+        )
+        path, params = cmd.http()
+        return self._publish(cmd, lambda: self._post("neopixel", path, params=params))
 
     def fill_neopixel_color(self, r: int, g: int, b: int):
-        url = self.urls.get("neopixel")
-        if not url:
-            return None
-        try:
-            requests.post(
-                f"{url}/fill",
-                params={"r_": int(r), "g": int(g), "b": int(b)},
-                timeout=1.0,
-            )
-        except Exception as exc:
-            logger.debug(f"Failed to fill neopixel color: {exc}")
+        cmd = NeoCommand(op="fill", color=(int(r), int(g), int(b)))
+        path, params = cmd.http()
+        return self._publish(cmd, lambda: self._post("neopixel", path, params=params))
 
     def speak(self, text, tone=None, engine=None):
-        payload = {"text": text}
-        if tone:
-            payload["tone"] = tone
-        if engine:
-            payload["engine"] = engine
-        return self._post("speak", "/say", payload)
+        def _http():
+            payload = {"text": text, "wait": False}
+            if tone:
+                payload["tone"] = tone
+            if engine:
+                payload["engine"] = engine
+            return self._post("speak", "/say", payload)
+        return self._publish(SpeakRequest(text=text, tone=tone if isinstance(tone, dict) else None, engine=engine), _http)
+
+    def _publish(self, event, fallback):
+        """Publish in-process; returns the HTTP reply when it had to fall back."""
+        reply = []
+        accepted = self.bus.publish(event, fallback=lambda: reply.append(fallback()))
+        if accepted:
+            return {"ok": True, "bus": accepted}
+        return reply[0] if reply else None
 
     def chat(self, query, apply_actions: bool = False):
         params = {"query": query, "apply_actions": str(bool(apply_actions)).lower()}
@@ -107,7 +123,10 @@ class ServiceClient:
         return self._get("speech", "/last")
 
     def push_interaction_event(self, event_type, data=None):
-        return self._post("interactions", "/event", {"type": event_type, "data": data})
+        return self._publish(
+            InteractionEvent(type=event_type, data=data),
+            lambda: self._post("interactions", "/event", {"type": event_type, "data": data}),
+        )
 
     def set_speech_tracking(self, enabled):
         endpoint = "/track/start" if enabled else "/track/stop"
@@ -2,7 +2,7 @@ from __future__ import annotations
 from typing import Dict, Any
 from fastapi import APIRouter
 
-from ..services.camera_calib import suggest_checkerboard
+from ..services.camera_calib import suggest_checkerboard, detect_checkerboard
 from ..services.servo_calib import sweep_params
 
 
@@ -17,6 +17,10 @@ def get_router(cfg: Dict[str, Any]) -> APIRouter:
     def checker(cols: int = 9, rows: int = 6, square_mm: float = 25.0):
         return suggest_checkerboard(cols, rows, square_mm)
 
+    @r.get("/camera/detect")
+    def checker_detect(cols: int = 9, rows: int = 6):
+        return detect_checkerboard(cols, rows)
+
     @r.get("/servo/sweep")
     def servo_sweep():
         return sweep_params()
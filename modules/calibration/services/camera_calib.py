@@ -1,6 +1,38 @@
 from __future__ import annotations
-from typing import Dict, Any
+from typing import Dict, Any, Optional
+
+try:
+    import cv2
+except Exception:
+    cv2 = None
+
+try:
+    from modules.camera.services.frame_bus import get_frame_bus
+except Exception:
+    get_frame_bus = None
 
 
 def suggest_checkerboard(cols: int = 9, rows: int = 6, square_mm: float = 25.0) -> Dict[str, Any]:
     return {"cols": cols, "rows": rows, "square_mm": square_mm}
+
+
+def detect_checkerboard(cols: int = 9, rows: int = 6, image: Optional[Any] = None) -> Dict[str, Any]:
+    """Find inner checkerboard corners on the latest camera bus frame (or `image`)."""
+    if cv2 is None:
+        return {"ok": False, "error": "cv2 not available"}
+    seq = None
+    if image is None:
+        if get_frame_bus is None:
+            return {"ok": False, "error": "camera frame bus not available"}
+        frame = get_frame_bus().latest()
+        if frame is None:
+            return {"ok": False, "error": "no frame on camera bus"}
+        image, seq = frame.image, frame.seq
+    gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY) if image.ndim == 3 else image
+    found, corners = cv2.findChessboardCorners(gray, (cols, rows))
+    return {
+        "ok": True,
+        "seq": seq,
+        "found": bool(found),
+        "corners": corners.reshape(-1, 2).tolist() if found else [],
+    }
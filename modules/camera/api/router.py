@@ -1,5 +1,7 @@
 from __future__ import annotations
-from fastapi import APIRouter, Response
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException, Response
 from fastapi.responses import StreamingResponse
 
 try:
@@ -11,26 +13,45 @@ except Exception:  # fallback when run as script
 def get_router(capture: CameraCapture, fps: int) -> APIRouter:
     router = APIRouter()
 
+    def _check_variant(variant: Optional[str]) -> None:
+        if variant and variant not in capture.pub.variants:
+            raise HTTPException(status_code=400, detail=f"unknown variant: {variant}")
+
     @router.get("/video")
-    async def video_stream():
+    async def video_stream(variant: Optional[str] = None):
+        _check_variant(variant)
         return StreamingResponse(
-            capture.mjpeg_generator(fps),
+            capture.mjpeg_generator(fps, variant),
             media_type="multipart/x-mixed-replace; boundary=frame",
             headers={"Cache-Control": "no-cache"},
         )
 
     @router.get("/snap")
-    async def snapshot():
-        data = await capture.snapshot()
+    async def snapshot(variant: Optional[str] = "full"):
+        _check_variant(variant)
+        data = await capture.snapshot(variant)
         if not data:
             return Response(status_code=503)
         return Response(data, media_type="image/jpeg")
 
     @router.get("/healthz")
     async def healthz():
-        # simple check: snapshot availability
-        data = await capture.snapshot()
-        return {"ok": bool(data)}
+        # simple check: a raw frame is available (does not force an encode)
+        return {"ok": capture.bus.latest() is not None}
+
+    @router.get("/bus")
+    async def bus_stats():
+        # shared raw frame bus (consumed by vision/calibration in-process)
+        return capture.bus.stats()
+
+    @router.get("/encoder")
+    async def encoder_stats():
+        return capture.pub.stats()
+
+    @router.get("/streams")
+    async def stream_stats():
+        # per-client fps / dropped frames / backpressure for /video viewers
+        return {"active": capture.streams.snapshot(), "total_opened": capture.streams.total_opened}
 
     @router.post("/start")
     async def start_camera():
@@ -1,3 +1,14 @@
 from .capture import CameraCapture, FramePublisher
+from .frame_bus import Frame, FrameBus, get_frame_bus
+from .streaming import StreamRegistry, StreamStats, mjpeg_stream
 
-__all__ = ["CameraCapture", "FramePublisher"]
+__all__ = [
+    "CameraCapture",
+    "FramePublisher",
+    "Frame",
+    "FrameBus",
+    "get_frame_bus",
+    "StreamRegistry",
+    "StreamStats",
+    "mjpeg_stream",
+]
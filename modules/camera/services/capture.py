@@ -2,7 +2,7 @@ from __future__ import annotations
 import asyncio
 import threading
 from dataclasses import dataclass
-from typing import Optional, Tuple
+from typing import Any, Dict, Optional, Tuple
 
 try:
     import cv2
@@ -15,6 +15,13 @@ try:
 except Exception:
     PICAM_AVAILABLE = False
 
+try:
+    from .frame_bus import Frame, FrameBus, get_frame_bus
+    from .streaming import StreamRegistry, mjpeg_stream
+except Exception:  # fallback when run as script
+    from services.frame_bus import Frame, FrameBus, get_frame_bus  # type: ignore
+    from services.streaming import StreamRegistry, mjpeg_stream  # type: ignore
+
 
 @dataclass
 class CaptureConfig:
@@ -33,23 +40,161 @@ class CaptureConfig:
 
 
 class FramePublisher:
-    def __init__(self) -> None:
+    """Holds the latest raw frame (via the frame bus) and encodes JPEG on demand.
+
+    Nothing is encoded while nobody is watching. Encoded bytes are cached per
+    (sequence, quality, size), so any number of viewers of the same variant
+    share a single `cv2.imencode` per frame.
+    """
+
+    def __init__(
+        self,
+        bus: Optional[FrameBus] = None,
+        quality: int = 80,
+        variants: Optional[Dict[str, Dict[str, Any]]] = None,
+    ) -> None:
+        self.bus = bus if bus is not None else get_frame_bus()
+        self.quality = int(quality)
+        # named per-consumer variants, e.g. {"thumb": {"width": 320, "quality": 60}}
+        self.variants: Dict[str, Dict[str, Any]] = {"full": {}}
+        self.variants.update(variants or {})
         self._lock = threading.Lock()
-        self._frame_bytes: Optional[bytes] = None
+        self._cache: Dict[Tuple[int, int, Optional[Tuple[int, int]]], bytes] = {}
+        self._cache_seq = 0
+        self._key_locks: Dict[Tuple[int, int, Optional[Tuple[int, int]]], threading.Lock] = {}
+        self._external: Optional[bytes] = None
+        self.encodes = 0
+        self.cache_hits = 0
+
+    def set_frame(self, image: Any) -> int:
+        """Publish a raw frame; encoding is deferred until someone asks."""
+        return self.bus.publish(image)
 
     def set_jpeg(self, jpeg_bytes: bytes) -> None:
+        # Pre-encoded input without a raw frame (older callers); served until a raw frame arrives
+        with self._lock:
+            self._external = jpeg_bytes
+
+    @property
+    def seq(self) -> int:
+        return self.bus.seq
+
+    def _resolve(self, variant: Optional[str], quality: Optional[int], width: Optional[int]) -> Tuple[int, Optional[int]]:
+        spec = self.variants.get(variant, {}) if variant else {}
+        q = int(quality if quality is not None else spec.get("quality", self.quality))
+        w = width if width is not None else spec.get("width")
+        return max(1, min(100, q)), (int(w) if w else None)
+
+    def _key(self, frame: Frame, variant: Optional[str], quality: Optional[int], width: Optional[int]):
+        q, w = self._resolve(variant, quality, width)
+        return (frame.seq, q, _scaled_size(frame.image, w))
+
+    def cached(
+        self,
+        frame: Frame,
+        variant: Optional[str] = None,
+        quality: Optional[int] = None,
+        width: Optional[int] = None,
+    ) -> Optional[bytes]:
+        """Cheap cache lookup; never encodes (safe to call from the event loop)."""
+        key = self._key(frame, variant, quality, width)
         with self._lock:
-            self._frame_bytes = jpeg_bytes
+            data = self._cache.get(key)
+            if data is not None:
+                self.cache_hits += 1
+            return data
 
-    def get_jpeg(self) -> Optional[bytes]:
+    def encode(
+        self,
+        frame: Frame,
+        variant: Optional[str] = None,
+        quality: Optional[int] = None,
+        width: Optional[int] = None,
+    ) -> Optional[bytes]:
+        """Encode `frame` for a variant, at most once per key across all callers."""
+        key = self._key(frame, variant, quality, width)
         with self._lock:
-            return self._frame_bytes
+            data = self._cache.get(key)
+            if data is not None:
+                self.cache_hits += 1
+                return data
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+        with key_lock:
+            # another viewer may have finished the same encode meanwhile
+            with self._lock:
+                data = self._cache.get(key)
+                if data is not None:
+                    self.cache_hits += 1
+                    return data
+            data = _encode_jpeg(frame.image, key[1], key[2])
+            with self._lock:
+                self.encodes += 1
+                if frame.seq > self._cache_seq:
+                    # only the newest sequence is worth keeping
+                    self._cache = {k: v for k, v in self._cache.items() if k[0] >= frame.seq}
+                    self._key_locks = {k: v for k, v in self._key_locks.items() if k[0] >= frame.seq}
+                    self._cache_seq = frame.seq
+                if data is not None and frame.seq >= self._cache_seq:
+                    self._cache[key] = data
+        return data
+
+    def get_jpeg_seq(
+        self,
+        variant: Optional[str] = None,
+        quality: Optional[int] = None,
+        width: Optional[int] = None,
+    ) -> Tuple[int, Optional[bytes]]:
+        """Return (seq, jpeg) for the latest frame."""
+        frame = self.bus.latest()
+        if frame is None:
+            return 0, self._external
+        return frame.seq, self.encode(frame, variant, quality, width)
+
+    def get_jpeg(
+        self,
+        variant: Optional[str] = None,
+        quality: Optional[int] = None,
+        width: Optional[int] = None,
+    ) -> Optional[bytes]:
+        return self.get_jpeg_seq(variant, quality, width)[1]
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "seq": self.bus.seq,
+                "encodes": self.encodes,
+                "cache_hits": self.cache_hits,
+                "cached": len(self._cache),
+                "variants": dict(self.variants),
+            }
+
+
+def _scaled_size(image: Any, width: Optional[int]) -> Optional[Tuple[int, int]]:
+    if not width:
+        return None
+    h, w = image.shape[:2]
+    if width >= w:
+        return None
+    return int(width), max(1, int(round(h * width / w)))
+
+
+def _encode_jpeg(image: Any, quality: int, size: Optional[Tuple[int, int]]) -> Optional[bytes]:
+    if cv2 is None:
+        return None
+    if size is not None:
+        image = cv2.resize(image, size, interpolation=cv2.INTER_AREA)
+    ok, buf = cv2.imencode('.jpg', image, [cv2.IMWRITE_JPEG_QUALITY, quality])
+    return buf.tobytes() if ok else None
 
 
 class CameraCapture:
     def __init__(self, cfg: CaptureConfig, publisher: FramePublisher) -> None:
         self.cfg = cfg
         self.pub = publisher
+        # Raw frames go to the shared bus so other modules never reopen the device
+        self.bus = publisher.bus
+        self.streams = StreamRegistry()
+        self._attached = False
         self._stop = threading.Event()
         self._thread: Optional[threading.Thread] = None
         self._cap: Optional[cv2.VideoCapture] = None
@@ -95,15 +240,11 @@ class CameraCapture:
             return img
 
         def loop() -> None:
-            q = self.cfg.jpeg_quality
             while not self._stop.is_set():
                 ok, frame = cap.read()
                 if not ok:
                     continue
-                frame = _apply_flip(frame)
-                ok2, buf = cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, q])
-                if ok2:
-                    self.pub.set_jpeg(buf.tobytes())
+                self.pub.set_frame(_apply_flip(frame))
         self._thread = threading.Thread(target=loop, daemon=True)
         self._thread.start()
 
@@ -147,17 +288,16 @@ class CameraCapture:
             return img
 
         def loop() -> None:
-            q = self.cfg.jpeg_quality
             while not self._stop.is_set():
                 rgb = cam.capture_array("main")
-                rgb = _apply_flip(rgb)
-                ok, buf = cv2.imencode('.jpg', rgb, [cv2.IMWRITE_JPEG_QUALITY, q])
-                if ok:
-                    self.pub.set_jpeg(buf.tobytes())
+                self.pub.set_frame(_apply_flip(rgb))
         self._thread = threading.Thread(target=loop, daemon=True)
         self._thread.start()
 
     def start(self) -> None:
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
         backend = self.cfg.backend
         if backend == "auto":
             backend = "picamera2" if PICAM_AVAILABLE else "opencv"
@@ -165,11 +305,16 @@ class CameraCapture:
             self._start_picam()
         else:
             self._start_opencv()
+        self.bus.attach_producer()
+        self._attached = True
 
     def stop(self) -> None:
         self._stop.set()
         if self._thread and self._thread.is_alive():
             self._thread.join(timeout=1)
+        if self._attached:
+            self.bus.detach_producer()
+            self._attached = False
         if self._cap is not None:
             try:
                 self._cap.release()
@@ -182,17 +327,9 @@ class CameraCapture:
             except Exception:
                 pass
 
-    async def mjpeg_generator(self, fps: int):
-        boundary = b"--frame\r\nContent-Type: image/jpeg\r\n\r\n"
-        next_tick = 0.0
-        while True:
-            if next_tick == 0.0:
-                next_tick = asyncio.get_running_loop().time()
-            next_tick += 1 / max(1, fps)
-            await asyncio.sleep(max(0.0, next_tick - asyncio.get_running_loop().time()))
-            frame = await asyncio.to_thread(self.pub.get_jpeg)
-            if frame:
-                yield boundary + frame + b"\r\n"
-
-    async def snapshot(self) -> Optional[bytes]:
-        return await asyncio.to_thread(self.pub.get_jpeg)
+    def mjpeg_generator(self, fps: int, variant: Optional[str] = None):
+        # wakes on new frame sequences only; slow clients skip frames instead of queueing
+        return mjpeg_stream(self.pub, fps, variant=variant, registry=self.streams, name="camera")
+
+    async def snapshot(self, variant: Optional[str] = None) -> Optional[bytes]:
+        return await asyncio.to_thread(self.pub.get_jpeg, variant)
@@ -0,0 +1,176 @@
+"""In-process frame bus shared by camera, vision and calibration.
+
+`CameraCapture` is the single owner of the camera device and publishes every
+raw frame here. Consumers (vision inference, calibration, MJPEG endpoints)
+read the same numpy arrays instead of opening the device again.
+
+Frames are handed out by reference: a published array is marked read-only and
+never mutated by the producer, so subscribers can use it without copying and
+without torn reads. The ring keeps the last `capacity` frames addressable by
+sequence number.
+"""
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+
+@dataclass(frozen=True)
+class Frame:
+    seq: int
+    ts: float
+    image: Any  # numpy.ndarray (H, W, C), read-only
+    fmt: str = "BGR"
+
+    @property
+    def shape(self):
+        return getattr(self.image, "shape", None)
+
+
+class FrameBus:
+    def __init__(self, capacity: int = 4) -> None:
+        self.capacity = max(1, int(capacity))
+        self._ring: List[Optional[Frame]] = [None] * self.capacity
+        self._seq = 0
+        self._cond = threading.Condition()
+        self._producers = 0
+        self._published = 0
+        self._last_ts = 0.0
+        self._fps = 0.0
+        # (loop, future) pairs of coroutines awaiting the next sequence
+        self._async_waiters: List[Tuple[asyncio.AbstractEventLoop, "asyncio.Future[None]"]] = []
+
+    # Producer side ----------------------------------------------------
+    def attach_producer(self) -> None:
+        with self._cond:
+            self._producers += 1
+
+    def detach_producer(self) -> None:
+        with self._cond:
+            self._producers = max(0, self._producers - 1)
+            self._cond.notify_all()
+
+    @property
+    def has_producer(self) -> bool:
+        return self._producers > 0
+
+    def publish(self, image: Any, fmt: str = "BGR") -> int:
+        """Publish a raw frame and return its sequence number.
+
+        The array is frozen (read-only) rather than copied; callers must not
+        write into it afterwards.
+        """
+        try:
+            image.flags.writeable = False
+        except Exception:
+            pass
+        now = time.time()
+        with self._cond:
+            self._seq += 1
+            frame = Frame(seq=self._seq, ts=now, image=image, fmt=fmt)
+            self._ring[self._seq % self.capacity] = frame
+            self._published += 1
+            if self._last_ts:
+                dt = now - self._last_ts
+                if dt > 0:
+                    # light EMA so /stats shows a stable producer rate
+                    self._fps = (0.9 * self._fps + 0.1 / dt) if self._fps else 1.0 / dt
+            self._last_ts = now
+            self._cond.notify_all()
+            seq = self._seq
+            waiters, self._async_waiters = self._async_waiters, []
+        for loop, fut in waiters:
+            try:
+                loop.call_soon_threadsafe(_wake, fut)
+            except RuntimeError:
+                pass  # loop already closed
+        return seq
+
+    # Consumer side ----------------------------------------------------
+    @property
+    def seq(self) -> int:
+        return self._seq
+
+    def latest(self) -> Optional[Frame]:
+        with self._cond:
+            if self._seq == 0:
+                return None
+            return self._ring[self._seq % self.capacity]
+
+    def get(self, seq: int) -> Optional[Frame]:
+        """Return frame `seq` if it is still inside the ring."""
+        with self._cond:
+            if seq <= 0 or seq > self._seq or self._seq - seq >= self.capacity:
+                return None
+            return self._ring[seq % self.capacity]
+
+    def wait_next(self, after_seq: int, timeout: Optional[float] = None) -> Optional[Frame]:
+        """Block until a frame newer than `after_seq` exists and return the latest one.
+
+        Slow consumers skip intermediate frames instead of queueing them.
+        Returns None on timeout.
+        """
+        with self._cond:
+            if not self._cond.wait_for(lambda: self._seq > after_seq, timeout=timeout):
+                return None
+            return self._ring[self._seq % self.capacity]
+
+    async def wait_next_async(self, after_seq: int, timeout: Optional[float] = None) -> Optional[Frame]:
+        """Asyncio counterpart of `wait_next`: no polling, no worker thread."""
+        loop = asyncio.get_running_loop()
+        with self._cond:
+            if self._seq > after_seq:
+                return self._ring[self._seq % self.capacity]
+            fut = loop.create_future()
+            entry = (loop, fut)
+            self._async_waiters.append(entry)
+        try:
+            await asyncio.wait_for(fut, timeout)
+        except asyncio.TimeoutError:
+            return None
+        finally:
+            with self._cond:
+                try:
+                    self._async_waiters.remove(entry)
+                except ValueError:
+                    pass
+        return self.latest()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            latest = self._ring[self._seq % self.capacity] if self._seq else None
+            return {
+                "seq": self._seq,
+                "published": self._published,
+                "producers": self._producers,
+                "capacity": self.capacity,
+                "fps": round(self._fps, 2),
+                "age_s": round(time.time() - latest.ts, 3) if latest else None,
+                "shape": list(latest.shape) if latest is not None and latest.shape else None,
+                "async_waiters": len(self._async_waiters),
+            }
+
+
+def _wake(fut: "asyncio.Future[None]") -> None:
+    if not fut.done():
+        fut.set_result(None)
+
+
+_buses: Dict[str, FrameBus] = {}
+_buses_lock = threading.Lock()
+
+
+def get_frame_bus(name: str = "default", capacity: int = 4) -> FrameBus:
+    """Return the process-wide bus called `name`, creating it on first use."""
+    with _buses_lock:
+        bus = _buses.get(name)
+        if bus is None:
+            bus = FrameBus(capacity=capacity)
+            _buses[name] = bus
+        return bus
+
+
+__all__ = ["Frame", "FrameBus", "get_frame_bus"]
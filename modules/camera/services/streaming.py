@@ -0,0 +1,125 @@
+"""Event-driven MJPEG streaming on top of FrameBus/FramePublisher.
+
+Each client coroutine sleeps until the bus publishes a newer sequence, so a
+stream never resends a frame and never polls. When a client is slower than the
+camera it simply picks up the newest frame on its next turn (intermediate
+frames are dropped, nothing queues up). Per-client counters are kept in a
+`StreamRegistry` for the stats endpoints.
+"""
+from __future__ import annotations
+
+import asyncio
+import itertools
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+BOUNDARY = b"--frame\r\nContent-Type: image/jpeg\r\n\r\n"
+
+
+@dataclass
+class StreamStats:
+    id: int
+    name: str
+    variant: Optional[str]
+    opened: float = field(default_factory=time.time)
+    sent: int = 0
+    dropped: int = 0  # sequences never sent to this client
+    slow_sends: int = 0  # sends that took longer than one frame interval (backpressure)
+    bytes: int = 0
+    fps: float = 0.0
+    send_ms: float = 0.0  # EMA of time spent waiting on the client socket
+    _last_sent: float = 0.0
+
+    def on_sent(self, nbytes: int, send_s: float, interval_s: float, now: float) -> None:
+        self.sent += 1
+        self.bytes += nbytes
+        if send_s > interval_s:
+            self.slow_sends += 1
+        ms = send_s * 1000.0
+        self.send_ms = ms if self.sent == 1 else 0.9 * self.send_ms + 0.1 * ms
+        if self._last_sent:
+            dt = now - self._last_sent
+            if dt > 0:
+                self.fps = 1.0 / dt if not self.fps else 0.9 * self.fps + 0.1 / dt
+        self._last_sent = now
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "name": self.name,
+            "variant": self.variant,
+            "age_s": round(time.time() - self.opened, 1),
+            "sent": self.sent,
+            "dropped": self.dropped,
+            "slow_sends": self.slow_sends,
+            "bytes": self.bytes,
+            "fps": round(self.fps, 2),
+            "send_ms": round(self.send_ms, 2),
+        }
+
+
+class StreamRegistry:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self._active: Dict[int, StreamStats] = {}
+        self.total_opened = 0
+
+    def open(self, name: str, variant: Optional[str]) -> StreamStats:
+        st = StreamStats(id=next(self._ids), name=name, variant=variant)
+        with self._lock:
+            self._active[st.id] = st
+            self.total_opened += 1
+        return st
+
+    def close(self, st: StreamStats) -> None:
+        with self._lock:
+            self._active.pop(st.id, None)
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [s.as_dict() for s in self._active.values()]
+
+
+async def mjpeg_stream(
+    pub: Any,
+    fps: int,
+    variant: Optional[str] = None,
+    registry: Optional[StreamRegistry] = None,
+    name: str = "stream",
+):
+    """Yield multipart JPEG parts for `pub` (a FramePublisher), capped at `fps`."""
+    interval = 1.0 / max(1, int(fps))
+    st = registry.open(name, variant) if registry else StreamStats(id=0, name=name, variant=variant)
+    loop = asyncio.get_running_loop()
+    last_seq = 0
+    try:
+        while True:
+            frame = await pub.bus.wait_next_async(last_seq, timeout=2.0)
+            if frame is None:
+                continue  # producer stalled; keep the connection open
+            if last_seq and frame.seq > last_seq + 1:
+                st.dropped += frame.seq - last_seq - 1
+            last_seq = frame.seq
+            data = pub.cached(frame, variant)
+            if data is None:
+                # first viewer of this (seq, variant) pays the encode off-loop
+                data = await asyncio.to_thread(pub.encode, frame, variant)
+            if not data:
+                continue
+            t0 = loop.time()
+            yield BOUNDARY + data + b"\r\n"
+            t1 = loop.time()
+            st.on_sent(len(data), t1 - t0, interval, t1)
+            # fps cap: frames published while we sleep are skipped, not queued
+            delay = interval - (t1 - t0)
+            if delay > 0:
+                await asyncio.sleep(delay)
+    finally:
+        if registry:
+            registry.close(st)
+
+
+__all__ = ["BOUNDARY", "StreamStats", "StreamRegistry", "mjpeg_stream"]
@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+import threading
+
+import numpy as np
+
+from modules.camera.services.frame_bus import FrameBus, get_frame_bus
+
+
+def test_publish_is_zero_copy_and_read_only():
+    bus = FrameBus(capacity=2)
+    img = np.zeros((4, 4, 3), dtype=np.uint8)
+    seq = bus.publish(img)
+    f = bus.latest()
+    assert f is not None and f.seq == seq == 1
+    assert f.image is img
+    assert not f.image.flags.writeable
+
+
+def test_ring_evicts_old_sequences():
+    bus = FrameBus(capacity=2)
+    for _ in range(3):
+        bus.publish(np.zeros((2, 2, 3), dtype=np.uint8))
+    assert bus.get(1) is None
+    assert bus.get(2).seq == 2
+    assert bus.get(3).seq == 3
+
+
+def test_wait_next_wakes_on_publish_and_times_out():
+    bus = FrameBus()
+    assert bus.wait_next(0, timeout=0.01) is None
+    t = threading.Timer(0.02, lambda: bus.publish(np.ones((1, 1, 3), dtype=np.uint8)))
+    t.start()
+    f = bus.wait_next(0, timeout=1.0)
+    t.join()
+    assert f is not None and f.seq == 1
+
+
+def test_named_bus_is_shared():
+    assert get_frame_bus("unit") is get_frame_bus("unit")
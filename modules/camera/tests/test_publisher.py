@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+import importlib.util
+
+import numpy as np
+import pytest
+
+if importlib.util.find_spec("cv2") is None:
+    pytest.skip("cv2 not installed; skipping publisher tests", allow_module_level=True)
+
+from modules.camera.services.capture import FramePublisher  # noqa: E402
+from modules.camera.services.frame_bus import FrameBus  # noqa: E402
+
+
+def _pub() -> FramePublisher:
+    return FramePublisher(bus=FrameBus(), quality=80, variants={"thumb": {"width": 32, "quality": 50}})
+
+
+def test_no_encode_until_requested():
+    pub = _pub()
+    for _ in range(5):
+        pub.set_frame(np.zeros((48, 64, 3), dtype=np.uint8))
+    assert pub.encodes == 0
+    assert pub.get_jpeg()[:2] == b"\xff\xd8"
+    assert pub.encodes == 1
+
+
+def test_viewers_share_one_encode_per_variant():
+    pub = _pub()
+    pub.set_frame(np.zeros((48, 64, 3), dtype=np.uint8))
+    first = pub.get_jpeg("thumb")
+    for _ in range(3):
+        assert pub.get_jpeg("thumb") is first
+    assert pub.encodes == 1 and pub.cache_hits == 3
+    pub.get_jpeg()
+    assert pub.encodes == 2
+
+
+def test_cache_drops_old_sequences():
+    pub = _pub()
+    pub.set_frame(np.zeros((48, 64, 3), dtype=np.uint8))
+    seq1, _ = pub.get_jpeg_seq()
+    pub.set_frame(np.ones((48, 64, 3), dtype=np.uint8))
+    seq2, _ = pub.get_jpeg_seq()
+    assert seq2 == seq1 + 1
+    assert pub.stats()["cached"] == 1
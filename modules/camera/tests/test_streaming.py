@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+import asyncio
+import importlib.util
+import threading
+
+import numpy as np
+import pytest
+
+if importlib.util.find_spec("cv2") is None:
+    pytest.skip("cv2 not installed; skipping streaming tests", allow_module_level=True)
+
+from modules.camera.services.capture import FramePublisher  # noqa: E402
+from modules.camera.services.frame_bus import FrameBus  # noqa: E402
+from modules.camera.services.streaming import BOUNDARY, StreamRegistry, mjpeg_stream  # noqa: E402
+
+
+def test_wait_next_async_wakes_from_producer_thread():
+    bus = FrameBus()
+
+    async def main():
+        t = threading.Timer(0.02, lambda: bus.publish(np.zeros((2, 2, 3), dtype=np.uint8)))
+        t.start()
+        frame = await bus.wait_next_async(0, timeout=1.0)
+        t.join()
+        return frame
+
+    frame = asyncio.run(main())
+    assert frame is not None and frame.seq == 1
+    assert bus.stats()["async_waiters"] == 0
+
+
+def test_stream_skips_duplicates_and_counts_drops():
+    pub = FramePublisher(bus=FrameBus())
+    reg = StreamRegistry()
+
+    async def main():
+        gen = mjpeg_stream(pub, fps=1000, registry=reg, name="t")
+        pub.set_frame(np.zeros((8, 8, 3), dtype=np.uint8))
+        first = await gen.__anext__()
+        # three frames arrive before the client asks again -> two dropped
+        for _ in range(3):
+            pub.set_frame(np.zeros((8, 8, 3), dtype=np.uint8))
+        second = await gen.__anext__()
+        stats = reg.snapshot()[0]
+        # no new frame: the stream must wait instead of resending
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(gen.__anext__(), 0.05)
+        await gen.aclose()
+        return first, second, stats
+
+    first, second, stats = asyncio.run(main())
+    assert first.startswith(BOUNDARY) and second.startswith(BOUNDARY)
+    assert stats["sent"] == 1 and stats["dropped"] == 2
+    assert reg.snapshot() == []
@@ -37,7 +37,7 @@ def create_app(config_path: str | None = None) -> FastAPI:
     flip=str(cfg.get("flip", "none")),
     )
 
-    publisher = FramePublisher()
+    publisher = FramePublisher(quality=cap_cfg.jpeg_quality, variants=cfg.get("variants") or {})
     capture = CameraCapture(cap_cfg, publisher)
     capture.start()
 
@@ -0,0 +1,22 @@
+"""
+eventbus modülü: aynı süreçteki modüller arası yayın/abonelik (pub/sub).
+
+Dışa açılan basit API:
+- get_bus() -> EventBus (süreç genelinde tek bus)
+- EventBus.publish(event, fallback=None) / EventBus.subscribe(EventType, handler, mode="thread"|"async")
+- Konular: InteractionEvent, UserInteraction, NeoCommand, SpeakRequest, BargeIn
+"""
+from .services.bus import EventBus, Subscription, get_bus, topic
+from .services.topics import BargeIn, InteractionEvent, NeoCommand, SpeakRequest, UserInteraction
+
+__all__ = [
+    "EventBus",
+    "Subscription",
+    "get_bus",
+    "topic",
+    "InteractionEvent",
+    "NeoCommand",
+    "SpeakRequest",
+    "BargeIn",
+    "UserInteraction",
+]
@@ -0,0 +1,368 @@
+"""In-process publish/subscribe bus for modules mounted in the same process.
+
+Modules used to reach each other through HTTP to ``localhost:8080`` even when
+the gateway had them all in one process. Here an event is a dataclass
+registered as a topic (`topic` decorator, see `topics.py`); `publish(event)`
+hands it to every subscriber of that type:
+
+- ``thread`` subscribers get a worker thread, ``async`` subscribers a task on
+  their event loop (coroutine or plain handlers); a slow handler never blocks
+  the publisher;
+- each subscription has a bounded queue with an overflow policy
+  (``drop_oldest`` | ``drop_newest`` | ``block`` for up to `block_s`), and
+  counts depth, drops, lag and handler time (`stats()`);
+- when nobody in this process subscribes to the topic, `publish` runs the
+  caller's `fallback` (the old HTTP call), so a module running standalone
+  keeps working unchanged.
+"""
+from __future__ import annotations
+
+import asyncio
+import inspect
+import itertools
+import logging
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple, Type, TypeVar
+
+logger = logging.getLogger("eventbus")
+
+OVERFLOW_POLICIES = ("drop_oldest", "drop_newest", "block")
+MODES = ("thread", "async")
+
+T = TypeVar("T")
+Handler = Callable[[Any], Any]
+
+
+def topic(name: str) -> Callable[[Type[T]], Type[T]]:
+    """Class decorator registering an event type under topic `name`."""
+    def deco(cls: Type[T]) -> Type[T]:
+        cls.__topic__ = name  # type: ignore[attr-defined]
+        return cls
+    return deco
+
+
+def topic_of(event_type: type) -> str:
+    name = getattr(event_type, "__topic__", None)
+    if not name:
+        raise TypeError(f"{event_type.__name__} is not a bus topic (decorate it with @topic)")
+    return name
+
+
+class Subscription:
+    """A subscriber's bounded queue plus delivery counters."""
+
+    _ids = itertools.count(1)
+    mode = "thread"
+
+    def __init__(
+        self,
+        bus: "EventBus",
+        event_type: type,
+        handler: Handler,
+        name: Optional[str] = None,
+        maxsize: int = 256,
+        overflow: str = "drop_oldest",
+        block_s: float = 0.05,
+    ) -> None:
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"unknown overflow policy {overflow!r}; use one of {OVERFLOW_POLICIES}")
+        self.id = next(self._ids)
+        self.bus = bus
+        self.event_type = event_type
+        self.topic = topic_of(event_type)
+        self.handler = handler
+        self.name = name or getattr(handler, "__qualname__", repr(handler))
+        self.maxsize = max(1, int(maxsize))
+        self.overflow = overflow
+        self.block_s = max(0.0, float(block_s))
+        self._items: Deque[Tuple[float, Any]] = deque()
+        self._cv = threading.Condition()
+        self.closed = False
+        self.delivered = 0
+        self.dropped = 0
+        self.errors = 0
+        self.max_depth = 0
+        self._lag_total = 0.0
+        self.lag_max = 0.0
+        self._handler_total = 0.0
+
+    # Publisher side -------------------------------------------------------
+    def offer(self, event: Any) -> bool:
+        with self._cv:
+            if self.closed:
+                return False
+            if len(self._items) >= self.maxsize:
+                if self.overflow == "drop_oldest":
+                    self._items.popleft()
+                    self.dropped += 1
+                elif self.overflow == "block" and not self._on_consumer():
+                    deadline = time.monotonic() + self.block_s
+                    while len(self._items) >= self.maxsize and not self.closed:
+                        left = deadline - time.monotonic()
+                        if left <= 0:
+                            break
+                        self._cv.wait(left)
+                    if len(self._items) >= self.maxsize or self.closed:
+                        self.dropped += 1
+                        return False
+                else:
+                    self.dropped += 1
+                    return False
+            self._items.append((time.monotonic(), event))
+            self.max_depth = max(self.max_depth, len(self._items))
+            self._cv.notify_all()
+        self._wake()
+        return True
+
+    def _on_consumer(self) -> bool:
+        """True when called from the consumer itself (blocking would deadlock)."""
+        return False
+
+    def _wake(self) -> None:
+        pass
+
+    # Consumer side --------------------------------------------------------
+    def _take(self) -> Optional[Tuple[float, Any]]:
+        with self._cv:
+            if not self._items:
+                return None
+            item = self._items.popleft()
+            self._cv.notify_all()  # room for a blocked publisher
+            return item
+
+    def _record(self, queued_at: float, started: float, ok: bool) -> None:
+        lag = started - queued_at
+        with self._cv:
+            self.delivered += 1
+            self._lag_total += lag
+            self.lag_max = max(self.lag_max, lag)
+            self._handler_total += time.monotonic() - started
+            if not ok:
+                self.errors += 1
+
+    def depth(self) -> int:
+        with self._cv:
+            return len(self._items)
+
+    def close(self) -> None:
+        self.bus.unsubscribe(self)
+        with self._cv:
+            self.closed = True
+            self._cv.notify_all()
+        self._wake()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cv:
+            n = self.delivered
+            return {
+                "id": self.id,
+                "name": self.name,
+                "topic": self.topic,
+                "mode": self.mode,
+                "depth": len(self._items),
+                "maxsize": self.maxsize,
+                "max_depth": self.max_depth,
+                "overflow": self.overflow,
+                "delivered": n,
+                "dropped": self.dropped,
+                "errors": self.errors,
+                "lag_ms_avg": round(self._lag_total / n * 1000.0, 2) if n else 0.0,
+                "lag_ms_max": round(self.lag_max * 1000.0, 2),
+                "handler_ms_avg": round(self._handler_total / n * 1000.0, 2) if n else 0.0,
+            }
+
+
+class ThreadSubscription(Subscription):
+    mode = "thread"
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self._thread = threading.Thread(target=self._run, name=f"bus-{self.topic}-{self.id}", daemon=True)
+        self._thread.start()
+
+    def _on_consumer(self) -> bool:
+        return threading.current_thread() is self._thread
+
+    def _run(self) -> None:
+        while True:
+            with self._cv:
+                while not self._items and not self.closed:
+                    self._cv.wait()
+                if self.closed and not self._items:
+                    return
+            item = self._take()
+            if item is None:
+                continue
+            started = time.monotonic()
+            ok = True
+            try:
+                self.handler(item[1])
+            except Exception:
+                ok = False
+                logger.exception("bus handler %s failed on %s", self.name, self.topic)
+            self._record(item[0], started, ok)
+
+    def close(self, timeout: float = 1.0) -> None:
+        super().close()
+        if not self._on_consumer():
+            self._thread.join(timeout)
+
+
+class AsyncSubscription(Subscription):
+    """Delivers on an event loop; `handler` may be a coroutine function."""
+
+    mode = "async"
+
+    def __init__(self, *args: Any, loop: asyncio.AbstractEventLoop, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.loop = loop
+        self._ready: Optional[asyncio.Event] = None
+        self._loop_thread: Optional[int] = None
+        self._future = asyncio.run_coroutine_threadsafe(self._run(), loop)
+
+    def _on_consumer(self) -> bool:
+        return threading.get_ident() == self._loop_thread
+
+    def _wake(self) -> None:
+        ready = self._ready
+        if ready is None:
+            return
+        try:
+            self.loop.call_soon_threadsafe(ready.set)
+        except RuntimeError:
+            pass  # loop already closed
+
+    async def _run(self) -> None:
+        self._loop_thread = threading.get_ident()
+        self._ready = asyncio.Event()
+        is_coro = inspect.iscoroutinefunction(self.handler)
+        while not self.closed:
+            item = self._take()
+            if item is None:
+                await self._ready.wait()
+                self._ready.clear()
+                continue
+            started = time.monotonic()
+            ok = True
+            try:
+                if is_coro:
+                    await self.handler(item[1])
+                else:
+                    self.handler(item[1])
+            except Exception:
+                ok = False
+                logger.exception("bus handler %s failed on %s", self.name, self.topic)
+            self._record(item[0], started, ok)
+
+
+class EventBus:
+    def __init__(self) -> None:
+        self._subs: Dict[type, List[Subscription]] = {}
+        self._lock = threading.Lock()
+        self._topics: Dict[str, Dict[str, int]] = {}
+
+    def subscribe(
+        self,
+        event_type: type,
+        handler: Handler,
+        mode: str = "thread",
+        name: Optional[str] = None,
+        maxsize: int = 256,
+        overflow: str = "drop_oldest",
+        block_s: float = 0.05,
+        loop: Optional[asyncio.AbstractEventLoop] = None,
+    ) -> Subscription:
+        """Deliver every published `event_type` to `handler` off the publisher's thread."""
+        topic_of(event_type)
+        if mode == "thread":
+            sub: Subscription = ThreadSubscription(self, event_type, handler, name, maxsize, overflow, block_s)
+        elif mode == "async":
+            if loop is None:
+                try:
+                    loop = asyncio.get_running_loop()
+                except RuntimeError:
+                    raise ValueError("async subscription needs a running loop or loop=") from None
+            sub = AsyncSubscription(self, event_type, handler, name, maxsize, overflow, block_s, loop=loop)
+        else:
+            raise ValueError(f"unknown mode {mode!r}; use one of {MODES}")
+        with self._lock:
+            self._subs.setdefault(event_type, []).append(sub)
+            self._counters(sub.topic)
+        return sub
+
+    def unsubscribe(self, sub: Subscription) -> None:
+        with self._lock:
+            subs = self._subs.get(sub.event_type, [])
+            if sub in subs:
+                subs.remove(sub)
+
+    def has_subscribers(self, event_type: type) -> bool:
+        with self._lock:
+            return bool(self._subs.get(event_type))
+
+    def publish(self, event: Any, fallback: Optional[Callable[[], Any]] = None) -> int:
+        """Queue `event` for its subscribers; returns how many accepted it.
+
+        With no subscriber in this process `fallback` runs instead (counted as
+        ``fallbacks``); subscribers that drop the event under backpressure do
+        not trigger it.
+        """
+        name = topic_of(type(event))
+        with self._lock:
+            subs = list(self._subs.get(type(event), ()))
+            counters = self._counters(name)
+            counters["published"] += 1
+            if not subs:
+                counters["unrouted"] += 1
+        if not subs:
+            if fallback is not None:
+                with self._lock:
+                    counters["fallbacks"] += 1
+                try:
+                    fallback()
+                except Exception as exc:
+                    logger.debug("bus fallback for %s failed: %s", name, exc)
+            return 0
+        return sum(1 for s in subs if s.offer(event))
+
+    def _counters(self, name: str) -> Dict[str, int]:
+        return self._topics.setdefault(name, {"published": 0, "unrouted": 0, "fallbacks": 0})
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            topics = {k: dict(v) for k, v in self._topics.items()}
+            subs = [s for group in self._subs.values() for s in group]
+        return {"topics": topics, "subscriptions": [s.stats() for s in subs]}
+
+    def close(self) -> None:
+        with self._lock:
+            subs = [s for group in self._subs.values() for s in group]
+        for s in subs:
+            s.close()
+
+
+_default: Optional[EventBus] = None
+_default_lock = threading.Lock()
+
+
+def get_bus() -> EventBus:
+    """The process-wide bus shared by every module mounted in this process."""
+    global _default
+    with _default_lock:
+        if _default is None:
+            _default = EventBus()
+        return _default
+
+
+__all__ = [
+    "EventBus",
+    "Subscription",
+    "ThreadSubscription",
+    "AsyncSubscription",
+    "get_bus",
+    "topic",
+    "topic_of",
+    "OVERFLOW_POLICIES",
+]
@@ -0,0 +1,92 @@
+"""Event types carried on the bus, one dataclass per topic.
+
+The fields mirror the HTTP endpoints they replace, so the fallback path can
+post the same payload when the subscribing module runs in another process.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple
+
+from .bus import topic
+
+Color = Tuple[int, int, int]
+
+
+@topic("interactions.event")
+@dataclass(frozen=True)
+class InteractionEvent:
+    """One-shot event for the LED interaction rules (POST /interactions/event)."""
+
+    type: str
+    data: Optional[Dict[str, Any]] = None
+
+
+@topic("autonomy.interaction")
+@dataclass(frozen=True)
+class UserInteraction:
+    """Someone interacted with the robot; resets boredom (POST /autonomy/interaction)."""
+
+    source: str = "api"
+
+
+@topic("neopixel.command")
+@dataclass(frozen=True)
+class NeoCommand:
+    """LED strip command (POST /neopixel/clear | /fill | /animate)."""
+
+    op: str  # clear | fill | animate
+    name: Optional[str] = None
+    color: Optional[Color] = None
+    emotions: Optional[Tuple[str, ...]] = None
+    iterations: Optional[int] = None
+    layer: str = "effect"
+    blend: str = "replace"
+    duration: Optional[float] = None
+    loop: bool = False
+
+    def http(self) -> Tuple[str, Dict[str, Any]]:
+        """Path and query params of the equivalent neopixel HTTP call."""
+        if self.op == "clear":
+            return "/clear", {}
+        if self.op == "fill":
+            r, g, b = self.color or (0, 0, 0)
+            return "/fill", {"r_": int(r), "g": int(g), "b": int(b)}
+        params: Dict[str, Any] = {"name": self.name}
+        if self.emotions:
+            params["emotions"] = list(self.emotions)
+        if self.color:
+            params["r"], params["g"], params["b"] = (int(c) for c in self.color)
+        if self.iterations is not None:
+            params["iterations"] = self.iterations
+        if self.layer != "effect":
+            params["layer"] = self.layer
+        if self.blend != "replace":
+            params["blend"] = self.blend
+        if self.duration:
+            params["duration"] = self.duration
+        if self.loop:
+            params["loop"] = "true"
+        return "/animate", params
+
+
+@topic("speak.request")
+@dataclass(frozen=True)
+class SpeakRequest:
+    """Text to queue on the speaker (POST /speak/say without waiting)."""
+
+    text: str
+    tone: Optional[Dict[str, Any]] = None
+    engine: Optional[str] = None
+    priority: Optional[str] = None
+
+
+@topic("speak.barge_in")
+@dataclass(frozen=True)
+class BargeIn:
+    """The user started talking; stop the phrase being spoken (POST /speak/barge_in)."""
+
+    source: str = "speech"
+
+
+__all__ = ["InteractionEvent", "UserInteraction", "NeoCommand", "SpeakRequest", "BargeIn"]
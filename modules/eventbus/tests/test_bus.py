@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from dataclasses import dataclass
+
+import pytest
+
+from modules.eventbus import EventBus, InteractionEvent, NeoCommand, topic
+
+
+@topic("test.ping")
+@dataclass(frozen=True)
+class Ping:
+    n: int
+
+
+def _until(cond, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not cond() and time.monotonic() < deadline:
+        time.sleep(0.005)
+    return cond()
+
+
+def test_thread_subscriber_gets_events_in_order_off_the_publisher_thread():
+    bus = EventBus()
+    seen, threads = [], set()
+    sub = bus.subscribe(Ping, lambda e: (seen.append(e.n), threads.add(threading.current_thread().name)))
+    try:
+        assert [bus.publish(Ping(i)) for i in range(5)] == [1] * 5
+        assert _until(lambda: len(seen) == 5)
+        assert seen == list(range(5))
+        assert threading.current_thread().name not in threads
+    finally:
+        sub.close()
+    st = bus.stats()
+    assert st["topics"]["test.ping"]["published"] == 5
+    assert st["subscriptions"] == []
+
+
+def test_fallback_only_runs_without_subscribers():
+    bus = EventBus()
+    calls = []
+    assert bus.publish(InteractionEvent(type="speech.start"), fallback=lambda: calls.append("http")) == 0
+    sub = bus.subscribe(InteractionEvent, lambda e: None)
+    try:
+        assert bus.publish(InteractionEvent(type="speech.end"), fallback=lambda: calls.append("http")) == 1
+    finally:
+        sub.close()
+    assert calls == ["http"]
+    assert bus.stats()["topics"]["interactions.event"]["fallbacks"] == 1
+    with pytest.raises(TypeError):
+        bus.publish({"type": "untyped"})
+
+
+def test_bounded_queue_drops_oldest_and_reports_backpressure():
+    bus = EventBus()
+    gate = threading.Event()
+    seen = []
+    sub = bus.subscribe(Ping, lambda e: (gate.wait(2.0), seen.append(e.n)), maxsize=2)
+    try:
+        bus.publish(Ping(0))
+        assert _until(lambda: sub.depth() == 0)  # the worker holds event 0 in the handler
+        for i in range(1, 6):
+            bus.publish(Ping(i))
+        st = sub.stats()
+        assert (st["depth"], st["max_depth"], st["dropped"]) == (2, 2, 3)
+        gate.set()
+        assert _until(lambda: len(seen) == 3)
+        assert seen == [0, 4, 5]
+    finally:
+        gate.set()
+        sub.close()
+
+
+def test_drop_newest_rejects_when_full():
+    bus = EventBus()
+    gate = threading.Event()
+    sub = bus.subscribe(Ping, lambda e: gate.wait(2.0), maxsize=1, overflow="drop_newest")
+    try:
+        bus.publish(Ping(0))
+        assert _until(lambda: sub.depth() == 0)
+        assert bus.publish(Ping(1)) == 1
+        assert bus.publish(Ping(2)) == 0
+        assert sub.stats()["dropped"] == 1
+    finally:
+        gate.set()
+        sub.close()
+
+
+def test_async_subscriber_runs_coroutines_on_its_loop():
+    async def main():
+        bus = EventBus()
+        got = []
+        loop_thread = threading.get_ident()
+
+        async def handler(e):
+            await asyncio.sleep(0)
+            got.append((e.n, threading.get_ident() == loop_thread))
+
+        sub = bus.subscribe(Ping, handler, mode="async")
+        threading.Thread(target=lambda: [bus.publish(Ping(i)) for i in range(3)]).start()
+        for _ in range(200):
+            if len(got) == 3:
+                break
+            await asyncio.sleep(0.01)
+        sub.close()
+        return got
+
+    assert asyncio.run(main()) == [(0, True), (1, True), (2, True)]
+
+
+def test_neo_commands_reach_the_runner_in_process():
+    from modules.interactions.services.adapters.neopixel_client import NeoBusClient
+    from modules.neopixel.services.driver import NeoDriverConfig
+    from modules.neopixel.services.runner import NeoRunner
+
+    bus = EventBus()
+    runner = NeoRunner(NeoDriverConfig(num_leds=4, backend="sim", order="RGB"), fps=100)
+    runner.attach_bus(bus)
+    client = NeoBusClient("http://unused.invalid/neopixel", bus)
+    try:
+        client.fill(0, 0, 255)
+        client.animate("RAINBOW_CYCLE", layer="effect", duration=0.5)
+        assert _until(lambda: any(h.layer == "effect" for h in runner.engine.layers()))
+        assert [h.layer for h in runner.engine.layers()] == ["base", "effect"]
+        assert bus.stats()["topics"]["neopixel.command"]["fallbacks"] == 0
+    finally:
+        runner.stop()
+    assert NeoCommand(op="fill", color=(1, 2, 3)).http() == ("/fill", {"r_": 1, "g": 2, "b": 3})
@@ -1,50 +1,36 @@
 from __future__ import annotations
-from typing import Dict, Any
+import json
+from typing import Dict, Any, Optional
 from fastapi import APIRouter
+from fastapi.responses import StreamingResponse
 
+try:
+    from ..services.health import HealthRegistry
+except ImportError:
+    from modules.gateway.services.health import HealthRegistry  # type: ignore
 
-def get_router(cfg: Dict[str, Any], started: Dict[str, object]) -> APIRouter:
+
+def get_router(
+    cfg: Dict[str, Any],
+    started: Dict[str, object],
+    health: Optional[HealthRegistry] = None,
+    boot: Optional[Any] = None,
+) -> APIRouter:
     r = APIRouter()
+    hcfg = cfg.get("health", {})
+    if health is None:
+        health = HealthRegistry(timeout_s=float(hcfg.get("timeout_s", 0.5)), ttl_s=float(hcfg.get("ttl_s", 1.0)))
 
     @r.get("/healthz")
-    def healthz():
-        out: Dict[str, Any] = {"ok": True, "modules": {}}
-        # Try to call each module's health if known, else mark as started
-        try:
-            import httpx  # type: ignore
-        except Exception:
-            httpx = None  # type: ignore
-        port = int(cfg.get("server", {}).get("port", 8080))
-        client = None
-        if httpx:
-            client = httpx.Client(base_url=f"http://127.0.0.1:{port}")
-        try:
-            for name in started.keys():
-                path = None
-                if name in ("arduino", "neopixel", "piservo", "telemetry", "diagnostics", "state_manager", "scheduler", "notifier", "calibration", "config_center", "hardware"):
-                    path = f"/{name}/healthz" if name not in ("telemetry", "diagnostics") else f"/{name}/healthz"
-                elif name == "camera":
-                    path = "/camera/healthz"
-                elif name in ("speak", "speech"):
-                    path = f"/{name}/status"
-                elif name in ("wiki_rag",):
-                    path = "/wiki_rag/healthz"
-                if client and path:
-                    try:
-                        resp = client.get(path, timeout=0.5)
-                        ok = resp.status_code == 200
-                        out["modules"][name] = {"ok": ok}
-                        if not ok:
-                            out["ok"] = False
-                    except Exception as e:
-                        out["modules"][name] = {"ok": False, "error": str(e)}
-                        out["ok"] = False
-                else:
-                    out["modules"][name] = {"ok": True}
-        finally:
-            if client:
-                client.close()
-        return out
+    async def healthz():
+        # in-process probes, run concurrently; no HTTP loopback to ourselves
+        health.ensure(started.keys())
+        res = await health.check()
+        modules = {
+            name: {k: v for k, v in m.items() if k in ("ok", "error")}
+            for name, m in res["modules"].items()
+        }
+        return {"ok": res["ok"], "modules": modules}
 
     @r.get("/status")
     def status():
@@ -59,56 +45,36 @@ def get_router(cfg: Dict[str, Any], started: Dict[str, object]) -> APIRouter:
             "not_started": not_started,
         }
 
-    @r.get("/health")
-    def health():
-        try:
-            import httpx  # type: ignore
-        except Exception:
-            return {"ok": True, "note": "httpx not installed; basic status only", "included": list(started.keys())}
+    @r.get("/status/boot")
+    def boot_status():
+        # per-module import/start timings recorded by services.bootstrap
+        if boot is None:
+            return {"ok": False, "error": "boot report not available"}
+        return {"ok": True, **boot.snapshot()}
 
-        summary: Dict[str, Any] = {"ok": True}
-        checks = {
-            "arduino": ("GET", "/arduino/healthz"),
-            "neopixel": ("GET", "/neopixel/healthz"),
-            "piservo": ("GET", "/piservo/healthz"),
-            "speech": ("GET", "/speech/status"),
-            "speak": ("GET", "/speak/status"),
-            "vision_bridge": None,
-            "interactions": None,
-            "ollama": ("GET", "/ollama/healthz"),
-        }
-        mounted_checks = {
-            "camera": ("GET", "/camera/healthz"),
-            "wiki_rag": ("GET", "/wiki_rag/healthz"),
-        }
-        port = int(cfg.get("server", {}).get("port", 8080))
-        client = httpx.Client(base_url=f"http://127.0.0.1:{port}")
-        try:
-            for name, _ in started.items():
-                if name in checks and checks[name] is not None:
-                    method, path = checks[name]
-                    try:
-                        resp = client.request(method, path, timeout=0.5)
-                        summary[name] = {"ok": resp.status_code == 200, "body": resp.json() if resp.headers.get("content-type", "").startswith("application/json") else None}
-                        if not summary[name]["ok"]:
-                            summary["ok"] = False
-                    except Exception as e:
-                        summary[name] = {"ok": False, "error": str(e)}
-                        summary["ok"] = False
-                elif name in mounted_checks:
-                    method, path = mounted_checks[name]
-                    try:
-                        resp = client.request(method, path, timeout=0.5)
-                        summary[name] = {"ok": resp.status_code == 200, "body": resp.json() if resp.headers.get("content-type", "").startswith("application/json") else None}
-                        if not summary[name]["ok"]:
-                            summary["ok"] = False
-                    except Exception as e:
-                        summary[name] = {"ok": False, "error": str(e)}
-                        summary["ok"] = False
-                else:
-                    summary[name] = {"ok": True}
-        finally:
-            client.close()
+    @r.get("/status/bus")
+    def bus_status():
+        # in-process event bus: per-topic publish/fallback counts, per-subscriber queue depth and drops
+        from modules.eventbus import get_bus  # type: ignore
+        return {"ok": True, **get_bus().stats()}
+
+    @r.get("/health")
+    async def health_detail(force: bool = False):
+        health.ensure(started.keys())
+        res = await health.check(force=force)
+        summary: Dict[str, Any] = {"ok": res["ok"]}
+        summary.update(res["modules"])
         return summary
 
+    @r.get("/health/stream")
+    async def health_stream(interval_s: float = 1.0):
+        """Server-sent events: one `data:` line per change of any module's health."""
+        health.ensure(started.keys())
+
+        async def events():
+            async for res in health.watch(interval_s=max(0.2, float(interval_s))):
+                yield f"data: {json.dumps(res)}\n\n"
+
+        return StreamingResponse(events(), media_type="text/event-stream")
+
     return r
@@ -1,13 +1,26 @@
 from __future__ import annotations
-from typing import Dict, Any
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
+import asyncio
+import importlib
 import logging
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 
 from fastapi import FastAPI
 
+from .health import HealthRegistry
+
 logger = logging.getLogger("gateway.bootstrap")
 
 
+def _probe(app: FastAPI, name: str, probe, timeout_s: float | None = None) -> None:
+    health = getattr(app.state, "health", None)
+    if health is not None:
+        health.register(name, probe, timeout_s)
+
+
 def _include_arduino(app: FastAPI, started: Dict[str, object]) -> None:
     from modules.arduino_serial.xArduinoSerialService import xArduinoSerialService  # type: ignore
     from modules.arduino_serial.api.router import get_router as get_arduino_router  # type: ignore
@@ -19,12 +32,25 @@ def _include_arduino(app: FastAPI, started: Dict[str, object]) -> None:
     started["arduino"] = ardu
     app.include_router(get_arduino_router(ardu))
 
+    async def probe():
+        resp = await ardu.arequest({"cmd": "hello"}, timeout=0.4)
+        return {"ok": bool(resp.get("ok", False)), "resp": resp}
+    _probe(app, "arduino", probe)
+
 
 def _include_vision_bridge(app: FastAPI, started: Dict[str, object]) -> None:
     from modules.vision_bridge.api.router import get_router as get_vision_router  # type: ignore
-    app.include_router(get_vision_router(started.get("arduino")))
+    # no VisionProcessor in the gateway (model load stays in the standalone service);
+    # the serial service is the router's `ardu`, not its processor
+    ardu = started.get("arduino")
+    app.include_router(get_vision_router(None, ardu))
     started["vision_bridge"] = True
 
+    async def probe():
+        # no inference thread to watch here: the routes only drive the serial link
+        return {"ok": ardu is not None, "processor": False}
+    _probe(app, "vision_bridge", probe)
+
 
 def _include_neopixel(app: FastAPI, started: Dict[str, object]) -> None:
     from modules.neopixel.services.runner import NeoRunner  # type: ignore
@@ -41,11 +67,28 @@ def _include_neopixel(app: FastAPI, started: Dict[str, object]) -> None:
         ws2812_spi_khz=int(hw.get("ws2812_spi_khz", 2400)),
         backend=str(hw.get("backend", "auto")),
         order=str(hw.get("order", "GRB")),
+        brightness=float(hw.get("brightness", 1.0)),
+        gamma=float(hw.get("gamma", 1.0)),
+        serial_max_line=int(hw.get("serial_max_line", 240)),
+        serial_keyframe_s=float(hw.get("serial_keyframe_s", 5.0)),
     )
-    runner = NeoRunner(cfg_obj)
+    runner = NeoRunner(cfg_obj, fps=float(ncfg.get("render", {}).get("fps", 30)))
+    runner.attach_bus()  # interactions/autonomy publish LED commands in-process
     started["neopixel"] = runner
     app.include_router(get_neopixel_router(runner))
 
+    async def probe():
+        # the render thread starts with the first effect and must outlive it
+        st = runner.engine.stats()
+        link = runner.driver.link_stats()
+        return {
+            "ok": (st["running"] or not st["layers"]) and link.get("protocol") != "disabled",
+            "num_leds": runner.driver.num_leds,
+            "render_running": st["running"],
+            "backend": link.get("backend"),
+        }
+    _probe(app, "neopixel", probe)
+
 
 def _include_interactions(app: FastAPI, started: Dict[str, object], cfg: Dict[str, Any]) -> None:
     from modules.interactions.api.router import get_router as get_inter_router  # type: ignore
@@ -63,13 +106,24 @@ def _include_interactions(app: FastAPI, started: Dict[str, object], cfg: Dict[st
     started["interactions"] = eng
     app.include_router(get_inter_router(eng))
 
+    async def probe():
+        st = eng.rule_stats()
+        return {"ok": st["running"], "queue_depth": st["queue_depth"], "events_dropped": st["events_dropped"]}
+    _probe(app, "interactions", probe)
+
 
 def _include_speak(app: FastAPI, started: Dict[str, object]) -> None:
     from modules.speak.xSpeakService import SpeakService  # type: ignore
     from modules.speak.api.router import get_router as get_speak_router  # type: ignore
     svc = SpeakService()
+    svc.attach_bus()
     started["speak"] = svc
     app.include_router(get_speak_router(svc))
+
+    async def probe():
+        st = svc.scheduler.stats()
+        return {"ok": st["running"], "queued": st["queued"], "speaking": st["current"] is not None}
+    _probe(app, "speak", probe)
     logger.info("module speak mounted")
 
 
@@ -79,6 +133,7 @@ def _include_speech(app: FastAPI, started: Dict[str, object]) -> None:
     svc = SpeechService()
     started["speech"] = svc
     app.include_router(get_speech_router(svc))
+    _probe(app, "speech", svc.health)
     logger.info("module speech mounted")
 
 
@@ -128,11 +183,21 @@ def _include_camera(app: FastAPI, started: Dict[str, object]) -> None:
         picam_af_mode=int(ccfg.get("picamera2", {}).get("af_mode", 2)),
         flip=str(ccfg.get("flip", "none")),
     )
-    publisher = FramePublisher()
+    publisher = FramePublisher(quality=cap_cfg.jpeg_quality, variants=ccfg.get("variants") or {})
     capture = CameraCapture(cap_cfg, publisher)
     capture.start()
     app.include_router(get_cam_router(capture, cap_cfg.fps_target), prefix="/camera", tags=["camera"])
     started["camera"] = capture
+
+    # a few frame periods without a new frame means the capture loop is stuck
+    stale_s = max(0.5, 5.0 / max(1, cap_cfg.fps_target))
+
+    async def probe():
+        # a raw frame is on the bus; never forces an encode
+        stats = capture.bus.stats()
+        age = stats["age_s"]
+        return {"ok": age is not None and age <= stale_s, "fps": stats["fps"], "age_s": age, "stale_s": stale_s}
+    _probe(app, "camera", probe)
     logger.info("module camera mounted")
 
 
@@ -169,6 +234,11 @@ def _include_autonomy(app: FastAPI, started: Dict[str, object]) -> None:
     svc.start()
     started["autonomy"] = svc
     app.include_router(get_autonomy_router(svc.brain))
+
+    async def probe():
+        brain = svc.brain
+        return {"ok": bool(brain.running) and brain.thread is not None and brain.thread.is_alive()}
+    _probe(app, "autonomy", probe)
     logger.info("module autonomy mounted")
 
 
@@ -197,107 +267,241 @@ def _include_notifier(app: FastAPI, started: Dict[str, object]) -> None:
     logger.info("module notifier mounted")
 
 
+def _include_simple(app: FastAPI, started: Dict[str, object], name: str, pkg: str) -> None:
+    """Modules that only need `get_router(load_config(None))`."""
+    get_router = importlib.import_module(f"modules.{pkg}.api.router").get_router
+    load_config = importlib.import_module(f"modules.{pkg}.config_loader").load_config
+    app.include_router(get_router(load_config(None)))
+    started[name] = True
+
+
+def _include_state_manager(app: FastAPI, started: Dict[str, object]) -> None:
+    cfg_sm = importlib.import_module("modules.state_manager.config_loader").load_config(None)
+    StateStore = importlib.import_module("modules.state_manager.services.store").StateStore
+    get_router = importlib.import_module("modules.state_manager.api.router").get_router
+    store = StateStore(cfg_sm.get("defaults", {}))
+    started["state_manager"] = store
+    app.include_router(get_router(store))
+
+
+def _simple(name: str, pkg: str | None = None) -> Callable[..., None]:
+    return lambda app, started, cfg: _include_simple(app, started, name, pkg or name)
+
+
+# name -> (package under modules/, mount function, modules it needs started first, URL prefix)
+# Order is the route registration order.
+MODULES: Dict[str, Tuple[str, Callable[..., None], Tuple[str, ...], str]] = {
+    "arduino": ("arduino_serial", lambda a, s, c: _include_arduino(a, s), (), "/arduino"),
+    "vision_bridge": ("vision_bridge", lambda a, s, c: _include_vision_bridge(a, s), ("arduino", "camera"), "/vision"),
+    "neopixel": ("neopixel", lambda a, s, c: _include_neopixel(a, s), (), "/neopixel"),
+    "interactions": ("interactions", _include_interactions, (), "/interactions"),
+    "speak": ("speak", lambda a, s, c: _include_speak(a, s), (), "/speak"),
+    "speech": ("speech", lambda a, s, c: _include_speech(a, s), (), "/speech"),
+    "ollama": ("ollama", lambda a, s, c: _include_ollama(a, s), (), "/ollama"),
+    "logs": ("logwrapper", lambda a, s, c: _include_logs(a, s), (), "/logs"),
+    "wiki_rag": ("wiki_rag", lambda a, s, c: _include_wiki_rag(a, s), (), "/wiki_rag"),
+    "camera": ("camera", lambda a, s, c: _include_camera(a, s), (), "/camera"),
+    "animate": ("animate", lambda a, s, c: _include_animate(a, s), ("arduino",), "/animate"),
+    "piservo": ("piservo", lambda a, s, c: _include_piservo(a, s), (), "/piservo"),
+    "autonomy": ("autonomy", lambda a, s, c: _include_autonomy(a, s), (), "/autonomy"),
+    "mutagen": ("mutagen", _simple("mutagen"), (), "/mutagen"),
+    "ota": ("ota", _simple("ota"), (), "/ota"),
+    "hardware": ("hardware", _simple("hardware"), (), "/hardware"),
+    "telemetry": ("telemetry", _simple("telemetry"), (), "/telemetry"),
+    "diagnostics": ("diagnostics", _simple("diagnostics"), (), "/diagnostics"),
+    "state_manager": ("state_manager", lambda a, s, c: _include_state_manager(a, s), (), "/state"),
+    "scheduler": ("scheduler", _simple("scheduler"), (), "/scheduler"),
+    "notifier": ("notifier", lambda a, s, c: _include_notifier(a, s), (), "/notify"),
+    "calibration": ("calibration", _simple("calibration"), (), "/calib"),
+    "config_center": ("config_center", _simple("config_center"), (), "/config"),
+}
+
+
+class _Mounts:
+    """Stand-in for the app while a module starts on a worker thread.
+
+    Router and event-handler registrations are recorded and replayed on the
+    real app from the bootstrap thread, in MODULES order, so route order does
+    not depend on which worker finished first.
+    """
+
+    def __init__(self, app: FastAPI) -> None:
+        self._app = app
+        self._calls: List[Tuple[str, tuple, dict]] = []
+
+    @property
+    def state(self):
+        return self._app.state
+
+    def include_router(self, *args: Any, **kwargs: Any) -> None:
+        self._calls.append(("include_router", args, kwargs))
+
+    def add_event_handler(self, *args: Any, **kwargs: Any) -> None:
+        self._calls.append(("add_event_handler", args, kwargs))
+
+    def apply(self, app: FastAPI) -> None:
+        for method, args, kwargs in self._calls:
+            getattr(app, method)(*args, **kwargs)
+
+
+class BootReport:
+    """Per-module import/start timings and state, served at /status/boot."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.modules: Dict[str, Dict[str, Any]] = {}
+        self.wall_s: Optional[float] = None
+        self.workers = 0
+
+    def set(self, name: str, **fields: Any) -> None:
+        with self._lock:
+            self.modules.setdefault(name, {}).update(fields)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            mods = {k: dict(v) for k, v in self.modules.items()}
+        busy = sum((m.get("import_s") or 0.0) + (m.get("start_s") or 0.0) for m in mods.values() if not m.get("lazy_pending"))
+        return {
+            "wall_s": self.wall_s,
+            "sum_module_s": round(busy, 3),
+            "workers": self.workers,
+            "modules": mods,
+        }
+
+
+def _start_module(app: FastAPI, started: Dict[str, object], cfg: Dict[str, Any], name: str, report: BootReport) -> Optional[_Mounts]:
+    pkg, fn, _deps, _prefix = MODULES[name]
+    mounts = _Mounts(app)
+    t0 = time.perf_counter()
+    try:
+        importlib.import_module(f"modules.{pkg}")
+        t1 = time.perf_counter()
+        fn(mounts, started, cfg)
+        t2 = time.perf_counter()
+    except Exception as exc:
+        logger.warning("module %s failed to mount: %s", name, exc)
+        report.set(name, state="failed", error=str(exc), total_s=round(time.perf_counter() - t0, 3))
+        return None
+    report.set(
+        name,
+        state="started",
+        import_s=round(t1 - t0, 3),
+        start_s=round(t2 - t1, 3),
+        thread=threading.current_thread().name,
+    )
+    return mounts
+
+
+class _LazyMounter:
+    """Starts lazy modules on the first request under their URL prefix."""
+
+    def __init__(self, app: FastAPI, started: Dict[str, object], cfg: Dict[str, Any], report: BootReport, names: List[str]) -> None:
+        self.app = app
+        self.started = started
+        self.cfg = cfg
+        self.report = report
+        self.pending = {name: MODULES[name][3] for name in names}
+        self._lock = threading.Lock()  # held for a whole mount, one module at a time
+        self._pending_lock = threading.Lock()  # only guards `pending`; never held while starting
+
+    def match(self, path: str) -> Optional[str]:
+        # runs on the event loop: must not wait behind a mount holding `_lock`
+        with self._pending_lock:
+            pending = list(self.pending.items())
+        for name, prefix in pending:
+            if path == prefix or path.startswith(prefix + "/"):
+                return name
+        return None
+
+    def mount(self, name: str) -> None:
+        with self._lock:
+            if name not in self.pending:
+                return  # another request mounted it meanwhile
+            mounts = _start_module(self.app, self.started, self.cfg, name, self.report)
+            if mounts is not None:
+                mounts.apply(self.app)
+                self.app.openapi_schema = None  # regenerate docs with the new routes
+                health = getattr(self.app.state, "health", None)
+                if health is not None:
+                    health.ensure([name] if name in self.started else [])
+            self.report.set(name, lazy_pending=False)
+            with self._pending_lock:
+                self.pending.pop(name, None)
+
+    async def __call__(self, request, call_next):
+        name = self.match(request.url.path) if self.pending else None
+        if name is not None:
+            await asyncio.to_thread(self.mount, name)
+        return await call_next(request)
+
+
 def bootstrap(app: FastAPI, cfg: Dict[str, Any]) -> Dict[str, object]:
-    """Start and wire modules according to cfg.include and return started dict."""
+    """Start and wire modules according to cfg.include and return started dict.
+
+    Independent modules start concurrently on a thread pool (`boot.workers`);
+    a module waits for the ones listed as its dependencies in MODULES.
+    Modules named in `boot.lazy` are started on the first request under their
+    URL prefix instead. Timings are kept on `app.state.boot`.
+    """
     started: Dict[str, object] = {}
+    hcfg = cfg.get("health", {})
+    app.state.health = HealthRegistry(
+        timeout_s=float(hcfg.get("timeout_s", 0.5)),
+        ttl_s=float(hcfg.get("ttl_s", 1.0)),
+    )
+    report = BootReport()
+    app.state.boot = report
 
     include = cfg.get("include", {})
-
-    def _try(fn, name: str = ""):
-        try:
-            fn()
-        except Exception as exc:
-            logger.warning("module %s failed to mount: %s", name or fn.__name__, exc)
-
-    if include.get("arduino"):
-        _try(lambda: _include_arduino(app, started), "arduino")
-    if include.get("vision_bridge"):
-        _try(lambda: _include_vision_bridge(app, started), "vision_bridge")
-    if include.get("neopixel"):
-        _try(lambda: _include_neopixel(app, started), "neopixel")
-    if include.get("interactions"):
-        _try(lambda: _include_interactions(app, started, cfg), "interactions")
-    if include.get("speak"):
-        _try(lambda: _include_speak(app, started), "speak")
-    if include.get("speech"):
-        _try(lambda: _include_speech(app, started), "speech")
-    if include.get("ollama"):
-        _try(lambda: _include_ollama(app, started), "ollama")
-    if include.get("logs"):
-        _try(lambda: _include_logs(app, started), "logs")
-    if include.get("wiki_rag"):
-        _try(lambda: _include_wiki_rag(app, started), "wiki_rag")
-    if include.get("camera"):
-        _try(lambda: _include_camera(app, started), "camera")
-    if include.get("animate"):
-        _try(lambda: _include_animate(app, started), "animate")
-    if include.get("piservo"):
-        _try(lambda: _include_piservo(app, started), "piservo")
-    if include.get("autonomy"):
-        _try(lambda: _include_autonomy(app, started), "autonomy")
-
-    # optional: mutagen
-    if include.get("mutagen"):
-        _try(lambda: app.include_router(__import__("modules.mutagen.api.router", fromlist=["get_router"]).get_router(
-            __import__("modules.mutagen.config_loader", fromlist=["load_config"]).load_config(None)
-        )), "mutagen")
-        started["mutagen"] = True
-
-    # optional: ota
-    if include.get("ota"):
-        _try(lambda: app.include_router(__import__("modules.ota.api.router", fromlist=["get_router"]).get_router(
-            __import__("modules.ota.config_loader", fromlist=["load_config"]).load_config(None)
-        )), "ota")
-        started["ota"] = True
-
-    # new optional modules
-    if include.get("hardware"):
-        _try(lambda: app.include_router(__import__("modules.hardware.api.router", fromlist=["get_router"]).get_router(
-            __import__("modules.hardware.config_loader", fromlist=["load_config"]).load_config(None)
-        )), "hardware")
-        started["hardware"] = True
-
-    if include.get("telemetry"):
-        _try(lambda: app.include_router(__import__("modules.telemetry.api.router", fromlist=["get_router"]).get_router(
-            __import__("modules.telemetry.config_loader", fromlist=["load_config"]).load_config(None)
-        )), "telemetry")
-        started["telemetry"] = True
-
-    if include.get("diagnostics"):
-        _try(lambda: app.include_router(__import__("modules.diagnostics.api.router", fromlist=["get_router"]).get_router(
-            __import__("modules.diagnostics.config_loader", fromlist=["load_config"]).load_config(None)
-        )), "diagnostics")
-        started["diagnostics"] = True
-
-    if include.get("state_manager"):
-        def _mount_state():
-            cfg_sm = __import__("modules.state_manager.config_loader", fromlist=["load_config"]).load_config(None)
-            StateStore = __import__("modules.state_manager.services.store", fromlist=["StateStore"]).StateStore
-            get_router = __import__("modules.state_manager.api.router", fromlist=["get_router"]).get_router
-            store = StateStore(cfg_sm.get("defaults", {}))
-            started["state_manager"] = store
-            app.include_router(get_router(store))
-        _try(_mount_state, "state_manager")
-
-    if include.get("scheduler"):
-        _try(lambda: app.include_router(__import__("modules.scheduler.api.router", fromlist=["get_router"]).get_router(
-            __import__("modules.scheduler.config_loader", fromlist=["load_config"]).load_config(None)
-        )), "scheduler")
-        started["scheduler"] = True
-
-    if include.get("notifier"):
-        _try(lambda: _include_notifier(app, started), "notifier")
-
-    if include.get("calibration"):
-        _try(lambda: app.include_router(__import__("modules.calibration.api.router", fromlist=["get_router"]).get_router(
-            __import__("modules.calibration.config_loader", fromlist=["load_config"]).load_config(None)
-        )), "calibration")
-        started["calibration"] = True
-
-    if include.get("config_center"):
-        _try(lambda: app.include_router(__import__("modules.config_center.api.router", fromlist=["get_router"]).get_router(
-            __import__("modules.config_center.config_loader", fromlist=["load_config"]).load_config(None)
-        )), "config_center")
-        started["config_center"] = True
-
+    boot_cfg = cfg.get("boot", {}) or {}
+    enabled = [name for name in MODULES if include.get(name)]
+    lazy = {name for name in (boot_cfg.get("lazy") or []) if name in enabled}
+    # a module another eager module depends on cannot wait for a request
+    for name in enabled:
+        if name not in lazy:
+            for dep in MODULES[name][2]:
+                if dep in lazy:
+                    logger.info("boot: %s is needed by %s, starting it eagerly", dep, name)
+                    lazy.discard(dep)
+    eager = [name for name in enabled if name not in lazy]
+
+    t0 = time.perf_counter()
+    workers = max(1, int(boot_cfg.get("workers", 4)))
+    report.workers = workers
+    mounts: Dict[str, Optional[_Mounts]] = {}
+    if workers == 1:
+        todo = list(eager)
+        while todo:  # declaration order, but a module waits for its dependencies
+            name = next(n for n in todo if not any(d in todo for d in MODULES[n][2]))
+            todo.remove(name)
+            mounts[name] = _start_module(app, started, cfg, name, report)
+    else:
+        waiting = {name: {d for d in MODULES[name][2] if d in eager} for name in eager}
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="boot") as pool:
+            running: Dict[Any, str] = {}
+            while waiting or running:
+                for name in [n for n, deps in waiting.items() if not deps]:
+                    del waiting[name]
+                    running[pool.submit(_start_module, app, started, cfg, name, report)] = name
+                done, _ = wait(list(running), return_when=FIRST_COMPLETED)
+                for fut in done:
+                    name = running.pop(fut)
+                    mounts[name] = fut.result()
+                    for deps in waiting.values():
+                        deps.discard(name)
+    for name in eager:  # replay in declaration order
+        m = mounts.get(name)
+        if m is not None:
+            m.apply(app)
+    report.wall_s = round(time.perf_counter() - t0, 3)
+
+    if lazy:
+        for name in lazy:
+            report.set(name, state="lazy", lazy_pending=True)
+        app.middleware("http")(_LazyMounter(app, started, cfg, report, [n for n in enabled if n in lazy]))
+        logger.info("boot: lazy modules %s", ", ".join(sorted(lazy)))
+    logger.info("boot: %d modules in %.2fs (%d workers)", len(eager), report.wall_s, workers)
+
+    # modules without a dedicated probe report "mounted"
+    app.state.health.ensure(started.keys())
     return started
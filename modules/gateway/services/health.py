@@ -0,0 +1,99 @@
+"""In-process health registry for gateway-mounted modules.
+
+Each module mounted by `bootstrap` registers a probe (sync or async callable
+returning a bool or a dict with "ok"). `check` runs every probe concurrently,
+each under its own deadline, and caches the combined result for `ttl_s`, so
+one wedged module costs at most its timeout and concurrent callers share a
+single round of probes. `watch` yields the result whenever a module's state
+changes.
+"""
+from __future__ import annotations
+
+import asyncio
+import inspect
+import time
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, Optional, Tuple
+
+Probe = Callable[[], Any]
+
+
+async def _mounted() -> Dict[str, Any]:
+    return {"ok": True}
+
+
+class HealthRegistry:
+    def __init__(self, timeout_s: float = 0.5, ttl_s: float = 1.0) -> None:
+        self.timeout_s = float(timeout_s)
+        self.ttl_s = float(ttl_s)
+        self._probes: Dict[str, Tuple[Probe, float]] = {}
+        self._cache: Optional[Dict[str, Any]] = None
+        self._cache_ts = 0.0
+        self._inflight: Optional["asyncio.Future[Dict[str, Any]]"] = None
+        self.runs = 0
+
+    def register(self, name: str, probe: Probe, timeout_s: Optional[float] = None) -> None:
+        self._probes[name] = (probe, float(timeout_s if timeout_s is not None else self.timeout_s))
+        self._cache = None
+
+    def ensure(self, names: Iterable[str]) -> None:
+        """Give modules without a dedicated probe a plain "mounted" one."""
+        for name in names:
+            if name not in self._probes:
+                self.register(name, _mounted)
+
+    def names(self):
+        return list(self._probes)
+
+    async def _run(self, name: str, probe: Probe, timeout_s: float) -> Dict[str, Any]:
+        start = time.perf_counter()
+        try:
+            if inspect.iscoroutinefunction(probe):
+                value = await asyncio.wait_for(probe(), timeout_s)
+            else:
+                # sync probes may touch hardware: keep them off the event loop
+                value = await asyncio.wait_for(asyncio.to_thread(probe), timeout_s)
+            if isinstance(value, dict):
+                out = dict(value)
+                out["ok"] = bool(out.get("ok", True))
+            else:
+                out = {"ok": bool(value)}
+        except asyncio.TimeoutError:
+            out = {"ok": False, "error": f"timeout after {timeout_s:.2f}s"}
+        except Exception as exc:
+            out = {"ok": False, "error": str(exc) or type(exc).__name__}
+        out["latency_ms"] = round((time.perf_counter() - start) * 1000.0, 1)
+        return out
+
+    async def _run_all(self) -> Dict[str, Any]:
+        items = list(self._probes.items())
+        results = await asyncio.gather(*(self._run(n, p, t) for n, (p, t) in items))
+        modules = {name: res for (name, _), res in zip(items, results)}
+        self.runs += 1
+        return {"ok": all(m["ok"] for m in modules.values()), "modules": modules, "ts": time.time()}
+
+    async def check(self, force: bool = False) -> Dict[str, Any]:
+        now = time.monotonic()
+        if not force and self._cache is not None and now - self._cache_ts < self.ttl_s:
+            return self._cache
+        loop = asyncio.get_running_loop()
+        fut = self._inflight
+        if fut is None or fut.done() or fut.get_loop() is not loop:
+            fut = self._inflight = loop.create_task(self._run_all())
+        result = await asyncio.shield(fut)
+        if self._inflight is fut:
+            self._cache, self._cache_ts = result, time.monotonic()
+        return result
+
+    async def watch(self, interval_s: float = 1.0) -> AsyncIterator[Dict[str, Any]]:
+        """Yield the current result first, then only when any module's ok/error changes."""
+        last = None
+        while True:
+            result = await self.check()
+            key = {n: (m["ok"], m.get("error")) for n, m in result["modules"].items()}
+            if key != last:
+                last = key
+                yield result
+            await asyncio.sleep(interval_s)
+
+
+__all__ = ["HealthRegistry"]
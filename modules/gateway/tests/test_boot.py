@@ -0,0 +1,97 @@
+import time
+
+
+def _fake_modules(monkeypatch, log):
+    import importlib
+    from fastapi import APIRouter
+
+    # the package re-exports the bootstrap() function under the module's name
+    boot = importlib.import_module("modules.gateway.services.bootstrap")
+
+    def make(name, delay):
+        def mount(app, started, cfg):
+            log.append(("start", name, time.perf_counter()))
+            time.sleep(delay)
+            r = APIRouter(prefix=f"/{name}")
+
+            @r.get("/ping")
+            def ping():
+                return {"name": name}
+
+            app.include_router(r)
+            started[name] = True
+            log.append(("done", name, time.perf_counter()))
+        return mount
+
+    monkeypatch.setattr(boot, "MODULES", {
+        "base": ("gateway", make("base", 0.1), (), "/base"),
+        "a": ("gateway", make("a", 0.2), (), "/a"),
+        "b": ("gateway", make("b", 0.2), (), "/b"),
+        "child": ("gateway", make("child", 0.0), ("base",), "/child"),
+        "slowlazy": ("gateway", make("slowlazy", 0.0), (), "/slowlazy"),
+        "early": ("gateway", make("early", 0.0), ("late",), "/early"),
+        "late": ("gateway", make("late", 0.0), (), "/late"),
+    })
+    return boot
+
+
+def test_parallel_boot_respects_dependencies(monkeypatch):
+    from fastapi import FastAPI
+
+    log = []
+    boot = _fake_modules(monkeypatch, log)
+    app = FastAPI()
+    started = boot.bootstrap(app, {"include": {"base": 1, "a": 1, "b": 1, "child": 1}, "boot": {"workers": 4}})
+    assert set(started) == {"base", "a", "b", "child"}
+    times = {(ev, n): t for ev, n, t in log}
+    # independent modules run at the same time: all of them start before any finishes
+    roots = ("base", "a", "b")
+    assert max(times[("start", n)] for n in roots) < min(times[("done", n)] for n in roots)
+    assert times[("start", "child")] >= times[("done", "base")]
+    report = app.state.boot.snapshot()
+    assert report["modules"]["a"]["state"] == "started" and report["modules"]["a"]["start_s"] >= 0.2
+    # routes are registered in declaration order regardless of finish order
+    paths = [p for p in app.openapi()["paths"] if p.endswith("/ping")]
+    assert paths == ["/base/ping", "/a/ping", "/b/ping", "/child/ping"]
+
+
+def test_lazy_module_mounts_on_first_request(monkeypatch):
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+
+    log = []
+    boot = _fake_modules(monkeypatch, log)
+    app = FastAPI()
+    started = boot.bootstrap(app, {"include": {"a": 1, "slowlazy": 1}, "boot": {"lazy": ["slowlazy"]}})
+    assert "slowlazy" not in started
+    client = TestClient(app)
+    assert client.get("/slowlazy/ping").json() == {"name": "slowlazy"}
+    assert "slowlazy" in started
+    assert app.state.boot.snapshot()["modules"]["slowlazy"]["state"] == "started"
+    assert client.get("/a/ping").status_code == 200
+
+
+def test_serial_boot_still_waits_for_dependencies(monkeypatch):
+    from fastapi import FastAPI
+
+    log = []
+    boot = _fake_modules(monkeypatch, log)
+    boot.bootstrap(FastAPI(), {"include": {"early": 1, "late": 1}, "boot": {"workers": 1}})
+    assert [n for ev, n, _ in log if ev == "start"] == ["late", "early"]
+
+
+def test_lazy_match_does_not_wait_for_a_running_mount(monkeypatch):
+    import threading
+    from fastapi import FastAPI
+
+    boot = _fake_modules(monkeypatch, [])
+    app = FastAPI()
+    lazy = boot._LazyMounter(app, {}, {}, boot.BootReport(), ["a", "b"])
+    with lazy._lock:  # a slow module start in progress on a worker thread
+        got = []
+        t = threading.Thread(target=lambda: got.append(lazy.match("/b/ping")))
+        t.start()
+        t.join(1.0)
+        assert got == ["b"]
+    lazy.mount("a")
+    assert lazy.match("/a/ping") is None and list(lazy.pending) == ["b"]
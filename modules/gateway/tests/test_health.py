@@ -0,0 +1,73 @@
+import asyncio
+import time
+
+
+def test_probes_run_concurrently_with_deadlines():
+    from modules.gateway.services.health import HealthRegistry
+
+    reg = HealthRegistry(timeout_s=0.2, ttl_s=10.0)
+
+    async def slow():
+        await asyncio.sleep(0.15)
+        return {"ok": True}
+
+    async def wedged():
+        await asyncio.sleep(5)
+
+    def broken():
+        raise RuntimeError("no device")
+
+    for i in range(5):
+        reg.register(f"slow{i}", slow)
+    reg.register("wedged", wedged)
+    reg.register("broken", broken)
+    reg.ensure(["mounted"])
+
+    async def main():
+        t0 = time.perf_counter()
+        res = await reg.check()
+        elapsed = time.perf_counter() - t0
+        again = await reg.check()  # cached within ttl
+        return res, elapsed, again
+
+    res, elapsed, again = asyncio.run(main())
+    assert elapsed < 0.5  # bounded by the longest deadline, not the sum
+    assert res["ok"] is False
+    assert res["modules"]["slow3"]["ok"] is True
+    assert "timeout" in res["modules"]["wedged"]["error"]
+    assert res["modules"]["broken"]["error"] == "no device"
+    assert res["modules"]["mounted"]["ok"] is True
+    assert again is res and reg.runs == 1
+
+
+def test_gateway_health_routes():
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+    from modules.gateway.api.router import get_router
+    from modules.gateway.services.bootstrap import bootstrap
+
+    app = FastAPI()
+    started = bootstrap(app, {"include": {"ota": True}})
+    app.include_router(get_router({}, started, app.state.health))
+    client = TestClient(app)
+    body = client.get("/healthz").json()
+    assert body == {"ok": True, "modules": {"ota": {"ok": True}}}
+    assert client.get("/health").json()["ota"]["ok"] is True
+
+
+def test_module_probes_watch_worker_threads():
+    from fastapi import FastAPI
+    from modules.gateway.services.bootstrap import bootstrap
+
+    app = FastAPI()
+    started = bootstrap(app, {"include": {"neopixel": True, "interactions": True}})
+    try:
+        res = asyncio.run(app.state.health.check())
+        assert res["modules"]["interactions"]["ok"] is True
+        assert res["modules"]["neopixel"]["ok"] is True
+        started["interactions"].stop()
+        res = asyncio.run(app.state.health.check(force=True))
+        assert res["modules"]["interactions"]["ok"] is False
+    finally:
+        started["interactions"].stop()
+        started["neopixel"].stop()
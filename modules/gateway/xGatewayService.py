@@ -28,7 +28,12 @@ def create_app(config_path: str | None = None) -> FastAPI:
     # core API for status/health
     try:
         from .api.router import get_router as get_core_router  # type: ignore
-        app.include_router(get_core_router(cfg, app.state.started))  # type: ignore[attr-defined]
+        app.include_router(get_core_router(
+            cfg,
+            app.state.started,  # type: ignore[attr-defined]
+            getattr(app.state, "health", None),
+            getattr(app.state, "boot", None),
+        ))  # type: ignore[attr-defined]
     except Exception:
         pass
 
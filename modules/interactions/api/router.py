@@ -22,9 +22,14 @@ def get_router(engine: InteractionEngine) -> APIRouter:
         data = payload.get("data") if isinstance(payload.get("data"), dict) else None
         if not t:
             return {"ok": False, "error": "type is required"}
-        engine.push_event(t, data)
+        if not engine.push_event(t, data):
+            return {"ok": False, "error": "event queue full"}
         return {"ok": True}
 
+    @r.get("/rules", tags=["interactions"], summary="Rule Stats")
+    def rules():
+        return engine.rule_stats()
+
     @r.post("/effect", tags=["interactions"], summary="Effect")
     def effect(payload: Dict[str, Any]):
         name = str(payload.get("name", "COMET"))
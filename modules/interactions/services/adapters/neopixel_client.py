@@ -1,6 +1,5 @@
 from __future__ import annotations
 
-import time
 from typing import Any, Dict, Optional
 
 try:
@@ -8,6 +7,8 @@ try:
 except Exception:  # pragma: no cover
     requests = None  # type: ignore
 
+from modules.eventbus import NeoCommand, get_bus
+
 
 class NeoHttpClient:
     def __init__(self, base_url: str) -> None:
@@ -28,30 +29,79 @@ class NeoHttpClient:
     def fill(self, r: int, g: int, b: int) -> None:
         self._post("/fill", params={"r_": r, "g": g, "b": b})
 
-    def animate(self, name: str, emotions: Optional[list[str]] = None, iterations: Optional[int] = None) -> None:
+    def animate(
+        self,
+        name: str,
+        emotions: Optional[list[str]] = None,
+        iterations: Optional[int] = None,
+        layer: Optional[str] = None,
+        duration: Optional[float] = None,
+        loop: bool = False,
+    ) -> None:
         params: Dict[str, Any] = {"name": name}
         if emotions:
             params["emotions"] = emotions
         if iterations is not None:
             params["iterations"] = iterations
+        if layer:
+            params["layer"] = layer
+        if duration:
+            params["duration"] = duration
+        if loop:
+            params["loop"] = "true"
         self._post("/animate", params=params)
 
     # Friendly helpers
     def set_base(self, name: str, color: Optional[str | tuple[int, int, int]] = None, speed: Optional[str] = None) -> None:
         # Map to animate with optional emotions: if color hex provided, we cannot pass directly; fallback to simple fill
         if name.upper() in {"BREATHE", "PULSE", "COMET", "METEOR", "RAINBOW", "RAINBOW_CYCLE", "THEATER_CHASE"}:
-            self.animate(name)
+            self.animate(name, layer="base", loop=True)
         elif color and isinstance(color, tuple):
             r, g, b = color
             self.fill(r, g, b)
         else:
-            self.animate(name)
+            self.animate(name, layer="base", loop=True)
 
     def play_effect(self, name: str, duration_ms: int = 800, color: Optional[str | tuple[int, int, int]] = None) -> None:
-        # Trigger an animation for a brief time, then clear to allow base to repaint next tick
-        self.set_base(name, color=color)
-        time.sleep(max(0.0, duration_ms / 1000.0))
-        # Do not clear harshly; let engine repaint base on next cycle
+        # Transient effect layer over the base; the render engine drops it after duration and the base shows again
+        self.animate(name, layer="effect", duration=max(0.0, duration_ms / 1000.0))
+
+
+class NeoBusClient(NeoHttpClient):
+    """Publishes `NeoCommand`s on the in-process bus; HTTP only when neopixel is not mounted here."""
+
+    def __init__(self, base_url: str, bus=None) -> None:
+        super().__init__(base_url)
+        self.bus = bus or get_bus()
+
+    def _send(self, cmd: NeoCommand) -> None:
+        path, params = cmd.http()
+        self.bus.publish(cmd, fallback=lambda: self._post(path, params=params or None))
+
+    def clear(self) -> None:
+        self._send(NeoCommand(op="clear"))
+
+    def fill(self, r: int, g: int, b: int) -> None:
+        self._send(NeoCommand(op="fill", color=(int(r), int(g), int(b))))
+
+    def animate(
+        self,
+        name: str,
+        emotions: Optional[list[str]] = None,
+        iterations: Optional[int] = None,
+        layer: Optional[str] = None,
+        duration: Optional[float] = None,
+        loop: bool = False,
+    ) -> None:
+        self._send(NeoCommand(
+            op="animate",
+            name=name,
+            emotions=tuple(emotions) if emotions else None,
+            iterations=iterations,
+            layer=layer or "effect",
+            duration=duration or None,
+            loop=bool(loop),
+        ))
 
 
 class NoOpNeoClient:
@@ -61,7 +111,15 @@ class NoOpNeoClient:
     def fill(self, r: int, g: int, b: int) -> None:  # pragma: no cover
         pass
 
-    def animate(self, name: str, emotions: Optional[list[str]] = None, iterations: Optional[int] = None) -> None:  # pragma: no cover
+    def animate(
+        self,
+        name: str,
+        emotions: Optional[list[str]] = None,
+        iterations: Optional[int] = None,
+        layer: Optional[str] = None,
+        duration: Optional[float] = None,
+        loop: bool = False,
+    ) -> None:  # pragma: no cover
         pass
 
     def set_base(self, name: str, color: Optional[str | tuple[int, int, int]] = None, speed: Optional[str] = None) -> None:  # pragma: no cover
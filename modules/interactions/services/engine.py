@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import queue
 import threading
 import time
 from typing import Any, Dict, List, Optional, Tuple
@@ -10,16 +11,26 @@ except Exception:  # pragma: no cover
     requests = None  # type: ignore
 
 from .metrics import MetricsCollector
-from .rules import Rule, eval_condition, priority_rank
-from .adapters.neopixel_client import NeoHttpClient, NoOpNeoClient
+from .rules import Rule, RuleIndex, priority_rank
+from .adapters.neopixel_client import NeoBusClient, NeoHttpClient, NoOpNeoClient
+from modules.eventbus import InteractionEvent, get_bus
 
 
 class InteractionEngine:
-    def __init__(self, cfg: Dict[str, Any]):
+    def __init__(self, cfg: Dict[str, Any], bus=None):
         self.cfg = cfg
         self.metrics = MetricsCollector(window_s=int(cfg.get("thresholds", {}).get("cpu_load", {}).get("window_s", 60)))
-        base_url = str(cfg.get("adapter", {}).get("http_base_url", "http://localhost:8092/neopixel"))
-        self.neo = NeoHttpClient(base_url) if base_url else NoOpNeoClient()
+        self.bus = bus or get_bus()
+        adapter = cfg.get("adapter", {})
+        base_url = str(adapter.get("http_base_url", "http://localhost:8092/neopixel"))
+        if not base_url:
+            self.neo = NoOpNeoClient()
+        elif str(adapter.get("mode", "bus")) == "http":
+            self.neo = NeoHttpClient(base_url)
+        else:
+            # in-process when neopixel is mounted in the same gateway, base_url is the fallback
+            self.neo = NeoBusClient(base_url, self.bus)
+        self._sub = None
         # rules
         self.rules: List[Rule] = []
         for r in cfg.get("rules", []) or []:
@@ -30,6 +41,7 @@ class InteractionEngine:
                 action=dict(r.get("action", {})),
                 cooldown_ms=int(r.get("cooldown_ms", 0)),
             ))
+        self.index = RuleIndex(self.rules)
         self.defaults = dict(cfg.get("defaults", {}))
 
         # runtime
@@ -38,6 +50,12 @@ class InteractionEngine:
         self._lock = threading.Lock()
         self._last_base: Optional[Tuple[str, Optional[str | tuple[int, int, int]]]] = None
         self._active_effect_until: float = 0.0
+        self._active_effect_rank: int = 0
+        # one-shot events are decided on arrival by the loop thread, in order
+        self._events: "queue.Queue[Optional[Tuple[str, Optional[Dict[str, Any]]]]]" = queue.Queue(
+            maxsize=max(1, int(cfg.get("event_queue_size", 256)))
+        )
+        self._events_dropped = 0
         self._ctx: Dict[str, Any] = {"arduino_connected": False}
         self._last_net_burst: float = 0.0
         self.monitor_cfg = dict(cfg.get("monitor", {}))
@@ -47,20 +65,35 @@ class InteractionEngine:
         if self._thread and self._thread.is_alive():
             return
         self._stop.clear()
+        if self._sub is None:
+            self._sub = self.bus.subscribe(
+                InteractionEvent, lambda e: self.push_event(e.type, e.data), name="interactions.engine"
+            )
         self._thread = threading.Thread(target=self._loop, name="InteractionsEngine", daemon=True)
         self._thread.start()
 
     def stop(self) -> None:
         self._stop.set()
+        if self._sub is not None:
+            self._sub.close()
+            self._sub = None
+        try:
+            self._events.put_nowait(None)  # wake the loop
+        except queue.Full:
+            pass
         if self._thread:
             self._thread.join(timeout=1.0)
 
     # API
-    def push_event(self, type_: str, data: Optional[Dict[str, Any]] = None) -> None:
-        with self._lock:
-            self._ctx["event"] = type_
-            if data:
-                self._ctx.setdefault("event_data", {}).update(data)
+    def push_event(self, type_: str, data: Optional[Dict[str, Any]] = None) -> bool:
+        """Queue a one-shot event; False if the queue is full and it was dropped."""
+        try:
+            self._events.put_nowait((type_, data))
+            return True
+        except queue.Full:
+            with self._lock:
+                self._events_dropped += 1
+            return False
 
     def set_state(self, **kwargs: Any) -> None:
         with self._lock:
@@ -75,12 +108,39 @@ class InteractionEngine:
                 "ctx": {k: v for k, v in self._ctx.items() if k not in ("metrics",)},
             }
 
+    def rule_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "running": self._thread is not None and self._thread.is_alive(),
+                "ticks": self.index.ticks,
+                "events": sum(self.index.events.values()),
+                "events_unmatched": dict(self.index.unmatched),
+                "events_dropped": self._events_dropped,
+                "queue_depth": self._events.qsize(),
+                "rules": self.index.stats(),
+            }
+
     # Loop
     def _loop(self) -> None:
         interval = float(self.cfg.get("tick_interval_ms", 800)) / 1000.0
+        next_tick = time.monotonic()
         while not self._stop.is_set():
-            self._tick()
-            time.sleep(interval)
+            if time.monotonic() >= next_tick:
+                self._tick()
+                next_tick = time.monotonic() + interval
+            try:
+                item = self._events.get(timeout=max(0.0, next_tick - time.monotonic()))
+            except queue.Empty:
+                continue
+            if item is not None:
+                self._on_event(*item)
+
+    def _on_event(self, type_: str, data: Optional[Dict[str, Any]]) -> None:
+        with self._lock:
+            self._ctx["last_event"] = type_
+            if data:
+                self._ctx.setdefault("event_data", {}).update(data)
+            self._decide(time.time(), event=type_)
 
     def _tick(self) -> None:
         now = time.time()
@@ -107,57 +167,55 @@ class InteractionEngine:
             }
             self._ctx["arduino_connected"] = self._ctx.get("arduino_connected", True)
             self._ctx["net_burst"] = net_burst
-
-            # Evaluate rules
-            manual_base = self._ctx.pop("manual_base", None)
-            chosen: Optional[Rule] = None
-            for r in self.rules:
-                ctx = dict(self._ctx)
-                if eval_condition(r.when, ctx) and r.ready():
-                    if chosen is None or priority_rank(r.priority) > priority_rank(chosen.priority):
-                        chosen = r
-
-            # Render
-            if manual_base and now >= self._active_effect_until:
-                name, color = manual_base
-                key = (str(name).upper(), color)
+            self._decide(now, manual_base=self._ctx.pop("manual_base", None))
+
+    def _decide(self, now: float, event: Optional[str] = None, manual_base: Any = None) -> None:
+        """Pick the best ready rule for the current state (and `event`) and render it.
+
+        Caller holds `self._lock`.
+        """
+        chosen: Optional[Rule] = next((r for r in self.index.candidates(self._ctx, event) if r.ready()), None)
+
+        # Render
+        if manual_base and now >= self._active_effect_until:
+            name, color = manual_base
+            key = (str(name).upper(), color)
+            if key != self._last_base:
+                self._last_base = key
+                self.neo.set_base(name=str(name), color=color)
+        elif chosen:
+            act = chosen.action or {}
+            rank = priority_rank(chosen.priority)
+            # effect or base; a higher-priority effect interrupts the running one
+            if "effect" in act and (now >= self._active_effect_until or rank > self._active_effect_rank):
+                eff = act["effect"] or {}
+                name = str(eff.get("name", "COMET"))
+                duration_ms = int(eff.get("duration_ms", 800))
+                self._active_effect_until = now + duration_ms / 1000.0
+                self._active_effect_rank = rank
+                chosen.stamp()
+                # play effect asynchronously to avoid blocking
+                threading.Thread(target=self.neo.play_effect, args=(name, duration_ms), daemon=True).start()
+            elif "base" in act and now >= self._active_effect_until:
+                base = act["base"] or {}
+                name = str(base.get("name", self.defaults.get("idle", {}).get("base", {}).get("name", "BREATHE")))
+                color = base.get("color")
+                # Apply only if changed
+                key = (name.upper(), color)
                 if key != self._last_base:
                     self._last_base = key
-                    self.neo.set_base(name=str(name), color=color)
-            elif chosen:
-                act = chosen.action or {}
-                # effect or base
-                if "effect" in act and now >= self._active_effect_until:
-                    eff = act["effect"] or {}
-                    name = str(eff.get("name", "COMET"))
-                    duration_ms = int(eff.get("duration_ms", 800))
-                    self._active_effect_until = now + duration_ms / 1000.0
+                    self.neo.set_base(name=name, color=color)
                     chosen.stamp()
-                    # play effect asynchronously to avoid blocking
-                    threading.Thread(target=self.neo.play_effect, args=(name, duration_ms), daemon=True).start()
-                elif "base" in act and now >= self._active_effect_until:
-                    base = act["base"] or {}
-                    name = str(base.get("name", self.defaults.get("idle", {}).get("base", {}).get("name", "BREATHE")))
-                    color = base.get("color")
-                    # Apply only if changed
-                    key = (name.upper(), color)
-                    if key != self._last_base:
-                        self._last_base = key
-                        self.neo.set_base(name=name, color=color)
-                        chosen.stamp()
-            else:
-                # No rule matched; ensure idle base
-                if now >= self._active_effect_until:
-                    idle = self.defaults.get("idle", {}).get("base", {})
-                    name = str(idle.get("name", "BREATHE"))
-                    color = idle.get("color")
-                    key = (name.upper(), color)
-                    if key != self._last_base:
-                        self._last_base = key
-                        self.neo.set_base(name=name, color=color)
-
-            # one-shot event is consumed
-            self._ctx.pop("event", None)
+        else:
+            # No rule matched; ensure idle base
+            if now >= self._active_effect_until:
+                idle = self.defaults.get("idle", {}).get("base", {})
+                name = str(idle.get("name", "BREATHE"))
+                color = idle.get("color")
+                key = (name.upper(), color)
+                if key != self._last_base:
+                    self._last_base = key
+                    self.neo.set_base(name=name, color=color)
 
     def _update_arduino_state(self, now: float) -> None:
         if requests is None:
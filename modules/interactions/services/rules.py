@@ -1,7 +1,10 @@
 from __future__ import annotations
 
+from bisect import bisect_right
+from collections import Counter
 from dataclasses import dataclass, field
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional, Tuple
+import heapq
 import time
 
 
@@ -13,6 +16,8 @@ class Rule:
     action: Dict[str, Any] = field(default_factory=dict)
     cooldown_ms: int = 0
     _last_ts: float = field(default=0.0, init=False, repr=False)
+    matches: int = field(default=0, init=False, repr=False)
+    fires: int = field(default=0, init=False, repr=False)
 
     def ready(self) -> bool:
         if self.cooldown_ms <= 0:
@@ -21,6 +26,7 @@ class Rule:
 
     def stamp(self) -> None:
         self._last_ts = time.time()
+        self.fires += 1
 
 
 def priority_rank(p: str) -> int:
@@ -29,6 +35,7 @@ def priority_rank(p: str) -> int:
 
 
 def eval_condition(cond: Dict[str, Any], ctx: Dict[str, Any]) -> bool:
+    # Reference semantics for a single rule; the engine uses RuleIndex below.
     # Supported keys
     def get(name: str):
         return ctx.get(name)
@@ -50,6 +57,8 @@ def eval_condition(cond: Dict[str, Any], ctx: Dict[str, Any]) -> bool:
         return False
     if "cpu_load_gte" in cond and not ge(m.get("cpu_load"), cond["cpu_load_gte"]):
         return False
+    if "cpu_load_lt" in cond and not lt(m.get("cpu_load"), cond["cpu_load_lt"]):
+        return False
     if "net_burst" in cond:
         # expect ctx["net_burst"] boolean set by engine heuristic
         if bool(cond["net_burst"]) != bool(get("net_burst")):
@@ -59,3 +68,133 @@ def eval_condition(cond: Dict[str, Any], ctx: Dict[str, Any]) -> bool:
         if ac is None or bool(cond["arduino_connected"]) != bool(ac):
             return False
     return True
+
+
+METRICS = ("cpu_temp", "cpu_load")
+FLAGS = ("net_burst", "arduino_connected")
+
+
+class RuleIndex:
+    """Rules compiled once at load time, same semantics as `eval_condition`.
+
+    Event rules are keyed by event type. State rules become bitmasks: each
+    metric's thresholds split its axis into bands (`bisect` on the value),
+    and every band / flag value maps to the set of rules it satisfies, so a
+    decision is a few lookups plus an AND. Matches are cached per state key.
+    Candidates come out best first: priority, then config order.
+    """
+
+    def __init__(self, rules: List[Rule]) -> None:
+        self.rules = list(rules)
+        self._order = {id(r): (-priority_rank(r.priority), i) for i, r in enumerate(self.rules)}
+        ranked = sorted(self.rules, key=self._key)
+        self.by_event: Dict[str, List[Rule]] = {}
+        self.state_rules: List[Rule] = []
+        for r in ranked:
+            if "event" in r.when:
+                self.by_event.setdefault(str(r.when["event"]), []).append(r)
+            else:
+                self.state_rules.append(r)
+        self._everyone = (1 << len(self.state_rules)) - 1
+        self._breaks: Dict[str, List[float]] = {}
+        self._band_masks: Dict[str, List[int]] = {}
+        for m in METRICS:
+            pts = sorted({float(r.when[k]) for r in self.state_rules for k in (f"{m}_gte", f"{m}_lt") if k in r.when})
+            if not pts:
+                continue
+            self._breaks[m] = pts
+            # band -1 is "no reading"; band b holds values with b breakpoints <= value
+            self._band_masks[m] = [self._mask(lambda w: _band_ok(w, m, pts, b)) for b in range(-1, len(pts) + 1)]
+        self._flag_masks: Dict[str, Dict[Optional[bool], int]] = {}
+        for f in FLAGS:
+            if any(f in r.when for r in self.state_rules):
+                self._flag_masks[f] = {v: self._mask(lambda w: _flag_ok(w, f, v)) for v in (None, True, False)}
+        self._cache: Dict[Tuple[Any, ...], List[Rule]] = {}
+        self.ticks = 0
+        self.events: Counter = Counter()
+        self.unmatched: Counter = Counter()
+
+    def _key(self, r: Rule) -> Tuple[int, int]:
+        return self._order[id(r)]
+
+    def _mask(self, ok) -> int:
+        return sum(1 << i for i, r in enumerate(self.state_rules) if ok(r.when))
+
+    def state_key(self, ctx: Dict[str, Any]) -> Tuple[Any, ...]:
+        m = ctx.get("metrics") or {}
+        key: List[Any] = []
+        for name, pts in self._breaks.items():
+            v = m.get(name)
+            key.append(-1 if v is None else bisect_right(pts, v))
+        for f in self._flag_masks:
+            v = ctx.get(f)
+            key.append(None if v is None else bool(v))
+        return tuple(key)
+
+    def match_state(self, ctx: Dict[str, Any]) -> List[Rule]:
+        key = self.state_key(ctx)
+        hit = self._cache.get(key)
+        if hit is None:
+            mask = self._everyone
+            i = 0
+            for name in self._breaks:
+                mask &= self._band_masks[name][key[i] + 1]
+                i += 1
+            for f in self._flag_masks:
+                mask &= self._flag_masks[f][key[i]]
+                i += 1
+            hit = self._cache[key] = [r for j, r in enumerate(self.state_rules) if mask >> j & 1]
+        return hit
+
+    def candidates(self, ctx: Dict[str, Any], event: Optional[str] = None) -> List[Rule]:
+        """Rules whose conditions hold for `ctx` (plus `event`), best first."""
+        state = self.match_state(ctx)
+        if event is None:
+            self.ticks += 1
+            out = list(state)
+        else:
+            self.events[event] += 1
+            on_event = self.by_event.get(event)
+            if not on_event:
+                self.unmatched[event] += 1
+                out = list(state)
+            else:
+                out = list(heapq.merge(on_event, state, key=self._key))
+        for r in out:
+            r.matches += 1
+        return out
+
+    def stats(self) -> List[Dict[str, Any]]:
+        decisions = self.ticks + sum(self.events.values())
+        out = []
+        for r in self.rules:
+            ev = r.when.get("event")
+            out.append({
+                "id": r.id,
+                "priority": r.priority,
+                "on": f"event:{ev}" if ev is not None else "state",
+                "evaluations": self.events.get(str(ev), 0) if ev is not None else decisions,
+                "matches": r.matches,
+                "fires": r.fires,
+                "last_fired": r._last_ts or None,
+            })
+        return out
+
+
+def _band_ok(when: Dict[str, Any], metric: str, pts: List[float], band: int) -> bool:
+    gte, lt = when.get(f"{metric}_gte"), when.get(f"{metric}_lt")
+    if band < 0:
+        return gte is None and lt is None
+    if gte is not None and not band > pts.index(float(gte)):
+        return False
+    if lt is not None and not band <= pts.index(float(lt)):
+        return False
+    return True
+
+
+def _flag_ok(when: Dict[str, Any], flag: str, value: Optional[bool]) -> bool:
+    if flag not in when:
+        return True
+    if flag == "arduino_connected" and value is None:
+        return False
+    return bool(when[flag]) == bool(value)
@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import random
+import threading
+import time
+
+from modules.eventbus import EventBus
+from modules.interactions.config_loader import load_config
+from modules.interactions.services.engine import InteractionEngine
+from modules.interactions.services.metrics import SysMetrics
+from modules.interactions.services.rules import Rule, RuleIndex, eval_condition, priority_rank
+
+
+def _rules():
+    return [
+        Rule(id=str(r["id"]), priority=str(r.get("priority", "medium")), when=dict(r.get("when", {})))
+        for r in load_config()["rules"]
+    ]
+
+
+def test_index_matches_linear_evaluation():
+    rules = _rules() + [Rule(id="cool_idle", when={"cpu_temp_lt": 50, "cpu_load_lt": 0.3}, priority="low")]
+    index = RuleIndex(rules)
+    rnd = random.Random(7)
+    for _ in range(2000):
+        ctx = {
+            "metrics": {
+                "cpu_temp": rnd.choice([None, 40, 64.9, 65, 70, 75, 90]),
+                "cpu_load": rnd.choice([None, 0.1, 0.3, 0.5, 0.9, 1.0]),
+            },
+            "net_burst": rnd.choice([None, False, True]),
+            "arduino_connected": rnd.choice([None, False, True]),
+        }
+        event = rnd.choice([None, "speech.start", "error", "owner.rfid", "nobody.listens"])
+        linear = [r for r in rules if eval_condition(r.when, dict(ctx, event=event))]
+        linear.sort(key=lambda r: -priority_rank(r.priority))  # stable: config order within a priority
+        assert [r.id for r in index.candidates(ctx, event)] == [r.id for r in linear]
+    assert index.unmatched["nobody.listens"] > 0
+
+
+class _Metrics:
+    def sample(self):
+        return SysMetrics()
+
+
+class _Neo:
+    def __init__(self):
+        self.effects = []
+        self.bases = []
+        self.lock = threading.Lock()
+
+    def play_effect(self, name, duration_ms=800, color=None):
+        with self.lock:
+            self.effects.append(name)
+
+    def set_base(self, name, color=None, speed=None):
+        self.bases.append((name, color))
+
+
+def _engine():
+    eng = InteractionEngine(load_config(overrides={"tick_interval_ms": 60_000}), bus=EventBus())
+    eng.metrics = _Metrics()
+    eng.monitor_cfg = {}
+    eng.neo = _Neo()
+    eng.set_state(arduino_connected=True)
+    return eng
+
+
+def _until(cond, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not cond() and time.monotonic() < deadline:
+        time.sleep(0.005)
+    return cond()
+
+
+def test_events_fire_on_arrival_without_waiting_for_a_tick():
+    eng = _engine()
+    eng.start()
+    try:
+        assert _until(lambda: eng.rule_stats()["ticks"] == 1)
+        # a burst between ticks: nothing is overwritten, higher priority interrupts
+        for t in ("vision.person", "speech.start", "error", "speech.start"):
+            assert eng.push_event(t)
+        assert _until(lambda: eng.rule_stats()["events"] == 4)
+        assert _until(lambda: len(eng.neo.effects) == 3)
+        assert sorted(eng.neo.effects) == ["COMET", "METEOR", "RAINBOW_CYCLE"]
+        stats = eng.rule_stats()
+        by_id = {r["id"]: r for r in stats["rules"]}
+        assert stats["ticks"] == 1 and stats["queue_depth"] == 0
+        assert (by_id["speech_start"]["evaluations"], by_id["speech_start"]["fires"]) == (2, 1)
+        assert by_id["error_ping"]["fires"] == 1
+        assert by_id["cpu_hot"]["evaluations"] == 5 and by_id["cpu_hot"]["matches"] == 0
+    finally:
+        eng.stop()
@@ -1,5 +1,5 @@
 from __future__ import annotations
-from fastapi import APIRouter, Query
+from fastapi import APIRouter, HTTPException, Query
 from typing import List, Optional
 
 try:
@@ -8,6 +8,10 @@ except Exception:
     from services.runner import NeoRunner  # type: ignore
 
 
+def _handle(h) -> Optional[dict]:
+    return h.to_dict() if h is not None else None
+
+
 def get_router(runner: NeoRunner) -> APIRouter:
     r = APIRouter(prefix="/neopixel")
 
@@ -22,33 +26,31 @@ def get_router(runner: NeoRunner) -> APIRouter:
 
     @r.post("/fill")
     def fill(r_: int = 0, g: int = 0, b: int = 0):
-        runner.fill(r_, g, b)
-        return {"ok": True}
+        return {"ok": True, "animation": _handle(runner.fill(r_, g, b))}
 
     @r.post("/rainbow")
     def rainbow(wait: float = 0.02, cycles: int = 3):
-        runner.rainbow(wait=wait, cycles=cycles)
-        return {"ok": True}
+        return {"ok": True, "animation": _handle(runner.rainbow(wait=wait, cycles=cycles))}
 
     @r.post("/theater_chase")
     def theater_chase(r_: int = 255, g: int = 0, b: int = 0, wait: float = 0.05, cycles: int = 10):
-        runner.theater_chase(r_, g, b, wait=wait, cycles=cycles)
-        return {"ok": True}
+        return {"ok": True, "animation": _handle(runner.theater_chase(r_, g, b, wait=wait, cycles=cycles))}
 
     @r.post("/effect")
     def run_effect(name: str = Query(..., description="effect name: rainbow|theater_chase|fill|clear")):
         name = name.lower()
+        handle = None
         if name == "clear":
             runner.clear()
         elif name == "fill":
-            runner.fill(255, 255, 255)
+            handle = runner.fill(255, 255, 255)
         elif name == "rainbow":
-            runner.rainbow()
+            handle = runner.rainbow()
         elif name == "theater_chase":
-            runner.theater_chase()
+            handle = runner.theater_chase()
         else:
             return {"ok": False, "error": "unknown effect"}
-        return {"ok": True}
+        return {"ok": True, "animation": _handle(handle)}
 
     # Emote: parse text or list of emotions and show colors
     @r.post("/emote")
@@ -84,8 +86,8 @@ def get_router(runner: NeoRunner) -> APIRouter:
         for emo in seq:
             entry = store.random_entry(emo)
             chosen.append({"emotion": emo, "name": entry.name, "rgb": entry.color})
-            runner.show_color(*entry.color, duration=duration, clear_after=False)
-        return {"ok": True, "emotions": seq, "chosen": chosen}
+        handle = runner.emote_colors([c["rgb"] for c in chosen], duration=duration)
+        return {"ok": True, "emotions": seq, "chosen": chosen, "animation": _handle(handle)}
 
     @r.post("/emote_named")
     def emote_named(emotion: str, name: str, duration: float = 0.25):
@@ -97,8 +99,8 @@ def get_router(runner: NeoRunner) -> APIRouter:
         entry = store.get_by_name(emotion, name)
         if not entry:
             return {"ok": False, "error": "not found"}
-        runner.show_color(*entry.color, duration=duration, clear_after=False)
-        return {"ok": True, "emotion": emotion, "name": entry.name, "rgb": entry.color}
+        handle = runner.show_color(*entry.color, duration=duration, clear_after=False)
+        return {"ok": True, "emotion": emotion, "name": entry.name, "rgb": entry.color, "animation": _handle(handle)}
 
     @r.post("/animate")
     def animate(
@@ -108,9 +110,52 @@ def get_router(runner: NeoRunner) -> APIRouter:
         g: int | None = None,
         b: int | None = None,
         iterations: int | None = None,
+        layer: str = Query("effect", description="base | effect | alert"),
+        blend: str = Query("replace", description="replace | add | max | multiply"),
+        duration: float | None = Query(None, description="stop after this many seconds"),
+        loop: bool = False,
     ):
         color = (r, g, b) if r is not None and g is not None and b is not None else None
-        runner.animate(name, emotions=emotions, iterations=iterations, color=color)
-        return {"ok": True, "name": name, "emotions": emotions, "color": color, "iterations": iterations}
+        try:
+            handle = runner.animate(
+                name, emotions=emotions, iterations=iterations, color=color,
+                layer=layer, blend=blend, duration=duration, loop=loop,
+            )
+        except ValueError as exc:
+            raise HTTPException(status_code=400, detail=str(exc)) from exc
+        return {
+            "ok": True, "name": name, "emotions": emotions, "color": color,
+            "iterations": iterations, "animation": _handle(handle),
+        }
+
+    # Render engine: running layers, handles, cancellation
+    @r.get("/animations")
+    def animations():
+        st = runner.engine.stats()
+        st["recent"] = [h.to_dict() for h in runner.engine.recent()]
+        return st
+
+    @r.get("/animations/{anim_id}")
+    def animation(anim_id: int):
+        h = runner.engine.get(anim_id)
+        if h is None:
+            raise HTTPException(status_code=404, detail="animation not found")
+        return h.to_dict()
+
+    @r.delete("/animations/{anim_id}")
+    def stop_animation(anim_id: int):
+        h = runner.engine.cancel(anim_id)
+        if h is None:
+            raise HTTPException(status_code=404, detail="animation not found")
+        return h.to_dict()
+
+    @r.delete("/layers/{layer}")
+    def stop_layer(layer: str):
+        return {"ok": True, "animation": _handle(runner.engine.stop_layer(layer))}
+
+    # Link to the LEDs: protocol in use, frames sent/deduplicated, bytes per frame, fps
+    @r.get("/link")
+    def link():
+        return runner.driver.link_stats()
 
     return r
@@ -10,9 +10,9 @@ def main(argv: list[str] | None = None) -> int:
     runner = NeoRunner(NeoDriverConfig())
     try:
         if argv and argv[0] == "rainbow":
-            runner.rainbow()
+            runner.rainbow().wait()
         elif argv and argv[0] == "chase":
-            runner.theater_chase()
+            runner.theater_chase().wait()
         elif argv and argv[0] == "fill":
             r = int(argv[1]) if len(argv) > 1 else 255
             g = int(argv[2]) if len(argv) > 2 else 255
@@ -26,6 +26,7 @@ def main(argv: list[str] | None = None) -> int:
             runner.fill(255, 255, 255)
     finally:
         runner.clear()
+        runner.stop()
     return 0
 
 
@@ -1,313 +1,264 @@
+"""Animation patterns as frame generators for the render engine.
+
+Each function takes the strip length plus the pattern's parameters and
+returns an `Animation`; the former per-frame `wait` / `speed_ms` becomes the
+animation's interval, so nothing here sleeps or touches the driver.
+"""
 from __future__ import annotations
-import math
 import random
-import time
-from typing import Iterable, List, Sequence, Tuple
+from typing import Iterator, Sequence, Tuple
+
+import numpy as np
 
 try:
-    from .driver import NeoDriver
-    from .effects import wheel as base_wheel
+    from .engine import Animation, Frame
+    from .effects import lerp_colors, palette_wave, scale, wheel_array, wheel_tinted_array
 except Exception:
-    from driver import NeoDriver  # type: ignore
-    from effects import wheel as base_wheel  # type: ignore
+    from engine import Animation, Frame  # type: ignore
+    from effects import lerp_colors, palette_wave, scale, wheel_array, wheel_tinted_array  # type: ignore
 
 Color = Tuple[int, int, int]
 
 
-def _clamp(x: float, lo: int = 0, hi: int = 255) -> int:
-    return max(lo, min(hi, int(x)))
+def _wheel_frame(positions, color: Color | None = None) -> Frame:
+    return wheel_tinted_array(positions, color).reshape(-1, 3)
 
 
-def _wheel_tinted(pos: int, color: Color | None = None) -> Color:
-    pos &= 255
-    if color:
-        r, g, b = color
-        max_ch = max(r, g, b)
-        ratio = pos / 255.0
-        if max_ch == r:
-            return (r, _clamp(g * ratio), 0)
-        elif max_ch == g:
-            return (_clamp(r * ratio), g, 0)
-        else:
-            return (0, _clamp(g * ratio), b)
-    return base_wheel(pos)
+def _blank(n: int) -> Frame:
+    return np.zeros((n, 3), dtype=np.float32)
 
 
-def rainbow(driver: NeoDriver, color: Color | None = None, iterations: int = 1, wait: float = 0.02) -> None:
-    n = driver.num_leds
-    for j in range(256 * max(1, iterations)):
-        for i in range(n):
-            r, g, b = _wheel_tinted((i + j) & 255, color)
-            driver.set(i, r, g, b)
-        driver.show()
-        time.sleep(wait)
+def _filled(n: int, color) -> Frame:
+    frame = _blank(n)
+    frame[:] = color
+    return frame
 
 
-def rainbow_cycle(driver: NeoDriver, color: Color | None = None, iterations: int = 1, wait: float = 0.02) -> None:
-    n = driver.num_leds
-    for j in range(256 * max(1, iterations)):
-        for i in range(n):
-            pos = ((i * 256 // n) + j) & 255
-            r, g, b = _wheel_tinted(pos, color)
-            driver.set(i, r, g, b)
-        driver.show()
-        time.sleep(wait)
+def rainbow(n: int, color: Color | None = None, iterations: int = 1, wait: float = 0.02) -> Animation:
+    def frames() -> Iterator[Frame]:
+        idx = np.arange(n)
+        for j in range(256 * max(1, iterations)):
+            yield _wheel_frame((idx + j) & 255, color)
+    return Animation("RAINBOW", frames, wait)
 
 
-def spinner(driver: NeoDriver, color: Color, iterations: int = 1, wait: float = 0.1) -> None:
-    n = driver.num_leds
-    for _ in range(max(1, iterations)):
-        for i in range(n):
-            driver.clear()
-            driver.set(i, *color)
-            driver.show()
-            time.sleep(wait)
-
-
-def breathe(driver: NeoDriver, color: Color, iterations: int = 1, step: int = 5, wait: float = 0.02) -> None:
-    r, g, b = color
-    for _ in range(max(1, iterations)):
-        for bright in range(0, 256, max(1, step)):
-            rr = (r * bright) // 255
-            gg = (g * bright) // 255
-            bb = (b * bright) // 255
-            driver.fill(rr, gg, bb)
-            time.sleep(wait)
-        for bright in range(255, -1, -max(1, step)):
-            rr = (r * bright) // 255
-            gg = (g * bright) // 255
-            bb = (b * bright) // 255
-            driver.fill(rr, gg, bb)
-            time.sleep(wait)
-
-
-def meteor_rain(driver: NeoDriver, color: Color, size: int = 5, decay_ms: int = 50) -> None:
-    r, g, b = color
-    n = driver.num_leds
-    for i in range(n + size):
-        driver.clear()
-        for j in range(size):
-            idx = i - j
-            if 0 <= idx < n:
-                driver.set(idx, r // (j + 1), g // (j + 1), b // (j + 1))
-        driver.show()
-        time.sleep(max(0.0, decay_ms / 1000.0))
-
-
-def fire_flicker(driver: NeoDriver, color: Color, cycles: int = 1) -> None:
-    r, g, b = color
-    n = driver.num_leds
-    for _ in range(max(1, cycles)):
-        for i in range(n):
-            flicker = random.randint(50, 255) / 255.0
-            driver.set(i, _clamp(r * flicker), _clamp(g * flicker), _clamp(b * flicker))
-        driver.show()
-        time.sleep(random.uniform(0.05, 0.15))
-
-
-def comet(driver: NeoDriver, color: Color, speed_ms: int = 50) -> None:
-    r, g, b = color
-    n = driver.num_leds
-    for i in range(n):
-        driver.clear()
-        driver.set(i, r, g, b)
-        if i > 0:
-            driver.set(i - 1, r // 2, g // 2, b // 2)
-        driver.show()
-        time.sleep(max(0.0, speed_ms / 1000.0))
-
-
-def wave(driver: NeoDriver, color: Color | None = None, wait: float = 0.05) -> None:
-    n = driver.num_leds
-    for j in range(0, 256, 5):
-        for i in range(n):
-            r, g, b = _wheel_tinted((i * 256 // n + j) & 255, color)
-            driver.set(i, r, g, b)
-        driver.show()
-        time.sleep(wait)
-
-
-def pulse(driver: NeoDriver, color: Color, step: int = 10, wait: float = 0.05) -> None:
-    r, g, b = color
-    for bright in range(0, 255, max(1, step)):
-        ratio = bright / 255.0
-        driver.fill(_clamp(r * ratio), _clamp(g * ratio), _clamp(b * ratio))
-        time.sleep(wait)
-
-
-def twinkle(driver: NeoDriver, color: Color, count: int = 5, wait: float = 0.1) -> None:
-    n = driver.num_leds
-    for _ in range(count):
-        idx = random.randrange(n)
-        driver.set(idx, *color)
-        driver.show()
-        time.sleep(wait)
-        driver.set(idx, 0, 0, 0)
-        driver.show()
-
-
-def color_wipe(driver: NeoDriver, color: Color, speed_ms: int = 50) -> None:
-    n = driver.num_leds
-    for i in range(n):
-        driver.set(i, *color)
-        driver.show()
-        time.sleep(max(0.0, speed_ms / 1000.0))
-
-
-def random_blink(driver: NeoDriver, color: Color | None = None, wait: float = 0.1) -> None:
-    n = driver.num_leds
-    if color is None:
-        for i in range(n):
-            driver.set(i, random.randint(0, 255), random.randint(0, 255), random.randint(0, 255))
-    else:
-        r, g, b = color
-        for i in range(n):
-            variation = random.randint(-30, 30)
-            driver.set(i, _clamp(r + variation), _clamp(g + variation), _clamp(b + variation))
-    driver.show()
-    time.sleep(wait)
-
-
-def theater_chase(driver: NeoDriver, color: Color, wait: float = 0.05, cycles: int = 5) -> None:
-    n = driver.num_leds
-    for _ in range(cycles):
-        for q in range(3):
-            for i in range(0, n, 3):
-                if i + q < n:
-                    driver.set(i + q, *color)
-            driver.show()
-            time.sleep(wait)
-            for i in range(0, n, 3):
-                if i + q < n:
-                    driver.set(i + q, 0, 0, 0)
-
-
-def snow(driver: NeoDriver, color: Color, flakes: int = 10, wait: float = 0.2) -> None:
-    driver.clear()
-    r, g, b = color
-    n = driver.num_leds
-    for _ in range(flakes):
-        idx = random.randrange(n)
-        intensity = random.randint(100, 255) / 255.0
-        driver.set(idx, _clamp(r * intensity), _clamp(g * intensity), _clamp(b * intensity))
-    driver.show()
-    time.sleep(wait)
-
-
-def alternating_colors(driver: NeoDriver, color1: Color, color2: Color, cycles: int = 10, wait: float = 0.1) -> None:
-    n = driver.num_leds
-    for j in range(cycles):
+def rainbow_cycle(n: int, color: Color | None = None, iterations: int = 1, wait: float = 0.02) -> Animation:
+    def frames() -> Iterator[Frame]:
+        base = np.arange(n) * 256 // max(1, n)
+        for j in range(256 * max(1, iterations)):
+            yield _wheel_frame((base + j) & 255, color)
+    return Animation("RAINBOW_CYCLE", frames, wait)
+
+
+def spinner(n: int, color: Color, iterations: int = 1, wait: float = 0.1) -> Animation:
+    def frames() -> Iterator[Frame]:
+        for _ in range(max(1, iterations)):
+            for i in range(n):
+                frame = _blank(n)
+                frame[i] = color
+                yield frame
+    return Animation("SPINNER", frames, wait)
+
+
+def breathe(n: int, color: Color, iterations: int = 1, step: int = 5, wait: float = 0.02) -> Animation:
+    def frames() -> Iterator[Frame]:
+        up = list(range(0, 256, max(1, step)))
+        down = list(range(255, -1, -max(1, step)))
+        for _ in range(max(1, iterations)):
+            for bright in up + down:
+                yield _filled(n, scale(color, bright / 255.0))
+    return Animation("BREATHE", frames, wait)
+
+
+def meteor_rain(n: int, color: Color, size: int = 5, decay_ms: int = 50) -> Animation:
+    def frames() -> Iterator[Frame]:
+        c = np.asarray(color, dtype=np.float32)
+        for i in range(n + size):
+            frame = _blank(n)
+            for j in range(size):
+                idx = i - j
+                if 0 <= idx < n:
+                    frame[idx] = c // (j + 1)
+            yield frame
+    return Animation("METEOR", frames, max(1e-3, decay_ms / 1000.0))
+
+
+def fire_flicker(n: int, color: Color, cycles: int = 1) -> Animation:
+    def frames() -> Iterator[Frame]:
+        for _ in range(max(1, cycles)):
+            yield scale(color, np.random.randint(50, 256, size=n) / 255.0)
+    return Animation("FIRE", frames, 0.1, hold=True)
+
+
+def comet(n: int, color: Color, speed_ms: int = 50) -> Animation:
+    def frames() -> Iterator[Frame]:
+        c = np.asarray(color, dtype=np.float32)
         for i in range(n):
-            driver.set(i, *(color1 if (i + j) % 2 == 0 else color2))
-        driver.show()
-        time.sleep(wait)
+            frame = _blank(n)
+            frame[i] = c
+            if i > 0:
+                frame[i - 1] = c // 2
+            yield frame
+    return Animation("COMET", frames, max(1e-3, speed_ms / 1000.0))
+
+
+def wave(n: int, color: Color | None = None, wait: float = 0.05) -> Animation:
+    def frames() -> Iterator[Frame]:
+        base = np.arange(n) * 256 // max(1, n)
+        for j in range(0, 256, 5):
+            yield _wheel_frame((base + j) & 255, color)
+    return Animation("WAVE", frames, wait)
 
 
-def _lerp(a: int, b: int, t: float) -> int:
-    return _clamp(a + (b - a) * t)
+def pulse(n: int, color: Color, step: int = 10, wait: float = 0.05) -> Animation:
+    def frames() -> Iterator[Frame]:
+        for bright in range(0, 255, max(1, step)):
+            yield _filled(n, scale(color, bright / 255.0))
+    return Animation("PULSE", frames, wait)
 
 
-def _lerp_color(c1: Color, c2: Color, t: float) -> Color:
-    return (_lerp(c1[0], c2[0], t), _lerp(c1[1], c2[1], t), _lerp(c1[2], c2[2], t))
+def twinkle(n: int, color: Color, count: int = 5, wait: float = 0.1) -> Animation:
+    def frames() -> Iterator[Frame]:
+        for _ in range(count):
+            frame = _blank(n)
+            frame[random.randrange(n)] = color
+            yield frame
+            yield _blank(n)
+    return Animation("TWINKLE", frames, wait / 2)
 
 
-def multi_color_gradient(driver: NeoDriver, colors: Sequence[Color], iterations: int = 5, wait: float = 0.03) -> None:
-    if not colors:
-        return
-    n = driver.num_leds
+def color_wipe(n: int, color: Color, speed_ms: int = 50) -> Animation:
+    def frames() -> Iterator[Frame]:
+        frame = _blank(n)
+        for i in range(n):
+            frame[i] = color
+            yield frame.copy()
+    return Animation("COLOR_WIPE", frames, max(1e-3, speed_ms / 1000.0), hold=True)
+
+
+def random_blink(n: int, color: Color | None = None, wait: float = 0.1) -> Animation:
+    def frames() -> Iterator[Frame]:
+        if color is None:
+            yield np.random.randint(0, 256, size=(n, 3)).astype(np.float32)
+        else:
+            variation = np.random.randint(-30, 31, size=(n, 1))
+            yield np.clip(np.asarray(color, dtype=np.float32) + variation, 0, 255)
+    return Animation("RANDOM_BLINK", frames, wait, hold=True)
+
+
+def theater_chase(n: int, color: Color, wait: float = 0.05, cycles: int = 5) -> Animation:
+    def frames() -> Iterator[Frame]:
+        idx = np.arange(n)
+        for _ in range(cycles):
+            for q in range(3):
+                frame = _blank(n)
+                frame[(idx % 3) == q] = color
+                yield frame
+    return Animation("THEATER_CHASE", frames, wait)
+
+
+def snow(n: int, color: Color, flakes: int = 10, wait: float = 0.2) -> Animation:
+    def frames() -> Iterator[Frame]:
+        frame = _blank(n)
+        for _ in range(flakes):
+            frame[random.randrange(n)] = scale(color, random.randint(100, 255) / 255.0)
+        yield frame
+    return Animation("SNOW", frames, wait, hold=True)
+
+
+def alternating_colors(n: int, color1: Color, color2: Color, cycles: int = 10, wait: float = 0.1) -> Animation:
+    def frames() -> Iterator[Frame]:
+        idx = np.arange(n)
+        for j in range(cycles):
+            frame = _blank(n)
+            even = (idx + j) % 2 == 0
+            frame[even] = color1
+            frame[~even] = color2
+            yield frame
+    return Animation("ALTERNATING", frames, wait, hold=True)
+
+
+def multi_color_gradient(n: int, colors: Sequence[Color], iterations: int = 5, wait: float = 0.03) -> Animation:
     k = len(colors)
-    for _ in range(max(1, iterations)):
-        for j in range(0, 256, 5):
-            for i in range(n):
-                segment = (i * k) // max(1, n)
-                pos = (i * k * 256 // max(1, n)) % 256
-                c1 = colors[segment % k]
-                c2 = colors[(segment + 1) % k]
-                t = pos / 255.0
-                driver.set(i, *_lerp_color(c1, c2, t))
-            driver.show()
-            time.sleep(wait)
-
-
-def multi_color_wave(driver: NeoDriver, colors: Sequence[Color], iterations: int = 5, wait: float = 0.03) -> None:
-    if not colors:
-        return
-    n = driver.num_leds
+
+    def frames() -> Iterator[Frame]:
+        if not colors:
+            return
+        idx = np.arange(n)
+        segment = (idx * k) // max(1, n)
+        pos = (idx * k * 256 // max(1, n)) % 256
+        pal = np.asarray(colors, dtype=np.float32).reshape(-1, 3)
+        frame = lerp_colors(pal[segment % k], pal[(segment + 1) % k], pos / 255.0)
+        # the gradient is static; the frame count only paces the original loop
+        for _ in range(max(1, iterations) * len(range(0, 256, 5))):
+            yield frame
+    return Animation("MULTI_GRADIENT", frames, wait, hold=True)
+
+
+def multi_color_wave(n: int, colors: Sequence[Color], iterations: int = 5, wait: float = 0.03) -> Animation:
     k = len(colors)
-    for _ in range(max(1, iterations)):
-        for j in range(0, 256, 5):
-            for i in range(n):
-                pos = (i * 256 // n + j) % 256
-                segment = (pos * k) // 256
-                seg_pos = (pos * k) % 256
-                c1 = colors[segment % k]
-                c2 = colors[(segment + 1) % k]
-                t = seg_pos / 255.0
-                driver.set(i, *_lerp_color(c1, c2, t))
-            driver.show()
-            time.sleep(wait)
-
-
-def gradient_fade(driver: NeoDriver, cycles: int = 5, color: Color | None = None, wait: float = 0.03) -> None:
-    n = driver.num_leds
-    for j in range(cycles):
-        for i in range(n):
-            pos = int((i / max(1, n - 1)) * 255)
-            driver.set(i, *_wheel_tinted((pos + j) % 256, color))
-        driver.show()
-        time.sleep(wait)
-
-
-def bouncing_ball(driver: NeoDriver, color: Color, frames: int = 60, wait: float = 0.03) -> None:
-    r, g, b = color
-    n = driver.num_leds
-    gravity = 0.1
-    start_height = 1.0
-    height = start_height
-    velocity = 0.0
-    dampening = 0.90
-    for _ in range(frames):
-        velocity += gravity
-        height -= velocity
-        if height < 0:
-            height = 0
-            velocity = -velocity * dampening
-        pos = int((height * 100) / (start_height * 100) * (n - 1))
-        driver.clear()
-        if 0 <= pos < n:
-            driver.set(pos, r, g, b)
-        driver.show()
-        time.sleep(wait)
-
-
-def running_lights(driver: NeoDriver, color: Color, loops: int = 2, wait: float = 0.05) -> None:
-    r, g, b = color
-    n = driver.num_leds
-    position = 0
-    for _ in range(n * loops):
-        position += 1
-        for j in range(n):
-            sin_val = math.sin((j + position) * 1.0) * 127 + 128
-            ratio = sin_val / 255.0
-            driver.set(j, _clamp(r * ratio), _clamp(g * ratio), _clamp(b * ratio))
-        driver.show()
-        time.sleep(wait)
-
-
-def stacked_bars(driver: NeoDriver, wait_ms: int = 50, color: Color | None = None) -> None:
-    n = driver.num_leds
-    # Fill up
-    for h in range(n):
-        for i in range(h + 1):
-            if color is None:
-                driver.set(i, *base_wheel(int(i / max(1, n - 1) * 255)))
-            else:
-                driver.set(i, *color)
-        driver.show()
-        time.sleep(max(0.0, wait_ms / 1000.0))
-    # Empty
-    for h in range(n - 1, -1, -1):
-        for i in range(h, n):
-            driver.set(i, 0, 0, 0)
-        driver.show()
-        time.sleep(max(0.0, wait_ms / 1000.0))
+
+    def frames() -> Iterator[Frame]:
+        if not colors:
+            return
+        base = np.arange(n) * 256 // max(1, n)
+        for _ in range(max(1, iterations)):
+            for j in range(0, 256, 5):
+                yield palette_wave(colors, base + j)
+    return Animation("MULTI_WAVE", frames, wait)
+
+
+def gradient_fade(n: int, cycles: int = 5, color: Color | None = None, wait: float = 0.03) -> Animation:
+    def frames() -> Iterator[Frame]:
+        pos = (np.arange(n) / max(1, n - 1) * 255).astype(int)
+        for j in range(cycles):
+            yield _wheel_frame((pos + j) % 256, color)
+    return Animation("GRADIENT", frames, wait, hold=True)
+
+
+def bouncing_ball(n: int, color: Color, frames: int = 60, wait: float = 0.03) -> Animation:
+    count = frames
+
+    def gen() -> Iterator[Frame]:
+        gravity = 0.1
+        start_height = 1.0
+        height = start_height
+        velocity = 0.0
+        dampening = 0.90
+        for _ in range(count):
+            velocity += gravity
+            height -= velocity
+            if height < 0:
+                height = 0
+                velocity = -velocity * dampening
+            pos = int((height * 100) / (start_height * 100) * (n - 1))
+            frame = _blank(n)
+            if 0 <= pos < n:
+                frame[pos] = color
+            yield frame
+    return Animation("BOUNCING_BALL", gen, wait)
+
+
+def running_lights(n: int, color: Color, loops: int = 2, wait: float = 0.05) -> Animation:
+    def frames() -> Iterator[Frame]:
+        idx = np.arange(n)
+        for position in range(1, n * loops + 1):
+            yield scale(color, (np.sin((idx + position) * 1.0) * 127 + 128) / 255.0)
+    return Animation("RUNNING_LIGHTS", frames, wait)
+
+
+def stacked_bars(n: int, wait_ms: int = 50, color: Color | None = None) -> Animation:
+    def frames() -> Iterator[Frame]:
+        if color is None:
+            full = wheel_array((np.arange(n) / max(1, n - 1) * 255).astype(int))
+        else:
+            full = _filled(n, color)
+        for h in range(n):  # fill up
+            frame = _blank(n)
+            frame[: h + 1] = full[: h + 1]
+            yield frame
+        for h in range(n - 1, -1, -1):  # empty
+            frame = _blank(n)
+            frame[:h] = full[:h]
+            yield frame
+    return Animation("STACKED_BARS", frames, max(1e-3, wait_ms / 1000.0))
@@ -1,7 +1,16 @@
 from __future__ import annotations
-from dataclasses import dataclass
 import time
-from typing import List, Tuple, Protocol
+from dataclasses import dataclass
+from typing import Any, Dict, List, Tuple, Protocol
+
+import numpy as np
+
+try:
+    from .effects import gamma_lut
+    from .serial_frames import FrameEncoder, legacy_line
+except Exception:
+    from effects import gamma_lut  # type: ignore
+    from serial_frames import FrameEncoder, legacy_line  # type: ignore
 
 
 class _StripProto(Protocol):
@@ -14,23 +23,30 @@ class _StripProto(Protocol):
 class _SimStrip:
     """Simple simulator for development environments without hardware.
 
-    Prints basic actions and keeps an in-memory buffer.
+    Keeps the last wire-order frame in memory (`frame`, or `buf` as tuples).
     """
 
     def __init__(self, num_leds: int) -> None:
         self.num_leds = num_leds
-        self.buf: List[Tuple[int, int, int]] = [(0, 0, 0)] * num_leds
+        self.frame = np.zeros((num_leds, 3), dtype=np.uint8)
+
+    @property
+    def buf(self) -> List[Tuple[int, int, int]]:
+        return [tuple(p) for p in self.frame.tolist()]
 
     def set_led_color(self, idx: int, r: int, g: int, b: int) -> None:
         if 0 <= idx < self.num_leds:
-            self.buf[idx] = (r, g, b)
+            self.frame[idx] = (r, g, b)
 
     def update_strip(self) -> None:
         # No-op; in real use we could log or visualize
         pass
 
     def clear_strip(self) -> None:
-        self.buf = [(0, 0, 0)] * self.num_leds
+        self.frame[:] = 0
+
+    def write_frame(self, pixels: np.ndarray) -> None:
+        self.frame[:] = pixels
 
     def animate(self, name: str, r: int, g: int, b: int, iterations: int, speed_ms: int) -> bool:
         # Simulator doesn't play hardware animations
@@ -42,7 +58,9 @@ class NeoDriverConfig:
     device: str = "/dev/spidev0.0"
     num_leds: int = 30
     speed_khz: int = 800
-    order: str = "GRB"  # GRB | RGB | BRG
+    order: str = "GRB"  # GRB | RGB | BRG (any permutation of R, G, B)
+    brightness: float = 1.0  # global scale applied at flush time
+    gamma: float = 1.0  # 1.0 = linear; ~2.2 gives perceptually even fades
 
     # backend selection: auto | pi | arduino | sim
     # - `pi`     : Raspberry Pi native driver (pi5neo)
@@ -51,6 +69,8 @@ class NeoDriverConfig:
     backend: str = "auto"
     # When using Arduino backend the `device` may be a serial port or 'AUTO'
     ws2812_spi_khz: int = 2400
+    serial_max_line: int = 240  # Arduino backend: longest NDJSON line per frame chunk
+    serial_keyframe_s: float = 5.0  # Arduino backend: full frame at least this often (0 = never)
 
 
 def _parse_spidev_device(path: str) -> tuple[int, int] | None:
@@ -69,18 +89,30 @@ def _parse_spidev_device(path: str) -> tuple[int, int] | None:
 class _ArduinoStrip:
     """Backend that delegates LED driving to an attached Arduino via serial.
 
-    This class keeps a local pixel buffer and sends the full pixel array
-    to the Arduino when `update_strip` is called. The Arduino firmware is
-    expected to accept a JSON/NDJSON command such as:
+    Keeps the last wire-order frame locally. On first use it asks the firmware
+    for ``np_caps``; firmware that answers gets compact delta frames
+    (`serial_frames.FrameEncoder`: only changed pixel runs, base64 in
+    ``{"cmd":"np",...}`` lines, nothing at all for an unchanged frame). Older
+    firmware falls back to the full JSON command
       { "cmd": "neopixel_pixels", "pixels": [[r,g,b], ...] }
+    and a firmware built without NeoPixel support gets nothing.
 
     The implementation uses the high-level `ArduinoDriver` helper if
     available in the `modules.arduino_serial` module.
     """
 
-    def __init__(self, device: str, num_leds: int) -> None:
+    RENEGOTIATE_S = 5.0
+
+    def __init__(self, device: str, num_leds: int, max_line: int = 240, keyframe_s: float = 5.0) -> None:
         self.num_leds = num_leds
-        self.buf: List[Tuple[int, int, int]] = [(0, 0, 0)] * num_leds
+        self.frame = np.zeros((num_leds, 3), dtype=np.uint8)
+        self.protocol = "unknown"  # unknown | np | legacy | disabled
+        self.firmware_leds: int | None = None
+        self.encoder = FrameEncoder(num_leds, max_line=max_line, keyframe_s=keyframe_s)
+        self._max_line = int(max_line)
+        self._negotiated_at = 0.0
+        self._legacy_prev: np.ndarray | None = None
+        self._legacy = {"sent": 0, "deduped": 0, "bytes": 0}
         try:
             from modules.arduino_serial.services.driver import ArduinoDriver  # type: ignore
         except Exception:
@@ -99,39 +131,89 @@ class _ArduinoStrip:
         except Exception:
             # best-effort; caller may start Arduino service separately
             pass
+        self.negotiate()
+
+    @property
+    def buf(self) -> List[Tuple[int, int, int]]:
+        return [tuple(p) for p in self.frame.tolist()]
+
+    def _svc(self):
+        return getattr(self._arduino, "svc", None)
+
+    def negotiate(self) -> str:
+        """Ask the firmware which frame format it takes; keeps `unknown` if it does not answer."""
+        self._negotiated_at = time.monotonic()
+        svc = self._svc()
+        if svc is None:
+            return self.protocol
+        try:
+            reply = svc.request({"cmd": "np_caps"}, timeout=0.5)
+        except Exception:
+            return self.protocol
+        if reply.get("ok") and reply.get("np"):
+            self.protocol = "np"
+            self.firmware_leds = reply.get("leds")
+            line = int(reply.get("line", 256)) + 1  # firmware limit excludes the newline
+            self.encoder.set_max_line(min(self._max_line, line))
+            self.encoder.reset()
+        elif reply.get("err") == "neopixel_disabled":
+            self.protocol = "disabled"
+        else:
+            self.protocol = "legacy"
+        return self.protocol
 
     def set_led_color(self, idx: int, r: int, g: int, b: int) -> None:
         if 0 <= idx < self.num_leds:
-            self.buf[idx] = (int(r) & 0xFF, int(g) & 0xFF, int(b) & 0xFF)
+            self.frame[idx] = (int(r) & 0xFF, int(g) & 0xFF, int(b) & 0xFF)
 
     def clear_strip(self) -> None:
-        self.buf = [(0, 0, 0)] * self.num_leds
-        # notify Arduino immediately
-        try:
-            svc = getattr(self._arduino, "svc", None)
-            if svc is None:
-                # Arduino service not available; skip
-                return
-            svc.send({"cmd": "neopixel_clear"})
-        except Exception:
-            # best-effort; ignore
-            pass
+        self.frame[:] = 0
+        self.update_strip()
+
+    def write_frame(self, pixels: np.ndarray) -> None:
+        self.frame[:] = pixels
 
     def update_strip(self) -> None:
-        # send full pixel buffer as list of [r,g,b]
-        pix = [[r, g, b] for (r, g, b) in self.buf]
+        svc = self._svc()
+        if svc is None:
+            return
+        if self.protocol == "unknown" and time.monotonic() - self._negotiated_at >= self.RENEGOTIATE_S:
+            self.negotiate()
         try:
-            svc = getattr(self._arduino, "svc", None)
-            if svc is None:
-                return
-            svc.send({"cmd": "neopixel_pixels", "pixels": pix})
+            if self.protocol == "np":
+                svc.send_lines(self.encoder.encode(self.frame))
+            elif self.protocol != "disabled":
+                self._send_legacy(svc)
         except Exception:
-            # best-effort: ignore if Arduino not reachable
-            pass
+            # best-effort: ignore if Arduino not reachable; resend everything once it is back
+            self.encoder.reset()
+            self._legacy_prev = None
+
+    def _send_legacy(self, svc) -> None:
+        if self._legacy_prev is not None and np.array_equal(self._legacy_prev, self.frame):
+            self._legacy["deduped"] += 1
+            return
+        line = legacy_line(self.frame)
+        svc.send_lines([line])
+        self._legacy_prev = self.frame.copy()
+        self._legacy["sent"] += 1
+        self._legacy["bytes"] += len(line)
+
+    def link_stats(self) -> Dict[str, Any]:
+        if self.protocol == "np":
+            st = self.encoder.stats()
+        else:
+            sent = self._legacy["sent"]
+            st = {**self._legacy, "bytes_per_frame": round(self._legacy["bytes"] / sent, 1) if sent else 0.0}
+        return {"backend": "arduino", "protocol": self.protocol, "firmware_leds": self.firmware_leds, **st}
 
     def animate(self, name: str, r: int, g: int, b: int, iterations: int, speed_ms: int) -> bool:
+        # "np" firmware only shows frames we stream, "disabled" shows nothing:
+        # let the render engine draw the effect instead
+        if self.protocol in ("np", "disabled"):
+            return False
         try:
-            svc = getattr(self._arduino, "svc", None)
+            svc = self._svc()
             if svc is None:
                 return False
             svc.send({
@@ -143,16 +225,37 @@ class _ArduinoStrip:
                 "iterations": iterations,
                 "speed_ms": speed_ms
             })
+            # the board now draws on its own; the next streamed frame must go out in full
+            self.encoder.reset()
+            self._legacy_prev = None
             return True
         except Exception:
             return False
 
 
+def _order_perm(order: str) -> np.ndarray:
+    """Column permutation turning RGB pixels into the strip's wire order."""
+    order = (order or "GRB").upper()
+    if sorted(order) != ["B", "G", "R"]:
+        order = "GRB"
+    return np.array(["RGB".index(c) for c in order], dtype=np.intp)
+
+
 class NeoDriver:
+    """Holds the strip as an RGB ``(num_leds, 3)`` uint8 buffer.
+
+    `set` / `fill` only touch the buffer; `show` applies the brightness/gamma
+    LUT and the colour-order permutation to the whole buffer at once and hands
+    it to the backend in one call.
+    """
+
     def __init__(self, cfg: NeoDriverConfig) -> None:
         self.cfg = cfg
         self.num_leds = cfg.num_leds
         self.order = cfg.order.upper()
+        self.pixels = np.zeros((self.num_leds, 3), dtype=np.uint8)
+        self._perm = _order_perm(self.order)
+        self.set_levels(cfg.brightness, cfg.gamma)
 
         self._strip: _StripProto
         backend = (cfg.backend or "auto").strip().lower()
@@ -169,7 +272,12 @@ class NeoDriver:
 
         if backend in {"arduino"}:
             try:
-                self._strip = _ArduinoStrip(cfg.device, num_leds=cfg.num_leds)
+                self._strip = _ArduinoStrip(
+                    cfg.device,
+                    num_leds=cfg.num_leds,
+                    max_line=cfg.serial_max_line,
+                    keyframe_s=cfg.serial_keyframe_s,
+                )
                 return
             except Exception:
                 pass
@@ -177,21 +285,54 @@ class NeoDriver:
         # Fallback to simulator
         self._strip = _SimStrip(cfg.num_leds)
 
+    def set_levels(self, brightness: float = 1.0, gamma: float = 1.0) -> None:
+        self.brightness = float(brightness)
+        self.gamma = float(gamma)
+        lut = gamma_lut(self.gamma, self.brightness)
+        self._lut = None if (lut == np.arange(256)).all() else lut
+
     # Basic primitives
     def clear(self) -> None:
-        self._strip.clear_strip()
-        self._strip.update_strip()
+        self.pixels[:] = 0
+        self.show()
 
     def set(self, idx: int, r: int, g: int, b: int) -> None:
-        rr, gg, bb = self._map_color(r, g, b)
-        self._strip.set_led_color(idx, rr, gg, bb)
+        if 0 <= idx < self.num_leds:
+            self.pixels[idx] = (int(r) & 0xFF, int(g) & 0xFF, int(b) & 0xFF)
+
+    def wire_frame(self) -> np.ndarray:
+        """The buffer as it goes on the wire: levels applied, channels in strip order."""
+        out = self.pixels if self._lut is None else self._lut[self.pixels]
+        return out[:, self._perm]
 
     def show(self) -> None:
+        out = self.wire_frame()
+        write = getattr(self._strip, "write_frame", None)
+        if write is not None:
+            write(out)
+        else:
+            # backends without a bulk call (pi5neo): still one tolist() instead of per-pixel numpy access
+            for i, (r, g, b) in enumerate(out.tolist()):
+                self._strip.set_led_color(i, r, g, b)
         self._strip.update_strip()
 
+    def link_stats(self) -> Dict[str, Any]:
+        """Traffic of the last hop to the LEDs (frames, bytes per frame, fps on the serial link)."""
+        stats = getattr(self._strip, "link_stats", None)
+        if stats is not None:
+            return stats()
+        return {"backend": type(self._strip).__name__.lstrip("_").lower()}
+
     def fill(self, r: int, g: int, b: int) -> None:
-        for i in range(self.num_leds):
-            self.set(i, r, g, b)
+        self.pixels[:] = (int(r) & 0xFF, int(g) & 0xFF, int(b) & 0xFF)
+        self.show()
+
+    def show_frame(self, pixels) -> None:
+        """Write a full ``(num_leds, 3)`` RGB frame and flush it (used by the render engine)."""
+        frame = np.asarray(pixels)
+        if frame.dtype != np.uint8:
+            frame = np.clip(frame, 0, 255).astype(np.uint8)
+        self.pixels[: len(frame)] = frame[: self.num_leds]
         self.show()
 
     def animate(self, name: str, r: int = 255, g: int = 255, b: int = 255, iterations: int = 0, speed_ms: int = 50) -> bool:
@@ -199,13 +340,3 @@ class NeoDriver:
         Returns True if the backend handled it, False if we need to fall back to software.
         """
         return self._strip.animate(name.lower(), r, g, b, iterations, speed_ms)
-
-    # Helpers
-    def _map_color(self, r: int, g: int, b: int) -> Tuple[int, int, int]:
-        if self.order == "GRB":
-            return (g, r, b)
-        if self.order == "RGB":
-            return (r, g, b)
-        if self.order == "BRG":
-            return (b, r, g)
-        return (g, r, b)
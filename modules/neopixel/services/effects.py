@@ -1,5 +1,9 @@
 from __future__ import annotations
-from typing import Tuple
+from typing import Sequence, Tuple
+
+import numpy as np
+
+Color = Tuple[int, int, int]
 
 
 def wheel(pos: int) -> Tuple[int, int, int]:
@@ -13,3 +17,74 @@ def wheel(pos: int) -> Tuple[int, int, int]:
     else:
         pos -= 170
         return (0, pos * 3, 255 - pos * 3)
+
+
+# Vectorised kernels: one numpy call per frame instead of one Python call per pixel.
+# They return float32 (n, 3) frames in 0..255, the render engine's pixel format.
+
+def wheel_array(pos) -> np.ndarray:
+    """`wheel` for an array of positions."""
+    p = np.asarray(pos, dtype=np.int32) & 255
+    out = np.zeros(p.shape + (3,), dtype=np.float32)
+    a = p < 85
+    b = (p >= 85) & (p < 170)
+    c = p >= 170
+    pa, pb, pc = p[a] * 3, (p[b] - 85) * 3, (p[c] - 170) * 3
+    out[a, 0], out[a, 1] = pa, 255 - pa
+    out[b, 0], out[b, 2] = 255 - pb, pb
+    out[c, 1], out[c, 2] = pc, 255 - pc
+    return out
+
+
+def wheel_tinted_array(pos, color: Color | None = None) -> np.ndarray:
+    """Rainbow wheel, or a single-hue ramp of `color` scaled by position when given."""
+    if not color:
+        return wheel_array(pos)
+    p = np.asarray(pos, dtype=np.int32) & 255
+    ratio = p.astype(np.float64) / 255.0
+    r, g, b = (int(c) for c in color)
+    out = np.zeros(p.shape + (3,), dtype=np.float32)
+    max_ch = max(r, g, b)
+    if max_ch == r:
+        out[..., 0] = r
+        out[..., 1] = np.clip(np.floor(g * ratio), 0, 255)
+    elif max_ch == g:
+        out[..., 0] = np.clip(np.floor(r * ratio), 0, 255)
+        out[..., 1] = g
+    else:
+        out[..., 1] = np.clip(np.floor(g * ratio), 0, 255)
+        out[..., 2] = b
+    return out
+
+
+def lerp_colors(c1, c2, t) -> np.ndarray:
+    """Per-pixel linear blend of colour arrays `c1` -> `c2` at `t` (0..1), truncated like `int()`."""
+    c1 = np.asarray(c1, dtype=np.float64)
+    c2 = np.asarray(c2, dtype=np.float64)
+    t = np.asarray(t, dtype=np.float64)[..., None]
+    return np.clip(np.floor(c1 + (c2 - c1) * t), 0, 255).astype(np.float32)
+
+
+def palette_wave(colors: Sequence[Color], pos) -> np.ndarray:
+    """Cyclic gradient through `colors` sampled at wheel positions `pos` (0..255)."""
+    pal = np.asarray(colors, dtype=np.float64).reshape(-1, 3)
+    k = len(pal)
+    p = np.asarray(pos, dtype=np.int64) % 256
+    segment = (p * k) // 256
+    t = ((p * k) % 256) / 255.0
+    return lerp_colors(pal[segment % k], pal[(segment + 1) % k], t)
+
+
+def scale(color_or_frame, factor) -> np.ndarray:
+    """Brightness fade: colour or frame times `factor` (scalar or per-pixel), floored."""
+    f = np.asarray(factor, dtype=np.float64)
+    if f.ndim:
+        f = f[..., None]
+    return np.floor(np.asarray(color_or_frame, dtype=np.float64) * f).astype(np.float32)
+
+
+def gamma_lut(gamma: float = 1.0, brightness: float = 1.0) -> np.ndarray:
+    """256-entry uint8 table applying brightness then gamma; identity for (1.0, 1.0)."""
+    x = np.arange(256, dtype=np.float64) / 255.0
+    y = np.power(x * max(0.0, min(1.0, float(brightness))), float(gamma)) * 255.0
+    return np.clip(np.rint(y), 0, 255).astype(np.uint8)
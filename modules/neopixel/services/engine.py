@@ -0,0 +1,331 @@
+"""Frame-based render engine for the LED strip.
+
+A single compositor thread owns the strip and ticks at a fixed frame rate.
+Animations are frame generators yielding ``(num_leds, 3)`` float arrays
+(0..255); each one plays on a named layer:
+
+- layers are composited bottom-up by priority (``base`` < ``effect`` < ``alert``)
+  with a blend mode (replace / add / max / multiply) and an opacity;
+- `play()` returns an `AnimationHandle` at once and replaces whatever was
+  running on that layer immediately (the thread is woken, no waiting for the
+  old loop to notice);
+- when a transient layer finishes, the layers below it show through again;
+- identical composites are not pushed to the strip again.
+"""
+from __future__ import annotations
+
+import itertools
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+import numpy as np
+
+logger = logging.getLogger("neopixel.engine")
+
+Frame = np.ndarray  # (num_leds, 3) float32, 0..255
+
+LAYER_PRIORITIES: Dict[str, int] = {"base": 0, "effect": 10, "alert": 20}
+BLEND_MODES = ("replace", "add", "max", "multiply")
+
+
+@dataclass
+class Animation:
+    """A named frame generator advanced every `interval` seconds.
+
+    `frames` is a factory so a looping animation can restart it; `hold` keeps
+    the last frame on the layer after the generator is exhausted.
+    """
+
+    name: str
+    frames: Callable[[], Iterator[Frame]]
+    interval: float = 1.0 / 30
+    loop: bool = False
+    hold: bool = False
+
+
+def solid(num_leds: int, r: int, g: int, b: int, name: str = "SOLID", hold: bool = True) -> Animation:
+    frame = np.empty((num_leds, 3), dtype=np.float32)
+    frame[:] = (r, g, b)
+    return Animation(name, lambda: iter([frame]), interval=1.0, hold=hold)
+
+
+def sequence(frames: List[Frame], interval: float, name: str = "SEQUENCE", hold: bool = True) -> Animation:
+    return Animation(name, lambda: iter(list(frames)), interval=max(1e-3, interval), hold=hold)
+
+
+_ids = itertools.count(1)
+
+
+@dataclass
+class AnimationHandle:
+    animation: Animation
+    layer: str
+    priority: int
+    blend: str = "replace"
+    opacity: float = 1.0
+    duration: Optional[float] = None
+    id: int = field(default_factory=lambda: next(_ids))
+    state: str = "pending"  # pending | running | holding | done | cancelled | preempted
+    started: float = field(default_factory=time.monotonic)
+    frames: int = 0
+    _it: Optional[Iterator[Frame]] = field(default=None, repr=False)
+    _next_at: float = 0.0
+    _last: Optional[Frame] = field(default=None, repr=False)
+    _done: threading.Event = field(default_factory=threading.Event, repr=False)
+
+    @property
+    def active(self) -> bool:
+        return self.state in ("pending", "running", "holding")
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Block until the animation stops (a holding layer counts as finished)."""
+        return self._done.wait(timeout)
+
+    def _end(self, state: str) -> None:
+        self.state = state
+        self._done.set()
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "name": self.animation.name,
+            "layer": self.layer,
+            "priority": self.priority,
+            "blend": self.blend,
+            "state": self.state,
+            "frames": self.frames,
+            "elapsed_s": round(time.monotonic() - self.started, 3),
+        }
+
+
+def _blend(dst: Frame, src: Frame, mode: str, opacity: float) -> None:
+    if mode == "add":
+        mixed = np.minimum(dst + src, 255.0)
+    elif mode == "max":
+        mixed = np.maximum(dst, src)
+    elif mode == "multiply":
+        mixed = dst * src / 255.0
+    else:
+        mixed = src
+    if opacity >= 1.0:
+        dst[:] = mixed
+    else:
+        dst += (mixed - dst) * opacity
+
+
+class RenderEngine:
+    def __init__(self, driver, fps: float = 30.0, history: int = 50, autostart: bool = True) -> None:
+        self.driver = driver
+        self.num_leds = int(driver.num_leds)
+        self.fps = max(1.0, float(fps))
+        self.history = max(1, int(history))
+        self.autostart = bool(autostart)  # False: caller drives `render()` (tests, offline previews)
+        self._layers: Dict[str, AnimationHandle] = {}
+        self._finished: List[AnimationHandle] = []
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._shown: Optional[np.ndarray] = None
+        self.ticks = 0
+        self.pushed = 0
+        self.skipped = 0
+        self.late = 0
+
+    # Control ---------------------------------------------------------------
+    def play(
+        self,
+        animation: Animation,
+        layer: str = "effect",
+        priority: Optional[int] = None,
+        blend: str = "replace",
+        opacity: float = 1.0,
+        duration: Optional[float] = None,
+    ) -> AnimationHandle:
+        if blend not in BLEND_MODES:
+            raise ValueError(f"unknown blend mode {blend!r}; use one of {BLEND_MODES}")
+        prio = LAYER_PRIORITIES.get(layer, LAYER_PRIORITIES["effect"]) if priority is None else int(priority)
+        handle = AnimationHandle(
+            animation=animation,
+            layer=layer,
+            priority=prio,
+            blend=blend,
+            opacity=max(0.0, min(1.0, float(opacity))),
+            duration=duration if duration and duration > 0 else None,
+        )
+        with self._lock:
+            old = self._layers.get(layer)
+            if old is not None:
+                self._retire(old, "preempted")
+            self._layers[layer] = handle
+        self._ensure_thread()
+        self._wake.set()  # render the new layer now, not on the next tick
+        return handle
+
+    def stop_layer(self, layer: str) -> Optional[AnimationHandle]:
+        with self._lock:
+            handle = self._layers.pop(layer, None)
+            if handle is not None:
+                self._retire(handle, "cancelled", remove=False)
+        self._wake.set()
+        return handle
+
+    def cancel(self, anim_id: int) -> Optional[AnimationHandle]:
+        with self._lock:
+            for name, h in list(self._layers.items()):
+                if h.id == anim_id:
+                    del self._layers[name]
+                    self._retire(h, "cancelled", remove=False)
+                    self._wake.set()
+                    return h
+            return next((h for h in self._finished if h.id == anim_id), None)
+
+    def clear(self) -> None:
+        """Drop every layer; the strip goes dark on the next frame."""
+        with self._lock:
+            for h in list(self._layers.values()):
+                self._retire(h, "cancelled", remove=False)
+            self._layers.clear()
+        self._ensure_thread()
+        self._wake.set()
+
+    def get(self, anim_id: int) -> Optional[AnimationHandle]:
+        with self._lock:
+            for h in itertools.chain(self._layers.values(), self._finished):
+                if h.id == anim_id:
+                    return h
+        return None
+
+    def layers(self) -> List[AnimationHandle]:
+        with self._lock:
+            return sorted(self._layers.values(), key=lambda h: h.priority)
+
+    def recent(self) -> List[AnimationHandle]:
+        with self._lock:
+            return list(self._finished)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "fps": self.fps,
+            "running": self._thread is not None and self._thread.is_alive(),
+            "ticks": self.ticks,
+            "pushed": self.pushed,
+            "skipped_identical": self.skipped,
+            "late_ticks": self.late,
+            "layers": [h.to_dict() for h in self.layers()],
+        }
+
+    def stop(self, timeout: float = 1.0) -> None:
+        """Stop the compositor after flushing the current scene (e.g. a final `clear()`)."""
+        self._stop.set()
+        self._wake.set()
+        t = self._thread
+        if t is not None:
+            t.join(timeout)
+        self._thread = None
+        self._push(self.render())
+
+    # Rendering -------------------------------------------------------------
+    def _retire(self, handle: AnimationHandle, state: str, remove: bool = True) -> None:
+        if remove and self._layers.get(handle.layer) is handle:
+            del self._layers[handle.layer]
+        handle._end(state)
+        self._finished.append(handle)
+        del self._finished[: -self.history]
+
+    def _advance(self, handle: AnimationHandle, now: float) -> Optional[Frame]:
+        """Frame of `handle` for time `now`, or None once it is finished."""
+        anim = handle.animation
+        if handle.duration is not None and now - handle.started >= handle.duration:
+            self._retire(handle, "done")
+            return None
+        # tolerance: deadlines accumulate `interval` and drift by float rounding
+        if handle.state == "holding" or now < handle._next_at - 1e-6:
+            return handle._last
+        if handle._it is None:
+            handle._it = iter(anim.frames())
+            handle.state = "running"
+        frame = next(handle._it, None)
+        if frame is None and anim.loop and handle.frames:
+            handle._it = iter(anim.frames())
+            frame = next(handle._it, None)
+        if frame is None:
+            if anim.hold and handle._last is not None:
+                handle.state = "holding"
+                handle._done.set()
+                return handle._last
+            self._retire(handle, "done")
+            return None
+        handle._last = frame
+        handle.frames += 1
+        # catch up on a missed deadline rather than replaying the backlog
+        handle._next_at = max(handle._next_at + anim.interval, now) if handle._next_at else now + anim.interval
+        return frame
+
+    def render(self, now: Optional[float] = None) -> np.ndarray:
+        """Composite every layer for `now` into a uint8 ``(num_leds, 3)`` frame."""
+        now = time.monotonic() if now is None else now
+        out = np.zeros((self.num_leds, 3), dtype=np.float32)
+        with self._lock:
+            for handle in sorted(self._layers.values(), key=lambda h: h.priority):
+                try:
+                    frame = self._advance(handle, now)
+                except Exception:
+                    logger.exception("Animation %s failed", handle.animation.name)
+                    self._retire(handle, "done")
+                    continue
+                if frame is not None:
+                    _blend(out, frame, handle.blend, handle.opacity)
+        return np.clip(out, 0, 255).astype(np.uint8)
+
+    def _push(self, frame: np.ndarray) -> None:
+        if self._shown is not None and np.array_equal(frame, self._shown):
+            self.skipped += 1
+            return
+        self.driver.show_frame(frame)
+        self._shown = frame
+        self.pushed += 1
+
+    def _ensure_thread(self) -> None:
+        if not self.autostart or (self._thread is not None and self._thread.is_alive()):
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name="neopixel-render", daemon=True)
+        self._thread.start()
+
+    def _loop(self) -> None:
+        period = 1.0 / self.fps
+        deadline = time.monotonic()
+        while not self._stop.is_set():
+            now = time.monotonic()
+            try:
+                self._push(self.render(now))
+            except Exception:
+                logger.exception("NeoPixel frame push failed")
+            self.ticks += 1
+            deadline += period
+            now = time.monotonic()
+            if now > deadline:
+                self.late += 1
+                deadline = now  # don't burst to catch up
+            with self._lock:
+                idle = all(h.state == "holding" and h.duration is None for h in self._layers.values())
+            # static scene: sleep until something changes instead of re-rendering it
+            woke = self._wake.wait(None if idle and self._shown is not None else deadline - now)
+            if woke:
+                self._wake.clear()
+                deadline = time.monotonic()
+
+
+__all__ = [
+    "Animation",
+    "AnimationHandle",
+    "RenderEngine",
+    "LAYER_PRIORITIES",
+    "BLEND_MODES",
+    "solid",
+    "sequence",
+]
@@ -1,9 +1,11 @@
 from __future__ import annotations
-import time
+from typing import Optional
+
+import numpy as np
 
 try:
     from .driver import NeoDriver, NeoDriverConfig
-    from .effects import wheel
+    from .engine import Animation, AnimationHandle, RenderEngine, sequence, solid
     from .animations import (
         rainbow as anim_rainbow,
         rainbow_cycle,
@@ -29,50 +31,72 @@ try:
     )
 except Exception:
     from driver import NeoDriver, NeoDriverConfig  # type: ignore
-    from effects import wheel  # type: ignore
+    from engine import Animation, AnimationHandle, RenderEngine, sequence, solid  # type: ignore
 
 
 class NeoRunner:
-    def __init__(self, cfg: NeoDriverConfig):
+    """Facade over the driver; every effect is handed to the render engine and returns at once."""
+
+    def __init__(self, cfg: NeoDriverConfig, fps: float = 30.0):
         self.driver = NeoDriver(cfg)
+        self.engine = RenderEngine(self.driver, fps=fps)
         # Emotions loader is optional; imported lazily to avoid cost
         self._emotion_store = None
+        self._sub = None
+
+    @property
+    def num_leds(self) -> int:
+        return self.driver.num_leds
 
     # Exposed operations
     def clear(self) -> None:
-        self.driver.clear()
-
-    def fill(self, r: int, g: int, b: int) -> None:
-        self.driver.fill(r, g, b)
-
-    def rainbow(self, wait: float = 0.02, cycles: int = 3) -> None:
-        n = self.driver.num_leds
-        for j in range(256 * cycles):
-            for i in range(n):
-                r, g, b = wheel((i * 256 // n + j) & 255)
-                self.driver.set(i, r, g, b)
-            self.driver.show()
-            time.sleep(wait)
-
-    def theater_chase(self, r: int = 255, g: int = 0, b: int = 0, wait: float = 0.05, cycles: int = 10) -> None:
-        n = self.driver.num_leds
-        for _ in range(cycles):
-            for phase in range(3):
-                for i in range(n):
-                    if (i + phase) % 3 == 0:
-                        self.driver.set(i, r, g, b)
-                    else:
-                        self.driver.set(i, 0, 0, 0)
-                self.driver.show()
-                time.sleep(wait)
+        self.engine.clear()
+
+    def fill(self, r: int, g: int, b: int) -> AnimationHandle:
+        return self.engine.play(solid(self.num_leds, r, g, b, name="FILL"), layer="base")
+
+    def rainbow(self, wait: float = 0.02, cycles: int = 3) -> AnimationHandle:
+        return self.engine.play(rainbow_cycle(self.num_leds, None, cycles, wait))
+
+    def theater_chase(self, r: int = 255, g: int = 0, b: int = 0, wait: float = 0.05, cycles: int = 10) -> AnimationHandle:
+        return self.engine.play(anim_theater_chase(self.num_leds, (r, g, b), wait=wait, cycles=cycles))
+
+    def stop(self) -> None:
+        if self._sub is not None:
+            self._sub.close()
+            self._sub = None
+        self.engine.stop()
+
+    # --- Event bus ---
+    def attach_bus(self, bus=None):
+        """Serve `NeoCommand`s published by modules in this process (replaces their HTTP calls)."""
+        if self._sub is None:
+            from modules.eventbus import NeoCommand, get_bus  # type: ignore
+
+            self._sub = (bus or get_bus()).subscribe(NeoCommand, self.apply, name="neopixel.runner")
+        return self._sub
+
+    def apply(self, cmd) -> Optional[AnimationHandle]:
+        """Run one `NeoCommand` (clear | fill | animate)."""
+        if cmd.op == "clear":
+            self.clear()
+            return None
+        if cmd.op == "fill":
+            return self.fill(*(cmd.color or (0, 0, 0)))
+        if cmd.op == "animate":
+            return self.animate(
+                cmd.name or "", emotions=list(cmd.emotions) if cmd.emotions else None,
+                iterations=cmd.iterations, color=cmd.color, layer=cmd.layer,
+                blend=cmd.blend, duration=cmd.duration, loop=cmd.loop,
+            )
+        raise ValueError(f"unknown neopixel command {cmd.op!r}")
 
     # --- Emotions ---
-    def show_color(self, r: int, g: int, b: int, duration: float = 0.3, clear_after: bool = False) -> None:
-        self.fill(r, g, b)
-        if duration > 0:
-            time.sleep(duration)
+    def show_color(self, r: int, g: int, b: int, duration: float = 0.3, clear_after: bool = False) -> AnimationHandle:
+        """Set the base colour, or flash it for `duration` over the base when `clear_after`."""
         if clear_after:
-            self.clear()
+            return self.engine.play(solid(self.num_leds, r, g, b, name="FLASH"), duration=duration)
+        return self.fill(r, g, b)
 
     def _get_store(self):
         if self._emotion_store is None:
@@ -83,11 +107,15 @@ class NeoRunner:
             self._emotion_store = EmotionStore()
         return self._emotion_store
 
-    def emote_sequence(self, emotions: list[str], duration: float = 0.25) -> None:
+    def emote_colors(self, colors: list[tuple[int, int, int]], duration: float = 0.25) -> AnimationHandle:
+        """Show `colors` one after another for `duration` each; the last one stays as base."""
+        n = self.num_leds
+        frames = [np.tile(np.asarray(c, dtype=np.float32), (n, 1)) for c in colors] or [np.zeros((n, 3), np.float32)]
+        return self.engine.play(sequence(frames, duration, name="EMOTE"), layer="base")
+
+    def emote_sequence(self, emotions: list[str], duration: float = 0.25) -> AnimationHandle:
         store = self._get_store()
-        for emo in emotions:
-            r, g, b = store.random_color(emo)
-            self.show_color(r, g, b, duration=duration, clear_after=False)
+        return self.emote_colors([store.random_color(emo) for emo in emotions], duration=duration)
 
     # --- Animations ---
     def _colors_from_emotions(self, emotions: list[str] | None) -> list[tuple[int, int, int]]:
@@ -96,13 +124,64 @@ class NeoRunner:
         store = self._get_store()
         return [store.random_color(e) for e in emotions]
 
+    def _build(self, name: str, c1, c2, cols, iterations: int | None) -> Optional[Animation]:
+        n = self.num_leds
+        if name == "RAINBOW":
+            return anim_rainbow(n, c1, iterations or 1)
+        if name == "RAINBOW_CYCLE":
+            return rainbow_cycle(n, c1, iterations or 1)
+        if name == "SPINNER":
+            return anim_spinner(n, c1 or (255, 0, 0), iterations or 1)
+        if name == "BREATHE":
+            return anim_breathe(n, c1 or (255, 0, 0), iterations or 1)
+        if name == "METEOR":
+            return meteor_rain(n, c1 or (255, 255, 255))
+        if name == "FIRE":
+            return fire_flicker(n, c1 or (255, 165, 0))
+        if name == "COMET":
+            return anim_comet(n, c1 or (0, 255, 255))
+        if name == "WAVE":
+            return anim_wave(n, c1)
+        if name == "PULSE":
+            return anim_pulse(n, c1 or (255, 0, 127))
+        if name == "TWINKLE":
+            return anim_twinkle(n, c1 or (255, 255, 255))
+        if name == "COLOR_WIPE":
+            return color_wipe(n, c1 or (255, 0, 0))
+        if name == "RANDOM_BLINK":
+            return random_blink(n, c1)
+        if name == "THEATER_CHASE":
+            return anim_theater_chase(n, c1 or (127, 127, 127))
+        if name == "SNOW":
+            return anim_snow(n, c1 or (255, 255, 255))
+        if name == "ALTERNATING":
+            return alternating_colors(n, c1 or (255, 0, 0), c2 or (0, 0, 255))
+        if name == "GRADIENT":
+            return gradient_fade(n, 5, c1)
+        if name == "BOUNCING_BALL":
+            return bouncing_ball(n, c1 or (255, 0, 0))
+        if name == "RUNNING_LIGHTS":
+            return running_lights(n, c1 or (255, 0, 0))
+        if name == "STACKED_BARS":
+            return stacked_bars(n, 50, c1)
+        if name == "MULTI_GRADIENT" and cols:
+            return multi_color_gradient(n, cols, iterations or 5)
+        if name == "MULTI_WAVE" and cols:
+            return multi_color_wave(n, cols, iterations or 5)
+        return None
+
     def animate(
         self,
         name: str,
         emotions: list[str] | None = None,
         iterations: int | None = None,
         color: tuple[int, int, int] | None = None,
-    ) -> None:
+        layer: str = "effect",
+        blend: str = "replace",
+        duration: float | None = None,
+        loop: bool = False,
+    ) -> Optional[AnimationHandle]:
+        """Start an animation on `layer`; returns its handle (None if the hardware plays it)."""
         name_lower = name.lower().strip()
         cols = self._colors_from_emotions(emotions)
         c1 = color if color is not None else (cols[0] if cols else None)
@@ -113,60 +192,16 @@ class NeoRunner:
         mapped_name = name_lower
         if name_lower == "theater_chase": mapped_name = "theater"
 
-        if mapped_name in hw_names:
+        if mapped_name in hw_names and layer == "effect" and not loop:
             r, g, b = c1 if c1 else (255, 255, 255)
             # if hardware handles it, we are done
             if self.driver.animate(mapped_name, r, g, b, iterations or 0, 50):
-                return
+                return None
 
-        name = name.upper()
         c2 = cols[1] if len(cols) > 1 else None
-        # Map names to functions
-        if name == "RAINBOW":
-            anim_rainbow(self.driver, c1, iterations or 1)
-        elif name == "RAINBOW_CYCLE":
-            rainbow_cycle(self.driver, c1, iterations or 1)
-        elif name == "SPINNER":
-            anim_spinner(self.driver, c1 or (255, 0, 0), iterations or 1)
-        elif name == "BREATHE":
-            anim_breathe(self.driver, c1 or (255, 0, 0), iterations or 1)
-        elif name == "METEOR":
-            meteor_rain(self.driver, c1 or (255, 255, 255))
-        elif name == "FIRE":
-            fire_flicker(self.driver, c1 or (255, 165, 0))
-        elif name == "COMET":
-            anim_comet(self.driver, c1 or (0, 255, 255))
-        elif name == "WAVE":
-            anim_wave(self.driver, c1)
-        elif name == "PULSE":
-            anim_pulse(self.driver, c1 or (255, 0, 127))
-        elif name == "TWINKLE":
-            anim_twinkle(self.driver, c1 or (255, 255, 255))
-        elif name == "COLOR_WIPE":
-            color_wipe(self.driver, c1 or (255, 0, 0))
-        elif name == "RANDOM_BLINK":
-            random_blink(self.driver, c1)
-        elif name == "THEATER_CHASE":
-            anim_theater_chase(self.driver, c1 or (127, 127, 127))
-        elif name == "SNOW":
-            anim_snow(self.driver, c1 or (255, 255, 255))
-        elif name == "ALTERNATING":
-            alternating_colors(self.driver, c1 or (255, 0, 0), c2 or (0, 0, 255))
-        elif name == "GRADIENT":
-            gradient_fade(self.driver, 5, c1)
-        elif name == "BOUNCING_BALL":
-            bouncing_ball(self.driver, c1 or (255, 0, 0))
-        elif name == "RUNNING_LIGHTS":
-            running_lights(self.driver, c1 or (255, 0, 0))
-        elif name == "STACKED_BARS":
-            stacked_bars(self.driver, 50, c1)
-        elif name == "MULTI_GRADIENT":
-            if cols:
-                multi_color_gradient(self.driver, cols, iterations or 5)
-        elif name == "MULTI_WAVE":
-            if cols:
-                multi_color_wave(self.driver, cols, iterations or 5)
-        else:
+        anim = self._build(name.upper(), c1, c2, cols, iterations)
+        if anim is None:
             # fallback simple fill
-            if c1:
-                self.fill(*c1)
+            return self.fill(*c1) if c1 else None
+        anim.loop = bool(loop)
+        return self.engine.play(anim, layer=layer, blend=blend, duration=duration)
@@ -0,0 +1,165 @@
+"""Compact NeoPixel frames for the Arduino NDJSON link.
+
+The legacy path sent every frame as ``{"cmd":"neopixel_pixels","pixels":[[r,g,b],...]}``
+(~12 bytes per LED, and longer than the firmware's 256-char line guard for
+anything past ~20 LEDs). Here a frame becomes one or more lines
+
+    {"cmd":"np","d":"<base64>"}            ... more runs
+    {"cmd":"np","d":"<base64>","s":1}      last line: latch (strip.show())
+
+where the decoded payload is a list of runs ``[start u16 BE, count u8,
+r,g,b * count]`` of pixels that changed since the previous frame:
+
+- an unchanged frame is not sent at all;
+- runs separated by a single unchanged pixel are merged (cheaper than a
+  new 3-byte header);
+- every line is self-contained and stays under `max_line` bytes, so a
+  dropped line only loses its own pixels until the next keyframe.
+
+Base64 keeps the link a plain text line protocol (COBS would need a
+binary framing mode next to the JSON commands).
+"""
+from __future__ import annotations
+
+import base64
+import json
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+_HEADER = 3  # start u16 + count u8
+_MAX_RUN = 255
+_LINE_OVERHEAD = len('{"cmd":"np","d":"","s":1}\n')
+
+Run = Tuple[int, int]  # (start, count)
+
+
+def legacy_line(frame: np.ndarray) -> bytes:
+    """The old full-frame JSON command, for firmware without ``np`` support."""
+    obj = {"cmd": "neopixel_pixels", "pixels": np.asarray(frame, dtype=np.uint8).tolist()}
+    return (json.dumps(obj, separators=(",", ":")) + "\n").encode("utf-8")
+
+
+def changed_runs(prev: Optional[np.ndarray], frame: np.ndarray, merge_gap: int = 1) -> List[Run]:
+    """``(start, count)`` spans of pixels differing from `prev` (all pixels when `prev` is None)."""
+    n = len(frame)
+    if prev is None or prev.shape != frame.shape:
+        return [(0, n)] if n else []
+    idx = np.flatnonzero((prev != frame).any(axis=1))
+    if not len(idx):
+        return []
+    # split where the gap between changed pixels is wider than merge_gap
+    breaks = np.flatnonzero(np.diff(idx) > merge_gap + 1)
+    starts = np.concatenate(([idx[0]], idx[breaks + 1]))
+    ends = np.concatenate((idx[breaks], [idx[-1]]))
+    return [(int(s), int(e - s + 1)) for s, e in zip(starts, ends)]
+
+
+class FrameEncoder:
+    """Turns successive wire-order frames into ``np`` command lines."""
+
+    def __init__(self, num_leds: int, max_line: int = 240, keyframe_s: float = 5.0) -> None:
+        self.num_leds = int(num_leds)
+        self.keyframe_s = float(keyframe_s)
+        self.set_max_line(max_line)
+        self._prev: Optional[np.ndarray] = None
+        self._last_key = 0.0
+        self.frames = 0
+        self.sent = 0
+        self.deduped = 0
+        self.keyframes = 0
+        self.lines = 0
+        self.bytes = 0
+        self._t0: Optional[float] = None
+        self._t_last = 0.0
+
+    def set_max_line(self, max_line: int) -> None:
+        self.max_line = max(_LINE_OVERHEAD + 8, int(max_line))
+        # raw bytes per line: base64 turns 3 bytes into 4 chars
+        self.chunk = (self.max_line - _LINE_OVERHEAD) // 4 * 3
+
+    def reset(self) -> None:
+        """Forget the strip state; the next frame is sent in full (e.g. after a board reset)."""
+        self._prev = None
+
+    def encode(self, frame: np.ndarray, now: Optional[float] = None) -> List[bytes]:
+        """Lines to write for `frame`; empty when the strip already shows it."""
+        now = time.monotonic() if now is None else now
+        frame = np.ascontiguousarray(frame, dtype=np.uint8)
+        self.frames += 1
+        if self._t0 is None:
+            self._t0 = now
+        prev = self._prev
+        if prev is not None and self.keyframe_s > 0 and now - self._last_key >= self.keyframe_s:
+            prev = None  # periodic full frame heals pixels lost with a dropped line
+        runs = changed_runs(prev, frame)
+        if not runs:
+            self.deduped += 1
+            return []
+        if prev is None:
+            self.keyframes += 1
+            self._last_key = now
+        lines = self._pack(frame, runs)
+        self._prev = frame.copy()
+        self.sent += 1
+        self.lines += len(lines)
+        self.bytes += sum(len(line) for line in lines)
+        self._t_last = now
+        return lines
+
+    def _pack(self, frame: np.ndarray, runs: List[Run]) -> List[bytes]:
+        payloads: List[bytes] = []
+        cur = bytearray()
+        for start, count in runs:
+            while count > 0:
+                room = (self.chunk - len(cur) - _HEADER) // 3
+                if room <= 0:
+                    payloads.append(bytes(cur))
+                    cur = bytearray()
+                    continue
+                take = min(count, room, _MAX_RUN)
+                cur += bytes((start >> 8, start & 0xFF, take))
+                cur += frame[start : start + take].tobytes()
+                start += take
+                count -= take
+        if cur:
+            payloads.append(bytes(cur))
+        lines = []
+        for i, raw in enumerate(payloads):
+            latch = ',"s":1' if i == len(payloads) - 1 else ""
+            lines.append(('{"cmd":"np","d":"%s"%s}\n' % (base64.b64encode(raw).decode("ascii"), latch)).encode("ascii"))
+        return lines
+
+    def stats(self) -> Dict[str, Any]:
+        span = (self._t_last - self._t0) if self._t0 is not None else 0.0
+        return {
+            "frames": self.frames,
+            "sent": self.sent,
+            "deduped": self.deduped,
+            "keyframes": self.keyframes,
+            "lines": self.lines,
+            "bytes": self.bytes,
+            "bytes_per_frame": round(self.bytes / self.sent, 1) if self.sent else 0.0,
+            "fps": round((self.sent - 1) / span, 1) if self.sent > 1 and span > 0 else 0.0,
+        }
+
+
+def decode_line(line: bytes, pixels: np.ndarray) -> bool:
+    """Apply one ``np`` line to `pixels` the way the firmware does; True when it latches."""
+    obj = json.loads(line)
+    raw = base64.b64decode(obj["d"])
+    i = 0
+    while i + _HEADER <= len(raw):
+        start = (raw[i] << 8) | raw[i + 1]
+        count = raw[i + 2]
+        i += _HEADER
+        data = np.frombuffer(raw[i : i + count * 3], dtype=np.uint8).reshape(-1, 3)
+        i += count * 3
+        end = min(len(pixels), start + len(data))
+        if start < end:
+            pixels[start:end] = data[: end - start]
+    return bool(obj.get("s"))
+
+
+__all__ = ["FrameEncoder", "changed_runs", "decode_line", "legacy_line"]
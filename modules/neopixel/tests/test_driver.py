@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+import numpy as np
+
+from modules.neopixel.services.driver import NeoDriver, NeoDriverConfig
+from modules.neopixel.services.effects import gamma_lut, palette_wave, wheel, wheel_array, wheel_tinted_array
+
+
+def _driver(**kw):
+    return NeoDriver(NeoDriverConfig(num_leds=4, backend="sim", **kw))
+
+
+def test_order_is_applied_once_at_flush():
+    for order, wire in (("GRB", (20, 10, 30)), ("RGB", (10, 20, 30)), ("BRG", (30, 10, 20))):
+        drv = _driver(order=order)
+        drv.set(1, 10, 20, 30)
+        assert tuple(drv.pixels[1]) == (10, 20, 30)  # logical RGB until show()
+        drv.show()
+        assert drv._strip.buf[1] == wire
+
+
+def test_fill_and_show_frame_are_bulk():
+    drv = _driver()
+    drv.fill(1, 2, 3)
+    assert drv._strip.buf == [(2, 1, 3)] * 4
+    drv.show_frame(np.array([[300, -5, 7.9]] * 4))
+    assert tuple(drv.pixels[0]) == (255, 0, 7)
+
+
+def test_brightness_and_gamma_lut():
+    assert (gamma_lut() == np.arange(256)).all()
+    drv = _driver(order="RGB", brightness=0.5, gamma=1.0)
+    drv.fill(255, 100, 0)
+    assert drv._strip.buf[0] == (128, 50, 0)
+    lut = gamma_lut(2.2)
+    assert lut[0] == 0 and lut[255] == 255 and lut[128] < 64
+
+
+def test_vector_kernels_match_scalar_wheel():
+    pos = np.arange(256)
+    assert (wheel_array(pos) == np.array([wheel(p) for p in pos])).all()
+    tinted = wheel_tinted_array(pos, (200, 80, 10))
+    assert (tinted[:, 0] == 200).all() and tinted[255, 1] == 80 and (tinted[:, 2] == 0).all()
+    wave = palette_wave([(255, 0, 0), (0, 0, 255)], [0, 64, 128])
+    assert tuple(wave[0]) == (255, 0, 0) and tuple(wave[2]) == (0, 0, 255)
+    assert tuple(wave[1]) == (127, 0, 128)
@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import time
+
+import numpy as np
+
+from modules.neopixel.services.animations import breathe, comet
+from modules.neopixel.services.driver import NeoDriver, NeoDriverConfig
+from modules.neopixel.services.engine import Animation, RenderEngine, solid
+from modules.neopixel.services.runner import NeoRunner
+
+N = 8
+
+
+def _engine():
+    return RenderEngine(NeoDriver(NeoDriverConfig(num_leds=N, backend="sim")), fps=50, autostart=False)
+
+
+def test_effect_layer_over_base_then_base_returns():
+    eng = _engine()
+    eng.play(solid(N, 10, 0, 0), layer="base")
+    fx = eng.play(comet(N, (0, 200, 0), speed_ms=10))
+    t0 = fx.started
+    first = eng.render(t0)
+    assert tuple(first[0]) == (0, 200, 0) and tuple(first[1]) == (0, 0, 0)
+    t = t0
+    while fx.active:
+        t += 0.01
+        eng.render(t)
+    assert fx.state == "done" and fx.frames == N
+    assert (eng.render(t + 0.01) == (10, 0, 0)).all()
+
+
+def test_same_layer_is_preempted_immediately():
+    eng = _engine()
+    old = eng.play(breathe(N, (255, 0, 0)))
+    eng.render(old.started)
+    new = eng.play(solid(N, 0, 0, 255), layer="effect")
+    assert old.state == "preempted" and old.wait(0)
+    assert (eng.render(new.started) == (0, 0, 255)).all()
+
+
+def test_blend_add_and_duration():
+    eng = _engine()
+    eng.play(solid(N, 100, 0, 0), layer="base")
+    fx = eng.play(solid(N, 200, 50, 0), blend="add", duration=0.5)
+    assert (eng.render(fx.started) == (255, 50, 0)).all()
+    eng.render(fx.started + 0.6)
+    assert fx.state == "done"
+
+
+def test_looping_animation_restarts():
+    frames = [np.full((N, 3), v, dtype=np.float32) for v in (1, 2)]
+    eng = _engine()
+    h = eng.play(Animation("LOOP", lambda: iter(frames), interval=0.1, loop=True))
+    seen = [int(eng.render(h.started + 0.1 * i)[0, 0]) for i in range(5)]
+    assert seen == [1, 2, 1, 2, 1] and h.active
+
+
+def test_runner_routes_queue_the_animation_without_rendering_it():
+    runner = NeoRunner(NeoDriverConfig(num_leds=N, backend="sim"), fps=1000)
+    runner.engine.autostart = False  # frames are driven by hand below
+    h = runner.rainbow(wait=0.01, cycles=1)
+    assert h.state == "pending" and h.frames == 0
+    t = h.started
+    for _ in range(300):
+        runner.engine.render(t)
+        t += 0.01
+    assert h.state == "done" and h.frames == 256
+
+
+def test_runner_thread_renders_and_skips_static_scene():
+    runner = NeoRunner(NeoDriverConfig(num_leds=N, backend="sim"), fps=1000)
+    try:
+        runner.fill(1, 2, 3)
+        deadline = time.monotonic() + 1.0
+        while runner.driver._strip.buf[0] != (2, 1, 3) and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert runner.driver._strip.buf[0] == (2, 1, 3)  # GRB order
+        pushed = runner.engine.pushed
+        time.sleep(0.1)
+        assert runner.engine.pushed == pushed  # static scene is not re-sent
+    finally:
+        runner.stop()
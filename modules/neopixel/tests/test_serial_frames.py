@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import numpy as np
+
+import modules.arduino_serial.services.driver as arduino_driver
+from modules.neopixel.services.animations import meteor_rain, rainbow_cycle
+from modules.neopixel.services.driver import NeoDriver, NeoDriverConfig
+from modules.neopixel.services.serial_frames import FrameEncoder, changed_runs, decode_line, legacy_line
+
+
+def _play(enc: FrameEncoder, frames, n: int):
+    strip = np.zeros((n, 3), dtype=np.uint8)
+    for t, f in enumerate(frames):
+        for line in enc.encode(f, now=float(t)):
+            assert len(line) <= enc.max_line
+            decode_line(line, strip)
+        assert np.array_equal(strip, np.clip(f, 0, 255).astype(np.uint8))
+
+
+def test_changed_runs_merge_single_gaps():
+    prev = np.zeros((10, 3), dtype=np.uint8)
+    cur = prev.copy()
+    cur[[1, 3, 7, 8]] = 9
+    assert changed_runs(prev, cur) == [(1, 3), (7, 2)]
+    assert changed_runs(cur, cur) == []
+    assert changed_runs(None, cur) == [(0, 10)]
+
+
+def test_delta_frames_roundtrip_and_stay_under_line_limit():
+    n = 60
+    frames = [f for f in meteor_rain(n, (255, 80, 0)).frames()] + list(rainbow_cycle(n).frames())[:20]
+    enc = FrameEncoder(n, max_line=120, keyframe_s=0)
+    _play(enc, frames, n)
+    legacy = sum(len(legacy_line(np.clip(f, 0, 255).astype(np.uint8))) for f in frames)
+    assert enc.bytes < legacy / 4
+
+
+def test_unchanged_frames_are_not_sent_and_keyframes_resend_everything():
+    enc = FrameEncoder(8, keyframe_s=2.0)
+    frame = np.full((8, 3), 7, dtype=np.uint8)
+    assert enc.encode(frame, now=0.0)
+    assert enc.encode(frame, now=1.0) == []
+    key = enc.encode(frame, now=2.5)
+    assert len(key) == 1 and key[0].endswith(b',"s":1}\n')
+    st = enc.stats()
+    assert (st["sent"], st["deduped"], st["keyframes"]) == (2, 1, 2)
+
+
+class _FakeSvc:
+    def __init__(self, reply):
+        self.reply = reply
+        self.lines = []
+        self.sent = []
+
+    def request(self, obj, timeout=1.0):
+        assert obj == {"cmd": "np_caps"}
+        return self.reply
+
+    def send_lines(self, lines):
+        self.lines += lines
+
+    def send(self, obj):
+        self.sent.append(obj)
+
+
+def _arduino(monkeypatch, reply):
+    svc = _FakeSvc(reply)
+
+    class FakeArduinoDriver:
+        def __init__(self):
+            self.svc = svc
+
+        def start(self):
+            pass
+
+    monkeypatch.setattr(arduino_driver, "ArduinoDriver", FakeArduinoDriver)
+    return NeoDriver(NeoDriverConfig(num_leds=30, backend="arduino", order="RGB")), svc
+
+
+def test_arduino_backend_negotiates_delta_protocol(monkeypatch):
+    drv, svc = _arduino(monkeypatch, {"ok": True, "msg": "np_caps", "np": 1, "leds": 30, "line": 256})
+    drv.fill(1, 2, 3)
+    drv.fill(1, 2, 3)
+    drv.set(5, 9, 9, 9)
+    drv.show()
+    link = drv.link_stats()
+    assert link["protocol"] == "np" and link["sent"] == 2 and link["deduped"] == 1
+    assert all(line.startswith(b'{"cmd":"np"') for line in svc.lines)
+
+    old, svc_old = _arduino(monkeypatch, {"ok": False, "err": "unknown_cmd"})
+    old.fill(1, 2, 3)
+    assert old.link_stats()["protocol"] == "legacy"
+    assert svc_old.lines[0].startswith(b'{"cmd":"neopixel_pixels"')
+
+
+def test_hardware_animation_only_on_legacy_firmware(monkeypatch):
+    drv, svc = _arduino(monkeypatch, {"ok": True, "msg": "np_caps", "np": 1, "leds": 30, "line": 256})
+    drv.fill(1, 2, 3)
+    assert drv.animate("rainbow") is False  # the engine draws it and keeps streaming frames
+    assert svc.sent == []
+
+    old, svc_old = _arduino(monkeypatch, {"ok": False, "err": "unknown_cmd"})
+    old.fill(1, 2, 3)
+    assert old.animate("rainbow") is True
+    assert svc_old.sent[0]["cmd"] == "neopixel_animate"
+    old.fill(1, 2, 3)  # the board drew over the strip: the same frame goes out again
+    assert len(svc_old.lines) == 2
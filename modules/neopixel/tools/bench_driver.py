@@ -0,0 +1,101 @@
+"""Benchmark: per-pixel NeoDriver path vs the vectorised pixel buffer.
+
+For 300- and 1000-LED strips, times one frame of `fill` and of a rainbow
+cycle (wheel per pixel + colour-order mapping + flush into the simulator
+backend) and reports microseconds per frame and the frame rate the CPU side
+alone could sustain. The "engine" row adds compositing through RenderEngine.
+Usage: python -m modules.neopixel.tools.bench_driver [frames]
+"""
+from __future__ import annotations
+
+import sys
+import time
+from typing import Callable, List, Tuple
+
+import numpy as np
+
+from modules.neopixel.services.animations import rainbow_cycle
+from modules.neopixel.services.driver import NeoDriver, NeoDriverConfig
+from modules.neopixel.services.effects import wheel, wheel_array
+from modules.neopixel.services.engine import RenderEngine
+
+
+class LegacyDriver:
+    """The previous driver: order mapped per `set`, one backend call per pixel."""
+
+    def __init__(self, num_leds: int, order: str = "GRB") -> None:
+        self.num_leds = num_leds
+        self.order = order
+        self.buf: List[Tuple[int, int, int]] = [(0, 0, 0)] * num_leds
+
+    def set_led_color(self, idx: int, r: int, g: int, b: int) -> None:
+        if 0 <= idx < self.num_leds:
+            self.buf[idx] = (r, g, b)
+
+    def _map_color(self, r: int, g: int, b: int) -> Tuple[int, int, int]:
+        if self.order == "GRB":
+            return (g, r, b)
+        if self.order == "RGB":
+            return (r, g, b)
+        if self.order == "BRG":
+            return (b, r, g)
+        return (g, r, b)
+
+    def set(self, idx: int, r: int, g: int, b: int) -> None:
+        rr, gg, bb = self._map_color(r, g, b)
+        self.set_led_color(idx, rr, gg, bb)
+
+    def show(self) -> None:
+        pass
+
+    def fill(self, r: int, g: int, b: int) -> None:
+        for i in range(self.num_leds):
+            self.set(i, r, g, b)
+        self.show()
+
+
+def _time(fn: Callable[[int], None], frames: int) -> float:
+    fn(0)  # warm-up
+    t0 = time.perf_counter()
+    for j in range(frames):
+        fn(j)
+    return (time.perf_counter() - t0) / frames
+
+
+def main(argv: List[str]) -> None:
+    frames = int(argv[0]) if argv else 200
+    print(f"{'leds':>5} {'case':<16} {'legacy us':>10} {'new us':>10} {'speedup':>8} {'new fps':>9}")
+    for n in (300, 1000):
+        legacy = LegacyDriver(n)
+        drv = NeoDriver(NeoDriverConfig(num_leds=n, backend="sim", gamma=2.2))
+        base = np.arange(n) * 256 // n
+
+        def legacy_rainbow(j: int) -> None:
+            for i in range(n):
+                r, g, b = wheel((i * 256 // n + j) & 255)
+                legacy.set(i, r, g, b)
+            legacy.show()
+
+        def new_rainbow(j: int) -> None:
+            drv.pixels[:] = wheel_array((base + j) & 255)
+            drv.show()
+
+        engine = RenderEngine(drv, autostart=False)
+        handle = engine.play(rainbow_cycle(n, None, iterations=1000, wait=0.0))
+
+        def engine_rainbow(j: int) -> None:
+            drv.show_frame(engine.render(handle.started + j))
+
+        rows = [
+            ("fill", _time(lambda j: legacy.fill(j & 255, 0, 0), frames), _time(lambda j: drv.fill(j & 255, 0, 0), frames)),
+            ("rainbow", _time(legacy_rainbow, frames), _time(new_rainbow, frames)),
+            ("rainbow+engine", None, _time(engine_rainbow, frames)),
+        ]
+        for name, old, new in rows:
+            old_us = f"{old * 1e6:10.0f}" if old is not None else f"{'-':>10}"
+            speed = f"{old / new:7.1f}x" if old is not None else f"{'-':>8}"
+            print(f"{n:>5} {name:<16} {old_us} {new * 1e6:10.0f} {speed} {1.0 / new:9.0f}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,73 @@
+"""Benchmark: bytes per frame on the Arduino serial link, legacy JSON vs delta frames.
+
+Replays real animation frames for a 60-LED strip through both encodings and
+reports bytes per frame and the frame rate the link could carry at 115200
+baud (10 bits per byte on the wire). "legacy" is the previous behaviour: a
+full ``neopixel_pixels`` JSON frame per show, and for animations that used
+to call ``driver.clear()`` before drawing, an extra ``neopixel_clear`` line
+plus a full black frame. "delta" is `FrameEncoder` (unchanged frames and
+unchanged pixels are not sent). "long" counts lines over the firmware's
+256-char guard, which the board silently drops.
+Usage: python -m modules.neopixel.tools.bench_serial [num_leds] [baud]
+"""
+from __future__ import annotations
+
+import sys
+from typing import Iterable, List
+
+import numpy as np
+
+from modules.neopixel.services import animations as A
+from modules.neopixel.services.engine import solid
+from modules.neopixel.services.serial_frames import FrameEncoder, legacy_line
+
+_CLEAR_LINE = b'{"cmd":"neopixel_clear"}\n'
+
+
+def _frames(anim) -> List[np.ndarray]:
+    return [np.clip(f, 0, 255).astype(np.uint8) for f in anim.frames()]
+
+
+def _legacy(frames: Iterable[np.ndarray], cleared: bool) -> List[bytes]:
+    out: List[bytes] = []
+    for f in frames:
+        if cleared:
+            out += [_CLEAR_LINE, legacy_line(np.zeros_like(f))]
+        out.append(legacy_line(f))
+    return out
+
+
+def main(argv: List[str]) -> None:
+    n = int(argv[0]) if argv else 60
+    baud = int(argv[1]) if len(argv) > 1 else 115200
+    byte_rate = baud / 10.0
+    red = (255, 0, 0)
+    cases = [
+        ("spinner", A.spinner(n, red, iterations=2), True),
+        ("meteor_rain", A.meteor_rain(n, red), True),
+        ("theater_chase", A.theater_chase(n, red), True),
+        ("rainbow_cycle", A.rainbow_cycle(n, None, iterations=1), False),
+        ("breathe", A.breathe(n, red, step=5), False),
+        ("static", solid(n, 0, 40, 80), False),
+    ]
+    print(f"{n} LEDs @ {baud} baud ({byte_rate:.0f} B/s)")
+    print(f"{'case':<14} {'frames':>6} {'legacy B/f':>10} {'legacy fps':>10} {'long':>5} {'delta B/f':>10} {'delta fps':>10} {'dedup':>6}")
+    for name, anim, cleared in cases:
+        frames = _frames(anim)
+        if name == "static":
+            frames = frames * 30  # a held colour re-pushed every tick
+        old = _legacy(frames, cleared)
+        old_bpf = sum(len(line) for line in old) / len(frames)
+        long_lines = sum(1 for line in old if len(line) > 257)
+        enc = FrameEncoder(n, keyframe_s=0)
+        new_bytes = sum(len(line) for f in frames for line in enc.encode(f))
+        new_bpf = new_bytes / len(frames)
+        new_fps = byte_rate / new_bpf if new_bpf else float("inf")
+        print(
+            f"{name:<14} {len(frames):>6} {old_bpf:>10.0f} {byte_rate / old_bpf:>10.1f} {long_lines:>5}"
+            f" {new_bpf:>10.1f} {new_fps:>10.1f} {enc.deduped:>6}"
+        )
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -30,9 +30,14 @@ def create_app(config_path: str | None = None) -> FastAPI:
         ws2812_spi_khz=int(hw.get("ws2812_spi_khz", 2400)),
         backend=str(hw.get("backend", "auto")),
         order=str(hw.get("order", "GRB")),
+        brightness=float(hw.get("brightness", 1.0)),
+        gamma=float(hw.get("gamma", 1.0)),
+        serial_max_line=int(hw.get("serial_max_line", 240)),
+        serial_keyframe_s=float(hw.get("serial_keyframe_s", 5.0)),
     )
 
-    runner = NeoRunner(drv_cfg)
+    runner = NeoRunner(drv_cfg, fps=float(cfg.get("render", {}).get("fps", 30)))
+    runner.attach_bus()
 
     app = FastAPI()
     app.include_router(get_router(runner))
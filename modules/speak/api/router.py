@@ -1,6 +1,6 @@
 from __future__ import annotations
-from fastapi import APIRouter
-from typing import TYPE_CHECKING
+from fastapi import APIRouter, HTTPException
+from typing import TYPE_CHECKING, Optional
 import asyncio
 import logging
 
@@ -17,28 +17,58 @@ def get_router(service: SpeakService) -> APIRouter:
     async def status():
         return {"ready": True}
 
+    @router.get("/speak/cache")
+    async def cache_stats():
+        return service.tts.cache_stats()
+
     @router.post("/speak/say")
     async def say(payload: dict):
         text = str(payload.get("text", "")).strip()
-        engine = payload.get("engine")
-        tone = payload.get("tone")
-        speaker_wav = payload.get("speaker_wav")
-        language = payload.get("language")
         if not text:
             return {"ok": False, "error": "text is empty"}
         try:
-            # Offload blocking TTS to thread to avoid event loop freeze
-            return await asyncio.to_thread(
-                service.speak,
+            job = service.submit(
                 text,
-                engine=engine,
-                tone=tone,
-                speaker_wav=speaker_wav,
-                language=language,
+                engine=payload.get("engine"),
+                tone=payload.get("tone"),
+                speaker_wav=payload.get("speaker_wav"),
+                language=payload.get("language"),
+                priority=payload.get("priority"),
+                coalesce=bool(payload.get("coalesce", True)),
             )
         except Exception as e:
             logger.exception("/speak/say failed")
             return {"ok": False, "error": repr(e)}
+        if not payload.get("wait", True):
+            return {"ok": True, "job_id": job.id, "state": job.state}
+        # wait on the job without parking a threadpool worker for the whole utterance
+        loop = asyncio.get_running_loop()
+        done = loop.create_future()
+        job.add_done_callback(lambda j: loop.call_soon_threadsafe(lambda: done.done() or done.set_result(j)))
+        await done
+        return dict(job.result or {})
+
+    @router.get("/speak/jobs")
+    async def jobs(state: Optional[str] = None):
+        return {"jobs": [j.to_dict() for j in service.scheduler.list(state)], **service.scheduler.stats()}
+
+    @router.get("/speak/jobs/{job_id}")
+    async def job_status(job_id: str):
+        job = service.scheduler.get(job_id)
+        if job is None:
+            raise HTTPException(status_code=404, detail="job not found")
+        return job.to_dict()
+
+    @router.delete("/speak/jobs/{job_id}")
+    async def job_cancel(job_id: str):
+        job = service.scheduler.cancel(job_id)
+        if job is None:
+            raise HTTPException(status_code=404, detail="job not found")
+        return job.to_dict()
+
+    @router.post("/speak/barge_in")
+    async def barge_in():
+        return service.scheduler.barge_in()
 
     @router.post("/speak/play")
     async def play(payload: dict):
@@ -48,7 +78,7 @@ def get_router(service: SpeakService) -> APIRouter:
             return {"ok": False, "error": "data (base64 WAV) is required"}
         try:
             buf = base64.b64decode(data_b64)
-            return service.play_wav(buf)
+            return await asyncio.to_thread(service.play_wav, buf)
         except Exception as e:
             return {"ok": False, "error": str(e)}
 
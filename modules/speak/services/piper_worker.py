@@ -0,0 +1,231 @@
+"""Long-lived Piper processes that keep the ONNX voice resident.
+
+Each `PiperProcess` runs `piper -m <model> --output_dir <tmp>`: Piper reads one
+utterance per stdin line and prints the path of the WAV it wrote for it, so
+the model loads once per process instead of once per phrase. A
+`PiperWorkerPool` splits text into sentences and fans them out over its
+processes; `synthesize_stream` yields the PCM of each sentence in order as
+soon as it is ready, so playback of the first sentence starts while later
+ones are still being synthesized.
+"""
+from __future__ import annotations
+
+import logging
+import os
+import queue
+import re
+import shutil
+import subprocess
+import tempfile
+import threading
+import wave
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Deque, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .pcm import PCM
+
+logger = logging.getLogger("speak.piper")
+
+_SENTENCE_END = re.compile(r"(?<=[.!?…;:])\s+")
+
+
+def split_sentences(text: str) -> List[str]:
+    """Sentence-sized pieces on one line each (Piper reads one utterance per line)."""
+    out: List[str] = []
+    for line in text.splitlines():
+        out.extend(p.strip() for p in _SENTENCE_END.split(line) if p.strip())
+    return out
+
+
+def read_wav(path: str) -> PCM:
+    with wave.open(path, "rb") as w:
+        sr, ch, width = w.getframerate(), w.getnchannels(), w.getsampwidth()
+        raw = w.readframes(w.getnframes())
+    if width != 2:
+        raise RuntimeError(f"unsupported WAV sample width {width} in {path}")
+    data = np.frombuffer(raw, dtype="<i2").astype(np.float32) / 32768.0
+    if ch > 1:
+        data = data.reshape(-1, ch)
+    return PCM(data=data, samplerate=sr, channels=ch)
+
+
+class PiperProcess:
+    def __init__(self, args: Sequence[str], timeout: float = 30.0) -> None:
+        self.args = list(args)
+        self.timeout = float(timeout)
+        self.outdir = tempfile.mkdtemp(prefix="piper-")
+        self.proc: Optional[subprocess.Popen] = None
+        self._stdout: "queue.Queue[bytes]" = queue.Queue()
+        self.stderr: Deque[str] = deque(maxlen=20)
+        self.utterances = 0
+        self.restarts = -1
+        self._spawn()
+
+    def _spawn(self) -> None:
+        self.close(remove_dir=False)
+        self.proc = subprocess.Popen(
+            self.args + ["--output_dir", self.outdir],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+        )
+        self.restarts += 1
+        # a fresh queue per process: a late line from a killed one never answers the next request
+        self._stdout = queue.Queue()
+        # reading stdout on a thread gives a portable timeout (select() only takes pipes on POSIX)
+        threading.Thread(target=self._read_stdout, args=(self.proc, self._stdout), daemon=True).start()
+        # Piper logs every utterance on stderr; drain it so the pipe never fills up
+        threading.Thread(target=self._drain_stderr, args=(self.proc,), daemon=True).start()
+
+    @staticmethod
+    def _read_stdout(proc: subprocess.Popen, lines: "queue.Queue[bytes]") -> None:
+        for line in iter(proc.stdout.readline, b""):
+            lines.put(line)
+        lines.put(b"")  # EOF: the process exited
+
+    def _drain_stderr(self, proc: subprocess.Popen) -> None:
+        for line in iter(proc.stderr.readline, b""):
+            self.stderr.append(line.decode("utf-8", "ignore").rstrip())
+
+    def alive(self) -> bool:
+        return self.proc is not None and self.proc.poll() is None
+
+    def synthesize(self, sentence: str) -> PCM:
+        if not self.alive():
+            self._spawn()
+        proc, lines = self.proc, self._stdout
+        proc.stdin.write(sentence.replace("\n", " ").encode("utf-8") + b"\n")
+        proc.stdin.flush()
+        try:
+            raw = lines.get(timeout=self.timeout)
+        except queue.Empty:
+            self._spawn()  # wedged: restart rather than desync later replies
+            raise RuntimeError(f"piper timed out after {self.timeout:.0f}s") from None
+        line = raw.decode("utf-8", "ignore").strip()
+        if not line:
+            err = " | ".join(self.stderr) or f"exit code {proc.poll()}"
+            self._spawn()
+            raise RuntimeError(f"piper exited: {err}")
+        try:
+            return read_wav(line)
+        finally:
+            self.utterances += 1
+            try:
+                os.remove(line)
+            except OSError:
+                pass
+
+    def close(self, remove_dir: bool = True) -> None:
+        proc, self.proc = self.proc, None
+        if proc is not None and proc.poll() is None:
+            try:
+                proc.stdin.close()
+                proc.wait(timeout=2.0)
+            except Exception:
+                proc.kill()
+        if remove_dir:
+            shutil.rmtree(self.outdir, ignore_errors=True)
+
+
+class PiperWorkerPool:
+    def __init__(self, args: Sequence[str], workers: int = 1, timeout: float = 30.0) -> None:
+        self.args = list(args)
+        self.workers = max(1, int(workers))
+        self.timeout = float(timeout)
+        self._idle: "queue.Queue[PiperProcess]" = queue.Queue()
+        self._procs: List[PiperProcess] = []
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="piper")
+        self.closed = False
+
+    def _spawn(self) -> Optional[PiperProcess]:
+        """One more worker if the pool is below `workers`; caller holds `_lock`."""
+        if len(self._procs) >= self.workers:
+            return None
+        p = PiperProcess(self.args, self.timeout)  # spawned lazily, then kept
+        self._procs.append(p)
+        return p
+
+    def _borrow(self) -> PiperProcess:
+        with self._lock:
+            p = self._spawn() if self._idle.empty() else None
+        return p if p is not None else self._idle.get()
+
+    def _synth_one(self, sentence: str) -> PCM:
+        p = self._borrow()
+        try:
+            return p.synthesize(sentence)
+        except Exception:
+            # one retry on a fresh process (the failed call already respawned it)
+            return p.synthesize(sentence)
+        finally:
+            self._idle.put(p)
+
+    def warm(self) -> None:
+        """Start every worker now so the first utterance does not pay the model load."""
+        while True:
+            with self._lock:
+                p = self._spawn()
+            if p is None:
+                return
+            self._idle.put(p)
+
+    def synthesize_stream(self, text: str) -> Iterator[PCM]:
+        sentences = split_sentences(text)
+        futures: List[Future] = [self._executor.submit(self._synth_one, s) for s in sentences]
+        try:
+            for f in futures:
+                yield f.result()
+        finally:
+            for f in futures:
+                f.cancel()
+
+    def synthesize(self, text: str) -> PCM:
+        parts = list(self.synthesize_stream(text))
+        if not parts:
+            raise ValueError("text is empty")
+        data = np.concatenate([p.data for p in parts])
+        return PCM(data=data, samplerate=parts[0].samplerate, channels=parts[0].channels)
+
+    def stats(self) -> Dict[str, object]:
+        return {
+            "workers": len(self._procs),
+            "max_workers": self.workers,
+            "utterances": sum(p.utterances for p in self._procs),
+            "restarts": sum(max(0, p.restarts) for p in self._procs),
+        }
+
+    def close(self) -> None:
+        self.closed = True
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        for p in self._procs:
+            p.close()
+        self._procs.clear()
+
+
+_pools: Dict[Tuple[str, ...], PiperWorkerPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(args: Sequence[str], workers: int = 1, timeout: float = 30.0) -> PiperWorkerPool:
+    """Shared pool per distinct Piper command line (model, speaker, scales)."""
+    key = tuple(args)
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None or pool.closed:
+            pool = _pools[key] = PiperWorkerPool(args, workers, timeout)
+        return pool
+
+
+def close_pools() -> None:
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for p in pools:
+        p.close()
+
+
+__all__ = ["PiperProcess", "PiperWorkerPool", "get_pool", "close_pools", "split_sentences", "read_wav"]
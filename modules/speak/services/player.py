@@ -1,8 +1,10 @@
 from __future__ import annotations
 import io
 import logging
+import threading
+import time
 from dataclasses import dataclass
-from typing import Dict, Optional
+from typing import Dict, Iterable, Optional, Tuple
 from .pcm import PCM
 
 try:
@@ -21,6 +23,8 @@ class OutputConfig:
     samplerate: int = 22050
     channels: int = 1
     dtype: str = "float32"  # player expects float32
+    block_ms: int = 50  # write granularity; bounds how late a cancel/barge-in takes effect
+    idle_close_s: float = 30.0  # close the persistent stream after this much silence (0 = keep open)
 
 class AudioPlayer:
     def __init__(self, cfg: Dict):
@@ -29,15 +33,20 @@ class AudioPlayer:
             samplerate=int(cfg.get("samplerate", 22050)),
             channels=int(cfg.get("channels", 1)),
             dtype=str(cfg.get("dtype", "float32")),
+            block_ms=int(cfg.get("block_ms", 50)),
+            idle_close_s=float(cfg.get("idle_close_s", 30.0)),
         )
+        self._stream = None
+        self._stream_fmt: Optional[Tuple[int, int]] = None
+        self._lock = threading.Lock()
+        self._last_used = 0.0
+        self.streams_opened = 0
 
     def _ensure_backends(self):
         if sd is None:
             raise RuntimeError("sounddevice not available. Install with 'pip install sounddevice'.")
 
-    def play_blocking(self, pcm: PCM) -> float:
-        """PCM float32 verisini bloklayıcı şekilde çalar ve süreyi döner."""
-        self._ensure_backends()
+    def _fit_channels(self, pcm: PCM):
         import numpy as np
 
         data = pcm.data
@@ -52,12 +61,102 @@ class AudioPlayer:
                 data = data.mean(axis=1).astype(np.float32)
             else:
                 data = np.stack([data[:, 0]] * self.cfg.channels, axis=1).astype(np.float32)
+        return data
+
+    def _open(self, samplerate: int, channels: int):
+        """Kalıcı OutputStream; yalnızca biçim değişirse yeniden açılır."""
+        stream = self._stream
+        if stream is not None and self._stream_fmt == (samplerate, channels):
+            if not stream.active:
+                stream.start()  # aborted by a cancelled job
+            return stream
+        self._close_stream()
+        stream = sd.OutputStream(samplerate=samplerate, channels=channels, dtype="float32", device=self.cfg.device)
+        stream.start()
+        self._stream, self._stream_fmt = stream, (samplerate, channels)
+        self.streams_opened += 1
+        return stream
+
+    def _close_stream(self) -> None:
+        stream, self._stream, self._stream_fmt = self._stream, None, None
+        if stream is not None:
+            try:
+                stream.abort()
+                stream.close()
+            except Exception as e:
+                logger.debug("Closing output stream failed: %s", e)
+
+    def play_blocking(self, pcm: PCM) -> float:
+        """PCM float32 verisini bloklayıcı şekilde çalar ve süreyi döner."""
+        return self.play_stream([pcm])[0]
+
+    def play_stream(
+        self, pieces: Iterable[PCM], cancel: Optional[threading.Event] = None
+    ) -> Tuple[float, Optional[int], Optional[float]]:
+        """Parçaları geldikçe kalıcı OutputStream'e `block_ms`'lik bloklar halinde yazar.
+
+        `cancel` set edilirse sıradaki bloktan önce durur ve cihazda bekleyen ses atılır.
+        Dönüş: (çalınan süre sn, örnekleme hızı, ilk sese kadar geçen sn).
+        """
+        self._ensure_backends()
+        import numpy as np
+
+        t0 = time.monotonic()
+        sr: Optional[int] = None
+        first: Optional[float] = None
+        frames = 0
+        stopped = False
+        with self._lock:
+            try:
+                for pcm in pieces:
+                    data = self._fit_channels(pcm)
+                    if sr is None:
+                        sr = int(pcm.samplerate)
+                        stream = self._open(sr, 1 if data.ndim == 1 else int(data.shape[1]))
+                        first = time.monotonic() - t0
+                    elif int(pcm.samplerate) != sr:
+                        raise ValueError(f"samplerate changed mid-stream: {pcm.samplerate} != {sr}")
+                    block = max(1, sr * self.cfg.block_ms // 1000)
+                    for i in range(0, len(data), block):
+                        if cancel is not None and cancel.is_set():
+                            stopped = True
+                            break
+                        chunk = np.ascontiguousarray(data[i:i + block])
+                        stream.write(chunk)
+                        frames += len(chunk)
+                    if stopped:
+                        break
+            except BaseException:
+                stopped = True
+                raise
+            finally:
+                stopped = stopped or (cancel is not None and cancel.is_set())
+                if stopped and self._stream is not None:
+                    self._stream.abort()  # drop what is still queued in the device
+                self._last_used = time.monotonic()
+        dur = frames / float(sr) if sr else 0.0
+        if sr:
+            logger.info(
+                "Played audio: %.2fs @ %d Hz via %s (first audio after %.0f ms%s)",
+                dur, sr, self.cfg.device or "default", (first or 0.0) * 1000, ", interrupted" if stopped else "",
+            )
+        return dur, sr, first
+
+    def release_idle(self) -> None:
+        """`idle_close_s` boyunca kullanılmayan akışı kapatır (cihazı boşta tutmamak için)."""
+        if self._stream is None or self.cfg.idle_close_s <= 0:
+            return
+        if time.monotonic() - self._last_used < self.cfg.idle_close_s:
+            return
+        if self._lock.acquire(blocking=False):
+            try:
+                self._close_stream()
+            finally:
+                self._lock.release()
 
-        sd.play(data, samplerate=pcm.samplerate, device=self.cfg.device, blocking=True)
-        sd.stop()
-        dur = len(data) / float(pcm.samplerate)
-        logger.info("Played audio: %.2fs @ %d Hz via %s", dur, pcm.samplerate, self.cfg.device or "default")
-        return dur
+    def close(self) -> None:
+        with self._lock:
+            self._close_stream()
 
     def play_wav_bytes(self, payload: bytes) -> float:
         """WAV (RIFF) byte dizisini okuyup çalar."""
@@ -0,0 +1,347 @@
+"""Speech output scheduler: one speaker, many callers.
+
+Every `/speak/say` becomes a `SpeechJob` in a priority queue served by a single
+worker thread, so callers never overlap on the DAC and never hold an HTTP
+thread for the length of an utterance:
+
+- priorities: ``alert`` < ``high`` < ``normal`` < ``low`` (lower runs first);
+  a job at or above ``preempt`` priority (``alert`` by default) stops a
+  lower-priority phrase that is playing, everything else waits its turn;
+- a phrase identical to one still queued (same normalized text and voice
+  overrides) is coalesced into that job, which keeps the higher priority;
+- `cancel(job_id)` drops a queued job or stops a playing one between audio
+  blocks; `barge_in()` stops the current job when the user starts talking
+  (jobs at or above ``protect`` priority keep playing).
+"""
+from __future__ import annotations
+
+import heapq
+import itertools
+import json
+import logging
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from .pcm import PCM
+from .tts_cache import normalize_text
+
+logger = logging.getLogger("speak.scheduler")
+
+PRIORITIES: Dict[str, int] = {"alert": 0, "high": 1, "normal": 2, "low": 3}
+FINAL_STATES = ("done", "failed", "cancelled", "preempted")
+
+
+def parse_priority(value: Any, default: int = PRIORITIES["normal"]) -> int:
+    if value is None or value == "":
+        return default
+    if isinstance(value, str) and not value.lstrip("-").isdigit():
+        try:
+            return PRIORITIES[value.strip().lower()]
+        except KeyError:
+            raise ValueError(f"unknown priority {value!r}; use one of {sorted(PRIORITIES, key=PRIORITIES.get)}")
+    return max(0, int(value))
+
+
+def priority_name(value: int) -> str:
+    for name, p in PRIORITIES.items():
+        if p == value:
+            return name
+    return str(value)
+
+
+@dataclass
+class SpeechJob:
+    text: str
+    priority: int = PRIORITIES["normal"]
+    overrides: Optional[Dict[str, Any]] = None
+    id: str = field(default_factory=lambda: uuid.uuid4().hex[:12])
+    state: str = "queued"  # queued | synthesizing | playing | done | failed | cancelled | preempted
+    created: float = field(default_factory=time.time)
+    started: Optional[float] = None
+    finished: Optional[float] = None
+    coalesced: int = 0
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    _cancel: threading.Event = field(default_factory=threading.Event, repr=False)
+    _done: threading.Event = field(default_factory=threading.Event, repr=False)
+    _callbacks: List[Callable[["SpeechJob"], None]] = field(default_factory=list, repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    @property
+    def key(self) -> str:
+        return json.dumps([normalize_text(self.text), self.overrides or {}], sort_keys=True, ensure_ascii=False, default=str)
+
+    @property
+    def done(self) -> bool:
+        return self._done.is_set()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        return self._done.wait(timeout)
+
+    def add_done_callback(self, fn: Callable[["SpeechJob"], None]) -> None:
+        """Call `fn(job)` once the job reaches a final state (immediately if it already has)."""
+        with self._lock:
+            if not self._done.is_set():
+                self._callbacks.append(fn)
+                return
+        fn(self)
+
+    def _finish(self, state: str, error: Optional[str] = None) -> None:
+        with self._lock:
+            if self._done.is_set():
+                return
+            self.state = state
+            self.error = error if error or state == "done" else state
+            self.finished = time.time()
+            if self.result is None:
+                self.result = {"ok": False}
+            if self.error:
+                self.result["error"] = self.error
+            self.result.update({"job_id": self.id, "state": state})
+            self._done.set()
+            callbacks, self._callbacks = self._callbacks, []
+        for fn in callbacks:
+            try:
+                fn(self)
+            except Exception:
+                logger.exception("speech job callback failed")
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "text": self.text,
+            "priority": priority_name(self.priority),
+            "state": self.state,
+            "created": self.created,
+            "started": self.started,
+            "finished": self.finished,
+            "wait_ms": round((self.started - self.created) * 1000.0, 1) if self.started else None,
+            "coalesced": self.coalesced,
+            "result": self.result,
+            "error": self.error,
+        }
+
+
+class SpeechScheduler:
+    def __init__(
+        self,
+        tts,
+        player,
+        engine: Optional[str] = None,
+        preempt: Optional[int] = PRIORITIES["alert"],
+        protect: int = PRIORITIES["alert"],
+        flush_on_barge_in: bool = True,
+        history: int = 100,
+    ) -> None:
+        self.tts = tts
+        self.player = player
+        self.engine = engine
+        self.preempt = None if preempt is None else int(preempt)
+        self.protect = int(protect)
+        self.flush_on_barge_in = bool(flush_on_barge_in)
+        self.history = max(1, int(history))
+        self._heap: List[Tuple[int, int, SpeechJob]] = []
+        self._seq = itertools.count()
+        self._jobs: "OrderedDict[str, SpeechJob]" = OrderedDict()
+        self._current: Optional[SpeechJob] = None
+        self._cv = threading.Condition()
+        self._stop = False
+        self.submitted = 0
+        self.coalesced = 0
+        self.preempted = 0
+        self.barge_ins = 0
+        self._thread = threading.Thread(target=self._worker, name="speak-scheduler", daemon=True)
+        self._thread.start()
+
+    # Submission ------------------------------------------------------------
+    def submit(
+        self,
+        text: str,
+        priority: Any = None,
+        overrides: Optional[Dict[str, Any]] = None,
+        coalesce: bool = True,
+    ) -> SpeechJob:
+        if not text or not text.strip():
+            raise ValueError("text is empty")
+        job = SpeechJob(text=text, priority=parse_priority(priority), overrides=overrides or None)
+        with self._cv:
+            if self._stop:
+                raise RuntimeError("speech scheduler is closed")
+            self.submitted += 1
+            if coalesce:
+                twin = self._queued_twin(job.key)
+                if twin is not None:
+                    twin.coalesced += 1
+                    self.coalesced += 1
+                    if job.priority < twin.priority:
+                        twin.priority = job.priority  # stale heap entry is skipped on pop
+                        heapq.heappush(self._heap, (twin.priority, next(self._seq), twin))
+                        self._maybe_preempt(twin)
+                    return twin
+            self._jobs[job.id] = job
+            heapq.heappush(self._heap, (job.priority, next(self._seq), job))
+            self._maybe_preempt(job)
+            self._trim()
+            self._cv.notify()
+        return job
+
+    def _queued_twin(self, key: str) -> Optional[SpeechJob]:
+        for _, _, j in self._heap:
+            if j.state == "queued" and j.key == key:
+                return j
+        return None
+
+    def _maybe_preempt(self, job: SpeechJob) -> None:
+        cur = self._current
+        if self.preempt is None or job.priority > self.preempt:
+            return
+        if cur is not None and job.priority < cur.priority and not cur._cancel.is_set():
+            logger.info("Preempting %s (%s) for %s", cur.id, priority_name(cur.priority), priority_name(job.priority))
+            cur.state = "preempted"
+            cur._cancel.set()
+            self.preempted += 1
+
+    def _trim(self) -> None:
+        excess = len(self._jobs) - self.history
+        for jid in list(self._jobs):
+            if excess <= 0:
+                break
+            if self._jobs[jid].done:
+                del self._jobs[jid]
+                excess -= 1
+
+    # Control ---------------------------------------------------------------
+    def get(self, job_id: str) -> Optional[SpeechJob]:
+        with self._cv:
+            return self._jobs.get(job_id)
+
+    def list(self, state: Optional[str] = None) -> List[SpeechJob]:
+        with self._cv:
+            return [j for j in self._jobs.values() if state is None or j.state == state]
+
+    def cancel(self, job_id: str) -> Optional[SpeechJob]:
+        with self._cv:
+            job = self._jobs.get(job_id)
+            if job is None or job.done:
+                return job
+            if job is self._current:
+                job.state = "cancelled"
+                job._cancel.set()
+            else:
+                job._finish("cancelled")
+        return job
+
+    def barge_in(self) -> Dict[str, Any]:
+        """The user started talking: stop the current phrase and (optionally) drop queued chatter."""
+        with self._cv:
+            self.barge_ins += 1
+            cur = self._current
+            interrupted = None
+            if cur is not None and cur.priority > self.protect and not cur._cancel.is_set():
+                cur.state = "cancelled"
+                cur._cancel.set()
+                interrupted = cur.id
+            flushed = 0
+            if self.flush_on_barge_in:
+                for _, _, j in self._heap:
+                    if j.state == "queued" and j.priority > self.protect:
+                        j._finish("cancelled", "barge-in")
+                        flushed += 1
+        if interrupted:
+            logger.info("Barge-in: stopped %s, dropped %d queued", interrupted, flushed)
+        return {"interrupted": interrupted, "flushed": flushed}
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cv:
+            states: Dict[str, int] = {}
+            for j in self._jobs.values():
+                states[j.state] = states.get(j.state, 0) + 1
+            cur = self._current
+            return {
+                "running": self._thread.is_alive(),
+                "queued": len({j.id for _, _, j in self._heap if j.state == "queued"}),
+                "current": cur.to_dict() if cur is not None else None,
+                "states": states,
+                "submitted": self.submitted,
+                "coalesced": self.coalesced,
+                "preempted": self.preempted,
+                "barge_ins": self.barge_ins,
+            }
+
+    def close(self, timeout: float = 2.0) -> None:
+        with self._cv:
+            self._stop = True
+            if self._current is not None:
+                self._current._cancel.set()
+            for _, _, j in self._heap:
+                j._finish("cancelled", "scheduler closed")
+            self._heap.clear()
+            self._cv.notify_all()
+        self._thread.join(timeout)
+        close = getattr(self.player, "close", None)
+        if close:
+            close()
+
+    # Worker ----------------------------------------------------------------
+    def _next(self) -> Optional[SpeechJob]:
+        with self._cv:
+            while not self._stop:
+                while self._heap:
+                    prio, _, job = heapq.heappop(self._heap)
+                    if job.state == "queued" and prio == job.priority:
+                        job.state = "synthesizing"
+                        job.started = time.time()
+                        self._current = job
+                        return job
+                self._cv.wait(timeout=1.0)
+                if not self._heap:
+                    idle = getattr(self.player, "release_idle", None)
+                    if idle:
+                        idle()
+            return None
+
+    def _pieces(self, job: SpeechJob) -> Iterator[PCM]:
+        for pcm in self.tts.synthesize_stream(job.text, overrides=job.overrides):
+            if job._cancel.is_set():
+                return
+            if job.state == "synthesizing":
+                job.state = "playing"
+            yield pcm
+
+    def _run(self, job: SpeechJob) -> None:
+        dur, samplerate, first = self.player.play_stream(self._pieces(job), cancel=job._cancel)
+        engine = (job.overrides or {}).get("engine") or self.engine
+        job.result = {
+            "ok": not job._cancel.is_set(),
+            "engine": engine,
+            "duration_sec": dur,
+            "samplerate": samplerate,
+            "first_audio_ms": round(first * 1000.0, 1) if first is not None else None,
+        }
+        if job._cancel.is_set():
+            # state was set to cancelled/preempted by whoever raised the flag
+            job._finish(job.state if job.state in FINAL_STATES else "cancelled")
+        else:
+            job._finish("done")
+
+    def _worker(self) -> None:
+        while True:
+            job = self._next()
+            if job is None:
+                return
+            try:
+                self._run(job)
+            except Exception as e:
+                logger.exception("Speech job %s failed", job.id)
+                job._finish("failed", repr(e))
+            finally:
+                with self._cv:
+                    self._current = None
+                    self._trim()
+
+
+__all__ = ["SpeechJob", "SpeechScheduler", "PRIORITIES", "parse_priority", "priority_name"]
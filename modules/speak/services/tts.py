@@ -1,13 +1,18 @@
 from __future__ import annotations
 import copy
 import logging
+import os
 from dataclasses import dataclass
-from typing import Dict, Optional
+from pathlib import Path
+from typing import Dict, Iterator, Optional
 import threading
 from .pcm import PCM
+from .tts_cache import TTSCache, cache_key
+from .piper_worker import get_pool, read_wav
 
 import io
 
+import numpy as np
 import requests
 
 logger = logging.getLogger("speak.tts")
@@ -98,6 +103,8 @@ class PiperBackend(TTSBackend):
       - speaker: opsiyonel speaker id
       - length_scale, noise_scale, noise_w: opsiyonel parametreler
       - samplerate: beklenen örnekleme
+      - persistent: model belleğe bir kez yüklenen kalıcı süreç havuzu (varsayılan: true)
+      - workers, timeout: havuz boyutu ve cümle başına zaman aşımı
     """
     def __init__(self, cfg: TTSConfig, piper_cfg: Dict):
         self.bin_path = str(piper_cfg.get("bin_path", "piper"))
@@ -109,28 +116,44 @@ class PiperBackend(TTSBackend):
         self.length_scale = piper_cfg.get("length_scale")
         self.noise_scale = piper_cfg.get("noise_scale")
         self.noise_w = piper_cfg.get("noise_w")
+        self.persistent = bool(piper_cfg.get("persistent", True))
+        self.workers = int(piper_cfg.get("workers", 1))
+        self.timeout = float(piper_cfg.get("timeout", 30.0))
+
+    def _args(self):
+        cmd = [self.bin_path, "-m", str(self.model_path)]
+        if self.speaker is not None:
+            cmd += ["-s", str(self.speaker)]
+        if self.length_scale is not None:
+            cmd += ["-l", str(self.length_scale)]
+        if self.noise_scale is not None:
+            cmd += ["-n", str(self.noise_scale)]
+        if self.noise_w is not None:
+            cmd += ["-e", str(self.noise_w)]
+        return cmd
+
+    def pool(self):
+        return get_pool(self._args(), workers=self.workers, timeout=self.timeout)
+
+    def synthesize_stream(self, text: str):
+        """Yield PCM sentence by sentence from the resident worker pool."""
+        if not self.persistent:
+            yield self.synthesize(text)
+            return
+        yield from self.pool().synthesize_stream(text)
 
     def synthesize(self, text: str):
-        import subprocess, json, tempfile, os
-        import soundfile as sf
-        # Piper stdin->wav stdout; bazı kurulumlarda -w ile dosyaya yazmak daha stabil.
+        if self.persistent:
+            return self.pool().synthesize(text)
+        import subprocess, tempfile, os
+        # one-shot: model loads on every call
         with tempfile.TemporaryDirectory() as d:
             wav_path = os.path.join(d, "out.wav")
-            cmd = [self.bin_path, "-m", self.model_path, "-w", wav_path]
-            if self.speaker is not None:
-                cmd += ["-s", str(self.speaker)]
-            if self.length_scale is not None:
-                cmd += ["-l", str(self.length_scale)]
-            if self.noise_scale is not None:
-                cmd += ["-n", str(self.noise_scale)]
-            if self.noise_w is not None:
-                cmd += ["-e", str(self.noise_w)]
+            cmd = self._args() + ["-w", wav_path]
             proc = subprocess.run(cmd, input=text.encode("utf-8"), stdout=subprocess.PIPE, stderr=subprocess.PIPE)
             if proc.returncode != 0:
                 raise RuntimeError(f"piper failed: {proc.stderr.decode('utf-8', 'ignore')}")
-            data, sr = sf.read(wav_path, dtype='float32')
-            ch = 1 if data.ndim == 1 else data.shape[1]
-            return PCM(data=data, samplerate=sr, channels=ch)
+            return read_wav(wav_path)
 
 
 class XTTSHttpBackend(TTSBackend):
@@ -173,6 +196,38 @@ class TextToSpeech:
     def __init__(self, cfg: Dict):
         self._base_cfg = copy.deepcopy(cfg)
         self.backend = self._build_backend(self._base_cfg)
+        self.cache = self._build_cache(self._base_cfg.get("cache") or {})
+
+    @staticmethod
+    def _build_cache(ccfg: Dict) -> Optional[TTSCache]:
+        if not ccfg.get("enabled", False):
+            return None
+        disk_dir = ccfg.get("disk_dir")
+        if disk_dir and not os.path.isabs(disk_dir):
+            # relative to modules/speak, not to wherever the process was started
+            disk_dir = str(Path(__file__).resolve().parents[1] / disk_dir)
+        return TTSCache(
+            memory_mb=float(ccfg.get("memory_mb", 32)),
+            disk_dir=disk_dir,
+            disk_mb=float(ccfg.get("disk_mb", 256)),
+            level=int(ccfg.get("level", 6)),
+        )
+
+    @staticmethod
+    def _voice_params(cfg: Dict, backend: TTSBackend) -> Dict:
+        """Everything besides the text that changes the synthesized waveform."""
+        params = {k: cfg.get(k) for k in ("engine", "language", "voice", "rate", "volume", "samplerate")}
+        # pyttsx3 silently falls back to dummy: key on what actually synthesizes
+        params["backend"] = type(backend).__name__
+        if isinstance(backend, PiperBackend):
+            params["piper"] = {
+                k: v for k, v in (cfg.get("piper") or {}).items()
+                if k not in ("bin_path", "persistent", "workers", "timeout")
+            }
+        elif isinstance(backend, XTTSHttpBackend):
+            params["xtts"] = cfg.get("xtts")
+            params["speaker_wav"] = cfg.get("speaker_wav")
+        return params
 
     def _build_backend(self, cfg: Dict) -> TTSBackend:
         tcfg = TTSConfig(
@@ -212,12 +267,70 @@ class TextToSpeech:
         return merged
 
     def synthesize(self, text: str, overrides: Optional[Dict] = None):
-        if overrides:
-            cfg = self._merge_overrides(overrides)
-            backend = self._build_backend(cfg or self._base_cfg)
-            if isinstance(backend, XTTSHttpBackend):
-                speaker_wav = overrides.get("speaker_wav") if isinstance(overrides, dict) else None
-                language = overrides.get("language") if isinstance(overrides, dict) else None
-                return backend.synthesize(text, speaker_wav=speaker_wav, language=language)
-            return backend.synthesize(text)
-        return self.backend.synthesize(text)
+        cfg = (self._merge_overrides(overrides) if overrides else None) or self._base_cfg
+        backend = self._build_backend(cfg) if overrides else self.backend
+        key = None
+        if self.cache is not None:
+            key = cache_key(text, self._voice_params(cfg, backend))
+            hit = self.cache.get(key)
+            if hit is not None:
+                return hit
+        if overrides and isinstance(backend, XTTSHttpBackend):
+            speaker_wav = overrides.get("speaker_wav") if isinstance(overrides, dict) else None
+            language = overrides.get("language") if isinstance(overrides, dict) else None
+            pcm = backend.synthesize(text, speaker_wav=speaker_wav, language=language)
+        else:
+            pcm = backend.synthesize(text)
+        if key is not None:
+            pcm = self.cache.put(key, pcm)
+        return pcm
+
+    def synthesize_stream(self, text: str, overrides: Optional[Dict] = None) -> Iterator[PCM]:
+        """Yield PCM pieces as they become ready (sentence by sentence for Piper).
+
+        A cache hit yields the whole phrase at once; a miss is stored after the
+        last piece was produced.
+        """
+        cfg = (self._merge_overrides(overrides) if overrides else None) or self._base_cfg
+        backend = self._build_backend(cfg) if overrides else self.backend
+        stream = getattr(backend, "synthesize_stream", None)
+        if stream is None:
+            yield self.synthesize(text, overrides=overrides)
+            return
+        key = None
+        if self.cache is not None:
+            key = cache_key(text, self._voice_params(cfg, backend))
+            hit = self.cache.get(key)
+            if hit is not None:
+                yield hit
+                return
+        parts = []
+        for pcm in stream(text):
+            parts.append(pcm)
+            yield pcm
+        if key is not None and parts:
+            data = np.concatenate([p.data for p in parts])
+            self.cache.put(key, PCM(data=data, samplerate=parts[0].samplerate, channels=parts[0].channels))
+
+    def prewarm(self, phrases, overrides: Optional[Dict] = None, background: bool = True):
+        """Synthesize `phrases` into the cache (greetings, alerts...) without playing them."""
+        if self.cache is None:
+            return None
+
+        def _run():
+            for phrase in phrases:
+                try:
+                    self.synthesize(str(phrase), overrides=overrides)
+                except Exception as e:
+                    logger.warning("TTS prewarm failed for %r: %s", phrase, e)
+            logger.info("TTS cache prewarmed: %d phrases", len(phrases))
+
+        if not background:
+            _run()
+            return None
+        t = threading.Thread(target=_run, name="tts-prewarm", daemon=True)
+        t.start()
+        return t
+
+    def cache_stats(self) -> Dict:
+        return self.cache.stats() if self.cache is not None else {"enabled": False}
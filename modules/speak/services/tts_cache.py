@@ -0,0 +1,245 @@
+"""Content-addressed cache of synthesized speech.
+
+Keys are the SHA-256 of the normalized text plus every parameter that changes
+the waveform (engine, voice, rate, tone overrides, Piper/XTTS settings). Two
+tiers:
+
+- memory: LRU of read-only PCM arrays bounded by `memory_mb`;
+- disk: one zlib-compressed int16 file per key under `disk_dir`, bounded by
+  `disk_mb` (oldest access time evicted first). Disk hits are promoted to memory.
+
+Files are written to a temp name and renamed, so a crash never leaves a torn
+entry behind.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import struct
+import threading
+import unicodedata
+import zlib
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+from .pcm import PCM
+
+logger = logging.getLogger("speak.cache")
+
+_MAGIC = b"TTS1"
+_HEADER = struct.Struct("<4sIHH")  # magic, samplerate, channels, reserved
+
+
+def normalize_text(text: str) -> str:
+    """NFC + collapsed whitespace; case and punctuation are kept (they change prosody)."""
+    return " ".join(unicodedata.normalize("NFC", text).split())
+
+
+def cache_key(text: str, params: Dict[str, Any]) -> str:
+    blob = json.dumps({"t": normalize_text(text), "p": params}, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+def _readonly(pcm: PCM) -> PCM:
+    data = np.asarray(pcm.data, dtype=np.float32)
+    if data.flags.writeable:
+        data = data.copy() if data is pcm.data else data
+        data.setflags(write=False)
+    return PCM(data=data, samplerate=int(pcm.samplerate), channels=int(pcm.channels))
+
+
+class TTSCache:
+    def __init__(
+        self,
+        memory_mb: float = 32.0,
+        disk_dir: Optional[str] = None,
+        disk_mb: float = 256.0,
+        level: int = 6,
+    ) -> None:
+        self.memory_bytes = int(memory_mb * 1024 * 1024)
+        self.disk_dir = disk_dir
+        self.disk_bytes = int(disk_mb * 1024 * 1024)
+        self.level = int(level)
+        self._mem: "OrderedDict[str, PCM]" = OrderedDict()
+        self._mem_used = 0
+        self._disk_used = 0
+        self._lock = threading.Lock()
+        self._evicting = threading.Lock()  # one disk scan at a time, outside `_lock`
+        self.hits_memory = 0
+        self.hits_disk = 0
+        self.misses = 0
+        self.stores = 0
+        self.evicted_memory = 0
+        self.evicted_disk = 0
+        if disk_dir:
+            os.makedirs(disk_dir, exist_ok=True)
+            self._disk_used = sum(os.path.getsize(p) for p in self._disk_files())
+
+    # Memory tier -----------------------------------------------------------
+    def _mem_put(self, key: str, pcm: PCM) -> None:
+        size = pcm.data.nbytes
+        if size > self.memory_bytes:
+            return
+        old = self._mem.pop(key, None)
+        if old is not None:
+            self._mem_used -= old.data.nbytes
+        self._mem[key] = pcm
+        self._mem_used += size
+        while self._mem_used > self.memory_bytes and self._mem:
+            _, dropped = self._mem.popitem(last=False)
+            self._mem_used -= dropped.data.nbytes
+            self.evicted_memory += 1
+
+    # Disk tier -------------------------------------------------------------
+    def _path(self, key: str) -> str:
+        return os.path.join(self.disk_dir, key[:2], key + ".pcmz")
+
+    def _disk_files(self):
+        for root, _, files in os.walk(self.disk_dir):
+            for name in files:
+                if name.endswith(".pcmz"):
+                    yield os.path.join(root, name)
+
+    def _disk_get(self, key: str) -> Optional[PCM]:
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                blob = f.read()
+            magic, sr, ch, _ = _HEADER.unpack_from(blob)
+            if magic != _MAGIC:
+                raise ValueError("not a TTS cache file")
+            pcm16 = np.frombuffer(zlib.decompress(blob[_HEADER.size:]), dtype="<i2")
+            os.utime(path)  # access time for eviction order
+        except FileNotFoundError:
+            return None
+        except Exception as exc:
+            logger.debug("Dropping unreadable cache entry %s: %s", path, exc)
+            self._disk_drop(path)
+            return None
+        data = pcm16.astype(np.float32) / 32767.0
+        if ch > 1:
+            data = data.reshape(-1, ch)
+        data.setflags(write=False)
+        return PCM(data=data, samplerate=int(sr), channels=int(ch))
+
+    def _disk_drop(self, path: str) -> None:
+        try:
+            size = os.path.getsize(path)
+            os.remove(path)
+        except OSError:
+            return
+        with self._lock:
+            self._disk_used -= size
+
+    def _disk_put(self, key: str, pcm: PCM) -> None:
+        # compression and the file write run unlocked; lookups and other stores go on meanwhile
+        pcm16 = (np.clip(pcm.data, -1.0, 1.0) * 32767.0).astype("<i2")
+        blob = _HEADER.pack(_MAGIC, int(pcm.samplerate), int(pcm.channels), 0) + zlib.compress(pcm16.tobytes(), self.level)
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{threading.get_ident()}.tmp"  # concurrent stores of one key don't share a temp file
+        try:
+            with open(tmp, "wb") as f:
+                f.write(blob)
+        except OSError:
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
+            raise
+        with self._lock:
+            # rename and size lookup only, so the byte count matches what is on disk
+            try:
+                prev = os.path.getsize(path)
+            except OSError:
+                prev = 0
+            os.replace(tmp, path)
+            self._disk_used += len(blob) - prev
+            over = self._disk_used > self.disk_bytes
+        if over:
+            self._disk_evict()
+
+    def _disk_evict(self) -> None:
+        if not self._evicting.acquire(blocking=False):
+            return  # another store is already trimming the directory
+        try:
+            self._disk_trim()
+        finally:
+            self._evicting.release()
+
+    def _disk_trim(self) -> None:
+        files = []
+        for p in self._disk_files():
+            try:
+                st = os.stat(p)
+                files.append((st.st_mtime, st.st_size, p))
+            except OSError:
+                pass
+        files.sort()
+        total = sum(f[1] for f in files)
+        freed = evicted = 0
+        for _, size, p in files:
+            if total - freed <= self.disk_bytes:
+                break
+            try:
+                os.remove(p)
+                freed += size
+                evicted += 1
+            except OSError:
+                pass
+        with self._lock:
+            self._disk_used -= freed
+            self.evicted_disk += evicted
+
+    # Public API ------------------------------------------------------------
+    def get(self, key: str) -> Optional[PCM]:
+        with self._lock:
+            pcm = self._mem.get(key)
+            if pcm is not None:
+                self._mem.move_to_end(key)
+                self.hits_memory += 1
+                return pcm
+        pcm = self._disk_get(key) if self.disk_dir else None
+        with self._lock:
+            if pcm is None:
+                self.misses += 1
+                return None
+            self.hits_disk += 1
+            self._mem_put(key, pcm)
+        return pcm
+
+    def put(self, key: str, pcm: PCM) -> PCM:
+        """Store and return the cached (read-only) copy."""
+        pcm = _readonly(pcm)
+        with self._lock:
+            self._mem_put(key, pcm)
+            self.stores += 1
+        if self.disk_dir:
+            try:
+                self._disk_put(key, pcm)
+            except Exception as exc:
+                logger.warning("TTS cache disk write failed: %s", exc)
+        return pcm
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits_memory + self.hits_disk + self.misses
+            return {
+                "hits_memory": self.hits_memory,
+                "hits_disk": self.hits_disk,
+                "misses": self.misses,
+                "hit_rate": round((self.hits_memory + self.hits_disk) / lookups, 3) if lookups else None,
+                "stores": self.stores,
+                "memory_entries": len(self._mem),
+                "memory_mb": round(self._mem_used / (1024 * 1024), 2),
+                "disk_mb": round(self._disk_used / (1024 * 1024), 2) if self.disk_dir else None,
+                "evicted_memory": self.evicted_memory,
+                "evicted_disk": self.evicted_disk,
+            }
+
+
+__all__ = ["TTSCache", "cache_key", "normalize_text"]
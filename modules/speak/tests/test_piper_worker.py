@@ -0,0 +1,125 @@
+import os
+import stat
+import sys
+import textwrap
+import threading
+
+import pytest
+
+from modules.speak.services.piper_worker import PiperProcess, PiperWorkerPool, split_sentences
+from modules.speak.services.tts import TextToSpeech
+
+# Mimics `piper -m MODEL --output_dir DIR`: one WAV per stdin line, path on stdout.
+FAKE_PIPER = textwrap.dedent(
+    """
+    import os, sys, time, wave, itertools
+    args = sys.argv[1:]
+    out = args[args.index("--output_dir") + 1]
+    state = os.path.dirname(os.path.abspath(__file__))
+    with open(os.path.join(state, "loads"), "a") as f:
+        f.write("x")
+    sys.stderr.write("model loaded\\n"); sys.stderr.flush()
+    for i in itertools.count():
+        line = sys.stdin.readline()
+        if not line:
+            break
+        text = line.strip()
+        if text == "HANG":
+            time.sleep(30)
+        marker = os.path.join(state, "crashed")
+        if text == "CRASH" and not os.path.exists(marker):
+            open(marker, "w").close()
+            sys.exit(3)
+        path = os.path.join(out, f"{os.getpid()}_{i}.wav")
+        with wave.open(path, "wb") as w:
+            w.setnchannels(1); w.setsampwidth(2); w.setframerate(22050)
+            w.writeframes(b"\\x00\\x10" * (100 * len(text)))
+        sys.stderr.write(f"wrote {path}\\n"); sys.stderr.flush()
+        print(path, flush=True)
+    """
+)
+
+
+@pytest.fixture
+def piper_bin(tmp_path):
+    script = tmp_path / "fake_piper.py"
+    script.write_text(FAKE_PIPER)
+    wrapper = tmp_path / "piper"
+    wrapper.write_text(f"#!/bin/sh\nexec {sys.executable} {script} \"$@\"\n")
+    wrapper.chmod(wrapper.stat().st_mode | stat.S_IEXEC)
+    return str(wrapper)
+
+
+def _loads(tmp_path):
+    p = tmp_path / "loads"
+    return len(p.read_text()) if p.exists() else 0
+
+
+def test_split_sentences():
+    assert split_sentences("Merhaba! Nasılsın?\nBen iyiyim.  ") == ["Merhaba!", "Nasılsın?", "Ben iyiyim."]
+
+
+def test_pool_streams_sentences_in_order_with_one_model_load(piper_bin, tmp_path):
+    pool = PiperWorkerPool([piper_bin, "-m", "voice.onnx"], workers=2)
+    try:
+        pool.warm()
+        for _ in range(3):
+            parts = list(pool.synthesize_stream("Bir. İkinci cümle! Üç"))
+            assert [len(p.data) for p in parts] == [100 * 4, 100 * 13, 100 * 2]
+        assert _loads(tmp_path) == 2  # one per worker, not one per utterance
+        assert pool.stats()["utterances"] == 9
+    finally:
+        pool.close()
+
+
+def test_warm_racing_first_requests_stays_within_workers(piper_bin, tmp_path):
+    pool = PiperWorkerPool([piper_bin, "-m", "voice.onnx"], workers=2)
+    try:
+        threads = [threading.Thread(target=pool.warm) for _ in range(3)]
+        threads.append(threading.Thread(target=lambda: list(pool.synthesize_stream("Bir. İki. Üç. Dört."))))
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join(10.0)
+        assert pool.stats()["workers"] == 2
+        assert _loads(tmp_path) == 2
+    finally:
+        pool.close()
+
+
+def test_crashed_worker_is_respawned(piper_bin, tmp_path):
+    pool = PiperWorkerPool([piper_bin, "-m", "voice.onnx"], workers=1)
+    try:
+        pcm = pool.synthesize("CRASH")
+        assert len(pcm.data) == 500
+        assert pool.stats()["restarts"] == 1
+    finally:
+        pool.close()
+
+
+def test_wedged_process_times_out_and_is_replaced(piper_bin, tmp_path):
+    proc = PiperProcess([piper_bin, "-m", "voice.onnx"], timeout=0.5)
+    try:
+        with pytest.raises(RuntimeError, match="timed out"):
+            proc.synthesize("HANG")
+        assert len(proc.synthesize("Merhaba").data) == 700
+        assert proc.restarts == 1
+    finally:
+        proc.close()
+
+
+def test_tts_streams_then_serves_whole_phrase_from_cache(piper_bin, tmp_path):
+    cfg = {
+        "engine": "piper",
+        "piper": {"bin_path": piper_bin, "model_path": str(tmp_path / "voice.onnx"), "workers": 1},
+        "cache": {"enabled": True},
+    }
+    tts = TextToSpeech(cfg)
+    try:
+        first = list(tts.synthesize_stream("Merhaba. Hoş geldin."))
+        again = list(tts.synthesize_stream("Merhaba.  Hoş geldin."))
+        assert len(first) == 2 and len(again) == 1
+        assert len(again[0].data) == sum(len(p.data) for p in first)
+        assert tts.cache_stats()["hits_memory"] == 1
+    finally:
+        tts.backend.pool().close()
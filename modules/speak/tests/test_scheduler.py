@@ -0,0 +1,155 @@
+import threading
+import time
+
+import numpy as np
+
+from modules.speak.services import player as player_mod
+from modules.speak.services.pcm import PCM
+from modules.speak.services.player import AudioPlayer
+from modules.speak.services.scheduler import PRIORITIES, SpeechScheduler
+from modules.speak.services.tts import TextToSpeech
+
+
+class FakePlayer:
+    """Plays in 10 ms steps so cancellation between blocks can be observed."""
+
+    def __init__(self):
+        self.played = []
+        self.started = threading.Event()
+
+    def play_stream(self, pieces, cancel=None):
+        text = None
+        frames = 0
+        for pcm in pieces:
+            self.started.set()
+            for _ in range(len(pcm.data) // 160):
+                if cancel is not None and cancel.is_set():
+                    break
+                time.sleep(0.01)
+                frames += 160
+        self.played.append(frames)
+        return frames / 16000.0, 16000, 0.0
+
+
+def _scheduler(**kw):
+    tts = TextToSpeech({"engine": "dummy", "samplerate": 16000, "cache": {"enabled": False}})
+    player = FakePlayer()
+    return SpeechScheduler(tts, player, engine="dummy", **kw), player
+
+
+def test_jobs_run_one_at_a_time_in_priority_order():
+    sched, player = _scheduler()
+    try:
+        first = sched.submit("uzun bir sohbet cümlesi", priority="low")
+        player.started.wait(2.0)
+        low = sched.submit("düşük", priority="low")
+        normal = sched.submit("normal", priority="normal")
+        for j in (first, low, normal):
+            assert j.wait(5.0)
+        assert normal.started < low.started
+        assert all(j.state == "done" and j.result["ok"] for j in (first, low, normal))
+    finally:
+        sched.close()
+
+
+def test_alert_preempts_playing_chitchat():
+    sched, player = _scheduler()
+    try:
+        chat = sched.submit("x" * 30)  # ~0.9 s of audio
+        player.started.wait(2.0)
+        alert = sched.submit("Dikkat, engel var", priority="alert")
+        assert chat.wait(2.0) and alert.wait(5.0)
+        assert chat.state == "preempted" and not chat.result["ok"]
+        assert chat.result["duration_sec"] < 0.5
+        assert alert.state == "done"
+        assert sched.stats()["preempted"] == 1
+    finally:
+        sched.close()
+
+
+def test_duplicate_pending_phrases_coalesce_and_keep_higher_priority():
+    sched, player = _scheduler()
+    try:
+        busy = sched.submit("x" * 30)
+        player.started.wait(2.0)
+        a = sched.submit("Merhaba", priority="low")
+        b = sched.submit(" Merhaba ", priority="high")
+        assert a is b and a.coalesced == 1 and a.priority == PRIORITIES["high"]
+        sched.cancel(busy.id)
+        assert a.wait(5.0) and a.state == "done"
+        assert sched.stats()["coalesced"] == 1
+    finally:
+        sched.close()
+
+
+def test_cancel_and_barge_in():
+    sched, player = _scheduler()
+    try:
+        chat = sched.submit("x" * 30)
+        player.started.wait(2.0)
+        queued = sched.submit("sonra söylenecek")
+        dropped = sched.submit("bu iptal", priority="low")
+        sched.cancel(dropped.id)
+        assert dropped.state == "cancelled" and dropped.done
+        res = sched.barge_in()
+        assert res == {"interrupted": chat.id, "flushed": 1}
+        assert chat.wait(2.0) and chat.state == "cancelled"
+        assert queued.state == "cancelled"
+    finally:
+        sched.close()
+
+
+def test_barge_in_does_not_cut_alerts():
+    sched, player = _scheduler()
+    try:
+        alert = sched.submit("x" * 20, priority="alert")
+        player.started.wait(2.0)
+        assert sched.barge_in()["interrupted"] is None
+        assert alert.wait(5.0) and alert.state == "done"
+    finally:
+        sched.close()
+
+
+class FakeStream:
+    opened = 0
+
+    def __init__(self, samplerate, channels, dtype, device):
+        FakeStream.opened += 1
+        self.fmt = (samplerate, channels)
+        self.active = False
+        self.written = 0
+        self.aborts = 0
+
+    def start(self):
+        self.active = True
+
+    def write(self, data):
+        self.written += len(data)
+
+    def abort(self):
+        self.active = False
+        self.aborts += 1
+
+    def close(self):
+        self.active = False
+
+
+class FakeSd:
+    OutputStream = FakeStream
+
+
+def test_player_keeps_one_output_stream(monkeypatch):
+    monkeypatch.setattr(player_mod, "sd", FakeSd)
+    FakeStream.opened = 0
+    player = AudioPlayer({"block_ms": 10})
+    pcm = PCM(data=np.zeros(1600, dtype=np.float32), samplerate=16000, channels=1)
+    for _ in range(3):
+        assert player.play_stream([pcm, pcm])[0] == 0.2
+    assert FakeStream.opened == 1
+    cancel = threading.Event()
+    cancel.set()
+    dur, _, _ = player.play_stream([pcm], cancel=cancel)
+    assert dur == 0.0 and player._stream.aborts == 1
+    player.play_stream([PCM(data=np.zeros(2205, dtype=np.float32), samplerate=22050, channels=1)])
+    assert FakeStream.opened == 2  # reopened only because the format changed
+    player.close()
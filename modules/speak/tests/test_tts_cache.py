@@ -0,0 +1,102 @@
+import numpy as np
+
+from modules.speak.services.pcm import PCM
+from modules.speak.services.tts import TextToSpeech
+from modules.speak.services.tts_cache import TTSCache, cache_key, normalize_text
+
+
+def _tts(tmp_path, **cache):
+    cfg = {"engine": "dummy", "samplerate": 16000, "cache": {"enabled": True, "disk_dir": str(tmp_path), **cache}}
+    return TextToSpeech(cfg)
+
+
+def test_key_normalizes_whitespace_but_not_params():
+    assert normalize_text("  Merhaba\n  dünya ") == "Merhaba dünya"
+    assert cache_key("Merhaba  dünya", {"rate": 170}) == cache_key(" Merhaba dünya", {"rate": 170})
+    assert cache_key("Merhaba dünya", {"rate": 170}) != cache_key("Merhaba dünya", {"rate": 190})
+
+
+def test_memory_hit_returns_same_readonly_pcm(tmp_path):
+    tts = _tts(tmp_path)
+    a = tts.synthesize("Merhaba")
+    b = tts.synthesize("Merhaba ")
+    assert a is b
+    assert not a.data.flags.writeable
+    st = tts.cache_stats()
+    assert st["misses"] == 1 and st["hits_memory"] == 1 and st["stores"] == 1
+
+
+def test_tone_overrides_are_separate_entries(tmp_path):
+    tts = _tts(tmp_path)
+    tts.synthesize("Dikkat", overrides={"rate": 200})
+    tts.synthesize("Dikkat")
+    assert tts.cache_stats()["misses"] == 2
+
+
+def test_disk_tier_survives_restart(tmp_path):
+    first = _tts(tmp_path).synthesize("Engel var")
+    tts = _tts(tmp_path)
+    again = tts.synthesize("Engel var")
+    assert tts.cache_stats()["hits_disk"] == 1
+    assert again.samplerate == first.samplerate
+    np.testing.assert_allclose(again.data, first.data, atol=1.0 / 32767)
+
+
+def test_memory_budget_evicts_lru(tmp_path):
+    cache = TTSCache(memory_mb=0.01, disk_dir=None)  # ~10 KB
+    pcm = lambda: PCM(data=np.zeros(1000, dtype=np.float32), samplerate=16000, channels=1)  # 4 KB
+    for k in "abc":
+        cache.put(k, pcm())
+    assert cache.get("a") is None
+    assert cache.get("c") is not None
+    assert cache.stats()["evicted_memory"] == 1
+
+
+def test_disk_budget_and_prewarm(tmp_path):
+    tts = _tts(tmp_path, disk_mb=0.01)
+    tts.prewarm(["bir", "iki iki iki iki", "üç üç üç üç üç üç"], background=False)
+    st = tts.cache_stats()
+    assert st["stores"] == 3
+    assert st["evicted_disk"] >= 1 and st["disk_mb"] <= 0.01
+
+
+def test_unreadable_disk_entry_is_deleted(tmp_path):
+    cache = TTSCache(disk_dir=str(tmp_path))
+    cache.put("ab12", PCM(data=np.zeros(100, dtype=np.float32), samplerate=16000, channels=1))
+    path = tmp_path / "ab" / "ab12.pcmz"
+    path.write_bytes(b"garbage")
+    cache._mem.clear()
+    assert cache.get("ab12") is None
+    assert not path.exists()
+
+
+
+def test_disk_write_does_not_block_lookups(tmp_path, monkeypatch):
+    import threading
+
+    from modules.speak.services import tts_cache
+
+    cache = TTSCache(disk_dir=str(tmp_path))
+    pcm = PCM(data=np.zeros(1000, dtype=np.float32), samplerate=16000, channels=1)
+    cache.put("a", pcm)
+    entered, release = threading.Event(), threading.Event()
+    compress = tts_cache.zlib.compress
+
+    def slow_compress(data, level):
+        entered.set()
+        release.wait(2.0)
+        return compress(data, level)
+
+    monkeypatch.setattr(tts_cache.zlib, "compress", slow_compress)
+    writer = threading.Thread(target=cache.put, args=("b", pcm))
+    writer.start()
+    try:
+        assert entered.wait(2.0)
+        # "b" is still being compressed: lookups and stats must not wait for it
+        assert cache.get("a") is not None
+        assert cache.get("b") is not None  # already in the memory tier
+        assert cache.stats()["stores"] == 2
+    finally:
+        release.set()
+        writer.join(2.0)
+    assert TTSCache(disk_dir=str(tmp_path)).get("b") is not None
@@ -1,11 +1,14 @@
 from __future__ import annotations
 import argparse
 import logging
+import threading
 from typing import Optional
 
 from modules.speak.config_loader import load_config
-from modules.speak.services.tts import TextToSpeech
+from modules.speak.services.tts import PiperBackend, TextToSpeech
 from modules.speak.services.player import AudioPlayer
+from modules.speak.services.scheduler import SpeechJob, SpeechScheduler, parse_priority
+from modules.eventbus import BargeIn, SpeakRequest, get_bus
 from fastapi import FastAPI
 from typing import TYPE_CHECKING
 
@@ -27,7 +30,58 @@ class SpeakService:
     def __init__(self, config_path: Optional[str] = None):
         self.cfg = load_config(config_path)
         self.tts = TextToSpeech(self.cfg.get("tts", {}))
+        cache_cfg = (self.cfg.get("tts", {}) or {}).get("cache", {}) or {}
+        if cache_cfg.get("prewarm"):
+            self.tts.prewarm(list(cache_cfg["prewarm"]))
         self.player = AudioPlayer(self.cfg.get("audio_out", {}))
+        q_cfg = self.cfg.get("queue", {}) or {}
+        # a single worker owns the speaker; callers enqueue jobs and may or may not wait
+        self.scheduler = SpeechScheduler(
+            self.tts,
+            self.player,
+            engine=(self.cfg.get("tts", {}) or {}).get("engine"),
+            preempt=parse_priority(q_cfg.get("preempt", "alert")) if q_cfg.get("preempt", "alert") else None,
+            protect=parse_priority(q_cfg.get("barge_in_protect", "alert")),
+            flush_on_barge_in=bool(q_cfg.get("barge_in_flush", True)),
+            history=int(q_cfg.get("history", 100)),
+        )
+        self._subs: list = []
+        if isinstance(self.tts.backend, PiperBackend) and self.tts.backend.persistent:
+            # load the voice model in the background so the first phrase is fast too
+            threading.Thread(target=self._warm_piper, daemon=True).start()
+
+    def _warm_piper(self) -> None:
+        try:
+            self.tts.backend.pool().warm()
+        except Exception as e:
+            logger.warning("Piper warm-up failed: %s", e)
+
+    @staticmethod
+    def _overrides(
+        engine: Optional[str], tone: Optional[dict], speaker_wav: Optional[str], language: Optional[str]
+    ) -> dict:
+        overrides = dict(tone or {})
+        if engine:
+            overrides["engine"] = engine
+        if speaker_wav:
+            overrides["speaker_wav"] = speaker_wav
+        if language:
+            overrides["language"] = language
+        return overrides
+
+    def submit(
+        self,
+        text: str,
+        engine: Optional[str] = None,
+        tone: Optional[dict] = None,
+        speaker_wav: Optional[str] = None,
+        language: Optional[str] = None,
+        priority: Optional[str] = None,
+        coalesce: bool = True,
+    ) -> SpeechJob:
+        """Metni konuşma kuyruğuna ekler ve hemen döner (iş nesnesi ile durum izlenir)."""
+        overrides = self._overrides(engine, tone, speaker_wav, language)
+        return self.scheduler.submit(text, priority=priority, overrides=overrides or None, coalesce=coalesce)
 
     def speak(
         self,
@@ -36,23 +90,30 @@ class SpeakService:
         tone: Optional[dict] = None,
         speaker_wav: Optional[str] = None,
         language: Optional[str] = None,
+        priority: Optional[str] = None,
     ) -> dict:
-        """Metni sentezleyip oynatır; sonuç bilgisi döner.
+        """Metni kuyruğa ekler, çalınmasını bekler ve sonuç bilgisini döner.
         engine: 'pyttsx3' | 'piper' | 'xtts' | None (config default)
         """
         if not text or not text.strip():
             raise ValueError("text is empty")
-        overrides = dict(tone or {})
-        if engine:
-            overrides["engine"] = engine
-        if speaker_wav:
-            overrides["speaker_wav"] = speaker_wav
-        if language:
-            overrides["language"] = language
-        wav = self.tts.synthesize(text, overrides=overrides or None)
-        dur = self.player.play_blocking(wav)
-        used_engine = overrides.get("engine") or self.cfg.get("tts", {}).get("engine")
-        return {"ok": True, "engine": used_engine, "duration_sec": dur, "samplerate": wav.samplerate}
+        job = self.submit(text, engine=engine, tone=tone, speaker_wav=speaker_wav, language=language, priority=priority)
+        job.wait()
+        return dict(job.result or {})
+
+    def attach_bus(self, bus=None):
+        """Aynı süreçteki modüllerin `SpeakRequest` ve `BargeIn` olaylarını alır (HTTP /speak/say, /speak/barge_in yerine)."""
+        if not self._subs:
+            bus = bus or get_bus()
+            self._subs = [
+                bus.subscribe(SpeakRequest, self._on_request, name="speak.scheduler"),
+                bus.subscribe(BargeIn, lambda e: self.scheduler.barge_in(), name="speak.barge_in"),
+            ]
+        return self._subs
+
+    def _on_request(self, req: SpeakRequest) -> None:
+        tone = req.tone if isinstance(req.tone, dict) else None
+        self.submit(req.text, engine=req.engine, tone=tone, priority=req.priority)
 
     def play_wav(self, data: bytes) -> dict:
         dur = self.player.play_wav_bytes(data)
@@ -61,6 +122,7 @@ class SpeakService:
 
 def create_app(config_path: str | None = None) -> FastAPI:
     service = SpeakService(config_path)
+    service.attach_bus()
     app = FastAPI()
     from modules.speak.api import get_router  # local import to avoid circular
     app.include_router(get_router(service))
@@ -8,7 +8,10 @@ from typing import TYPE_CHECKING
 if TYPE_CHECKING:
     from modules.speech.xSpeechService import SpeechService
 
-def _notify_autonomy():
+from modules.eventbus import InteractionEvent, UserInteraction, get_bus
+
+
+def _post_autonomy():
     try:
         requests.post("http://localhost:8080/autonomy/interaction", timeout=0.1)
     except Exception:
@@ -24,15 +27,22 @@ def _push_interaction_event(event_type: str):
     except Exception:
         pass
 
+def _in_thread(fn, *args):
+    return lambda: threading.Thread(target=fn, args=args, daemon=True).start()
+
+def _notify_autonomy():
+    # in-process when autonomy is mounted in this gateway, HTTP otherwise
+    get_bus().publish(UserInteraction(source="speech"), fallback=_in_thread(_post_autonomy))
+
 def _emit_speech_event(name: str):
-    threading.Thread(target=_push_interaction_event, args=(name,), daemon=True).start()
+    get_bus().publish(InteractionEvent(type=name), fallback=_in_thread(_push_interaction_event, name))
 
 def get_router(service: SpeechService) -> APIRouter:
     router = APIRouter()
 
     @router.get("/speech/status")
     async def status():
-        return {"listening": True}
+        return service.health()
 
     last: dict | None = {"text": None}
     speaking = False
@@ -63,7 +73,7 @@ def get_router(service: SpeechService) -> APIRouter:
         nonlocal last
         last = {"text": r.text, "final": r.is_final, "confidence": r.confidence}
         if r.is_final and r.text:
-            threading.Thread(target=_notify_autonomy, daemon=True).start()
+            _notify_autonomy()
             if _mark_speaking(True):
                 _emit_speech_event("speech.start")
             _schedule_speech_end()
@@ -84,6 +94,29 @@ def get_router(service: SpeechService) -> APIRouter:
     async def last_result():
         return last or {}
 
+    @router.get("/speech/pipeline")
+    async def pipeline():
+        # ring fill, per-stage drops and latency histograms
+        return service.pipeline_stats()
+
+    @router.get("/speech/recognizer")
+    async def recognizer_stats():
+        # decoded vs skipped chunks, utterances, CPU in utterances vs idle
+        return service.recognizer.stats()
+
+    @router.get("/speech/models")
+    async def models():
+        return service.recognizer.models()
+
+    @router.post("/speech/language")
+    def set_language(lang: str):
+        # sync route: a model that is not cached yet loads on the threadpool
+        try:
+            path = service.set_language(lang)
+            return {"ok": True, "language": lang, "model": path}
+        except Exception as e:
+            return {"ok": False, "error": str(e)}
+
     @router.get("/speech/direction")
     async def direction():
         angle = service.last_angle if hasattr(service, "last_angle") else None
@@ -1,8 +1,9 @@
 from __future__ import annotations
 import logging
 import queue
+from time import monotonic
 from dataclasses import dataclass
-from typing import Dict, Iterable, Optional
+from typing import Callable, Dict, Iterable, Optional
 
 try:
     import sounddevice as sd
@@ -35,6 +36,13 @@ class AudioCapture:
         self._q: "queue.Queue[bytes]" = queue.Queue(maxsize=10)
         self._stream = None
         self._stopped = False
+        # When set, frames go straight from the PortAudio callback to the sink
+        # (SpeechPipeline.publish_chunk) instead of the pull queue below.
+        self.sink: Optional[Callable[[bytes], None]] = None
+        self.frames = 0
+        self.last_frame_at: Optional[float] = None  # monotonic time of the newest callback
+        self.dropped = 0     # pull queue full
+        self.overflows = 0   # PortAudio input overflow reported in status
 
     def _ensure_backend(self):
         if sd is None:
@@ -42,12 +50,20 @@ class AudioCapture:
 
     def _callback(self, indata, frames, time, status):  # noqa: D401
         if status:
+            if getattr(status, "input_overflow", False):
+                self.overflows += 1
             logger.warning("Audio status: %s", status)
+        self.frames += 1
+        self.last_frame_at = monotonic()
+        sink = self.sink
+        if sink is not None:
+            sink(bytes(indata))
+            return
         try:
             self._q.put_nowait(bytes(indata))
         except queue.Full:
             # drop frame; recognition is resilient
-            pass
+            self.dropped += 1
 
     def start(self):
         self._ensure_backend()
@@ -80,6 +96,13 @@ class AudioCapture:
                 break
         logger.info("Audio capture stopped")
 
+    @property
+    def running(self) -> bool:
+        return self._stream is not None and not self._stopped
+
+    def stats(self) -> Dict[str, int]:
+        return {"frames": self.frames, "dropped": self.dropped, "overflows": self.overflows}
+
     def stream(self) -> Iterable[bytes]:
         """Generator yielding audio frames. Starts backend lazily."""
         if self._stream is None:
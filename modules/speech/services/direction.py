@@ -1,8 +1,9 @@
 from __future__ import annotations
 import math
 import numpy as np
+from collections import deque
 from dataclasses import dataclass
-from typing import Iterable, Optional
+from typing import Deque, Dict, Optional
 
 
 @dataclass
@@ -11,40 +12,118 @@ class ArrayGeometry:
     sound_speed: float = 343.0    # m/s
 
 
+def _next_pow2(n: int) -> int:
+    return 1 << max(1, int(n - 1).bit_length())
+
+
+class _Plan:
+    """Per frame-length constants: FFT size, analysis window and lag steering matrix."""
+
+    def __init__(self, frame_len: int, fs: int, max_delay: float, interp: int):
+        self.frame_len = frame_len
+        self.nfft = _next_pow2(2 * frame_len)  # linear (not circular) correlation
+        self.window = np.hanning(frame_len).astype(np.float32)
+        span = int(math.ceil(max_delay * interp))
+        self.lags = np.arange(-span, span + 1, dtype=np.float64) / interp  # samples
+        bins = np.arange(self.nfft // 2 + 1)
+        # cc(lag) = Re(sum_f w_f R_f e^{+j 2 pi f lag / N}); w doubles the bins a real
+        # spectrum folds away, so only the few lags a mic pair can produce are evaluated
+        w = np.full(bins.shape, 2.0)
+        w[0] = 1.0
+        w[-1] = 1.0
+        self.steer = (np.exp(2j * np.pi * np.outer(bins, self.lags) / self.nfft) * w[:, None]).astype(np.complex64)
+
+
 class DirectionEstimator:
     """Estimate direction of arrival (azimuth) using two mics via GCC-PHAT.
 
     Expects interleaved int16 stereo frames (L,R,L,R,...) at given sample_rate.
     Returns azimuth in degrees (-90..+90) where + is to the right of mic0.
+
+    Frames are windowed and transformed with a power-of-two rFFT; the raw
+    cross-spectra of the last `window_frames` frames are summed before PHAT
+    weighting, so one estimate integrates ~window_frames * frame_ms of audio.
+    Only the lags physically possible for the mic spacing are evaluated, on a
+    1/`interp` sample grid, and the peak is refined by parabolic interpolation.
     """
 
-    def __init__(self, sample_rate: int, geometry: Optional[ArrayGeometry] = None):
+    def __init__(
+        self,
+        sample_rate: int,
+        geometry: Optional[ArrayGeometry] = None,
+        window_frames: int = 1,
+        interp: int = 4,
+    ):
         self.fs = sample_rate
         self.geom = geometry or ArrayGeometry()
-        self.max_delay = int(self.geom.mic_distance_m / self.geom.sound_speed * self.fs)  # samples
-
-    def _gcc_phat(self, sig, ref, interp=1):
-        n = sig.shape[0] + ref.shape[0]
-        SIG = np.fft.rfft(sig, n=n)
-        REF = np.fft.rfft(ref, n=n)
-        R = SIG * np.conj(REF)
-        R /= np.abs(R) + 1e-15
-        cc = np.fft.irfft(R, n=(n * interp))
-        max_shift = int(self.max_delay * interp)
-        cc = np.concatenate((cc[-max_shift:], cc[:max_shift+1]))
-        shift = np.argmax(np.abs(cc)) - max_shift
-        return shift / float(interp)
+        self.max_delay_f = self.geom.mic_distance_m / self.geom.sound_speed * self.fs  # samples
+        self.max_delay = int(self.max_delay_f)
+        self.window_frames = max(1, int(window_frames))
+        self.interp = max(1, int(interp))
+        self._plans: Dict[int, _Plan] = {}
+        self._history: Deque[np.ndarray] = deque(maxlen=max(1, self.window_frames - 1))
+        self._history_len = 0  # frame length the history spectra belong to
+
+    def _plan(self, frame_len: int) -> _Plan:
+        plan = self._plans.get(frame_len)
+        if plan is None:
+            plan = self._plans[frame_len] = _Plan(frame_len, self.fs, self.max_delay_f, self.interp)
+        if frame_len != self._history_len:
+            self._history.clear()  # spectra of another length can't be summed
+            self._history_len = frame_len
+        return plan
+
+    def reset(self) -> None:
+        self._history.clear()
 
     def estimate(self, frame_bytes: bytes) -> float:
         data = np.frombuffer(frame_bytes, dtype=np.int16)
         if data.size % 2 != 0:
             data = data[:-1]
-        # de-interleave
-        L = data[0::2].astype(np.float32)
-        R = data[1::2].astype(np.float32)
-        delay = self._gcc_phat(L, R)
-        # clamp to physical max delay
-        delay = max(-self.max_delay, min(self.max_delay, delay))
-        tau = delay / self.fs  # seconds
-        angle = math.degrees(math.asin(max(-1.0, min(1.0, tau * self.geom.sound_speed / self.geom.mic_distance_m))))
-        return float(angle)
+        return self.estimate_channels(data.reshape(-1, 2).astype(np.float32))
+
+    def estimate_channels(self, channels: np.ndarray) -> float:
+        """Azimuth from an (n, >=2) float array whose first two columns are L and R."""
+        return float(self.estimate_batch(channels[None, :, :])[0])
+
+    def estimate_batch(self, frames: np.ndarray) -> np.ndarray:
+        """Azimuths for a (batch, n, >=2) block of consecutive frames in one FFT call.
+
+        Each output integrates its own frame with the preceding ones (from this
+        batch and earlier calls) over the sliding window.
+        """
+        frames = np.asarray(frames, dtype=np.float32)
+        batch, n = frames.shape[0], frames.shape[1]
+        if batch == 0 or n < 2:
+            return np.zeros(batch)
+        plan = self._plan(n)
+        spec = np.fft.rfft(frames[:, :, :2] * plan.window[None, :, None], n=plan.nfft, axis=1)
+        cross = spec[:, :, 0] * np.conj(spec[:, :, 1])  # (batch, bins)
+        k = self.window_frames
+        if k > 1:
+            hist = len(self._history)
+            stack = np.concatenate([np.asarray(self._history).reshape(hist, -1), cross]) if hist else cross
+            csum = np.concatenate([np.zeros((1, stack.shape[1]), stack.dtype), np.cumsum(stack, axis=0)])
+            end = np.arange(hist + 1, hist + batch + 1)
+            acc = csum[end] - csum[np.maximum(0, end - k)]
+            self._history.extend(stack[-(k - 1):])
+        else:
+            acc = cross
+        acc = acc / (np.abs(acc) + 1e-15)  # PHAT
+        cc = (acc.astype(np.complex64) @ plan.steer).real  # (batch, lags)
+        delays = self._peak(cc, plan.lags)
+        delays = np.clip(delays, -self.max_delay_f, self.max_delay_f)
+        sin = np.clip(delays / self.fs * self.geom.sound_speed / self.geom.mic_distance_m, -1.0, 1.0)
+        return np.degrees(np.arcsin(sin))
+
+    def _peak(self, cc: np.ndarray, lags: np.ndarray) -> np.ndarray:
+        rows = np.arange(cc.shape[0])
+        i = np.argmax(cc, axis=1)
+        inner = (i > 0) & (i < cc.shape[1] - 1)
+        ic = np.clip(i, 1, cc.shape[1] - 2)
+        y0, y1, y2 = cc[rows, ic - 1], cc[rows, ic], cc[rows, ic + 1]
+        den = y0 - 2.0 * y1 + y2
+        with np.errstate(divide="ignore", invalid="ignore"):
+            frac = np.where(inner & (den < 0), 0.5 * (y0 - y2) / den, 0.0)
+        step = lags[1] - lags[0] if lags.size > 1 else 1.0
+        return lags[i] + frac * step
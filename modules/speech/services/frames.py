@@ -0,0 +1,73 @@
+"""Per-chunk audio frame stage: energy gate, de-interleave and downmix.
+
+Every captured chunk is decoded once with `np.frombuffer` (no copy) into an
+(n, channels) int16 view. From that single view the stage derives the float32
+channels used by `DirectionEstimator`, the mono int16 PCM fed to `Recognizer`
+and the RMS of the mono mix used as the DoA energy gate.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+
+DOWNMIX_MODES = ("left", "right", "mean")
+
+
+@dataclass
+class AudioFrame:
+    pcm: np.ndarray  # (n, channels) int16 view over the captured bytes
+    mono: bytes      # int16 mono PCM for the recognizer
+    rms: float       # RMS of the mono mix, int16 scale
+
+    @property
+    def samples(self) -> int:
+        return int(self.pcm.shape[0])
+
+    def channels_f32(self) -> Optional[np.ndarray]:
+        """(n, channels) float32 copy for DoA; None for mono input."""
+        if self.pcm.shape[1] < 2:
+            return None
+        return self.pcm.astype(np.float32)
+
+
+class FrameProcessor:
+    """Turn raw interleaved int16 chunks into `AudioFrame`s.
+
+    `downmix` picks the mono signal for stereo input: "left" (the old
+    `audioop.tomono(chunk, 2, 1.0, 0.0)` behaviour), "right" or "mean".
+    """
+
+    def __init__(self, channels: int = 1, downmix: str = "left"):
+        if downmix not in DOWNMIX_MODES:
+            raise ValueError(f"downmix must be one of {DOWNMIX_MODES}, got {downmix!r}")
+        self.channels = max(1, int(channels))
+        self.downmix = downmix
+
+    def view(self, chunk: bytes) -> np.ndarray:
+        """Zero-copy (n, channels) int16 view; a torn trailing sample is ignored."""
+        n = len(chunk) // (2 * self.channels)
+        return np.frombuffer(chunk, dtype="<i2", count=n * self.channels).reshape(n, self.channels)
+
+    def process(self, chunk: bytes) -> AudioFrame:
+        pcm = self.view(chunk)
+        if self.channels == 1:
+            mono16 = pcm[:, 0]
+            mono = chunk if len(chunk) == mono16.nbytes else mono16.tobytes()
+        elif self.downmix == "mean":
+            mix = pcm[:, 0].astype(np.int32)
+            mix += pcm[:, 1]
+            mix >>= 1
+            mono16 = mix.astype(np.int16)
+            mono = mono16.tobytes()
+        else:
+            mono16 = pcm[:, 0 if self.downmix == "left" else 1]
+            mono = mono16.tobytes()
+        mono_f = mono16.astype(np.float32)
+        n = mono_f.shape[0]
+        rms = float(np.sqrt(np.dot(mono_f, mono_f) / n)) if n else 0.0
+        return AudioFrame(pcm=pcm, mono=mono, rms=rms)
+
+
+__all__ = ["AudioFrame", "FrameProcessor", "DOWNMIX_MODES"]
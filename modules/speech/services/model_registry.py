@@ -0,0 +1,203 @@
+"""Process-wide Vosk model registry.
+
+A Vosk `Model` is hundreds of MB and takes seconds to load; `KaldiRecognizer`s
+built on it are cheap. The registry loads each model directory once, shares it
+between every `Recognizer` in the process and lets a recognizer switch language
+by swapping to another cached model. When the summed on-disk size of the
+cached models exceeds `budget_mb` the least recently used ones are dropped.
+A recognizer pins the model it decodes with (`acquire`/`release`): pinned
+models are never evicted, so a language switch back to one reuses the live
+instance instead of loading a second copy.
+"""
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+try:
+    from vosk import Model
+except Exception:  # soft dependency
+    Model = None  # type: ignore
+
+logger = logging.getLogger("speech.models")
+
+
+def _vosk_loader(path: str) -> Any:
+    if Model is None:
+        raise RuntimeError("vosk is not available. Install with 'pip install vosk' and download an offline model.")
+    return Model(path)
+
+
+def dir_size_mb(path: str) -> float:
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.path.getsize(os.path.join(root, name))
+            except OSError:
+                pass
+    return total / (1024 * 1024)
+
+
+class _Entry:
+    def __init__(self) -> None:
+        self.model: Any = None
+        self.size_mb = 0.0
+        self.load_s = 0.0
+        self.hits = 0
+        self.users = 0  # acquire() without release(): not evictable
+        self.error: Optional[str] = None
+        self.ready = threading.Event()
+
+
+class ModelRegistry:
+    def __init__(
+        self,
+        budget_mb: float = 0.0,
+        loader: Optional[Callable[[str], Any]] = None,
+        sizer: Optional[Callable[[str], float]] = None,
+    ) -> None:
+        self.budget_mb = float(budget_mb)  # 0 = unlimited
+        self._loader = loader or _vosk_loader
+        self._sizer = sizer or dir_size_mb
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.loads = 0
+        self.evictions = 0
+
+    def get(self, path: str) -> Any:
+        """Shared model for `path`; loads it on first use, concurrent callers wait for one load."""
+        return self._get(path, pin=False)
+
+    def acquire(self, path: str) -> Any:
+        """Like `get`, but the model stays cached until the matching `release`."""
+        return self._get(path, pin=True)
+
+    def release(self, path: str) -> None:
+        path = os.path.abspath(path)
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is not None and entry.users > 0:
+                entry.users -= 1
+                # eviction may have been held back by this pin
+                self._evict(keep=None)
+
+    def _get(self, path: str, pin: bool) -> Any:
+        path = os.path.abspath(path)
+        with self._lock:
+            entry = self._entries.get(path)
+            owner = entry is None
+            if owner:
+                entry = self._entries[path] = _Entry()
+            else:
+                entry.hits += 1
+            if pin:
+                entry.users += 1
+            self._entries.move_to_end(path)
+        if owner:
+            self._load(path, entry)
+        entry.ready.wait()
+        if entry.model is None:
+            raise RuntimeError(entry.error or f"model failed to load: {path}")
+        return entry.model
+
+    def _load(self, path: str, entry: _Entry) -> None:
+        start = time.monotonic()
+        try:
+            if not os.path.isdir(path):
+                raise FileNotFoundError(f"Vosk model directory not found: {path}")
+            entry.model = self._loader(path)
+            entry.size_mb = float(self._sizer(path))
+            entry.load_s = time.monotonic() - start
+            logger.info("Vosk model loaded in %.2fs (%.0f MB): %s", entry.load_s, entry.size_mb, path)
+        except Exception as exc:
+            entry.error = str(exc) or type(exc).__name__
+            with self._lock:
+                # failed loads are not cached; the next get() retries
+                if self._entries.get(path) is entry:
+                    del self._entries[path]
+        finally:
+            entry.ready.set()
+        with self._lock:
+            if entry.model is not None:
+                self.loads += 1
+                self._evict(keep=path)
+
+    def _evict(self, keep: Optional[str]) -> None:
+        if self.budget_mb <= 0:
+            return
+        total = sum(e.size_mb for e in self._entries.values())
+        for path in list(self._entries):
+            if total <= self.budget_mb:
+                break
+            e = self._entries[path]
+            if path == keep or e.users or not e.ready.is_set():
+                continue  # in use by a recognizer or still loading
+            del self._entries[path]
+            total -= e.size_mb
+            self.evictions += 1
+            logger.info("Vosk model evicted (LRU, budget %.0f MB): %s", self.budget_mb, path)
+
+    def preload(self, paths: Iterable[str], background: bool = True) -> Optional[threading.Thread]:
+        """Load `paths` now or on a daemon thread (e.g. at gateway startup)."""
+        paths = list(paths)
+
+        def _run() -> None:
+            for p in paths:
+                try:
+                    self.get(p)
+                except Exception as exc:
+                    logger.warning("Vosk model preload failed for %s: %s", p, exc)
+
+        if not background:
+            _run()
+            return None
+        t = threading.Thread(target=_run, name="vosk-preload", daemon=True)
+        t.start()
+        return t
+
+    def loaded(self) -> List[str]:
+        with self._lock:
+            return [p for p, e in self._entries.items() if e.model is not None]
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            models = {
+                p: {
+                    "ready": e.ready.is_set() and e.model is not None,
+                    "size_mb": round(e.size_mb, 1),
+                    "load_s": round(e.load_s, 3),
+                    "hits": e.hits,
+                    "users": e.users,
+                }
+                for p, e in self._entries.items()
+            }
+        return {
+            "budget_mb": self.budget_mb,
+            "used_mb": round(sum(m["size_mb"] for m in models.values()), 1),
+            "loads": self.loads,
+            "evictions": self.evictions,
+            "models": models,
+        }
+
+
+_registry: Optional[ModelRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_registry(budget_mb: Optional[float] = None) -> ModelRegistry:
+    """The process-wide registry; `budget_mb` (when given) updates its budget."""
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = ModelRegistry(budget_mb or 0.0)
+        elif budget_mb is not None:
+            _registry.budget_mb = float(budget_mb)
+        return _registry
+
+
+__all__ = ["ModelRegistry", "get_registry", "dir_size_mb"]
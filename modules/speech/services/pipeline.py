@@ -0,0 +1,239 @@
+"""Threaded speech pipeline: capture -> frame ring -> consumers (DoA, ASR, ...).
+
+The capture callback decodes each chunk once (`FrameProcessor`) and publishes
+the resulting `AudioFrame` into a fixed-size ring. Every consumer owns a
+cursor into that ring and runs at its own pace on its own thread, so a slow
+Vosk decode never stalls capture or direction estimation. Consumers share
+the same frame objects (no copies). A consumer that falls more than
+`capacity` frames behind skips to the oldest frame still held and counts the
+skipped ones as dropped; the producer never blocks.
+
+Per stage the pipeline keeps two latency histograms: `wait_ms` (capture to
+dequeue) and `service_ms` (time the consumer spent on a frame).
+"""
+from __future__ import annotations
+
+import bisect
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from .frames import AudioFrame, FrameProcessor
+
+logger = logging.getLogger("speech.pipeline")
+
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram (ms); percentiles are bucket upper bounds."""
+
+    BOUNDS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000)
+
+    def __init__(self) -> None:
+        self.counts = [0] * (len(self.BOUNDS_MS) + 1)
+        self.count = 0
+        self.sum_ms = 0.0
+        self.max_ms = 0.0
+
+    def observe(self, ms: float) -> None:
+        self.counts[bisect.bisect_left(self.BOUNDS_MS, ms)] += 1
+        self.count += 1
+        self.sum_ms += ms
+        if ms > self.max_ms:
+            self.max_ms = ms
+
+    def percentile(self, q: float) -> Optional[float]:
+        if not self.count:
+            return None
+        rank = q * self.count
+        acc = 0
+        for i, c in enumerate(self.counts):
+            acc += c
+            if acc >= rank:
+                return float(self.BOUNDS_MS[i]) if i < len(self.BOUNDS_MS) else round(self.max_ms, 1)
+        return round(self.max_ms, 1)
+
+    def snapshot(self) -> Dict[str, Any]:
+        labels = [f"<={b}" for b in self.BOUNDS_MS] + [f">{self.BOUNDS_MS[-1]}"]
+        return {
+            "count": self.count,
+            "mean_ms": round(self.sum_ms / self.count, 2) if self.count else None,
+            "max_ms": round(self.max_ms, 2),
+            "p50_ms": self.percentile(0.50),
+            "p95_ms": self.percentile(0.95),
+            "p99_ms": self.percentile(0.99),
+            "buckets": {k: c for k, c in zip(labels, self.counts) if c},
+        }
+
+
+class FrameRing:
+    """Single-producer, multi-consumer ring of (seq, capture_ts, frame)."""
+
+    def __init__(self, capacity: int = 100) -> None:
+        self.capacity = max(2, int(capacity))
+        self._slots: List[Optional[Tuple[int, float, Any]]] = [None] * self.capacity
+        self._seq = 0  # next sequence number to write
+        self._cond = threading.Condition()
+        self._closed = False
+
+    @property
+    def published(self) -> int:
+        return self._seq
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def publish(self, item: Any, ts: Optional[float] = None) -> None:
+        with self._cond:
+            self._slots[self._seq % self.capacity] = (self._seq, ts if ts is not None else time.monotonic(), item)
+            self._seq += 1
+            self._cond.notify_all()
+
+    def reader(self, name: str) -> "RingReader":
+        """New cursor starting at the next published frame."""
+        with self._cond:
+            return RingReader(self, name, self._seq)
+
+    def close(self) -> None:
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    def reopen(self) -> None:
+        with self._cond:
+            self._closed = False
+
+
+class RingReader:
+    def __init__(self, ring: FrameRing, name: str, start: int) -> None:
+        self.ring = ring
+        self.name = name
+        self.next = start
+        self.read = 0
+        self.dropped = 0
+        self.wait = LatencyHistogram()
+        self.service = LatencyHistogram()
+
+    def get(self, timeout: Optional[float] = None) -> Optional[Any]:
+        """Next frame, or None on timeout / when the ring is closed and drained."""
+        ring = self.ring
+        with ring._cond:
+            if not ring._cond.wait_for(lambda: ring._seq > self.next or ring._closed, timeout):
+                return None
+            if ring._seq <= self.next:
+                return None
+            oldest = ring._seq - ring.capacity
+            if self.next < oldest:
+                self.dropped += oldest - self.next
+                self.next = oldest
+            _, ts, item = ring._slots[self.next % ring.capacity]
+            self.next += 1
+        self.read += 1
+        self.wait.observe((time.monotonic() - ts) * 1000.0)
+        return item
+
+    def __iter__(self) -> Iterator[Any]:
+        while True:
+            item = self.get(timeout=0.5)
+            if item is None:
+                if self.ring.closed and self.ring._seq <= self.next:
+                    return
+                continue
+            t0 = time.monotonic()
+            yield item
+            self.service.observe((time.monotonic() - t0) * 1000.0)
+
+    def lag(self) -> int:
+        return max(0, self.ring._seq - self.next)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "read": self.read,
+            "dropped": self.dropped,
+            "lag": self.lag(),
+            "wait_ms": self.wait.snapshot(),
+            "service_ms": self.service.snapshot(),
+        }
+
+
+class SpeechPipeline:
+    """Owns the frame ring, the consumer cursors and the worker threads."""
+
+    def __init__(self, frames: FrameProcessor, capacity: int = 100) -> None:
+        self.frames = frames
+        self.ring = FrameRing(capacity)
+        self.capture = LatencyHistogram()  # decode + publish time in the audio callback
+        self._readers: Dict[str, RingReader] = {}
+        self._threads: Dict[str, threading.Thread] = {}
+        self._lock = threading.Lock()
+
+    def publish_chunk(self, chunk: bytes) -> AudioFrame:
+        """Capture stage: decode once and hand the frame to every consumer."""
+        t0 = time.monotonic()
+        frame = self.frames.process(chunk)
+        self.ring.publish(frame, t0)
+        self.capture.observe((time.monotonic() - t0) * 1000.0)
+        return frame
+
+    def subscribe(self, name: str) -> RingReader:
+        """Cursor yielding `AudioFrame`s until the pipeline stops (wakeword, recorder, ASR...)."""
+        reader = self.ring.reader(name)
+        with self._lock:
+            self._readers[name] = reader
+        return reader
+
+    def add_worker(self, name: str, fn: Callable[[Any], None], max_batch: Optional[int] = None) -> RingReader:
+        """Run `fn` on its own thread for every frame.
+
+        With `max_batch` set `fn` gets a list instead: the next frame plus
+        whatever else is already waiting (up to `max_batch`), so a lagging stage
+        catches up in vectorised calls instead of falling further behind.
+        """
+        reader = self.subscribe(name)
+
+        def _run() -> None:
+            for frame in reader:
+                item: Any = frame
+                if max_batch is not None:
+                    item = [frame]
+                    while len(item) < max_batch:
+                        nxt = reader.get(timeout=0)
+                        if nxt is None:
+                            break
+                        item.append(nxt)
+                try:
+                    fn(item)
+                except Exception as exc:
+                    logger.debug("Stage %s failed: %s", name, exc)
+
+        t = threading.Thread(target=_run, name=f"speech-{name}", daemon=True)
+        with self._lock:
+            self._threads[name] = t
+        t.start()
+        return reader
+
+    def start(self) -> None:
+        self.ring.reopen()
+
+    def stop(self, timeout: float = 1.0) -> None:
+        self.ring.close()
+        with self._lock:
+            threads = list(self._threads.values())
+            self._threads.clear()
+        for t in threads:
+            if t is not threading.current_thread():
+                t.join(timeout=timeout)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            readers = dict(self._readers)
+        return {
+            "published": self.ring.published,
+            "capacity": self.ring.capacity,
+            "capture_ms": self.capture.snapshot(),
+            "stages": {name: r.stats() for name, r in readers.items()},
+        }
+
+
+__all__ = ["FrameRing", "LatencyHistogram", "RingReader", "SpeechPipeline"]
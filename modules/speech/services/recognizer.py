@@ -2,8 +2,11 @@ from __future__ import annotations
 import json
 import logging
 import os
+import time
+import threading
+from collections import deque
 from dataclasses import dataclass
-from typing import Dict, Iterable, Iterator, Optional
+from typing import Any, Deque, Dict, Iterable, Iterator, Optional
 from pathlib import Path
 
 try:
@@ -12,11 +15,12 @@ except Exception:
     webrtcvad = None  # type: ignore
 
 try:
-    from vosk import Model, KaldiRecognizer
+    from vosk import KaldiRecognizer
 except Exception:  # soft dependency
-    Model = None  # type: ignore
     KaldiRecognizer = None  # type: ignore
 
+from .model_registry import ModelRegistry, get_registry
+
 logger = logging.getLogger("speech.recognizer")
 
 
@@ -38,33 +42,87 @@ class RecognizerConfig:
     vad_enabled: bool = False
     vad_aggressiveness: int = 2
     vad_hangover_ms: int = 300
+    # endpointing: decode only between VAD onset and hangover expiry
+    endpointing: bool = True
+    preroll_ms: int = 300
+    partial_interval_ms: int = 200
+
+
+class RecognizerMetrics:
+    """Decoder counters; CPU is thread time spent in the recognizer loop."""
+
+    def __init__(self) -> None:
+        self.chunks = 0
+        self.decoded = 0
+        self.skipped = 0
+        self.utterances = 0
+        self.finals = 0
+        self.partials = 0
+        self.partials_suppressed = 0
+        self.cpu_utterance_s = 0.0
+        self.cpu_idle_s = 0.0
+        self.audio_utterance_s = 0.0
+        self.audio_idle_s = 0.0
+        self.last_utterance: Optional[Dict[str, float]] = None
+
+    def snapshot(self) -> Dict[str, Any]:
+        utt = max(1, self.utterances)
+        return {
+            "chunks": self.chunks,
+            "decoded": self.decoded,
+            "skipped": self.skipped,
+            "utterances": self.utterances,
+            "finals": self.finals,
+            "partials": self.partials,
+            "partials_suppressed": self.partials_suppressed,
+            "cpu_utterance_s": round(self.cpu_utterance_s, 4),
+            "cpu_idle_s": round(self.cpu_idle_s, 4),
+            "cpu_per_utterance_s": round(self.cpu_utterance_s / utt, 4),
+            # CPU seconds per second of audio in each state
+            "load_utterance": round(self.cpu_utterance_s / self.audio_utterance_s, 4) if self.audio_utterance_s else None,
+            "load_idle": round(self.cpu_idle_s / self.audio_idle_s, 4) if self.audio_idle_s else None,
+            "last_utterance": self.last_utterance,
+        }
 
 
 class Recognizer:
-    def __init__(self, cfg: Dict):
+    def __init__(self, cfg: Dict, registry: Optional[ModelRegistry] = None):
+        vad = cfg.get("vad", {}) or {}
         self.cfg = RecognizerConfig(
             language=cfg.get("language"),
             model_path=cfg.get("model_path"),
             language_models=cfg.get("language_models"),
             samplerate=int(cfg.get("samplerate", 16000)),
             max_alternatives=int(cfg.get("max_alternatives", 0)),
-            vad_enabled=bool(cfg.get("vad", {}).get("enabled", False)),
-            vad_aggressiveness=int(cfg.get("vad", {}).get("aggressiveness", 2)),
-            vad_hangover_ms=int(cfg.get("vad", {}).get("hangover_ms", 300)),
+            vad_enabled=bool(vad.get("enabled", False)),
+            vad_aggressiveness=int(vad.get("aggressiveness", 2)),
+            vad_hangover_ms=int(vad.get("hangover_ms", 300)),
+            endpointing=bool(vad.get("endpointing", True)),
+            preroll_ms=int(vad.get("preroll_ms", 300)),
+            partial_interval_ms=int(cfg.get("partial_interval_ms", 200)),
         )
+        models = cfg.get("models", {}) or {}
+        self._registry = registry or get_registry(float(models.get("budget_mb", 0)))
         self._model = None
+        self._model_path: Optional[str] = None  # pinned in the registry while `_rec` decodes with it
         self._rec = None
+        self._next_rec = None  # built by set_language, swapped in between utterances
+        self._next_path: Optional[str] = None
+        self._swap_lock = threading.Lock()
         self._vad = None
+        self.metrics = RecognizerMetrics()
+        self._last_partial = ""
+        self._last_partial_ts = 0.0
         # Resolve model path relative to module root when not absolute (if provided)
         if self.cfg.model_path and not os.path.isabs(self.cfg.model_path):
             module_root = Path(__file__).resolve().parents[1]  # .../modules/speech
             resolved = module_root / self.cfg.model_path
             self.cfg.model_path = str(resolved)
 
-    def _resolve_model_path(self) -> str:
-        if self.cfg.model_path:
+    def _resolve_model_path(self, language: Optional[str] = None) -> str:
+        if language is None and self.cfg.model_path:
             return str(self.cfg.model_path)
-        lang = (self.cfg.language or "tr").lower()
+        lang = (language or self.cfg.language or "tr").lower()
         mapping = self.cfg.language_models or {
             "tr": "models/vosk-tr",
             "en": "models/vosk-en",
@@ -75,65 +133,239 @@ class Recognizer:
         }
         return mapping.get(lang, mapping.get("en", "models/vosk-en"))
 
-    def _ensure_model(self):
-        if Model is None or KaldiRecognizer is None:
+    def model_dir(self, language: Optional[str] = None) -> str:
+        """Absolute model directory for `language` (default: the configured one)."""
+        model_path = self._resolve_model_path(language)
+        # resolve relative to module root
+        if not os.path.isabs(model_path):
+            module_root = Path(__file__).resolve().parents[1]
+            model_path = str((module_root / model_path).resolve())
+        return model_path
+
+    def _new_recognizer(self, model):
+        if KaldiRecognizer is None:
             raise RuntimeError("vosk is not available. Install with 'pip install vosk' and download an offline model.")
-        if self._model is None:
-            model_path = self._resolve_model_path()
-            # resolve relative to module root
-            if not os.path.isabs(model_path):
-                module_root = Path(__file__).resolve().parents[1]
-                model_path = str((module_root / model_path).resolve())
-            if not os.path.isdir(model_path):
-                raise FileNotFoundError(f"Vosk model directory not found: {model_path}")
-            self._model = Model(model_path)
+        rec = KaldiRecognizer(model, self.cfg.samplerate)
+        if self.cfg.max_alternatives:
+            rec.SetMaxAlternatives(self.cfg.max_alternatives)
+        return rec
+
+    def set_language(self, language: str) -> str:
+        """Switch decoding language without reloading models already in the registry.
+
+        Blocks while a model that is not cached yet loads; a running `run` loop
+        picks the new recognizer up before its next utterance.
+        """
+        path = self.model_dir(language)
+        model = self._registry.acquire(path)
+        try:
+            rec = self._new_recognizer(model)
+        except Exception:
+            self._registry.release(path)
+            raise
+        self.cfg.language, self.cfg.model_path = language, None
+        self._model = model
+        with self._swap_lock:
+            if self._rec is None:
+                self._rec = rec
+                self._pin(path)
+                return path
+            superseded, self._next_rec, self._next_path = self._next_path, rec, path
+        if superseded is not None:
+            self._registry.release(superseded)
+        return path
+
+    def _pin(self, path: str) -> None:
+        old, self._model_path = self._model_path, path
+        if old is not None:
+            self._registry.release(old)
+
+    def preload(self, languages, background: bool = True):
+        """Warm the shared registry with the models of `languages`."""
+        return self._registry.preload([self.model_dir(lang) for lang in languages], background=background)
+
+    def models(self) -> Dict[str, Any]:
+        return self._registry.stats()
+
+    def _maybe_switch(self) -> Optional[RecognitionResult]:
+        """Swap in the recognizer built by `set_language`; returns what the old one still held."""
+        with self._swap_lock:
+            rec, path = self._next_rec, self._next_path
+            if rec is None:
+                return None
+            old, self._rec, self._next_rec, self._next_path = self._rec, rec, None, None
+            # audio the old recognizer buffered is finished in its own language, not dropped
+            final = self._final(old.FinalResult()) if old is not None else None
+            self._pin(path)
+        self._last_partial = ""
+        return final
+
+    def _ensure_model(self):
         if self._rec is None:
-            self._rec = KaldiRecognizer(self._model, self.cfg.samplerate)
-            if self.cfg.max_alternatives:
-                self._rec.SetMaxAlternatives(self.cfg.max_alternatives)
-        if self.cfg.vad_enabled:
+            if KaldiRecognizer is None:
+                raise RuntimeError("vosk is not available. Install with 'pip install vosk' and download an offline model.")
+            if self._model is None:
+                path = self.model_dir()
+                self._model = self._registry.acquire(path)
+                self._pin(path)
+            self._rec = self._new_recognizer(self._model)
+        if self.cfg.vad_enabled and self._vad is None:
             if webrtcvad is None:
                 raise RuntimeError("VAD enabled but 'webrtcvad' is not installed. Install with 'pip install webrtcvad'.")
-            if self._vad is None:
-                self._vad = webrtcvad.Vad(self.cfg.vad_aggressiveness)
+            self._vad = webrtcvad.Vad(self.cfg.vad_aggressiveness)
+
+    def _chunk_ms(self, chunk: bytes) -> float:
+        return len(chunk) * 500.0 / self.cfg.samplerate  # int16 mono
+
+    def _voiced(self, chunk: bytes) -> bool:
+        """WebRTC VAD over the chunk; one call when it is already a 10/20/30 ms frame."""
+        sr = self.cfg.samplerate
+        try:
+            if len(chunk) in (sr // 50, sr // 25, sr * 3 // 50):  # 10/20/30 ms of int16
+                return self._vad.is_speech(chunk, sr)
+            step = sr * 3 // 50
+            for i in range(0, len(chunk) - step + 1, step):
+                if self._vad.is_speech(chunk[i:i + step], sr):
+                    return True
+            return False
+        except Exception:
+            return True
+
+    def _partial(self) -> Optional[RecognitionResult]:
+        """PartialResult at most every partial_interval_ms, and only when the text changed."""
+        now = time.monotonic()
+        if (now - self._last_partial_ts) * 1000.0 < self.cfg.partial_interval_ms:
+            self.metrics.partials_suppressed += 1
+            return None
+        self._last_partial_ts = now
+        partial = json.loads(self._rec.PartialResult()).get("partial", "")
+        if not partial or partial == self._last_partial:
+            self.metrics.partials_suppressed += 1
+            return None
+        self._last_partial = partial
+        self.metrics.partials += 1
+        return RecognitionResult(text=partial, is_final=False)
+
+    def _final(self, raw: str) -> Optional[RecognitionResult]:
+        res = json.loads(raw)
+        self._last_partial = ""
+        text = res.get("text", "")
+        if not text:
+            return None
+        self.metrics.finals += 1
+        return RecognitionResult(text=text, is_final=True, confidence=res.get("confidence"))
+
+    def _decode(self, data: bytes) -> Iterator[RecognitionResult]:
+        self.metrics.decoded += 1
+        if self._rec.AcceptWaveform(data):
+            out = self._final(self._rec.Result())
+        else:
+            out = self._partial()
+        if out is not None:
+            yield out
 
     def run(self, stream: Iterable[bytes]) -> Iterator[RecognitionResult]:
         self._ensure_model()
-        hangover_frames = 0
-        # 20ms step size for VAD, samples->bytes: int16 -> *2
-        vad_step_bytes = int(self.cfg.samplerate * 0.02) * 2
+        if self._vad is not None and self.cfg.endpointing:
+            yield from self._run_endpointing(stream)
+        else:
+            yield from self._run_continuous(stream)
+
+    def _run_continuous(self, stream: Iterable[bytes]) -> Iterator[RecognitionResult]:
+        m = self.metrics
+        hangover_ms = 0.0
         for chunk in stream:
-            data = chunk
+            t0 = time.thread_time()
+            m.chunks += 1
+            chunk_ms = self._chunk_ms(chunk)
+            # between utterances only: VAD silence, or no words decoded since the last final
+            if hangover_ms <= 0 and (self._vad is not None or not self._last_partial):
+                flushed = self._maybe_switch()
+                if flushed is not None:
+                    yield flushed
             if self._vad:
-                voiced_any = False
-                # iterate over 20ms frames
-                for i in range(0, len(data), vad_step_bytes):
-                    frame = data[i:i + vad_step_bytes]
-                    if len(frame) < vad_step_bytes:
-                        break
-                    try:
-                        if self._vad.is_speech(frame, self.cfg.samplerate):
-                            voiced_any = True
-                            break
-                    except Exception:
-                        voiced_any = True
-                        break
-                if not voiced_any:
-                    if hangover_frames > 0:
-                        hangover_frames -= 1
-                    else:
-                        continue
+                if self._voiced(chunk):
+                    hangover_ms = float(self.cfg.vad_hangover_ms)
+                elif hangover_ms > 0:
+                    hangover_ms -= chunk_ms
                 else:
-                    # Set hangover to ~vad_hangover_ms/20ms frames
-                    hangover_frames = max(hangover_frames, max(1, int(self.cfg.vad_hangover_ms / 20)))
+                    m.skipped += 1
+                    m.cpu_idle_s += time.thread_time() - t0
+                    m.audio_idle_s += chunk_ms / 1000.0
+                    continue
+            results = list(self._decode(chunk))
+            m.cpu_utterance_s += time.thread_time() - t0
+            m.audio_utterance_s += chunk_ms / 1000.0
+            yield from results
 
-            if self._rec.AcceptWaveform(data):
-                res = json.loads(self._rec.Result())
-                yield RecognitionResult(text=res.get("text", ""), is_final=True, confidence=res.get("confidence"))
+    def _run_endpointing(self, stream: Iterable[bytes]) -> Iterator[RecognitionResult]:
+        """Decode only inside utterances.
+
+        Silence is kept in a pre-roll ring (`preroll_ms`) and fed ahead of the
+        first voiced chunk so onsets are not clipped. An utterance ends once
+        `vad_hangover_ms` of unvoiced audio has passed: the final result is
+        emitted and the recognizer is reset for the next one.
+        """
+        m = self.metrics
+        preroll: Deque[bytes] = deque()
+        preroll_bytes = 0
+        preroll_max = int(self.cfg.samplerate * self.cfg.preroll_ms / 1000) * 2
+        in_speech = False
+        hangover_ms = 0.0
+        utt_cpu = utt_audio_ms = 0.0
+        for chunk in stream:
+            t0 = time.thread_time()
+            m.chunks += 1
+            chunk_ms = self._chunk_ms(chunk)
+            voiced = self._voiced(chunk)
+            if not in_speech:
+                flushed = self._maybe_switch()
+                if flushed is not None:
+                    yield flushed
+                if not voiced:
+                    preroll.append(chunk)
+                    preroll_bytes += len(chunk)
+                    while preroll and preroll_bytes - len(preroll[0]) >= preroll_max:
+                        preroll_bytes -= len(preroll.popleft())
+                    m.skipped += 1
+                    m.cpu_idle_s += time.thread_time() - t0
+                    m.audio_idle_s += chunk_ms / 1000.0
+                    continue
+                in_speech = True
+                m.utterances += 1
+                utt_cpu = 0.0
+                utt_audio_ms = preroll_bytes * 500.0 / self.cfg.samplerate
+                data = b"".join(preroll) + chunk
+                preroll.clear()
+                preroll_bytes = 0
             else:
-                partial = json.loads(self._rec.PartialResult()).get("partial", "")
-                if partial:
-                    yield RecognitionResult(text=partial, is_final=False)
+                data = chunk
+            utt_audio_ms += chunk_ms
+            hangover_ms = float(self.cfg.vad_hangover_ms) if voiced else hangover_ms - chunk_ms
+            results = list(self._decode(data))
+            if hangover_ms <= 0:
+                final = self._final(self._rec.FinalResult())
+                if final is not None:
+                    results.append(final)
+                self._rec.Reset()
+                in_speech = False
+            dt = time.thread_time() - t0
+            utt_cpu += dt
+            m.cpu_utterance_s += dt
+            m.audio_utterance_s += chunk_ms / 1000.0
+            if not in_speech:
+                m.last_utterance = {
+                    "audio_s": round(utt_audio_ms / 1000.0, 3),
+                    "cpu_s": round(utt_cpu, 4),
+                    "ts": time.time(),
+                }
+            yield from results
+
+    def stats(self) -> Dict[str, Any]:
+        st = self.metrics.snapshot()
+        st["mode"] = "endpointing" if self._vad is not None and self.cfg.endpointing else "continuous"
+        st["language"] = self.cfg.language
+        return st
 
     def finalize(self) -> Optional[RecognitionResult]:
         if self._rec is None:
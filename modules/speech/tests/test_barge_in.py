@@ -0,0 +1,30 @@
+import time
+
+from modules.eventbus import BargeIn, get_bus
+from modules.speech.xSpeechService import SpeechService
+
+
+def test_barge_in_goes_over_the_bus_and_is_rate_limited(monkeypatch):
+    svc = SpeechService()
+    svc._barge_in_url = "http://speak.invalid/speak/barge_in"
+    posted = []
+    monkeypatch.setattr(svc, "_post_barge_in", lambda: posted.append(True))
+    got = []
+    sub = get_bus().subscribe(BargeIn, got.append, name="test.barge_in")
+    try:
+        svc._barge_in()
+        svc._barge_in()  # inside min_interval_s: dropped
+        deadline = time.monotonic() + 2.0
+        while not got and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert got == [BargeIn(source="speech")]
+    finally:
+        sub.close()
+    assert posted == []
+
+    svc._barge_in_last = 0.0  # nobody subscribed: the HTTP fallback runs
+    svc._barge_in()
+    deadline = time.monotonic() + 2.0
+    while not posted and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert posted == [True]
@@ -0,0 +1,38 @@
+import numpy as np
+import pytest
+
+from modules.speech.services.direction import ArrayGeometry, DirectionEstimator
+from modules.speech.tools.bench_doa import FS, delayed_pair
+
+
+@pytest.mark.parametrize("angle", [-45.0, -12.5, 0.0, 20.0, 50.0])
+def test_fractional_delay_accuracy(angle):
+    frames = delayed_pair(angle, 1.0, snr_db=20.0, geom=ArrayGeometry(), seed=3)
+    est = DirectionEstimator(FS, window_frames=4)
+    angles = [est.estimate_channels(f) for f in frames]
+    assert np.median(np.abs(np.array(angles[4:]) - angle)) < 2.0
+
+
+def test_batch_matches_sequential():
+    frames = delayed_pair(25.0, 0.5, snr_db=5.0, geom=ArrayGeometry(), seed=4)
+    seq = DirectionEstimator(FS, window_frames=3)
+    expected = [seq.estimate_channels(f) for f in frames]
+    batched = DirectionEstimator(FS, window_frames=3)
+    got = np.concatenate([batched.estimate_batch(frames[:5]), batched.estimate_batch(frames[5:])])
+    np.testing.assert_allclose(got, expected, atol=1e-3)
+
+
+def test_window_integration_reduces_error_in_noise():
+    frames = delayed_pair(-30.0, 2.0, snr_db=-5.0, geom=ArrayGeometry(), seed=5)
+    single = DirectionEstimator(FS).estimate_batch(frames)
+    windowed = DirectionEstimator(FS, window_frames=8).estimate_batch(frames)
+    assert np.mean(np.abs(windowed[8:] + 30.0)) < np.mean(np.abs(single[8:] + 30.0))
+
+
+def test_plan_is_power_of_two_and_cached():
+    est = DirectionEstimator(FS)
+    est.estimate(np.zeros((480, 2), dtype=np.int16).tobytes())
+    plan = est._plans[480]
+    assert plan.nfft == 1024 and plan.window.shape == (480,)
+    est.estimate(np.ones((480, 2), dtype=np.int16).tobytes())
+    assert est._plans[480] is plan
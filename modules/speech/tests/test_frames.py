@@ -0,0 +1,52 @@
+import math
+
+import numpy as np
+import pytest
+
+from modules.speech.services.direction import DirectionEstimator
+from modules.speech.services.frames import FrameProcessor
+
+
+def _stereo(n=480, seed=0):
+    rng = np.random.default_rng(seed)
+    return rng.integers(-20000, 20000, size=(n, 2), dtype=np.int16)
+
+
+def test_stereo_left_downmix_matches_old_tomono():
+    pcm = _stereo()
+    chunk = pcm.tobytes()
+    frame = FrameProcessor(2).process(chunk)
+    assert frame.mono == pcm[:, 0].tobytes()
+    ref = math.sqrt(sum(int(v) * int(v) for v in pcm[:, 0]) / len(pcm))
+    assert frame.rms == pytest.approx(ref, rel=1e-5)
+    assert np.shares_memory(frame.pcm, np.frombuffer(chunk, dtype=np.int16))
+
+
+def test_mean_downmix_and_torn_tail():
+    pcm = _stereo(seed=1)
+    frame = FrameProcessor(2, "mean").process(pcm.tobytes() + b"\x01")
+    expected = ((pcm[:, 0].astype(np.int32) + pcm[:, 1]) >> 1).astype(np.int16)
+    assert frame.samples == len(pcm)
+    assert frame.mono == expected.tobytes()
+
+
+def test_mono_passthrough_and_silence():
+    chunk = np.zeros(480, dtype=np.int16).tobytes()
+    frame = FrameProcessor(1).process(chunk)
+    assert frame.mono is chunk
+    assert frame.rms == 0.0
+    assert frame.channels_f32() is None
+    assert FrameProcessor(2).process(b"").rms == 0.0
+
+
+def test_invalid_downmix():
+    with pytest.raises(ValueError):
+        FrameProcessor(2, "sum")
+
+
+def test_estimate_channels_matches_bytes_path():
+    pcm = _stereo(seed=2)
+    pcm[:, 1] = np.roll(pcm[:, 0], 2)
+    doa = DirectionEstimator(16000)
+    frame = FrameProcessor(2).process(pcm.tobytes())
+    assert doa.estimate_channels(frame.channels_f32()) == doa.estimate(pcm.tobytes())
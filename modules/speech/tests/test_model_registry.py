@@ -0,0 +1,128 @@
+import threading
+import time
+
+import pytest
+
+from modules.speech.services import recognizer as recognizer_mod
+from modules.speech.services.model_registry import ModelRegistry
+from modules.speech.services.recognizer import Recognizer
+
+
+class SlowLoader:
+    def __init__(self, delay=0.05):
+        self.delay = delay
+        self.calls = []
+
+    def __call__(self, path):
+        self.calls.append(path)
+        time.sleep(self.delay)
+        return ("model", path)
+
+
+def _dirs(tmp_path, *names):
+    out = []
+    for n in names:
+        d = tmp_path / n
+        d.mkdir()
+        out.append(str(d))
+    return out
+
+
+def test_concurrent_gets_share_one_load(tmp_path):
+    (tr,) = _dirs(tmp_path, "vosk-tr")
+    loader = SlowLoader()
+    reg = ModelRegistry(loader=loader, sizer=lambda p: 50.0)
+    got = []
+    threads = [threading.Thread(target=lambda: got.append(reg.get(tr))) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert loader.calls == [tr]
+    assert len(got) == 8 and all(m is got[0] for m in got)
+    assert reg.stats()["models"][tr]["hits"] == 7
+
+
+def test_lru_eviction_under_budget(tmp_path):
+    a, b, c = _dirs(tmp_path, "a", "b", "c")
+    loader = SlowLoader(0)
+    reg = ModelRegistry(budget_mb=100, loader=loader, sizer=lambda p: 50.0)
+    reg.get(a)
+    reg.get(b)
+    reg.get(a)  # b is now least recently used
+    reg.get(c)
+    assert reg.loaded() == [a, c]
+    assert reg.evictions == 1
+    reg.get(b)
+    assert loader.calls == [a, b, c, b]
+
+
+def test_missing_dir_is_not_cached(tmp_path):
+    reg = ModelRegistry(loader=SlowLoader(0))
+    with pytest.raises(RuntimeError):
+        reg.get(str(tmp_path / "nope"))
+    assert reg.loaded() == []
+
+
+def test_background_preload(tmp_path):
+    tr, en = _dirs(tmp_path, "tr", "en")
+    reg = ModelRegistry(loader=SlowLoader(0.01))
+    reg.preload([tr, en]).join(2.0)
+    assert sorted(reg.loaded()) == sorted([tr, en])
+
+
+def test_set_language_switches_between_utterances(tmp_path, monkeypatch):
+    tr, en = _dirs(tmp_path, "tr", "en")
+
+    class FakeKaldi:
+        def __init__(self, model, sr):
+            self.model = model
+
+        def FinalResult(self):
+            return '{"text": ""}'
+
+    monkeypatch.setattr(recognizer_mod, "KaldiRecognizer", FakeKaldi)
+    loader = SlowLoader(0)
+    reg = ModelRegistry(loader=loader)
+    rec = Recognizer({"language": "tr", "language_models": {"tr": tr, "en": en}}, registry=reg)
+    rec._ensure_model()
+    first = rec._rec
+    rec.set_language("en")
+    assert rec._rec is first  # still decoding Turkish until the next safe point
+    rec._maybe_switch()
+    assert rec._rec.model == ("model", en)
+    rec.set_language("tr")
+    rec._maybe_switch()
+    assert rec._rec.model is first.model
+    assert loader.calls == [tr, en]
+
+
+def test_models_in_use_are_not_evicted(tmp_path, monkeypatch):
+    tr, en, de = _dirs(tmp_path, "tr", "en", "de")
+
+    class FakeKaldi:
+        def __init__(self, model, sr):
+            self.model = model
+
+        def FinalResult(self):
+            return '{"text": ""}'
+
+    monkeypatch.setattr(recognizer_mod, "KaldiRecognizer", FakeKaldi)
+    loader = SlowLoader(0)
+    reg = ModelRegistry(budget_mb=100, loader=loader, sizer=lambda p: 60.0)
+    a = Recognizer({"language": "tr", "language_models": {"tr": tr, "en": en, "de": de}}, registry=reg)
+    b = Recognizer({"language": "en", "language_models": {"tr": tr, "en": en, "de": de}}, registry=reg)
+    a._ensure_model()
+    b._ensure_model()
+    # over budget, but both models are decoding: nothing is dropped or reloaded
+    assert sorted(reg.loaded()) == sorted([tr, en]) and reg.evictions == 0
+    b.set_language("tr")
+    assert reg.stats()["models"][en]["users"] == 1  # still decoding English until the swap
+    b._maybe_switch()
+    assert reg.loaded() == [tr] and reg.evictions == 1  # English released and evicted
+    assert b._rec.model is a._rec.model
+    a.set_language("de")
+    a.set_language("tr")  # superseded before the swap: "de" is unpinned again
+    a._maybe_switch()
+    assert reg.stats()["models"][tr]["users"] == 2
+    assert loader.calls == [tr, en, de]
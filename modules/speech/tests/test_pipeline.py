@@ -0,0 +1,77 @@
+import threading
+import time
+
+import numpy as np
+
+from modules.speech.services.frames import FrameProcessor
+from modules.speech.services.pipeline import LatencyHistogram, SpeechPipeline
+
+
+def _chunk(value, n=480):
+    return np.full((n, 2), value, dtype=np.int16).tobytes()
+
+
+def test_fanout_shares_frames():
+    pl = SpeechPipeline(FrameProcessor(2), capacity=8)
+    a, b = pl.subscribe("asr"), pl.subscribe("recorder")
+    published = [pl.publish_chunk(_chunk(i)) for i in range(3)]
+    got_a = [a.get(0) for _ in range(3)]
+    got_b = [b.get(0) for _ in range(3)]
+    assert all(x is y for x, y in zip(got_a, published))
+    assert all(x is y for x, y in zip(got_b, published))
+    assert a.get(0) is None
+
+
+def test_slow_reader_drops_oldest_and_counts():
+    pl = SpeechPipeline(FrameProcessor(2), capacity=4)
+    slow = pl.subscribe("asr")
+    for i in range(10):
+        pl.publish_chunk(_chunk(i))
+    first = slow.get(0)
+    assert slow.dropped == 6
+    assert first.pcm[0, 0] == 6
+    st = pl.stats()["stages"]["asr"]
+    assert st["dropped"] == 6 and st["lag"] == 3
+
+
+def test_worker_runs_and_stop_ends_iteration():
+    pl = SpeechPipeline(FrameProcessor(2), capacity=16)
+    seen = []
+    done = threading.Event()
+
+    def fn(frame):
+        seen.append(frame.rms)
+        if len(seen) == 5:
+            done.set()
+
+    pl.add_worker("doa", fn)
+    reader = pl.subscribe("asr")
+    for i in range(5):
+        pl.publish_chunk(_chunk(100 * (i + 1)))
+    assert done.wait(2.0)
+    pl.stop()
+    assert len(list(reader)) == 5  # drains what was published, then ends
+    assert seen == [100.0, 200.0, 300.0, 400.0, 500.0]
+    assert pl.stats()["stages"]["doa"]["service_ms"]["count"] == 5
+
+
+def test_latency_histogram_percentiles():
+    h = LatencyHistogram()
+    for ms in [0.5] * 90 + [30.0] * 9 + [5000.0]:
+        h.observe(ms)
+    snap = h.snapshot()
+    assert snap["count"] == 100
+    assert snap["p50_ms"] == 1.0
+    assert snap["p95_ms"] == 50.0
+    assert snap["p99_ms"] == 50.0
+    assert snap["max_ms"] == 5000.0
+    assert snap["buckets"][">2000"] == 1
+
+
+def test_wait_histogram_tracks_capture_to_dequeue():
+    pl = SpeechPipeline(FrameProcessor(2), capacity=4)
+    r = pl.subscribe("asr")
+    pl.publish_chunk(_chunk(1))
+    time.sleep(0.03)
+    r.get(0)
+    assert r.wait.max_ms >= 25.0
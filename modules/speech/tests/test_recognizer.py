@@ -0,0 +1,116 @@
+import json
+
+from modules.speech.services.recognizer import Recognizer
+
+SR = 16000
+CHUNK = SR * 3 // 100 * 2  # 30 ms int16 mono
+SILENCE = b"\x00" * CHUNK
+SPEECH = b"\x10\x10" * (CHUNK // 2)
+
+
+class FakeVad:
+    def __init__(self):
+        self.calls = 0
+
+    def is_speech(self, frame, sr):
+        self.calls += 1
+        return frame[:1] != b"\x00"
+
+
+class FakeKaldi:
+    """Records fed audio; 'text' is the number of speech chunks seen since Reset."""
+
+    def __init__(self):
+        self.fed = []
+        self.resets = 0
+        self.partial_calls = 0
+
+    def AcceptWaveform(self, data):
+        self.fed.append(data)
+        return False
+
+    def _words(self):
+        return sum(d.count(b"\x10") for d in self.fed) // CHUNK
+
+    def PartialResult(self):
+        self.partial_calls += 1
+        return json.dumps({"partial": f"w{self._words()}"})
+
+    def FinalResult(self):
+        return json.dumps({"text": f"utt{self._words()}"})
+
+    def Result(self):
+        return self.FinalResult()
+
+    def Reset(self):
+        self.fed = []
+        self.resets += 1
+
+
+def _recognizer(**vad):
+    cfg = {"samplerate": SR, "partial_interval_ms": 0, "vad": {"enabled": True, "hangover_ms": 90, "preroll_ms": 60, **vad}}
+    rec = Recognizer(cfg)
+    rec._rec, rec._vad = FakeKaldi(), FakeVad()
+    return rec
+
+
+def test_endpointing_preroll_reset_and_metrics():
+    rec = _recognizer()
+    kaldi = rec._rec
+    stream = [SILENCE] * 10 + [SPEECH] * 3 + [SILENCE] * 4 + [SILENCE] * 10 + [SPEECH] * 2 + [SILENCE] * 4
+    out = list(rec.run(stream))
+    finals = [r.text for r in out if r.is_final]
+    assert finals == ["utt3", "utt2"]
+    assert kaldi.resets == 2
+    # first decode of an utterance carries the pre-roll (60 ms = 2 chunks) ahead of the onset
+    st = rec.stats()
+    assert st["mode"] == "endpointing" and st["utterances"] == 2
+    assert st["skipped"] == 10 + 1 + 10 + 1  # leading silence + the chunk after each hangover
+    assert st["last_utterance"]["audio_s"] == 0.06 + 0.06 + 0.09
+
+
+def test_preroll_is_fed_before_onset():
+    rec = _recognizer()
+    fed_first = []
+    kaldi = rec._rec
+    orig = kaldi.AcceptWaveform
+
+    def spy(data):
+        if not fed_first:
+            fed_first.append(data)
+        return orig(data)
+
+    kaldi.AcceptWaveform = spy
+    list(rec.run([SILENCE] * 5 + [SPEECH] + [SILENCE] * 4))
+    assert fed_first[0] == SILENCE * 2 + SPEECH
+
+
+def test_partials_are_throttled_and_deduplicated():
+    rec = _recognizer(enabled=False)
+    rec._vad = None
+    rec.cfg.partial_interval_ms = 10_000
+    out = list(rec.run([SPEECH] * 20))
+    assert [r.text for r in out] == ["w1"]
+    assert rec._rec.partial_calls == 1
+    assert rec.stats()["partials_suppressed"] == 19
+
+
+def test_single_vad_call_per_30ms_chunk():
+    rec = _recognizer()
+    list(rec.run([SILENCE] * 7))
+    assert rec._vad.calls == 7
+
+
+def test_language_switch_waits_for_the_utterance_in_continuous_mode():
+    rec = _recognizer(enabled=False)
+    rec._vad = None
+    old, new = rec._rec, FakeKaldi()
+    rec._next_rec = new
+    # a switch requested mid-utterance: the words heard so far stay with the old model
+    rec._last_partial = "w2"
+    out = list(rec.run([SPEECH] * 2))
+    assert rec._rec is old and len(old.fed) == 2
+    rec._last_partial = ""  # the utterance ended with a final result
+    out = list(rec.run([SPEECH]))
+    assert rec._rec is new and new.fed == [SPEECH]
+    assert out[0].is_final and out[0].text == "utt2"  # the old recognizer's tail, finished before the swap
@@ -0,0 +1,13 @@
+from modules.speech.xSpeechService import SpeechService
+
+
+def test_health_flags_a_listener_that_ended_without_stop():
+    svc = SpeechService()
+    assert svc.health() == {"ok": True, "listening": False}
+
+    svc.start = lambda on_result=None: None  # e.g. the model or the device failed to open
+    svc.start_background()
+    svc._worker.join(2.0)
+    assert svc.health()["ok"] is False
+    svc.stop()
+    assert svc.health()["ok"] is True
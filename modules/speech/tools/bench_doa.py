@@ -0,0 +1,80 @@
+"""Test bench: DoA accuracy and CPU cost on synthetic fractional delays.
+
+A noise source is placed at known azimuths; the right channel is the left
+one delayed by the matching (fractional) number of samples, plus independent
+sensor noise. Reports mean absolute error in degrees and CPU milliseconds per
+second of audio for the previous per-frame GCC-PHAT and for the streaming
+estimator (single frame, sliding window, batched).
+Usage: python -m modules.speech.tools.bench_doa [snr_db]
+"""
+from __future__ import annotations
+
+import math
+import sys
+import time
+
+import numpy as np
+
+from modules.speech.services.direction import ArrayGeometry, DirectionEstimator
+
+FS = 16000
+FRAME = 480  # 30 ms
+
+
+def delayed_pair(angle_deg: float, seconds: float, snr_db: float, geom: ArrayGeometry, seed: int = 0) -> np.ndarray:
+    """(frames, FRAME, 2) float32 stereo where R lags L by the delay of `angle_deg`."""
+    rng = np.random.default_rng(seed)
+    n = int(seconds * FS)
+    src = rng.normal(0, 3000, n)
+    delay = -math.sin(math.radians(angle_deg)) * geom.mic_distance_m / geom.sound_speed * FS
+    spec = np.fft.rfft(src)
+    shifted = np.fft.irfft(spec * np.exp(-2j * np.pi * np.arange(spec.size) * delay / n), n)
+    noise = 3000 / (10 ** (snr_db / 20))
+    left = src + rng.normal(0, noise, n)
+    right = shifted + rng.normal(0, noise, n)
+    frames = n // FRAME
+    return np.stack([left, right], axis=1)[: frames * FRAME].reshape(frames, FRAME, 2).astype(np.float32)
+
+
+def legacy_estimate(ch: np.ndarray, geom: ArrayGeometry) -> float:
+    """The per-frame estimator this bench replaces (integer lags, full irfft)."""
+    max_delay = int(geom.mic_distance_m / geom.sound_speed * FS)
+    sig, ref = ch[:, 0], ch[:, 1]
+    n = sig.shape[0] + ref.shape[0]
+    r = np.fft.rfft(sig, n=n) * np.conj(np.fft.rfft(ref, n=n))
+    r /= np.abs(r) + 1e-15
+    cc = np.fft.irfft(r, n=n)
+    cc = np.concatenate((cc[-max_delay:], cc[: max_delay + 1]))
+    delay = max(-max_delay, min(max_delay, np.argmax(np.abs(cc)) - max_delay))
+    return math.degrees(math.asin(max(-1.0, min(1.0, delay / FS * geom.sound_speed / geom.mic_distance_m))))
+
+
+def main(snr_db: float = 10.0, seconds: float = 3.0) -> None:
+    geom = ArrayGeometry()
+    angles = [-60.0, -40.0, -20.0, -7.5, 0.0, 7.5, 20.0, 40.0, 60.0]
+    cases = [(a, delayed_pair(a, seconds, snr_db, geom, seed=i)) for i, a in enumerate(angles)]
+    audio_s = seconds * len(cases)
+
+    def run(label, fn):
+        errs = []
+        start = time.process_time()
+        for angle, frames in cases:
+            errs.extend(abs(e - angle) for e in fn(frames))
+        cpu = time.process_time() - start
+        print(f"{label:<22} MAE {np.mean(errs):6.2f} deg   CPU {cpu / audio_s * 1000:7.2f} ms per s of audio")
+
+    run("legacy per-frame", lambda fr: [legacy_estimate(f, geom) for f in fr])
+    def streaming(window_frames):
+        def fn(fr):
+            est = DirectionEstimator(FS, geom, window_frames=window_frames)
+            return [est.estimate_channels(f) for f in fr]
+        return fn
+
+    run("streaming window=1", streaming(1))
+    run("streaming window=4", streaming(4))
+    run("batched window=4", lambda fr: DirectionEstimator(FS, geom, window_frames=4).estimate_batch(fr))
+    print(f"SNR {snr_db:.0f} dB, {len(angles)} azimuths x {seconds:.0f} s, 30 ms frames @ {FS} Hz")
+
+
+if __name__ == "__main__":
+    main(float(sys.argv[1]) if len(sys.argv) > 1 else 10.0)
@@ -0,0 +1,78 @@
+"""Benchmark: per-chunk energy gate + downmix, struct loop vs FrameProcessor.
+
+Feeds synthetic 30 ms stereo int16 chunks (the default capture format) and
+reports microseconds per chunk and the real-time factor (processing time /
+audio time; < 1.0 keeps up with the microphones). The "+doa" rows add the
+GCC-PHAT estimate that runs on every gated chunk.
+Usage: python -m modules.speech.tools.bench_frames [seconds_of_audio]
+"""
+from __future__ import annotations
+
+import math
+import struct
+import sys
+import time
+
+import numpy as np
+
+from modules.speech.services.direction import DirectionEstimator
+from modules.speech.services.frames import FrameProcessor
+
+try:
+    import audioop  # removed in Python 3.13; only used for the legacy column
+except Exception:
+    audioop = None
+
+
+def legacy_frame(chunk: bytes, channels: int) -> tuple:
+    count = len(chunk) // 2
+    vals = struct.unpack("<" + "h" * count, chunk[:count * 2])
+    step = 2 if channels >= 2 else 1
+    acc = 0.0
+    n = 0
+    for i in range(0, len(vals), step):
+        acc += vals[i] * vals[i]
+        n += 1
+    rms = math.sqrt(acc / n) if n else 0.0
+    mono = audioop.tomono(chunk, 2, 1.0, 0.0) if audioop is not None else chunk[0::4] + chunk[1::4]
+    return rms, mono
+
+
+def make_chunks(seconds: float, fs: int = 16000, frame_ms: int = 30) -> list:
+    rng = np.random.default_rng(0)
+    n = int(fs * frame_ms / 1000)
+    out = []
+    for _ in range(int(seconds * 1000 / frame_ms)):
+        left = rng.normal(0, 3000, n)
+        right = np.roll(left, 2) + rng.normal(0, 300, n)
+        out.append(np.stack([left, right], axis=1).clip(-32768, 32767).astype("<i2").tobytes())
+    return out
+
+
+def run(label: str, fn, chunks: list, audio_s: float) -> None:
+    start = time.perf_counter()
+    for c in chunks:
+        fn(c)
+    dt = time.perf_counter() - start
+    print(f"{label:<18} {dt / len(chunks) * 1e6:9.1f} us/chunk   RTF {dt / audio_s:.4f}")
+
+
+def main(seconds: float = 60.0) -> None:
+    fs, channels = 16000, 2
+    chunks = make_chunks(seconds, fs)
+    proc = FrameProcessor(channels, "left")
+    doa = DirectionEstimator(fs)
+    print(f"{len(chunks)} chunks x 30 ms stereo ({seconds:.0f} s of audio)")
+    run("legacy", lambda c: legacy_frame(c, channels), chunks, seconds)
+    run("numpy", proc.process, chunks, seconds)
+    run("legacy+doa", lambda c: (legacy_frame(c, channels), doa.estimate(c)), chunks, seconds)
+
+    def numpy_doa(c: bytes) -> None:
+        frame = proc.process(c)
+        doa.estimate_channels(frame.channels_f32())
+
+    run("numpy+doa", numpy_doa, chunks, seconds)
+
+
+if __name__ == "__main__":
+    main(float(sys.argv[1]) if len(sys.argv) > 1 else 60.0)
@@ -1,18 +1,21 @@
 from __future__ import annotations
 import argparse
 import logging
+import threading
+import time
 from threading import Event
-try:
-    import audioop
-except Exception:
-    audioop = None
-    # Don't fail import; we'll degrade direction/downmix functionality and log at runtime.
-from typing import Optional, Callable, Iterable
+from typing import Optional, Callable, Iterable, List
+
+import numpy as np
+import requests
 
+from modules.eventbus import BargeIn, get_bus
 from modules.speech.config_loader import load_config
 from modules.speech.services.audio_capture import AudioCapture
 from modules.speech.services.recognizer import Recognizer, RecognitionResult
-from modules.speech.services.direction import DirectionEstimator
+from modules.speech.services.direction import ArrayGeometry, DirectionEstimator
+from modules.speech.services.frames import AudioFrame, FrameProcessor
+from modules.speech.services.pipeline import RingReader, SpeechPipeline
 from modules.speech.services.pan_tilt import PanTiltController
 from fastapi import FastAPI
 from typing import TYPE_CHECKING
@@ -37,114 +40,162 @@ class SpeechService:
         self._stop_event = Event()
         self.capture = AudioCapture(self.cfg.get("audio", {}))
         self.recognizer = Recognizer(self.cfg.get("recognition", {}))
+        models_cfg = (self.cfg.get("recognition", {}) or {}).get("models", {}) or {}
+        if models_cfg.get("preload"):
+            # models are process-wide: a gateway mount warms them once for every recognizer
+            self.recognizer.preload(models_cfg["preload"], background=bool(models_cfg.get("preload_background", True)))
+        self.frames = FrameProcessor(
+            self.capture.cfg.channels, str(self.cfg.get("audio", {}).get("downmix", "left"))
+        )
         # Direction estimator (optional, needs stereo)
         dir_cfg = self.cfg.get("direction", {})
         self.direction_enabled = bool(dir_cfg.get("enabled", False)) and self.capture.cfg.channels >= 2
-        self._direction = DirectionEstimator(self.capture.cfg.samplerate) if self.direction_enabled else None
+        self._direction = DirectionEstimator(
+            self.capture.cfg.samplerate,
+            ArrayGeometry(mic_distance_m=float(dir_cfg.get("mic_distance_m", 0.06))),
+            window_frames=int(dir_cfg.get("window_frames", 4)),
+            interp=int(dir_cfg.get("interp", 4)),
+        ) if self.direction_enabled else None
+        self._dir_batch = max(1, int(dir_cfg.get("batch_frames", 4)))
         self._last_angle = None
+        self._dir_ctrl = (dir_cfg or {}).get("control", {}) or {}
+        self._dir_last_out: Optional[float] = None
+        self._dir_last_ts: Optional[float] = None
+        pl_cfg = self.cfg.get("pipeline", {}) or {}
+        self.pipeline = SpeechPipeline(self.frames, capacity=int(pl_cfg.get("ring_frames", 100)))
         # Pan-tilt controller (optional)
         pt_cfg = self.cfg.get("pan_tilt", {})
         self._pan = PanTiltController(pt_cfg, sender=self._send_pan)
         self._tracking = False
+        bi_cfg = self.cfg.get("barge_in", {}) or {}
+        self._barge_in_url = str(bi_cfg.get("url") or "http://localhost:8080/speak/barge_in") if bi_cfg.get("enabled") else None
+        self._barge_in_gap = float(bi_cfg.get("min_interval_s", 1.0))
+        self._barge_in_last = 0.0
+        self._worker: Optional[threading.Thread] = None
 
     def start(self, on_result: Optional[Callable[[RecognitionResult], None]] = None) -> None:
-        """Start capturing and recognition in the same thread using a generator pipeline.
+        """Capture, DoA and recognition as decoupled stages; blocks running the ASR stage.
 
-        For production, consider running capture in its own thread and feeding a queue.
+        The audio callback publishes decoded frames into the pipeline ring; DoA
+        runs on its own worker thread and Vosk consumes the ring from this thread,
+        so a long decode only makes the ASR cursor lag (see `pipeline_stats`).
         """
         self._stop_event.clear()
-        stream: Iterable[bytes] = self.capture.stream()
-        for result in self.recognizer.run(self._direction_wrapper(stream)):
-            if on_result:
-                on_result(result)
-            if self._stop_event.is_set():
-                break
-
-    def _direction_wrapper(self, stream):
-        if not self._direction:
-            yield from stream
+        self._dir_last_out = self._dir_last_ts = None
+        self.pipeline.start()
+        if self._direction:
+            self._direction.reset()
+            self.pipeline.add_worker("doa", self._update_direction, max_batch=self._dir_batch)
+        asr = self.pipeline.subscribe("asr")
+        try:
+            for result in self.recognizer.run(self._asr_stream(asr)):
+                if result.text:
+                    self._barge_in()
+                if on_result:
+                    on_result(result)
+                if self._stop_event.is_set():
+                    break
+        finally:
+            self.capture.sink = None
+            self.pipeline.stop()
+
+    def _asr_stream(self, reader: RingReader) -> Iterable[bytes]:
+        # capture starts on the first pull, after the recognizer loaded its model
+        self.capture.sink = self.pipeline.publish_chunk
+        self.capture.start()
+        for frame in reader:
+            yield frame.mono
+
+    def _barge_in(self) -> None:
+        """User is talking: ask the speak module to stop the phrase it is playing."""
+        now = time.monotonic()
+        if self._barge_in_url is None or now - self._barge_in_last < self._barge_in_gap:
+            return
+        self._barge_in_last = now
+        get_bus().publish(
+            BargeIn(source="speech"),
+            fallback=lambda: threading.Thread(target=self._post_barge_in, daemon=True).start(),
+        )
+
+    def _post_barge_in(self) -> None:
+        try:
+            requests.post(self._barge_in_url, timeout=0.5)
+        except Exception as e:
+            logger.debug(f"Barge-in request failed: {e}")
+
+    def set_language(self, language: str) -> str:
+        """Switch ASR language; cached models are reused, the switch applies between utterances."""
+        return self.recognizer.set_language(language)
+
+    def subscribe(self, name: str) -> RingReader:
+        """Extra consumer of the live audio (wakeword, recorder...); yields shared `AudioFrame`s."""
+        return self.pipeline.subscribe(name)
+
+    def pipeline_stats(self) -> dict:
+        st = self.pipeline.stats()
+        st["capture"] = self.capture.stats()
+        return st
+
+    def _update_direction(self, frames: List[AudioFrame]) -> None:
+        ctrl = self._dir_ctrl
+        energy_th = float(ctrl.get("energy_threshold", 0.0))
+        voiced = [f for f in frames if f.samples and not (energy_th and f.rms < energy_th)]
+        if not voiced:
             return
-        # Control parameters
-        ctrl = (self.cfg.get("direction", {}) or {}).get("control", {})
         invert = bool(ctrl.get("invert_direction", False))
         deadband = float(ctrl.get("deadband_deg", 0.0))
         alpha = float(ctrl.get("smoothing_alpha", 0.0))
         slew = float(ctrl.get("slew_deg_per_s", 0.0))
-        energy_th = float(ctrl.get("energy_threshold", 0.0))
-        last_out = None
-        last_ts = None
-        for chunk in stream:
-            try:
-                # Energy gate (RMS)
-                import math, time
-                # 16-bit PCM
-                rms = 0.0
-                if len(chunk) >= 2:
-                    import struct
-                    count = len(chunk) // 2
-                    if count:
-                        vals = struct.unpack('<' + 'h'*count, chunk[:count*2])
-                        # use mono mix for energy
-                        step = 2 if self.capture.cfg.channels >= 2 else 1
-                        acc = 0.0
-                        n = 0
-                        for i in range(0, len(vals), step):
-                            acc += (vals[i])*(vals[i])
-                            n += 1
-                        if n:
-                            rms = math.sqrt(acc / n)
-
-                if energy_th and rms < energy_th:
-                    # energy too low; don't update angle
-                    pass
-                else:
-                    angle = self._direction.estimate(chunk)
-                    if invert:
-                        angle = -angle
-                    # deadband vs last_out
-                    if last_out is not None and abs(angle - last_out) < deadband:
-                        angle = last_out
-                    # smoothing
-                    if last_out is not None and 0.0 < alpha < 1.0:
-                        angle = alpha * angle + (1 - alpha) * last_out
-                    # slew-rate limit
-                    now = time.time()
-                    if last_out is not None and last_ts is not None and slew > 0:
-                        dt = max(1e-3, now - last_ts)
-                        max_step = slew * dt
-                        if abs(angle - last_out) > max_step:
-                            angle = last_out + (max_step if angle > last_out else -max_step)
-                    self._last_angle = angle
-                    # if tracking, map to absolute pan angle
-                    if self._tracking:
-                        center = float(self.cfg.get("pan_tilt", {}).get("center_deg", 90.0))
-                        target = center + angle
-                        self._pan.set_target(target)
-                    last_out = angle
-                    last_ts = time.time()
-            except Exception:
-                pass
-            # Downmix to mono for recognizer if input is stereo
-            if self.capture.cfg.channels >= 2:
-                try:
-                    if audioop is not None:
-                        mono = audioop.tomono(chunk, 2, 1.0, 0.0)
-                    else:
-                        mono = chunk
-                except Exception:
-                    mono = chunk
-                yield mono
-            else:
-                yield chunk
+        last_out, last_ts = self._dir_last_out, self._dir_last_ts
+        if len({f.samples for f in voiced}) > 1:
+            voiced = voiced[-1:]
+        # one FFT call for everything pending; the newest estimate already
+        # integrates the older frames through the estimator's sliding window
+        block = np.stack([f.pcm for f in voiced]).astype(np.float32)
+        angle = float(self._direction.estimate_batch(block)[-1])
+        if invert:
+            angle = -angle
+        # deadband vs last_out
+        if last_out is not None and abs(angle - last_out) < deadband:
+            angle = last_out
+        # smoothing
+        if last_out is not None and 0.0 < alpha < 1.0:
+            angle = alpha * angle + (1 - alpha) * last_out
+        # slew-rate limit
+        now = time.time()
+        if last_out is not None and last_ts is not None and slew > 0:
+            dt = max(1e-3, now - last_ts)
+            max_step = slew * dt
+            if abs(angle - last_out) > max_step:
+                angle = last_out + (max_step if angle > last_out else -max_step)
+        self._last_angle = angle
+        # if tracking, map to absolute pan angle
+        if self._tracking:
+            center = float(self.cfg.get("pan_tilt", {}).get("center_deg", 90.0))
+            self._pan.set_target(center + angle)
+        self._dir_last_out, self._dir_last_ts = angle, now
 
     def start_background(self, on_result: Optional[Callable[[RecognitionResult], None]] = None) -> None:
-        import threading
         t = threading.Thread(target=self.start, kwargs={"on_result": on_result}, daemon=True)
+        self._worker = t
         t.start()
 
+    def health(self, stall_s: float = 2.0) -> dict:
+        """Idle is healthy; while listening, audio callbacks must keep arriving."""
+        worker = self._worker
+        if worker is None or not worker.is_alive():
+            # a worker that ended without stop() died on an error (no model, no device...)
+            return {"ok": worker is None or self._stop_event.is_set(), "listening": False}
+        if not self.capture.running:
+            return {"ok": True, "listening": False, "state": "starting"}
+        last = self.capture.last_frame_at
+        age = None if last is None else round(time.monotonic() - last, 3)
+        return {"ok": age is not None and age <= stall_s, "listening": True, "audio_age_s": age}
+
     def stop(self) -> None:
         self._stop_event.set()
         self.capture.stop()
+        self.pipeline.stop()
 
     def listen_once(self, timeout_sec: float = 5.0) -> Optional[RecognitionResult]:
         """Listen until first final result or timeout."""
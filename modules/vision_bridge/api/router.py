@@ -12,15 +12,27 @@ except (ImportError, ModuleNotFoundError):
         # Fallback for script execution where relative import fails
         from services.stub import xArduinoSerialService  # type: ignore
 
+try:
+    from modules.eventbus import UserInteraction, get_bus  # type: ignore
+except ImportError:
+    get_bus = None
+
 # Shared singleton to avoid re-creating serial per request (fallback only)
 _ardu_singleton: Optional[xArduinoSerialService] = None
 
-def _notify_autonomy():
+def _post_autonomy():
     try:
         requests.post("http://localhost:8080/autonomy/interaction", timeout=0.1)
     except Exception:
         pass
 
+def _notify_autonomy():
+    # runs as a background task already, so the HTTP fallback may block here
+    if get_bus is None:
+        _post_autonomy()
+        return
+    get_bus().publish(UserInteraction(source="vision"), fallback=_post_autonomy)
+
 def _get_or_create_ardu() -> xArduinoSerialService:
     global _ardu_singleton
     if _ardu_singleton is None:
@@ -103,6 +115,24 @@ def get_router(processor: Any, ardu: Optional[xArduinoSerialService] = None) ->
         from fastapi.responses import StreamingResponse
         return StreamingResponse(processor.generate_frames(), media_type="multipart/x-mixed-replace; boundary=frame")
 
+    @r.get("/video_feed/stats", tags=["stream"], summary="Per-client annotated stream stats")
+    def video_feed_stats():
+        if not processor or getattr(processor, "streams", None) is None:
+            return {"active": []}
+        return {"active": processor.streams.snapshot(), "total_opened": processor.streams.total_opened}
+
+    @r.get("/health", tags=["control"], summary="Inference/capture thread liveness")
+    def health():
+        if not processor:
+            return {"ok": True, "processor": False}
+        return processor.health()
+
+    @r.get("/outbound", tags=["remote"], summary="Outbound HTTP queue counters per target")
+    def outbound_stats():
+        if not processor:
+            raise HTTPException(status_code=503, detail="Vision processor not initialized")
+        return {"targets": processor.outbound.stats()}
+
     @r.get("/results/latest", tags=["remote"], summary="Get last cached detections")
     def latest_results(limit: int = 10):
         if not processor:
@@ -113,6 +143,15 @@ def get_router(processor: Any, ardu: Optional[xArduinoSerialService] = None) ->
             results = results[:limit]
         return {"results": results, "count": len(processor.latest_results)}
 
+    @r.get("/tracks", tags=["remote"], summary="Active tracks and face re-id counters")
+    def tracks():
+        if not processor:
+            raise HTTPException(status_code=503, detail="Vision processor not initialized")
+        tracker = getattr(processor, "tracker", None)
+        if tracker is None:
+            return {"tracks": [], "stats": None}
+        return {"tracks": tracker.snapshot(), "stats": tracker.stats()}
+
     @r.post("/results", tags=["remote"], summary="Ingest remote detection results")
     def ingest_results(request: Request, payload: dict):
         """External processor posts detection results.
@@ -156,7 +195,18 @@ def get_router(processor: Any, ardu: Optional[xArduinoSerialService] = None) ->
         """List known faces."""
         if not processor or not processor.face_manager:
             return {"faces": []}
-        return {"faces": processor.face_manager.known_face_names}
+        fm = processor.face_manager
+        return {"faces": fm.known_face_names, "gallery": fm.gallery.stats()}
+
+    @r.delete("/faces/{name}", tags=["faces"], summary="Forget a known face")
+    def delete_face(name: str):
+        """Remove all embeddings of a person and compact the face store."""
+        if not processor or not processor.face_manager:
+            raise HTTPException(status_code=501, detail="Face recognition not available")
+        removed = processor.face_manager.remove_face(name)
+        if not removed:
+            raise HTTPException(status_code=404, detail=f"Unknown face: {name}")
+        return {"ok": True, "removed": removed}
 
     @r.post("/memory/chat", tags=["memory"], summary="Append chat to person's memory")
     def memory_chat(person: str, text: str, role: str = "assistant"):
@@ -179,4 +229,18 @@ def get_router(processor: Any, ardu: Optional[xArduinoSerialService] = None) ->
             raise HTTPException(status_code=503, detail="Vision processor not initialized")
         return {"people": processor.memory.list_people()}
 
+    @r.get("/memory/recent", tags=["memory"], summary="Recent chats of a person")
+    def memory_recent(person: str, limit: int = 20):
+        if not processor:
+            raise HTTPException(status_code=503, detail="Vision processor not initialized")
+        mem = processor.memory
+        return {"person": person, "last_seen": mem.last_seen(person), "chats": mem.recent_chats(person, limit)}
+
+    @r.get("/memory/last_seen", tags=["memory"], summary="People ordered by last seen")
+    def memory_last_seen(since: Optional[float] = None, limit: Optional[int] = None):
+        if not processor:
+            raise HTTPException(status_code=503, detail="Vision processor not initialized")
+        seen = processor.memory.people_by_last_seen(since=since, limit=limit)
+        return {"people": [{"person": p, "last_seen": ts} for p, ts in seen]}
+
     return r
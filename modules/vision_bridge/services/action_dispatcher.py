@@ -2,7 +2,7 @@ from __future__ import annotations
 """LLM action dispatch helper for Vision Bridge."""
 
 import logging
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 
 import requests
 
@@ -15,12 +15,17 @@ logger = logging.getLogger("vision_bridge.actions")
 
 
 class VisionActionDispatcher:
-    """Parses semantic descriptions and forwards action tags to Autonomy."""
+    """Parses semantic descriptions and forwards action tags to Autonomy.
 
-    def __init__(self, endpoint: str, timeout: float = 1.5, enabled: bool = False) -> None:
+    With an `outbound` dispatcher the POST is queued (a newer scene replaces a
+    queued one); without it the call is made inline.
+    """
+
+    def __init__(self, endpoint: str, timeout: float = 1.5, enabled: bool = False, outbound: Optional[Any] = None) -> None:
         self.endpoint = (endpoint or "").strip()
         self.timeout = timeout
         self.enabled = enabled and bool(self.endpoint)
+        self.outbound = outbound
 
     def emit_scene(self, semantic_describer, results: List[Dict[str, Any]]) -> None:
         if not self.enabled or not results or semantic_describer is None:
@@ -44,6 +49,9 @@ class VisionActionDispatcher:
             "actions": parsed,
             "speak": False,
         }
+        if self.outbound is not None:
+            self.outbound.post("actions", self.endpoint, payload, timeout=self.timeout, coalesce_key="scene")
+            return
         try:
             requests.post(self.endpoint, json=payload, timeout=self.timeout)
         except Exception as exc:  # pragma: no cover - network
@@ -0,0 +1,164 @@
+"""Contiguous face-embedding gallery with batched nearest-neighbour lookup.
+
+All known encodings live in one float32 matrix (rows may share a name, so a
+person can have several embeddings). Identification of every face in a frame is
+a single distance computation against the matrix. Past `ann_threshold` rows an
+inverted-file index (k-means coarse quantiser, numpy only) narrows the search
+to the `nprobe` closest clusters.
+"""
+from __future__ import annotations
+
+import threading
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+UNKNOWN = "Unknown"
+
+
+class _IVFIndex:
+    def __init__(self, data: np.ndarray, nlist: int, iters: int = 8, seed: int = 0) -> None:
+        rng = np.random.default_rng(seed)
+        n = data.shape[0]
+        nlist = max(1, min(nlist, n))
+        self.centroids = data[rng.choice(n, size=nlist, replace=False)].copy()
+        assign = np.zeros(n, dtype=np.int64)
+        for _ in range(iters):
+            assign = _sq_dists(data, self.centroids).argmin(axis=1)
+            sums = np.zeros_like(self.centroids)
+            np.add.at(sums, assign, data)
+            counts = np.bincount(assign, minlength=nlist).astype(np.float32)
+            nonempty = counts > 0
+            self.centroids[nonempty] = sums[nonempty] / counts[nonempty, None]
+        order = np.argsort(assign, kind="stable")
+        bounds = np.searchsorted(assign[order], np.arange(nlist + 1))
+        self.lists = [order[bounds[i]:bounds[i + 1]] for i in range(nlist)]
+
+    def candidates(self, queries: np.ndarray, nprobe: int) -> List[np.ndarray]:
+        nprobe = max(1, min(nprobe, len(self.lists)))
+        near = np.argpartition(_sq_dists(queries, self.centroids), nprobe - 1, axis=1)[:, :nprobe]
+        return [np.concatenate([self.lists[c] for c in row]) for row in near.tolist()]
+
+
+def _sq_dists(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Squared euclidean distances (m, n) via the |a|^2 + |b|^2 - 2ab expansion."""
+    d = (a * a).sum(axis=1)[:, None] + (b * b).sum(axis=1)[None, :] - 2.0 * (a @ b.T)
+    np.maximum(d, 0.0, out=d)
+    return d
+
+
+class FaceGallery:
+    def __init__(self, dim: int = 128, ann_threshold: int = 4000, nprobe: int = 8) -> None:
+        self.dim = dim
+        self.ann_threshold = int(ann_threshold)
+        self.nprobe = int(nprobe)
+        self._lock = threading.RLock()
+        self._data = np.empty((64, dim), dtype=np.float32)
+        self._sq_norms = np.empty(64, dtype=np.float32)
+        self._n = 0
+        self._names: List[str] = []
+        self._index: Optional[_IVFIndex] = None
+        self._index_n = 0
+
+    def __len__(self) -> int:
+        return self._n
+
+    @property
+    def matrix(self) -> np.ndarray:
+        """(n, dim) float32 view of all embeddings."""
+        return self._data[: self._n]
+
+    @property
+    def names(self) -> List[str]:
+        return list(self._names)
+
+    def people(self) -> List[str]:
+        return list(dict.fromkeys(self._names))
+
+    def embeddings_of(self, name: str) -> np.ndarray:
+        with self._lock:
+            rows = [i for i, n in enumerate(self._names) if n == name]
+            return self.matrix[rows].copy()
+
+    def set(self, names: Sequence[str], matrix: np.ndarray) -> None:
+        """Replace the gallery contents in one go (used by loaders).
+
+        A float32 matrix is kept as given, so the store's read-only memmap is
+        not copied into RAM; the first `add` moves it into a growable buffer.
+        """
+        matrix = np.asarray(matrix, dtype=np.float32).reshape(-1, self.dim)
+        with self._lock:
+            self._data = matrix
+            self._sq_norms = np.einsum("ij,ij->i", matrix, matrix)
+            self._n = matrix.shape[0]
+            self._names = list(names)
+            self._index = None
+
+    def add(self, name: str, encoding: np.ndarray) -> int:
+        """Append one embedding (amortised O(1)); returns its row."""
+        vec = np.asarray(encoding, dtype=np.float32).reshape(self.dim)
+        with self._lock:
+            if self._n == self._data.shape[0] or not self._data.flags.writeable:
+                grow = max(64, self._n * 2)
+                data = np.empty((grow, self.dim), dtype=np.float32)
+                data[: self._n] = self._data[: self._n]
+                norms = np.empty(grow, dtype=np.float32)
+                norms[: self._n] = self._sq_norms[: self._n]
+                self._data, self._sq_norms = data, norms
+            row = self._n
+            self._data[row] = vec
+            self._sq_norms[row] = float(vec @ vec)
+            self._names.append(name)
+            self._n += 1
+            return row
+
+    def _maybe_index(self) -> Optional[_IVFIndex]:
+        if self._n < self.ann_threshold:
+            return None
+        # rebuild once the gallery grew 10% since the last build
+        if self._index is None or self._n > self._index_n * 1.1:
+            self._index = _IVFIndex(self.matrix, nlist=int(np.sqrt(self._n)))
+            self._index_n = self._n
+        return self._index
+
+    def nearest(self, encodings: np.ndarray) -> tuple:
+        """Best row and distance for each query: (rows (m,), distances (m,))."""
+        q = np.asarray(encodings, dtype=np.float32).reshape(-1, self.dim)
+        with self._lock:
+            if self._n == 0 or q.shape[0] == 0:
+                return np.full(q.shape[0], -1, dtype=np.int64), np.full(q.shape[0], np.inf, dtype=np.float32)
+            index = self._maybe_index()
+            data = self.matrix
+            q_sq = (q * q).sum(axis=1)
+            if index is None:
+                d = q_sq[:, None] + self._sq_norms[None, : self._n] - 2.0 * (q @ data.T)
+                rows = d.argmin(axis=1)
+                best = d[np.arange(len(rows)), rows]
+            else:
+                # rows added after the last build are always searched exhaustively
+                tail = np.arange(self._index_n, self._n)
+                rows = np.empty(q.shape[0], dtype=np.int64)
+                best = np.empty(q.shape[0], dtype=np.float32)
+                for i, cand in enumerate(index.candidates(q, self.nprobe)):
+                    cand = np.concatenate([cand, tail]) if tail.size else cand
+                    d = q_sq[i] + self._sq_norms[cand] - 2.0 * (data[cand] @ q[i])
+                    j = int(d.argmin())
+                    rows[i], best[i] = cand[j], d[j]
+            return rows, np.sqrt(np.maximum(best, 0.0))
+
+    def identify(self, encodings: np.ndarray, tolerance: float = 0.6) -> List[str]:
+        """Names for each query encoding (UNKNOWN when no row is within `tolerance`)."""
+        rows, dist = self.nearest(encodings)
+        names = self._names
+        return [names[r] if r >= 0 and d <= tolerance else UNKNOWN for r, d in zip(rows.tolist(), dist.tolist())]
+
+    def stats(self) -> Dict[str, object]:
+        return {
+            "embeddings": self._n,
+            "people": len(set(self._names)),
+            "ann": self._index is not None,
+            "ann_threshold": self.ann_threshold,
+        }
+
+
+__all__ = ["FaceGallery", "UNKNOWN"]
@@ -5,52 +5,79 @@ import logging
 import numpy as np
 from typing import Dict, List, Optional, Tuple
 
+try:
+    from .face_gallery import FaceGallery, UNKNOWN
+    from .face_store import FaceStore
+except ImportError:
+    from services.face_gallery import FaceGallery, UNKNOWN
+    from services.face_store import FaceStore
+
 logger = logging.getLogger("vision_bridge.face_manager")
 
 class FaceManager:
-    def __init__(self, data_dir: str = "data"):
+    def __init__(self, data_dir: str = "data", ann_threshold: int = 4000):
         self.data_dir = data_dir
-        self.faces_file = os.path.join(data_dir, "faces.json")
-        self.known_face_encodings: List[np.ndarray] = []
-        self.known_face_names: List[str] = []
+        self.faces_file = os.path.join(data_dir, "faces.bin")
+        self.legacy_faces_file = os.path.join(data_dir, "faces.json")
+        # one contiguous float32 matrix; a name may own several rows
+        self.gallery = FaceGallery(ann_threshold=ann_threshold)
         
         self._ensure_data_dir()
+        self.store = FaceStore(self.faces_file, dim=self.gallery.dim)
         self.load_faces()
 
+    @property
+    def known_face_names(self) -> List[str]:
+        return self.gallery.people()
+
+    @property
+    def known_face_encodings(self) -> np.ndarray:
+        return self.gallery.matrix
+
     def _ensure_data_dir(self):
         if not os.path.exists(self.data_dir):
             os.makedirs(self.data_dir)
 
     def load_faces(self):
-        """Load known faces from JSON file."""
-        if not os.path.exists(self.faces_file):
-            logger.info("No existing faces file found.")
+        """Load known faces from the binary store (migrating faces.json once)."""
+        if not self.store.exists():
+            if os.path.exists(self.legacy_faces_file):
+                self._migrate_json()
+            else:
+                logger.info("No existing faces file found.")
             return
 
         try:
-            with open(self.faces_file, 'r') as f:
+            names, matrix = self.store.load()
+            # the gallery keeps the read-only memmap; the first register copies it
+            self.gallery.set(names, matrix)
+            logger.info(f"Loaded {len(self.gallery)} encodings for {len(self.known_face_names)} known faces.")
+        except Exception as e:
+            logger.error(f"Failed to load faces: {e}")
+
+    def _migrate_json(self):
+        try:
+            with open(self.legacy_faces_file, 'r') as f:
                 data = json.load(f)
-            
-            self.known_face_names = []
-            self.known_face_encodings = []
-            
-            for name, encoding_list in data.items():
-                self.known_face_names.append(name)
-                self.known_face_encodings.append(np.array(encoding_list))
-            
-            logger.info(f"Loaded {len(self.known_face_names)} known faces.")
+
+            names: List[str] = []
+            rows: List[np.ndarray] = []
+            for name, encodings in data.items():
+                # {name: [128 floats]} (old) or {name: [[128 floats], ...]}
+                arr = np.asarray(encodings, dtype=np.float32).reshape(-1, self.gallery.dim)
+                names.extend([name] * arr.shape[0])
+                rows.append(arr)
+            matrix = np.concatenate(rows) if rows else np.empty((0, self.gallery.dim), dtype=np.float32)
+            self.gallery.set(names, matrix)
+            self.store.compact(names, matrix)
+            logger.info(f"Migrated {len(names)} encodings from {self.legacy_faces_file} to {self.faces_file}.")
         except Exception as e:
             logger.error(f"Failed to load faces: {e}")
 
     def save_faces(self):
-        """Save known faces to JSON file."""
-        data = {}
-        for name, encoding in zip(self.known_face_names, self.known_face_encodings):
-            data[name] = encoding.tolist()
-        
+        """Rewrite the store from the in-memory gallery (atomic compaction)."""
         try:
-            with open(self.faces_file, 'w') as f:
-                json.dump(data, f)
+            self.store.compact(self.gallery.names, self.gallery.matrix)
             logger.info("Faces saved successfully.")
         except Exception as e:
             logger.error(f"Failed to save faces: {e}")
@@ -72,31 +99,36 @@ class FaceManager:
             
         new_encoding = face_encodings[0]
         
-        # Check if already exists (optional, maybe update?)
-        # For now, just append
-        self.known_face_names.append(name)
-        self.known_face_encodings.append(new_encoding)
-        self.save_faces()
+        # Re-registering a known name adds another embedding for that person
+        try:
+            self.store.append(name, new_encoding)
+        except Exception as e:
+            logger.error(f"Failed to save face {name}: {e}")
+            return False
+        self.gallery.add(name, new_encoding)
         logger.info(f"Registered new face: {name}")
         return True
 
+    def remove_face(self, name: str) -> int:
+        """Drop every embedding of `name`; returns how many were removed."""
+        names = self.gallery.names
+        keep = [i for i, n in enumerate(names) if n != name]
+        removed = len(names) - len(keep)
+        if removed:
+            kept_names = [names[i] for i in keep]
+            matrix = self.gallery.matrix[keep].copy()
+            self.gallery.set(kept_names, matrix)
+            self.save_faces()
+        return removed
+
     def identify_face(self, face_encoding: np.ndarray, tolerance: float = 0.6) -> str:
         """Identify a face encoding against known faces."""
-        if not self.known_face_encodings:
-            return "Unknown"
-
-        matches = face_recognition.compare_faces(self.known_face_encodings, face_encoding, tolerance=tolerance)
-        name = "Unknown"
-
-        # If a match was found in known_face_encodings, just use the first one.
-        if True in matches:
-            first_match_index = matches.index(True)
-            name = self.known_face_names[first_match_index]
-            
-            # Or use the one with the smallest distance
-            face_distances = face_recognition.face_distance(self.known_face_encodings, face_encoding)
-            best_match_index = np.argmin(face_distances)
-            if matches[best_match_index]:
-                name = self.known_face_names[best_match_index]
+        return self.identify_faces([face_encoding], tolerance)[0]
 
-        return name
+    def identify_faces(self, face_encodings, tolerance: float = 0.6) -> List[str]:
+        """Identify all faces of a frame with one batched distance computation."""
+        if len(face_encodings) == 0:
+            return []
+        if not len(self.gallery):
+            return [UNKNOWN] * len(face_encodings)
+        return self.gallery.identify(np.asarray(face_encodings, dtype=np.float32), tolerance)
@@ -0,0 +1,117 @@
+"""Binary, append-only on-disk store for face embeddings.
+
+One file of fixed-size records after a 16-byte header::
+
+    header  b"SBFACE1\\0" | dim (uint32) | name_bytes (uint32)
+    record  name (name_bytes, UTF-8, NUL padded) | encoding (dim x float32 LE)
+
+Registration appends a single record (O(1), no rewrite). Loading memory-maps
+the file as a numpy structured array, so a large gallery is read without
+parsing. A torn trailing record from an interrupted append is ignored on load
+and dropped by the next compaction. `compact` writes a temp file and swaps it
+in with `os.replace`, so readers see either the old or the new file.
+"""
+from __future__ import annotations
+
+import logging
+import os
+import struct
+import threading
+from typing import List, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger("vision_bridge.face_store")
+
+MAGIC = b"SBFACE1\0"
+_HEADER = struct.Struct("<8sII")
+
+
+class FaceStore:
+    def __init__(self, path: str, dim: int = 128, name_bytes: int = 64) -> None:
+        self.path = path
+        self.dim = int(dim)
+        self.name_bytes = int(name_bytes)
+        self._lock = threading.Lock()
+        self._dtype = self._record_dtype(self.dim, self.name_bytes)
+
+    @staticmethod
+    def _record_dtype(dim: int, name_bytes: int) -> np.dtype:
+        return np.dtype([("name", f"S{name_bytes}"), ("enc", "<f4", (dim,))])
+
+    def exists(self) -> bool:
+        return os.path.exists(self.path)
+
+    def _encode_name(self, name: str) -> bytes:
+        raw = name.encode("utf-8")
+        if not raw or len(raw) > self.name_bytes or b"\0" in raw:
+            raise ValueError(f"face name must be 1..{self.name_bytes} UTF-8 bytes without NUL")
+        return raw
+
+    def _read_header(self, f) -> None:
+        magic, dim, name_bytes = _HEADER.unpack(f.read(_HEADER.size))
+        if magic != MAGIC:
+            raise ValueError(f"{self.path}: not a face store")
+        if dim != self.dim:
+            raise ValueError(f"{self.path}: dim {dim} != {self.dim}")
+        if name_bytes != self.name_bytes:
+            self.name_bytes = name_bytes
+            self._dtype = self._record_dtype(self.dim, name_bytes)
+
+    def load(self) -> Tuple[List[str], np.ndarray]:
+        """Return (names, (n, dim) float32 view) backed by a read-only memmap."""
+        with self._lock:
+            if not self.exists():
+                return [], np.empty((0, self.dim), dtype=np.float32)
+            with open(self.path, "rb") as f:
+                self._read_header(f)
+            size = os.path.getsize(self.path) - _HEADER.size
+            n, torn = divmod(size, self._dtype.itemsize)
+            if torn:
+                logger.warning(f"{self.path}: ignoring {torn} bytes of a partial record")
+            if n == 0:
+                return [], np.empty((0, self.dim), dtype=np.float32)
+            mm = np.memmap(self.path, dtype=self._dtype, mode="r", offset=_HEADER.size, shape=(n,))
+            names = [raw.decode("utf-8") for raw in mm["name"].tolist()]
+            return names, mm["enc"]
+
+    def append(self, name: str, encoding: np.ndarray) -> None:
+        """Append one embedding record and fsync it."""
+        rec = np.zeros(1, dtype=self._dtype)
+        rec["name"] = self._encode_name(name)
+        rec["enc"] = np.asarray(encoding, dtype=np.float32).reshape(self.dim)
+        with self._lock:
+            new = not self.exists() or os.path.getsize(self.path) < _HEADER.size
+            with open(self.path, "r+b" if not new else "wb") as f:
+                if new:
+                    f.write(_HEADER.pack(MAGIC, self.dim, self.name_bytes))
+                else:
+                    f.seek(0)
+                    self._read_header(f)
+                    size = os.path.getsize(self.path) - _HEADER.size
+                    # overwrite a torn tail instead of appending after it
+                    f.seek(_HEADER.size + size - size % self._dtype.itemsize)
+                f.write(rec.tobytes())
+                f.truncate()
+                f.flush()
+                os.fsync(f.fileno())
+
+    def compact(self, names: Sequence[str], matrix: np.ndarray) -> None:
+        """Atomically replace the store with exactly `names` / `matrix` rows."""
+        matrix = np.asarray(matrix, dtype=np.float32).reshape(-1, self.dim)
+        if len(names) != matrix.shape[0]:
+            raise ValueError("names and matrix length differ")
+        recs = np.zeros(len(names), dtype=self._dtype)
+        recs["name"] = [self._encode_name(n) for n in names]
+        recs["enc"] = matrix
+        tmp = self.path + ".tmp"
+        with self._lock:
+            with open(tmp, "wb") as f:
+                f.write(_HEADER.pack(MAGIC, self.dim, self.name_bytes))
+                f.write(recs.tobytes())
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, self.path)
+
+
+__all__ = ["FaceStore"]
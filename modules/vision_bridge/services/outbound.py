@@ -0,0 +1,191 @@
+"""Asynchronous outbound HTTP for vision side effects (speak, autonomy, interactions).
+
+The inference loop only enqueues; a worker thread per target drains its own
+bounded queue over a shared keep-alive `requests.Session`, so a slow endpoint
+delays its own messages but never detection or the other targets. Order is
+kept within a target (a greeting is spoken before its follow-up).
+
+- When a target queue is full the oldest message is dropped.
+- Messages with a `coalesce_key` replace a still-queued message with the same
+  key (a newer scene description supersedes the old one).
+"""
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Callable, Deque, Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger("vision_bridge.outbound")
+
+
+@dataclass
+class _Message:
+    url: str
+    json: Any
+    timeout: float
+    coalesce_key: Optional[str] = None
+    on_response: Optional[Callable[[Any], None]] = None
+    enqueued: float = field(default_factory=time.monotonic)
+
+
+class _TargetStats:
+    def __init__(self) -> None:
+        self.sent = 0
+        self.failed = 0
+        self.dropped = 0
+        self.coalesced = 0
+        self.latency_ms = 0.0  # EMA of request round trip
+        self.wait_ms = 0.0  # EMA of time spent queued
+        self.last_error: Optional[str] = None
+
+    def observe(self, wait_ms: float, latency_ms: float) -> None:
+        if self.sent + self.failed <= 1:
+            self.wait_ms, self.latency_ms = wait_ms, latency_ms
+        else:
+            self.wait_ms = 0.8 * self.wait_ms + 0.2 * wait_ms
+            self.latency_ms = 0.8 * self.latency_ms + 0.2 * latency_ms
+
+
+class _Target:
+    def __init__(self, name: str, max_queue: int) -> None:
+        self.name = name
+        self.queue: Deque[_Message] = deque()
+        self.max_queue = max_queue
+        self.cond = threading.Condition()
+        self.stats = _TargetStats()
+        self.busy = False
+        self.thread: Optional[threading.Thread] = None
+
+
+class OutboundDispatcher:
+    def __init__(self, max_queue: int = 32, pool_size: int = 4) -> None:
+        self.max_queue = max(1, int(max_queue))
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self._session.mount("http://", adapter)
+        self._session.mount("https://", adapter)
+        self._targets: Dict[str, _Target] = {}
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def _target(self, name: str) -> _Target:
+        with self._lock:
+            t = self._targets.get(name)
+            if t is None:
+                t = _Target(name, self.max_queue)
+                t.thread = threading.Thread(target=self._worker, args=(t,), name=f"outbound-{name}", daemon=True)
+                self._targets[name] = t
+                t.thread.start()
+            return t
+
+    def post(
+        self,
+        target: str,
+        url: str,
+        json: Any,
+        timeout: float = 1.5,
+        coalesce_key: Optional[str] = None,
+        on_response: Optional[Callable[[Any], None]] = None,
+    ) -> None:
+        """Queue a JSON POST; never blocks on the network.
+
+        `on_response` runs on the worker thread with the decoded JSON body of a
+        2xx response.
+        """
+        if self._closed:
+            return
+        t = self._target(target)
+        msg = _Message(url, json, float(timeout), coalesce_key, on_response)
+        with t.cond:
+            if coalesce_key is not None:
+                for i, queued in enumerate(t.queue):
+                    if queued.coalesce_key == coalesce_key:
+                        msg.enqueued = queued.enqueued
+                        t.queue[i] = msg
+                        t.stats.coalesced += 1
+                        return
+            if len(t.queue) >= t.max_queue:
+                t.queue.popleft()
+                t.stats.dropped += 1
+            t.queue.append(msg)
+            t.cond.notify()
+
+    def _worker(self, t: _Target) -> None:
+        while True:
+            with t.cond:
+                while not t.queue and not self._closed:
+                    t.cond.wait()
+                if not t.queue:
+                    return
+                msg = t.queue.popleft()
+                t.busy = True
+            start = time.monotonic()
+            body = None
+            try:
+                resp = self._session.post(msg.url, json=msg.json, timeout=msg.timeout)
+                ok = 200 <= resp.status_code < 300
+                if ok and msg.on_response is not None:
+                    body = resp.json()
+                error = None if ok else f"HTTP {resp.status_code}"
+            except Exception as exc:
+                error = str(exc) or type(exc).__name__
+            end = time.monotonic()
+            with t.cond:
+                t.busy = False
+                if error is None:
+                    t.stats.sent += 1
+                else:
+                    t.stats.failed += 1
+                    t.stats.last_error = error
+                t.stats.observe((start - msg.enqueued) * 1000.0, (end - start) * 1000.0)
+                t.cond.notify_all()
+            if error is not None:
+                logger.debug("Outbound %s to %s failed: %s", t.name, msg.url, error)
+            elif body is not None:
+                try:
+                    msg.on_response(body)
+                except Exception as exc:
+                    logger.error(f"Outbound {t.name} callback failed: {exc}")
+
+    def drain(self, timeout: float = 5.0) -> bool:
+        """Wait until every queue is empty and idle (used on shutdown and in tests)."""
+        deadline = time.monotonic() + timeout
+        for t in list(self._targets.values()):
+            with t.cond:
+                if not t.cond.wait_for(lambda: not t.queue and not t.busy, timeout=max(0.0, deadline - time.monotonic())):
+                    return False
+        return True
+
+    def close(self, timeout: float = 2.0) -> None:
+        self.drain(timeout)
+        self._closed = True
+        for t in list(self._targets.values()):
+            with t.cond:
+                t.cond.notify_all()
+        self._session.close()
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        out: Dict[str, Dict[str, Any]] = {}
+        for name, t in list(self._targets.items()):
+            with t.cond:
+                s = t.stats
+                out[name] = {
+                    "queued": len(t.queue),
+                    "sent": s.sent,
+                    "failed": s.failed,
+                    "dropped": s.dropped,
+                    "coalesced": s.coalesced,
+                    "latency_ms": round(s.latency_ms, 1),
+                    "queue_wait_ms": round(s.wait_ms, 1),
+                    "last_error": s.last_error,
+                }
+        return out
+
+
+__all__ = ["OutboundDispatcher"]
@@ -1,49 +1,239 @@
 from __future__ import annotations
+import bisect
 import json
 import os
+import threading
 import time
-from typing import Dict, List, Any, Optional
+from collections import deque
+from typing import Dict, List, Any, Optional, Tuple
 
 class PeopleMemory:
     """Kişi bazlı sohbet geçmişi ve son özet hafızası.
 
-    Basit JSON dosyasına yazar. DryCode: tek sorumluluk, küçük API.
+    Yazmalar bellekte uygulanır ve arka plan iş parçacığı ile toplu olarak
+    `people_memory.jsonl` günlüğüne eklenir (write-behind). Günlük büyüyünce
+    tam görüntü `people_memory.json` dosyasına atomik olarak yazılır ve günlük
+    sıfırlanır. Kişi başına en fazla `max_chats` sohbet tutulur; taşanlar
+    `rollup` sayacına katlanır. `last_seen` değerleri yazma sırasında sıralı
+    bir dizinde tutulur; `people_by_last_seen` her sorguda sıralama yapmaz.
     """
 
-    def __init__(self, data_dir: str = "data", filename: str = "people_memory.json"):
+    def __init__(
+        self,
+        data_dir: str = "data",
+        filename: str = "people_memory.json",
+        flush_interval_s: float = 1.0,
+        max_chats: int = 500,
+        compact_bytes: int = 1_000_000,
+    ):
         self.path = os.path.join(data_dir, filename)
+        self.journal_path = os.path.splitext(self.path)[0] + ".jsonl"
+        self.flush_interval_s = float(flush_interval_s)
+        self.max_chats = max(1, int(max_chats))
+        self.compact_bytes = int(compact_bytes)
         self.data: Dict[str, Any] = {}
+        self._by_seen: List[Tuple[float, str]] = []  # (last_seen, person), ascending
+        self._lock = threading.RLock()
+        self._io_lock = threading.Lock()
+        self._pending: List[Dict[str, Any]] = []
+        # set_summary is called every blind-mode interval: keep only the newest per person
+        self._pending_summaries: Dict[str, Dict[str, Any]] = {}
+        self._seq = 0  # last journal sequence applied to `data`
+        self._wake = threading.Event()
+        self._closed = False
+        self.flushes = 0
         os.makedirs(data_dir, exist_ok=True)
         self._load()
+        self._thread = threading.Thread(target=self._flush_loop, name="people-memory", daemon=True)
+        self._thread.start()
 
+    # Persistence --------------------------------------------------------
     def _load(self):
         if os.path.exists(self.path):
             try:
                 with open(self.path, "r", encoding="utf-8") as f:
-                    self.data = json.load(f)
+                    raw = json.load(f)
+                meta = raw.pop("_meta", None) if isinstance(raw, dict) else None
+                self._seq = int((meta or {}).get("seq", 0))
+                for person, rec in raw.items():
+                    self.data[person] = rec = self._normalize(rec)
+                    if rec["last_seen"] is not None:
+                        bisect.insort(self._by_seen, (rec["last_seen"], person))
             except Exception:
                 self.data = {}
+                self._by_seen = []
+        if os.path.exists(self.journal_path):
+            try:
+                with open(self.journal_path, "r", encoding="utf-8") as f:
+                    for line in f:
+                        try:
+                            entry = json.loads(line)
+                        except ValueError:
+                            continue  # torn last line
+                        if int(entry.get("seq", 0)) > self._seq:
+                            self._apply(entry)
+                            self._seq = int(entry["seq"])
+            except Exception:
+                pass
+
+    def _normalize(self, rec: Dict[str, Any]) -> Dict[str, Any]:
+        chats = rec.get("chats") or []
+        out = {
+            "chats": deque(),
+            "last_summary": rec.get("last_summary"),
+            "last_seen": rec.get("last_seen"),
+            "rollup": rec.get("rollup"),
+        }
+        for c in chats:
+            self._push_chat(out, c)
+        return out
+
+    def _record(self, person: str) -> Dict[str, Any]:
+        rec = self.data.get(person)
+        if rec is None:
+            rec = {"chats": deque(), "last_summary": None, "last_seen": None, "rollup": None}
+            self.data[person] = rec
+        return rec
+
+    def _push_chat(self, rec: Dict[str, Any], chat: Dict[str, Any]):
+        chats = rec["chats"]
+        chats.append(chat)
+        while len(chats) > self.max_chats:
+            old = chats.popleft()
+            roll = rec.get("rollup") or {"count": 0, "first_ts": old.get("ts"), "last_ts": None, "roles": {}}
+            roll["count"] += 1
+            roll["last_ts"] = old.get("ts")
+            role = old.get("role", "?")
+            roll["roles"][role] = roll["roles"].get(role, 0) + 1
+            rec["rollup"] = roll
+
+    def _apply(self, entry: Dict[str, Any]):
+        rec = self._record(entry["p"])
+        if entry["op"] == "chat":
+            self._push_chat(rec, {"ts": entry["ts"], "role": entry["role"], "text": entry["text"]})
+            self._mark_seen(entry["p"], rec, entry["ts"])
+        elif entry["op"] == "summary":
+            rec["last_summary"] = {"ts": entry["ts"], "text": entry["text"]}
+
+    def _mark_seen(self, person: str, rec: Dict[str, Any], ts: float):
+        old = rec["last_seen"]
+        if old is not None:
+            i = bisect.bisect_left(self._by_seen, (old, person))
+            if i < len(self._by_seen) and self._by_seen[i] == (old, person):
+                del self._by_seen[i]
+        rec["last_seen"] = ts
+        # timestamps only grow, so this is an append in practice
+        bisect.insort(self._by_seen, (ts, person))
+
+    def _flush_loop(self):
+        while not self._closed:
+            self._wake.wait(self.flush_interval_s)
+            self._wake.clear()
+            self.flush()
 
-    def _save(self):
-        try:
-            with open(self.path, "w", encoding="utf-8") as f:
-                json.dump(self.data, f, ensure_ascii=False, indent=2)
-        except Exception:
-            pass
+    def flush(self):
+        """Append pending entries to the journal; compact when it grew large."""
+        with self._io_lock:
+            with self._lock:
+                batch = self._pending + list(self._pending_summaries.values())
+                self._pending = []
+                self._pending_summaries = {}
+                if not batch:
+                    return
+                batch.sort(key=lambda e: e["seq"])
+            try:
+                with open(self.journal_path, "a", encoding="utf-8") as f:
+                    f.write("".join(json.dumps(e, ensure_ascii=False) + "\n" for e in batch))
+                self.flushes += 1
+                if os.path.getsize(self.journal_path) >= self.compact_bytes:
+                    self._compact()
+            except Exception:
+                pass
+
+    def _compact(self):
+        with self._lock:
+            snapshot = {
+                person: {
+                    "chats": list(rec["chats"]),
+                    "last_summary": rec["last_summary"],
+                    "last_seen": rec["last_seen"],
+                    "rollup": rec["rollup"],
+                }
+                for person, rec in self.data.items()
+            }
+            seq = self._seq
+        snapshot["_meta"] = {"seq": seq}
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(snapshot, f, ensure_ascii=False)
+        os.replace(tmp, self.path)
+        # every entry <= seq is in the snapshot (later flushes of those are skipped
+        # on replay); a crash before this truncate is harmless
+        open(self.journal_path, "w").close()
+
+    def close(self):
+        self._closed = True
+        self._wake.set()
+        self._thread.join(timeout=2.0)
+        self.flush()
+
+    # Write API ------------------------------------------------------------
+    def _enqueue(self, entry: Dict[str, Any]) -> Dict[str, Any]:
+        self._seq += 1
+        entry["seq"] = self._seq
+        self._apply(entry)
+        return entry
 
     def append_chat(self, person: str, role: str, text: str):
-        rec = self.data.setdefault(person, {"chats": [], "last_summary": None, "last_seen": None})
-        rec["chats"].append({"ts": time.time(), "role": role, "text": text})
-        rec["last_seen"] = time.time()
-        self._save()
+        with self._lock:
+            self._pending.append(self._enqueue({"op": "chat", "p": person, "ts": time.time(), "role": role, "text": text}))
+        if len(self._pending) >= 256:
+            self._wake.set()
 
     def set_summary(self, person: str, summary: str):
-        rec = self.data.setdefault(person, {"chats": [], "last_summary": None, "last_seen": None})
-        rec["last_summary"] = {"ts": time.time(), "text": summary}
-        self._save()
+        with self._lock:
+            rec = self.data.get(person)
+            if rec and (rec.get("last_summary") or {}).get("text") == summary:
+                return
+            self._pending_summaries[person] = self._enqueue({"op": "summary", "p": person, "ts": time.time(), "text": summary})
 
+    # Query API ------------------------------------------------------------
     def get_person(self, person: str) -> Optional[Dict[str, Any]]:
-        return self.data.get(person)
+        with self._lock:
+            rec = self.data.get(person)
+            if rec is None:
+                return None
+            return {
+                "chats": list(rec["chats"]),
+                "last_summary": rec["last_summary"],
+                "last_seen": rec["last_seen"],
+                "rollup": rec["rollup"],
+            }
 
     def list_people(self) -> List[str]:
-        return list(self.data.keys())
+        with self._lock:
+            return list(self.data.keys())
+
+    def last_seen(self, person: str) -> Optional[float]:
+        with self._lock:
+            rec = self.data.get(person)
+            return rec["last_seen"] if rec else None
+
+    def recent_chats(self, person: str, limit: int = 20) -> List[Dict[str, Any]]:
+        with self._lock:
+            rec = self.data.get(person)
+            if not rec or limit <= 0:
+                return []
+            chats = rec["chats"]
+            start = max(0, len(chats) - limit)
+            return [chats[i] for i in range(start, len(chats))]
+
+    def people_by_last_seen(self, since: Optional[float] = None, limit: Optional[int] = None) -> List[Tuple[str, float]]:
+        """(person, last_seen) pairs, most recent first."""
+        with self._lock:
+            idx = self._by_seen
+            lo = 0 if since is None else bisect.bisect_left(idx, (since,))
+            if limit:
+                lo = max(lo, len(idx) - limit)
+            window = idx[lo:]
+        return [(p, ts) for ts, p in reversed(window)]
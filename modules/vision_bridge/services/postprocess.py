@@ -0,0 +1,141 @@
+"""Vectorized YOLO post-processing shared by the live loop and snapshots.
+
+Works on whole box tensors at once (classes / confidences / xyxy as numpy
+arrays) instead of touching every `box` object, and keeps index arrays so face
+recognition output maps straight back to result rows.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Pinhole estimate used since the first version: distance = H_person * f / h_px
+PERSON_HEIGHT_M = 1.7
+FOCAL_PX = 600.0
+
+_label_tables: Dict[int, Tuple[Any, np.ndarray, int]] = {}
+
+
+def _label_table(names: Any) -> Tuple[np.ndarray, int]:
+    """(class-id -> label array, person class id or -1), cached per `model.names` object."""
+    cached = _label_tables.get(id(names))
+    if cached is not None and cached[0] is names:
+        return cached[1], cached[2]
+    if isinstance(names, dict):
+        size = (max(names) + 1) if names else 0
+        table = np.array([str(names.get(i, i)) for i in range(size)], dtype=object)
+    else:
+        table = np.array([str(n) for n in names], dtype=object)
+    hits = np.flatnonzero(table == "person")
+    person_id = int(hits[0]) if hits.size else -1
+    _label_tables[id(names)] = (names, table, person_id)
+    return table, person_id
+
+
+def _as_numpy(t: Any) -> np.ndarray:
+    if hasattr(t, "cpu"):
+        t = t.cpu()
+    if hasattr(t, "numpy"):
+        return t.numpy()
+    return np.asarray(t)
+
+
+@dataclass
+class Detections:
+    cls: np.ndarray  # (n,) int
+    conf: np.ndarray  # (n,) float32
+    xyxy: np.ndarray  # (n, 4) float32
+    labels: np.ndarray  # (n,) object
+    distance: np.ndarray  # (n,) float64, nan where unknown
+    person_idx: np.ndarray  # row indices of person detections
+
+    def __len__(self) -> int:
+        return int(self.cls.shape[0])
+
+    def face_locations(self, rows: Optional[np.ndarray] = None) -> List[Tuple[int, int, int, int]]:
+        """Boxes of `rows` (default: all people) as face_recognition (top, right, bottom, left)."""
+        b = self.xyxy[self.person_idx if rows is None else rows].astype(np.int32)
+        return list(map(tuple, b[:, [1, 2, 3, 0]].tolist()))
+
+    def to_results(self) -> List[Dict[str, Any]]:
+        dist = np.round(self.distance, 2).tolist()
+        return [
+            {
+                "label": lbl,
+                "confidence": c,
+                "bbox": box,
+                "distance_m": d if d == d else None,  # nan -> None
+                "name": "Unknown",
+            }
+            for lbl, c, box, d in zip(self.labels.tolist(), self.conf.tolist(), self.xyxy.tolist(), dist)
+        ]
+
+
+def estimate_distance(xyxy: np.ndarray, mask: np.ndarray) -> np.ndarray:
+    """Per-row distance in metres for rows in `mask` with positive height, else nan."""
+    h = xyxy[:, 3].astype(np.float64) - xyxy[:, 1]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        d = (PERSON_HEIGHT_M * FOCAL_PX) / h
+    return np.where(mask & (h > 0), d, np.nan)
+
+
+def from_arrays(cls: Any, conf: Any, xyxy: Any, names: Any) -> Detections:
+    cls = np.asarray(cls, dtype=np.int64).reshape(-1)
+    conf = np.asarray(conf, dtype=np.float32).reshape(-1)
+    xyxy = np.asarray(xyxy, dtype=np.float32).reshape(-1, 4)
+    table, person_id = _label_table(names)
+    if cls.size and 0 <= cls.min() and cls.max() < table.size:
+        labels = table[cls]
+    else:
+        labels = np.array([str(table[c]) if 0 <= c < table.size else str(c) for c in cls.tolist()], dtype=object)
+    person = cls == person_id
+    return Detections(
+        cls=cls,
+        conf=conf,
+        xyxy=xyxy,
+        labels=labels,
+        distance=estimate_distance(xyxy, person),
+        person_idx=np.flatnonzero(person),
+    )
+
+
+def from_ultralytics(results: Sequence[Any], names: Any) -> Detections:
+    """Flatten ultralytics `Results` into one Detections batch."""
+    cls_parts, conf_parts, box_parts = [], [], []
+    for r in results:
+        boxes = getattr(r, "boxes", None)
+        if boxes is None or len(boxes) == 0:
+            continue
+        cls_parts.append(_as_numpy(boxes.cls))
+        conf_parts.append(_as_numpy(boxes.conf))
+        box_parts.append(_as_numpy(boxes.xyxy))
+    if not cls_parts:
+        return from_arrays(np.empty(0), np.empty(0), np.empty((0, 4)), names)
+    if len(cls_parts) == 1:  # the usual single-image case: no concatenate copy
+        return from_arrays(cls_parts[0], conf_parts[0], box_parts[0], names)
+    return from_arrays(
+        np.concatenate(cls_parts),
+        np.concatenate(conf_parts),
+        np.concatenate(box_parts),
+        names,
+    )
+
+
+def apply_names(results: List[Dict[str, Any]], rows: np.ndarray, names: Sequence[Optional[str]]) -> None:
+    """Write recognised names back onto result rows (rows[i] <- names[i])."""
+    for row, name in zip(rows.tolist(), names):
+        if not name:
+            continue
+        results[row]["name"] = name
+        results[row]["label"] = name  # label doubles as display text
+
+
+__all__ = [
+    "Detections",
+    "estimate_distance",
+    "from_arrays",
+    "from_ultralytics",
+    "apply_names",
+]
@@ -2,7 +2,6 @@ import cv2
 import time
 import threading
 import logging
-import requests
 import numpy as np
 from ultralytics import YOLO
 from typing import List, Dict, Any, Optional, Generator
@@ -33,6 +32,32 @@ try:
     from .action_dispatcher import VisionActionDispatcher
 except ImportError:
     from services.action_dispatcher import VisionActionDispatcher
+try:
+    from .outbound import OutboundDispatcher
+except ImportError:
+    from services.outbound import OutboundDispatcher
+try:
+    from .postprocess import from_ultralytics, apply_names
+except ImportError:
+    from services.postprocess import from_ultralytics, apply_names
+try:
+    from .tracker import Tracker
+except ImportError:
+    from services.tracker import Tracker
+
+# Shared raw frame bus fed by the camera module (same process only)
+try:
+    from modules.camera.services.frame_bus import FrameBus, get_frame_bus
+    from modules.camera.services.capture import FramePublisher
+    from modules.camera.services.streaming import StreamRegistry, mjpeg_stream
+except Exception:
+    get_frame_bus = None
+
+# In-process event bus when mounted in the gateway next to speak/interactions
+try:
+    from modules.eventbus import InteractionEvent, SpeakRequest, get_bus
+except Exception:
+    get_bus = None
 
 class VisionProcessor:
     def __init__(self, config: Dict[str, Any]):
@@ -41,6 +66,7 @@ class VisionProcessor:
         self.processing_mode = vision_cfg.get("processing_mode", "local")  # local | remote
         self.model_path = vision_cfg.get("model_path", "yolov8n.pt")
         self.camera_source = vision_cfg.get("camera_source", 0)
+        self.frame_source = str(vision_cfg.get("frame_source", "auto")).lower()  # auto | bus | device
         self.conf_threshold = vision_cfg.get("confidence_threshold", 0.5)
 
         self.model = None
@@ -55,7 +81,8 @@ class VisionProcessor:
 
         self.face_manager = None
         if FACE_REC_AVAILABLE and self.processing_mode == "local":
-            self.face_manager = FaceManager()
+            faces_cfg = vision_cfg.get("faces", {})
+            self.face_manager = FaceManager(ann_threshold=int(faces_cfg.get("ann_threshold", 4000)))
         
         self._stop_event = threading.Event()
         self._capture_thread: Optional[threading.Thread] = None
@@ -66,36 +93,117 @@ class VisionProcessor:
         self.last_blind_announcement = 0.0
         self.last_alert_announcement = 0.0
         self._last_person_greet: Dict[str, float] = {}
+        self._greeted_tracks: set = set()
+
+        # Track IDs across frames; face identity is cached per track
+        trk_cfg = vision_cfg.get("tracker", {})
+        self.tracker: Optional[Tracker] = None
+        if trk_cfg.get("enabled", True):
+            self.tracker = Tracker(
+                iou_threshold=float(trk_cfg.get("iou_threshold", 0.3)),
+                max_age=int(trk_cfg.get("max_age", 15)),
+                reid_iou=float(trk_cfg.get("reid_iou", 0.5)),
+                reverify_s=float(trk_cfg.get("reverify_s", 5.0)),
+            )
         
         # Shared state
         self._frame_lock = threading.Lock()
         self._latest_raw_frame: Optional[Any] = None
         self._latest_annotated_frame: Optional[bytes] = None
+        self._bus = get_frame_bus() if get_frame_bus is not None else None
+        # Annotated frames get their own private bus: encoded lazily, streamed event-driven
+        self._annotated_pub = FramePublisher(bus=FrameBus(capacity=2)) if get_frame_bus is not None else None
+        self.streams = StreamRegistry() if get_frame_bus is not None else None
 
         # Semantic describer (even in remote mode, works on ingested results)
         self.semantic = SemanticDescriber(config)
-        self.memory = PeopleMemory()
+        mem_cfg = vision_cfg.get("memory", {})
+        self.memory = PeopleMemory(
+            flush_interval_s=float(mem_cfg.get("flush_interval_s", 1.0)),
+            max_chats=int(mem_cfg.get("max_chats", 500)),
+            compact_bytes=int(mem_cfg.get("compact_bytes", 1_000_000)),
+        )
         actions_cfg = config.get("actions", {}) if isinstance(config, dict) else {}
         endpoint = str(actions_cfg.get("endpoint", "http://localhost:8100/autonomy/apply_actions"))
         timeout = float(actions_cfg.get("timeout", 1.5))
         enabled = bool(actions_cfg.get("default_apply", False))
-        self.action_dispatcher = VisionActionDispatcher(endpoint=endpoint, timeout=timeout, enabled=enabled)
+        # speak / autonomy / interactions / ollama calls never block the inference loop
+        out_cfg = config.get("outbound", {}) if isinstance(config, dict) else {}
+        self.outbound = OutboundDispatcher(
+            max_queue=int(out_cfg.get("max_queue", 32)),
+            pool_size=int(out_cfg.get("pool_size", 4)),
+        )
+        self.action_dispatcher = VisionActionDispatcher(
+            endpoint=endpoint, timeout=timeout, enabled=enabled, outbound=self.outbound
+        )
 
     def start_stream_processing(self):
         if self.processing_mode != "local":
             # In remote mode we rely on external processor feeding results
             logger.debug("start_stream_processing() called in remote mode; no-op")
             return
-        if self._capture_thread and self._capture_thread.is_alive():
+        if self._inference_thread is not None and self._inference_thread.is_alive():
+            return
+        if self._capture_thread is not None and self._capture_thread.is_alive():
             return
         self._stop_event.clear()
-        self._capture_thread = threading.Thread(target=self._capture_loop, daemon=True)
-        self._capture_thread.start()
+        if self._use_bus():
+            # Camera module already owns the device; inference reads the bus directly
+            logger.info("Vision using shared camera frame bus")
+            self._capture_thread = None
+        else:
+            self._capture_thread = threading.Thread(target=self._capture_loop, daemon=True)
+            self._capture_thread.start()
         self._inference_thread = threading.Thread(target=self._inference_loop, daemon=True)
         self._inference_thread.start()
         logger.info("Vision processing started (Multi-threaded, local mode)")
 
+    def health(self) -> Dict[str, Any]:
+        """Once started, the inference thread (and the private capture thread in device mode) must be alive."""
+        if self.processing_mode != "local":
+            return {"ok": True, "mode": "remote"}
+        inference = self._inference_thread
+        if inference is None or self._stop_event.is_set():
+            return {"ok": True, "mode": "local", "running": False}
+        capture = self._capture_thread
+        capture_ok = capture is None or capture.is_alive()
+        return {
+            "ok": inference.is_alive() and capture_ok,
+            "mode": "local",
+            "running": True,
+            "inference_alive": inference.is_alive(),
+            "capture_alive": None if capture is None else capture.is_alive(),
+        }
+
+    def _use_bus(self) -> bool:
+        if self._bus is None or self.frame_source == "device":
+            return False
+        if self.frame_source == "bus":
+            return True
+        return self._bus.has_producer
+
+    def _current_frame(self) -> Optional[Any]:
+        """Latest raw BGR frame from the bus or the private capture thread (read-only)."""
+        if self._use_bus():
+            f = self._bus.latest()
+            return f.image if f is not None else None
+        with self._frame_lock:
+            return self._latest_raw_frame
+
+    def _next_frame(self, last_seq: int) -> tuple:
+        """Return (seq, frame) for a frame newer than last_seq, or (last_seq, None)."""
+        if self._use_bus():
+            f = self._bus.wait_next(last_seq, timeout=0.5)
+            if f is None:
+                return last_seq, None
+            return f.seq, f.image
+        with self._frame_lock:
+            frame = self._latest_raw_frame
+        return last_seq, frame
+
     def stop_stream_processing(self):
+        self.memory.flush()
+        self.outbound.drain(timeout=1.0)
         if self.processing_mode != "local":
             return
         self._stop_event.set()
@@ -131,12 +239,12 @@ class VisionProcessor:
 
     def _inference_loop(self):
         """Runs inference on the latest available frame."""
+        last_seq = 0
         while not self._stop_event.is_set():
-            frame = None
-            with self._frame_lock:
-                if self._latest_raw_frame is not None:
-                    frame = self._latest_raw_frame.copy()
-            
+            # Frames are never mutated in place (bus frames are read-only,
+            # the capture thread swaps in new arrays), so no defensive copy.
+            last_seq, frame = self._next_frame(last_seq)
+
             if frame is None:
                 time.sleep(0.1)
                 continue
@@ -147,67 +255,8 @@ class VisionProcessor:
             # Run YOLO inference
             results = self.model(frame, verbose=False, conf=self.conf_threshold)
             
-            parsed_results = []
             annotated_frame = frame.copy()
-            
-            person_boxes = []
-            
-            for r in results:
-                for box in r.boxes:
-                    cls_id = int(box.cls[0])
-                    label = self.model.names[cls_id]
-                    conf = float(box.conf[0])
-                    x1, y1, x2, y2 = box.xyxy[0].tolist()
-                    
-                    # Distance estimation
-                    distance = -1.0
-                    if label == "person":
-                        h = y2 - y1
-                        if h > 0:
-                            distance = (1.7 * 600) / h 
-                        
-                        # Store for face recognition
-                        # YOLO: x1, y1, x2, y2
-                        # Face_rec: top, right, bottom, left -> y1, x2, y2, x1
-                        person_boxes.append((int(y1), int(x2), int(y2), int(x1)))
-                    
-                    parsed_results.append({
-                        "label": label,
-                        "confidence": conf,
-                        "bbox": [x1, y1, x2, y2],
-                        "distance_m": round(distance, 2) if distance > 0 else None,
-                        "name": "Unknown" # Default
-                    })
-
-            # Face Recognition
-            if self.face_manager and person_boxes:
-                # Convert BGR to RGB
-                rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-                
-                try:
-                    # Compute encodings for detected people
-                    encodings = face_recognition.face_encodings(rgb_frame, person_boxes)
-                    
-                    # Match encodings to names
-                    for i, encoding in enumerate(encodings):
-                        name = self.face_manager.identify_face(encoding)
-                        
-                        # Find the corresponding result in parsed_results and update it
-                        # The order of person_boxes matches the order we added them
-                        # We need to map back.
-                        # Since we iterated results linearly, let's just find the person result
-                        # This is a bit tricky if there are non-person objects interspersed.
-                        # Let's re-iterate parsed_results to find the i-th person.
-                        person_idx = 0
-                        for res in parsed_results:
-                            if res["label"] == "person":
-                                if person_idx == i:
-                                    res["name"] = name
-                                    res["label"] = name # Update label for display
-                                    break
-                                person_idx += 1
-                except Exception as e:
-                    logger.error(f"Face recognition error: {e}")
+            parsed_results = self._postprocess(frame, results, track=True)
 
             # Draw annotations
             for res in parsed_results:
@@ -234,19 +283,31 @@ class VisionProcessor:
             if parsed_results:
                 self.action_dispatcher.emit_scene(self.semantic, parsed_results)
             
-            # Encode frame for streaming
-            ret, buffer = cv2.imencode('.jpg', annotated_frame)
-            if ret:
-                with self._frame_lock:
-                    self._latest_annotated_frame = buffer.tobytes()
+            # Publish for streaming (encoded only if someone watches /vision/video_feed)
+            if self._annotated_pub is not None:
+                self._annotated_pub.set_frame(annotated_frame)
+            else:
+                ret, buffer = cv2.imencode('.jpg', annotated_frame)
+                if ret:
+                    with self._frame_lock:
+                        self._latest_annotated_frame = buffer.tobytes()
             
             if self.blind_mode_enabled:
                 self._handle_blind_mode(parsed_results)
 
             time.sleep(0.05)
 
-    def generate_frames(self) -> Generator[bytes, None, None]:
-        """Generator for MJPEG streaming."""
+    def generate_frames(self, fps: int = 20):
+        """MJPEG stream of annotated frames.
+
+        Async and wake-on-new-frame when the camera streaming helpers are
+        importable; otherwise the legacy polling generator.
+        """
+        if self._annotated_pub is not None:
+            return mjpeg_stream(self._annotated_pub, fps, registry=self.streams, name="vision")
+        return self._poll_frames()
+
+    def _poll_frames(self) -> Generator[bytes, None, None]:
         while True:
             with self._frame_lock:
                 frame = self._latest_annotated_frame
@@ -286,84 +347,85 @@ class VisionProcessor:
             name = r.get("name")
             if name and name != "Unknown":
                 self.memory.set_summary(name, text)
-        self._send_tts(text)
+        # a newer scene description supersedes one still waiting to be spoken
+        self._send_tts(text, coalesce_key="blind")
         self.last_blind_announcement = now
 
-    def _send_tts(self, text: str):
+    def _send_tts(self, text: str, coalesce_key: Optional[str] = None):
         url = self.config.get("speak", {}).get("endpoint") or "http://localhost:8083/speak/say"
-        try:
-            requests.post(url, json={"text": text}, timeout=1.0)
-        except Exception as e:
-            logger.error(f"Failed to send TTS: {e}")
+        # hazard alerts preempt chit-chat on the speaker; don't wait for playback
+        priority = "alert" if coalesce_key == "alert" else "normal"
+        payload = {"text": text, "priority": priority, "wait": False}
+
+        def post() -> None:
+            self.outbound.post("speak", url, payload, timeout=1.0, coalesce_key=coalesce_key)
+
+        if get_bus is None:
+            post()
+            return
+        get_bus().publish(SpeakRequest(text=text, priority=priority), fallback=post)
 
     def analyze_snapshot(self) -> List[Dict[str, Any]]:
         """Capture a single frame and analyze it (local mode only)."""
         if self.processing_mode != "local" or self.model is None:
             return [{"error": "Local inference disabled (remote mode)"}]
-        cap = cv2.VideoCapture(self.camera_source)
-        if not cap.isOpened():
-            return [{"error": "Could not open camera"}]
-        ret, frame = cap.read()
-        cap.release()
-        if not ret:
-            return [{"error": "Failed to capture frame"}]
+        frame = self._current_frame()
+        if frame is None:
+            if self._use_bus():
+                return [{"error": "No frame on camera bus yet"}]
+            cap = cv2.VideoCapture(self.camera_source)
+            if not cap.isOpened():
+                return [{"error": "Could not open camera"}]
+            ret, frame = cap.read()
+            cap.release()
+            if not ret:
+                return [{"error": "Failed to capture frame"}]
         results = self.model(frame, verbose=False, conf=self.conf_threshold)
-        parsed_results = []
-        
-        # ... (Same logic as loop, but simplified) ...
-        # For snapshot, we might skip face rec or include it.
-        # Let's include it if available.
-        
-        person_boxes = []
-        for r in results:
-            for box in r.boxes:
-                cls_id = int(box.cls[0])
-                label = self.model.names[cls_id]
-                conf = float(box.conf[0])
-                x1, y1, x2, y2 = box.xyxy[0].tolist()
-                
-                distance = -1.0
-                if label == "person":
-                    h = y2 - y1
-                    if h > 0:
-                        distance = (1.7 * 600) / h
-                    person_boxes.append((int(y1), int(x2), int(y2), int(x1)))
-                
-                parsed_results.append({
-                    "label": label,
-                    "confidence": conf,
-                    "bbox": [x1, y1, x2, y2],
-                    "distance_m": round(distance, 2) if distance > 0 else None,
-                    "name": "Unknown"
-                })
-
-        if self.face_manager and person_boxes:
-            rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            try:
-                encodings = face_recognition.face_encodings(rgb_frame, person_boxes)
-                person_idx = 0
-                for i, encoding in enumerate(encodings):
-                    name = self.face_manager.identify_face(encoding)
-                    for res in parsed_results:
-                        if res["label"] == "person":
-                            if person_idx == i:
-                                res["name"] = name
-                                res["label"] = name
-                                break
-                            person_idx += 1
-            except Exception:
-                pass
-
+        return self._postprocess(frame, results)
+
+    def _postprocess(self, frame: Any, results: Any, track: bool = False) -> List[Dict[str, Any]]:
+        """Vectorized box parsing + face recognition, shared by loop and snapshot.
+
+        With `track=True` (live loop) detections get stable track IDs and face
+        encoding only runs for tracks whose cached identity is stale.
+        """
+        dets = from_ultralytics(results, self.model.names)
+        parsed_results = dets.to_results()
+        tracker = self.tracker if track else None
+        track_ids = None
+        if tracker is not None:
+            track_ids = tracker.update(dets.xyxy, dets.cls)
+            for res, tid in zip(parsed_results, track_ids.tolist()):
+                res["track_id"] = tid
+        if self.face_manager and dets.person_idx.size:
+            rows = dets.person_idx
+            now = time.time()
+            if tracker is not None:
+                stale = np.array([tracker.needs_identity(track_ids[r], now) for r in rows.tolist()], dtype=bool)
+                cached_rows = rows[~stale]
+                apply_names(parsed_results, cached_rows, [tracker.identity(track_ids[r]) for r in cached_rows.tolist()])
+                tracker.reid_skipped += int(cached_rows.size)
+                rows = rows[stale]
+            if rows.size:
+                rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+                try:
+                    encodings = face_recognition.face_encodings(rgb_frame, dets.face_locations(rows))
+                    names = self.face_manager.identify_faces(encodings)
+                    # encodings follow row order, so results map back directly
+                    apply_names(parsed_results, rows, names)
+                    if tracker is not None:
+                        tracker.reid_runs += len(names)
+                        for r, name in zip(rows.tolist(), names):
+                            tracker.set_identity(track_ids[r], name, now)
+                except Exception as e:
+                    logger.error(f"Face recognition error: {e}")
         return parsed_results
 
     def register_face_from_current_frame(self, name: str) -> bool:
         """Register the largest face in the current frame (local mode only)."""
         if not self.face_manager or self.processing_mode != "local":
             return False
-        frame = None
-        with self._frame_lock:
-            if self._latest_raw_frame is not None:
-                frame = self._latest_raw_frame.copy()
+        frame = self._current_frame()
         if frame is None:
             return False
         rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
@@ -390,6 +452,8 @@ class VisionProcessor:
                 "distance_m": distance,
                 "name": o.get("name", o.get("id", "Unknown")),
             }
+            if o.get("track_id") is not None:
+                entry["track_id"] = o.get("track_id")
             normalized.append(entry)
         self.latest_results = normalized
         self._evaluate_alerts(normalized)
@@ -428,20 +492,26 @@ class VisionProcessor:
         # Build alert text
         parts = [f"{lbl} {dist:.1f}m" for lbl, dist in hazards]
         text = "Dikkat yakın tehlike: " + ", ".join(parts)
-        self._send_tts(text)
+        self._send_tts(text, coalesce_key="alert")
         self._emit_emotion("alert")
         self.last_alert_announcement = now
 
     def _emit_emotion(self, emotion: str):
-        # Hook to interactions module using its event API
-        try:
-            requests.post(
+        # Hook to interactions module: on the bus in-process, its event API otherwise
+        event_type = f"autonomy.{emotion}"
+
+        def post() -> None:
+            self.outbound.post(
+                "interactions",
                 "http://localhost:8080/interactions/event",
-                json={"type": f"autonomy.{emotion}"},
+                {"type": event_type},
                 timeout=0.5,
             )
-        except Exception:
-            pass
+
+        if get_bus is None:
+            post()
+            return
+        get_bus().publish(InteractionEvent(type=event_type), fallback=post)
 
     # Person-centric interactions -------------------------------------
     def _handle_person_interactions(self, results: List[Dict[str, Any]]):
@@ -450,10 +520,19 @@ class VisionProcessor:
             return
         greet_cooldown = float(vision_cfg.get("personalization", {}).get("greet_cooldown_s", 30))
         now = time.time()
+        if self.tracker is not None and self.processing_mode == "local":
+            # forget greetings of tracks that left the scene
+            self._greeted_tracks &= self.tracker.active_ids()
+        elif len(self._greeted_tracks) > 256:
+            self._greeted_tracks.clear()  # remote track ids: no lifecycle info, just bound it
         for r in results:
             name = r.get("name")
             if not name or name == "Unknown":
                 continue
+            tid = r.get("track_id")
+            if tid is not None and tid in self._greeted_tracks:
+                # same continuous presence: greet once, however long they stay
+                continue
             last = self._last_person_greet.get(name, 0.0)
             if now - last < greet_cooldown:
                 continue
@@ -464,12 +543,11 @@ class VisionProcessor:
             # Emotion and memory
             self._emit_emotion("excited")
             self.memory.append_chat(name, role="system", text=f"Greeted: {greeting}")
-            # Optional: ask LLM for a friendly follow-up line
-            follow = self._ollama_followup(name)
-            if follow:
-                self._send_tts(follow)
-                self.memory.append_chat(name, role="assistant", text=follow)
+            # Optional: ask LLM for a friendly follow-up line (spoken when it arrives)
+            self._ollama_followup(name)
             self._last_person_greet[name] = now
+            if tid is not None:
+                self._greeted_tracks.add(tid)
 
     def _build_greeting(self, name: str) -> Optional[str]:
         p_cfg = self.config.get("vision", {}).get("personalization", {})
@@ -478,23 +556,24 @@ class VisionProcessor:
             return known[name].get("greeting")
         return f"Merhaba {name}, seni gördüğüme sevindim."
 
-    def _ollama_followup(self, name: str) -> Optional[str]:
+    def _ollama_followup(self, name: str) -> None:
         # Query Ollama for a short warm line referencing last summary
-        try:
-            import httpx  # type: ignore
-        except Exception:
-            return None
         rec = self.memory.get_person(name) or {}
         last_sum = (rec.get("last_summary") or {}).get("text")
         prompt = f"{name} ile karşılaştın. {('Özet: '+last_sum) if last_sum else ''} Türkçe kısacık ve sıcak bir cümle söyle."
         url = self.config.get("ollama", {}).get("endpoint", "http://localhost:11434/api/generate")
         model = self.config.get("ollama", {}).get("model", "llama3")
-        try:
-            with httpx.Client(timeout=4.0) as client:
-                resp = client.post(url, json={"model": model, "prompt": prompt, "stream": False})
-            if resp.status_code == 200:
-                data = resp.json()
-                return data.get("response")
-        except Exception:
-            return None
-        return None
+
+        def on_reply(data: Dict[str, Any]) -> None:
+            follow = data.get("response") if isinstance(data, dict) else None
+            if follow:
+                self._send_tts(follow)
+                self.memory.append_chat(name, role="assistant", text=follow)
+
+        self.outbound.post(
+            "ollama",
+            url,
+            {"model": model, "prompt": prompt, "stream": False},
+            timeout=4.0,
+            on_response=on_reply,
+        )
@@ -0,0 +1,206 @@
+"""Lightweight SORT-style multi-object tracker.
+
+Constant-velocity Kalman filter per track plus greedy IoU association (same
+class only). Tracks keep a cached face identity so the processor only runs
+`face_recognition.face_encodings` when a track is new, its box moved/resized
+substantially since the last identification, or the re-verify interval expired.
+The inference thread updates the tracks while API handlers read them, so every
+public method holds the tracker's lock.
+"""
+from __future__ import annotations
+
+import itertools
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Set
+
+import numpy as np
+
+
+def iou_matrix(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Pairwise IoU between (n,4) and (m,4) xyxy boxes."""
+    if a.size == 0 or b.size == 0:
+        return np.zeros((len(a), len(b)), dtype=np.float64)
+    a = a[:, None, :]
+    b = b[None, :, :]
+    iw = np.clip(np.minimum(a[..., 2], b[..., 2]) - np.maximum(a[..., 0], b[..., 0]), 0, None)
+    ih = np.clip(np.minimum(a[..., 3], b[..., 3]) - np.maximum(a[..., 1], b[..., 1]), 0, None)
+    inter = iw * ih
+    area_a = (a[..., 2] - a[..., 0]) * (a[..., 3] - a[..., 1])
+    area_b = (b[..., 2] - b[..., 0]) * (b[..., 3] - b[..., 1])
+    union = area_a + area_b - inter
+    with np.errstate(divide="ignore", invalid="ignore"):
+        out = np.where(union > 0, inter / union, 0.0)
+    return out
+
+
+def _to_z(box: np.ndarray) -> np.ndarray:
+    w = max(1e-3, float(box[2] - box[0]))
+    h = max(1e-3, float(box[3] - box[1]))
+    return np.array([box[0] + w / 2.0, box[1] + h / 2.0, w * h, w / h])
+
+
+def _to_box(x: np.ndarray) -> np.ndarray:
+    s = max(1e-3, float(x[2]))
+    r = max(1e-3, float(x[3]))
+    w = np.sqrt(s * r)
+    h = s / w
+    return np.array([x[0] - w / 2.0, x[1] - h / 2.0, x[0] + w / 2.0, x[1] + h / 2.0])
+
+
+class _KalmanBox:
+    """State [cx, cy, area, aspect, vcx, vcy, varea]; aspect is held constant."""
+
+    F = np.eye(7)
+    F[0, 4] = F[1, 5] = F[2, 6] = 1.0
+    H = np.eye(4, 7)
+    Q = np.diag([1.0, 1.0, 1.0, 1.0, 0.01, 0.01, 0.0001])
+    R = np.diag([1.0, 1.0, 10.0, 10.0])
+
+    def __init__(self, box: np.ndarray) -> None:
+        self.x = np.zeros(7)
+        self.x[:4] = _to_z(box)
+        self.P = np.diag([10.0, 10.0, 10.0, 10.0, 1e4, 1e4, 1e4])
+
+    def predict(self) -> np.ndarray:
+        if self.x[2] + self.x[6] <= 0:
+            self.x[6] = 0.0
+        self.x = self.F @ self.x
+        self.P = self.F @ self.P @ self.F.T + self.Q
+        return _to_box(self.x)
+
+    def update(self, box: np.ndarray) -> None:
+        y = _to_z(box) - self.H @ self.x
+        S = self.H @ self.P @ self.H.T + self.R
+        K = self.P @ self.H.T @ np.linalg.inv(S)
+        self.x = self.x + K @ y
+        self.P = (np.eye(7) - K @ self.H) @ self.P
+
+    def box(self) -> np.ndarray:
+        return _to_box(self.x)
+
+
+@dataclass
+class Track:
+    id: int
+    cls: int
+    kf: _KalmanBox
+    box: np.ndarray
+    hits: int = 1
+    misses: int = 0
+    name: Optional[str] = None
+    name_box: Optional[np.ndarray] = None
+    name_ts: float = 0.0
+
+
+class Tracker:
+    def __init__(
+        self,
+        iou_threshold: float = 0.3,
+        max_age: int = 15,
+        reid_iou: float = 0.5,
+        reverify_s: float = 5.0,
+    ) -> None:
+        self.iou_threshold = float(iou_threshold)
+        self.max_age = int(max_age)  # frames a track survives without a match
+        self.reid_iou = float(reid_iou)
+        self.reverify_s = float(reverify_s)
+        self._tracks: Dict[int, Track] = {}
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self.reid_runs = 0
+        self.reid_skipped = 0
+
+    def update(self, xyxy: np.ndarray, cls: np.ndarray) -> np.ndarray:
+        """Associate detections with tracks; returns a track id per detection row."""
+        xyxy = np.asarray(xyxy, dtype=np.float64).reshape(-1, 4)
+        cls = np.asarray(cls).reshape(-1)
+        with self._lock:
+            return self._update(xyxy, cls)
+
+    def _update(self, xyxy: np.ndarray, cls: np.ndarray) -> np.ndarray:
+        tracks = list(self._tracks.values())
+        predicted = np.array([t.kf.predict() for t in tracks]).reshape(-1, 4)
+        ids = np.full(len(xyxy), -1, dtype=np.int64)
+
+        iou = iou_matrix(predicted, xyxy)
+        used_t: Set[int] = set()
+        if iou.size:
+            iou[np.array([t.cls for t in tracks])[:, None] != cls[None, :]] = 0.0
+            # greedy assignment, best overlaps first
+            order = np.argsort(-iou, axis=None)
+            for flat in order.tolist():
+                ti, di = divmod(flat, iou.shape[1])
+                if iou[ti, di] < self.iou_threshold:
+                    break
+                if ti in used_t or ids[di] >= 0:
+                    continue
+                t = tracks[ti]
+                t.kf.update(xyxy[di])
+                t.box = xyxy[di]
+                t.hits += 1
+                t.misses = 0
+                used_t.add(ti)
+                ids[di] = t.id
+        for ti, t in enumerate(tracks):
+            if ti not in used_t:
+                t.misses += 1
+                if t.misses > self.max_age:
+                    self._tracks.pop(t.id, None)
+
+        for di in np.flatnonzero(ids < 0).tolist():
+            tid = next(self._ids)
+            self._tracks[tid] = Track(id=tid, cls=int(cls[di]), kf=_KalmanBox(xyxy[di]), box=xyxy[di])
+            ids[di] = tid
+        return ids
+
+    # Identity cache ---------------------------------------------------
+    def needs_identity(self, track_id: int, now: float) -> bool:
+        with self._lock:
+            t = self._tracks.get(int(track_id))
+            if t is None or t.name is None or t.name_box is None:
+                return True
+            if now - t.name_ts >= self.reverify_s:
+                return True
+            name_box, box = t.name_box, t.box
+        return float(iou_matrix(name_box[None, :], box[None, :])[0, 0]) < self.reid_iou
+
+    def identity(self, track_id: int) -> Optional[str]:
+        with self._lock:
+            t = self._tracks.get(int(track_id))
+            return t.name if t else None
+
+    def set_identity(self, track_id: int, name: str, now: float) -> None:
+        with self._lock:
+            t = self._tracks.get(int(track_id))
+            if t is None:
+                return
+            t.name = name
+            t.name_box = t.box.copy()
+            t.name_ts = now
+
+    def get(self, track_id: int) -> Optional[Track]:
+        with self._lock:
+            return self._tracks.get(int(track_id))
+
+    def active_ids(self) -> Set[int]:
+        with self._lock:
+            return set(self._tracks)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "tracks": len(self._tracks),
+                "reid_runs": self.reid_runs,
+                "reid_skipped": self.reid_skipped,
+            }
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [
+                {"track_id": t.id, "cls": t.cls, "name": t.name, "hits": t.hits, "misses": t.misses, "bbox": t.box.tolist()}
+                for t in self._tracks.values()
+            ]
+
+
+__all__ = ["Tracker", "Track", "iou_matrix"]
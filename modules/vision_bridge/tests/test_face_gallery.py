@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+from pathlib import Path
+import sys
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parents[3]
+if str(ROOT) not in sys.path:
+    sys.path.append(str(ROOT))
+
+from modules.vision_bridge.services.face_gallery import FaceGallery, UNKNOWN  # noqa: E402
+from modules.vision_bridge.services.face_store import FaceStore  # noqa: E402
+
+
+def _gallery(n: int, ann_threshold: int):
+    rng = np.random.default_rng(1)
+    base = rng.normal(0, 0.09, size=(n, 128)).astype(np.float32)
+    g = FaceGallery(ann_threshold=ann_threshold)
+    g.set([f"p{i}" for i in range(n)], base)
+    return g, base, rng
+
+
+def test_batched_identify_matches_and_rejects():
+    g, base, rng = _gallery(50, ann_threshold=10_000)
+    queries = np.vstack([base[3] + 0.01, base[42], rng.normal(5, 1, size=128)])
+    assert g.identify(queries) == ["p3", "p42", UNKNOWN]
+
+
+def test_multiple_embeddings_per_person_and_growth():
+    g = FaceGallery()
+    for i in range(100):  # forces several capacity doublings
+        g.add("alice" if i % 2 else "bob", np.full(128, i, dtype=np.float32))
+    assert len(g) == 100 and g.people() == ["bob", "alice"]
+    assert g.embeddings_of("alice").shape == (50, 128)
+    assert g.identify(np.full((1, 128), 51, dtype=np.float32)) == ["alice"]
+
+
+def test_ivf_index_finds_near_duplicates():
+    g, base, rng = _gallery(3000, ann_threshold=1000)
+    idx = rng.integers(0, 3000, size=40)
+    out = g.identify(base[idx] + rng.normal(0, 0.005, size=(40, 128)).astype(np.float32))
+    assert g.stats()["ann"] is True
+    assert sum(o == f"p{i}" for o, i in zip(out, idx)) >= 38
+    # rows appended after the index build are still found
+    g.add("late", np.full(128, 0.3, dtype=np.float32))
+    assert g.identify(np.full((1, 128), 0.3, dtype=np.float32)) == ["late"]
+
+
+def test_loaded_store_stays_memory_mapped_until_an_add(tmp_path):
+    store = FaceStore(str(tmp_path / "faces.bin"))
+    encs = np.random.default_rng(2).normal(size=(4, 128)).astype(np.float32)
+    for i, enc in enumerate(encs):
+        store.append(f"p{i}", enc)
+    names, mm = store.load()
+    g = FaceGallery()
+    g.set(names, mm)
+    assert np.shares_memory(g.matrix, mm) and not g.matrix.flags.writeable
+    assert g.identify(encs[2:3] + 0.001) == ["p2"]
+    g.add("new", np.zeros(128, dtype=np.float32))
+    assert not np.shares_memory(g.matrix, mm)
+    assert np.array_equal(g.matrix[:4], encs) and g.identify(np.zeros((1, 128), dtype=np.float32)) == ["new"]
@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+from pathlib import Path
+import sys
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parents[3]
+if str(ROOT) not in sys.path:
+    sys.path.append(str(ROOT))
+
+from modules.vision_bridge.services.face_store import FaceStore  # noqa: E402
+
+
+def test_append_and_mmap_load(tmp_path):
+    store = FaceStore(str(tmp_path / "faces.bin"))
+    encs = np.random.default_rng(0).normal(size=(3, 128)).astype(np.float32)
+    for name, enc in zip(["alice", "bob", "alice"], encs):
+        store.append(name, enc)
+    names, matrix = FaceStore(str(tmp_path / "faces.bin")).load()
+    assert names == ["alice", "bob", "alice"]
+    assert isinstance(matrix.base, np.memmap) or isinstance(matrix, np.memmap)
+    assert np.array_equal(np.asarray(matrix), encs)
+
+
+def test_torn_tail_is_ignored_and_overwritten(tmp_path):
+    path = tmp_path / "faces.bin"
+    store = FaceStore(str(path))
+    store.append("alice", np.ones(128, dtype=np.float32))
+    with open(path, "ab") as f:
+        f.write(b"\x01" * 100)  # interrupted append
+    names, _ = store.load()
+    assert names == ["alice"]
+    store.append("bob", np.zeros(128, dtype=np.float32))
+    names, matrix = store.load()
+    assert names == ["alice", "bob"] and matrix.shape == (2, 128)
+
+
+def test_compact_replaces_contents(tmp_path):
+    store = FaceStore(str(tmp_path / "faces.bin"))
+    for i in range(4):
+        store.append(f"p{i}", np.full(128, i, dtype=np.float32))
+    store.compact(["p2"], np.full((1, 128), 2, dtype=np.float32))
+    names, matrix = store.load()
+    assert names == ["p2"] and float(matrix[0, 0]) == 2.0
+    assert not (tmp_path / "faces.bin.tmp").exists()
@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+from pathlib import Path
+import sys
+import threading
+
+ROOT = Path(__file__).resolve().parents[3]
+if str(ROOT) not in sys.path:
+    sys.path.append(str(ROOT))
+
+from modules.vision_bridge.services.outbound import OutboundDispatcher  # noqa: E402
+
+
+class FakeResponse:
+    status_code = 200
+
+    def json(self):
+        return {"response": "ok"}
+
+
+class BlockingSession:
+    """Holds the first request until released so the queue can fill up."""
+
+    def __init__(self):
+        self.release = threading.Event()
+        self.started = threading.Event()
+        self.sent = []
+
+    def post(self, url, json, timeout):
+        self.started.set()
+        self.release.wait(2.0)
+        self.sent.append(json)
+        return FakeResponse()
+
+    def close(self):
+        pass
+
+
+def _dispatcher(max_queue):
+    d = OutboundDispatcher(max_queue=max_queue)
+    d._session = BlockingSession()
+    return d
+
+
+def test_drop_oldest_and_coalesce():
+    d = _dispatcher(max_queue=2)
+    d.post("speak", "http://x", {"i": 0})
+    assert d._session.started.wait(1.0)  # first message is in flight
+    d.post("speak", "http://x", {"i": 1})
+    d.post("speak", "http://x", {"scene": "a"}, coalesce_key="blind")
+    d.post("speak", "http://x", {"scene": "b"}, coalesce_key="blind")  # replaces "a"
+    d.post("speak", "http://x", {"i": 2})  # queue full: drops {"i": 1}
+    d._session.release.set()
+    assert d.drain(2.0)
+    assert d._session.sent == [{"i": 0}, {"scene": "b"}, {"i": 2}]
+    s = d.stats()["speak"]
+    assert (s["sent"], s["dropped"], s["coalesced"], s["queued"]) == (3, 1, 1, 0)
+    d.close()
+
+
+def test_on_response_runs_on_worker():
+    d = _dispatcher(max_queue=4)
+    d._session.release.set()
+    got = []
+    d.post("ollama", "http://x", {"prompt": "p"}, on_response=got.append)
+    assert d.drain(2.0)
+    assert got == [{"response": "ok"}]
+    d.close()
+
+
+def test_post_does_not_block_on_slow_target():
+    d = _dispatcher(max_queue=4)
+    d.post("speak", "http://x", {"i": 0})
+    assert d._session.started.wait(1.0)
+    d.post("actions", "http://y", {"j": 0})  # returns while speak is still stuck
+    assert d.stats()["speak"]["sent"] == 0
+    d._session.release.set()
+    assert d.drain(2.0)
+    d.close()
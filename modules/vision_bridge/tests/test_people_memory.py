@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+import sys
+
+ROOT = Path(__file__).resolve().parents[3]
+if str(ROOT) not in sys.path:
+    sys.path.append(str(ROOT))
+
+from modules.vision_bridge.services.people_memory import PeopleMemory  # noqa: E402
+
+
+def test_journal_replay_and_summary_coalescing(tmp_path):
+    mem = PeopleMemory(data_dir=str(tmp_path), flush_interval_s=60)
+    mem.append_chat("Alice", "user", "merhaba")
+    for i in range(10):
+        mem.set_summary("Alice", f"özet {i}")
+    mem.close()
+    lines = (tmp_path / "people_memory.jsonl").read_text(encoding="utf-8").splitlines()
+    assert len(lines) == 2  # one chat + only the newest summary
+    assert not (tmp_path / "people_memory.json").exists()
+
+    again = PeopleMemory(data_dir=str(tmp_path))
+    rec = again.get_person("Alice")
+    assert rec["last_summary"]["text"] == "özet 9"
+    assert [c["text"] for c in rec["chats"]] == ["merhaba"]
+    again.close()
+
+
+def test_chat_cap_rollup_and_queries(tmp_path):
+    mem = PeopleMemory(data_dir=str(tmp_path), flush_interval_s=60, max_chats=3)
+    for i in range(5):
+        mem.append_chat("Bob", "user" if i % 2 else "assistant", str(i))
+    mem.append_chat("Alice", "user", "x")
+    assert [c["text"] for c in mem.recent_chats("Bob", 10)] == ["2", "3", "4"]
+    assert mem.get_person("Bob")["rollup"]["count"] == 2
+    assert [p for p, _ in mem.people_by_last_seen()] == ["Alice", "Bob"]
+    assert mem.last_seen("Nobody") is None
+    mem.close()
+
+
+def test_compaction_writes_snapshot_and_resets_journal(tmp_path):
+    mem = PeopleMemory(data_dir=str(tmp_path), flush_interval_s=60, compact_bytes=200)
+    for i in range(5):
+        mem.append_chat("Alice", "user", f"satır {i}")
+    mem.close()
+    snap = json.loads((tmp_path / "people_memory.json").read_text(encoding="utf-8"))
+    assert snap["_meta"]["seq"] == 5 and len(snap["Alice"]["chats"]) == 5
+    assert (tmp_path / "people_memory.jsonl").stat().st_size == 0
+    again = PeopleMemory(data_dir=str(tmp_path))
+    assert len(again.recent_chats("Alice", 10)) == 5
+    again.close()
+
+
+def test_last_seen_index_answers_since_and_limit(tmp_path, monkeypatch):
+    import itertools
+
+    from modules.vision_bridge.services import people_memory
+
+    clock = itertools.count(100)
+    monkeypatch.setattr(people_memory.time, "time", lambda: float(next(clock)))
+    mem = PeopleMemory(data_dir=str(tmp_path), flush_interval_s=60)
+    for person in ["A", "B", "C", "A", "D", "B"]:  # seen at 100..105
+        mem.append_chat(person, "user", "x")
+    assert mem.people_by_last_seen() == [("B", 105.0), ("D", 104.0), ("A", 103.0), ("C", 102.0)]
+    assert mem.people_by_last_seen(since=103.0) == [("B", 105.0), ("D", 104.0), ("A", 103.0)]
+    assert mem.people_by_last_seen(since=102.5, limit=2) == [("B", 105.0), ("D", 104.0)]
+    mem.close()
+    again = PeopleMemory(data_dir=str(tmp_path))  # rebuilt from the journal
+    assert again.people_by_last_seen(limit=1) == [("B", 105.0)]
+    again.close()
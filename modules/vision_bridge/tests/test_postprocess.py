@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+from pathlib import Path
+import sys
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parents[3]
+if str(ROOT) not in sys.path:
+    sys.path.append(str(ROOT))
+
+from modules.vision_bridge.services.postprocess import apply_names, from_arrays  # noqa: E402
+
+NAMES = {0: "person", 2: "car"}
+
+
+def test_labels_distance_and_person_rows():
+    dets = from_arrays(
+        [2, 0, 0],
+        [0.9, 0.8, 0.7],
+        [[0, 0, 50, 50], [10, 100, 60, 400], [0, 0, 10, 0]],
+        NAMES,
+    )
+    results = dets.to_results()
+    assert [r["label"] for r in results] == ["car", "person", "person"]
+    assert results[0]["distance_m"] is None  # only people get a distance
+    assert results[1]["distance_m"] == round(1.7 * 600 / 300, 2)
+    assert results[2]["distance_m"] is None  # zero-height box
+    assert dets.person_idx.tolist() == [1, 2]
+    assert dets.face_locations()[0] == (100, 60, 400, 10)
+
+
+def test_apply_names_maps_faces_back_to_rows():
+    dets = from_arrays([2, 0, 2, 0], [0.9] * 4, np.zeros((4, 4)), NAMES)
+    results = dets.to_results()
+    apply_names(results, dets.person_idx, ["Alice", "Unknown"])
+    assert results[1]["name"] == "Alice" and results[1]["label"] == "Alice"
+    assert results[3]["name"] == "Unknown"
+    assert results[0]["label"] == "car" and results[2]["label"] == "car"
+
+
+def test_empty_batch():
+    dets = from_arrays(np.empty(0), np.empty(0), np.empty((0, 4)), NAMES)
+    assert len(dets) == 0 and dets.to_results() == [] and dets.face_locations() == []
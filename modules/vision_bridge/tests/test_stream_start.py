@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+from pathlib import Path
+import sys
+import threading
+import time
+
+ROOT = Path(__file__).resolve().parents[3]
+if str(ROOT) not in sys.path:
+    sys.path.append(str(ROOT))
+
+from modules.vision_bridge.services import processor as proc  # noqa: E402
+
+
+def test_second_start_in_bus_mode_keeps_one_inference_thread(monkeypatch):
+    monkeypatch.setattr(proc, "YOLO", lambda path: None)
+    vp = proc.VisionProcessor({"vision": {"frame_source": "bus", "tracker": {"enabled": False}}})
+    started = []
+
+    def idle_loop():
+        started.append(threading.current_thread())
+        vp._stop_event.wait(2.0)
+
+    monkeypatch.setattr(vp, "_inference_loop", idle_loop)
+    try:
+        vp.start_stream_processing()
+        first = vp._inference_thread
+        vp.start_stream_processing()
+        assert vp._capture_thread is None
+        assert vp._inference_thread is first
+        assert [t for t in threading.enumerate() if t in started] == [first]
+    finally:
+        vp.stop_stream_processing()
+    assert not first.is_alive()
+
+
+def test_speech_and_emotions_use_the_bus_with_http_fallback(monkeypatch):
+    from modules.eventbus import EventBus, InteractionEvent, SpeakRequest
+
+    bus = EventBus()
+    monkeypatch.setattr(proc, "get_bus", lambda: bus)
+    vp = proc.VisionProcessor({"vision": {"processing_mode": "remote"}})
+    posted = []
+    monkeypatch.setattr(vp.outbound, "post", lambda target, *a, **kw: posted.append(target))
+    got = []
+    subs = [bus.subscribe(SpeakRequest, got.append), bus.subscribe(InteractionEvent, got.append)]
+    try:
+        vp._send_tts("Dikkat", coalesce_key="alert")
+        vp._emit_emotion("alert")
+        deadline = time.monotonic() + 2.0
+        while len(got) < 2 and time.monotonic() < deadline:
+            time.sleep(0.01)
+    finally:
+        for sub in subs:
+            sub.close()
+    assert sorted(got, key=repr) == [InteractionEvent(type="autonomy.alert"), SpeakRequest(text="Dikkat", priority="alert")]
+    assert posted == []
+    vp._send_tts("Merhaba")  # standalone process: nobody subscribes
+    vp._emit_emotion("excited")
+    assert posted == ["speak", "interactions"]
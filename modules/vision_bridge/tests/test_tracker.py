@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+from pathlib import Path
+import sys
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parents[3]
+if str(ROOT) not in sys.path:
+    sys.path.append(str(ROOT))
+
+from modules.vision_bridge.services.tracker import Tracker, iou_matrix  # noqa: E402
+
+
+def test_iou_matrix():
+    a = np.array([[0, 0, 10, 10]], dtype=float)
+    b = np.array([[0, 0, 10, 10], [5, 0, 15, 10], [20, 20, 30, 30]], dtype=float)
+    np.testing.assert_allclose(iou_matrix(a, b)[0], [1.0, 50 / 150, 0.0])
+
+
+def test_ids_stable_across_moving_frames_and_classes_kept_apart():
+    trk = Tracker()
+    first = trk.update([[0, 0, 50, 100], [200, 0, 250, 100]], [0, 2])
+    for step in range(1, 6):
+        ids = trk.update([[step * 3, 0, 50 + step * 3, 100], [200, 0, 250, 100]], [0, 2])
+        assert ids.tolist() == first.tolist()
+    # same box, different class -> new track
+    other = trk.update([[15, 0, 65, 100]], [2])
+    assert other[0] not in first.tolist()
+
+
+def test_track_survives_short_dropout_then_expires():
+    trk = Tracker(max_age=2)
+    tid = trk.update([[0, 0, 50, 100]], [0])[0]
+    trk.update(np.empty((0, 4)), np.empty(0))
+    assert trk.update([[0, 0, 50, 100]], [0])[0] == tid
+    for _ in range(3):
+        trk.update(np.empty((0, 4)), np.empty(0))
+    assert tid not in trk.active_ids()
+
+
+def test_identity_cache_policy():
+    trk = Tracker(reid_iou=0.5, reverify_s=5.0)
+    tid = trk.update([[0, 0, 50, 100]], [0])[0]
+    assert trk.needs_identity(tid, now=0.0)
+    trk.set_identity(tid, "Alice", now=0.0)
+    assert not trk.needs_identity(tid, now=1.0)
+    assert trk.identity(tid) == "Alice"
+    assert trk.needs_identity(tid, now=6.0)  # re-verify interval
+    # large jump (still associated) -> box changed substantially
+    trk.update([[20, 0, 70, 100]], [0])
+    assert trk.needs_identity(tid, now=1.0)
+
+
+def test_snapshot_and_stats_while_the_inference_thread_updates():
+    import threading
+
+    trk = Tracker(max_age=0)
+    stop = threading.Event()
+    errors = []
+
+    def reader():
+        while not stop.is_set():
+            try:
+                trk.snapshot()
+                trk.stats()
+            except RuntimeError as exc:  # dict changed size during iteration
+                errors.append(exc)
+                return
+
+    t = threading.Thread(target=reader)
+    t.start()
+    try:
+        for step in range(2000):
+            n = step % 7
+            boxes = [[i * 60 + step % 3, 0, i * 60 + 50, 100] for i in range(n)]
+            trk.update(np.array(boxes, dtype=float).reshape(-1, 4), np.zeros(n))
+    finally:
+        stop.set()
+        t.join()
+    assert errors == []
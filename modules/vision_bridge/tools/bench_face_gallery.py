@@ -0,0 +1,65 @@
+"""Benchmark: list-based face matching vs FaceGallery (exact and IVF).
+
+Synthetic 128-d encodings; each query is a known identity plus noise, like a
+new frame of a registered person. The legacy column mirrors the old
+`compare_faces` + `face_distance` pair (two passes over a list of arrays).
+Usage: python -m modules.vision_bridge.tools.bench_face_gallery [identities]
+"""
+from __future__ import annotations
+
+import sys
+import time
+
+import numpy as np
+
+from modules.vision_bridge.services.face_gallery import FaceGallery
+
+
+def legacy_identify(known: list, names: list, enc: np.ndarray, tolerance: float = 0.6) -> str:
+    matches = list(np.linalg.norm(np.array(known) - enc, axis=1) <= tolerance)  # compare_faces
+    name = "Unknown"
+    if True in matches:
+        d = np.linalg.norm(np.array(known) - enc, axis=1)  # face_distance
+        best = int(np.argmin(d))
+        if matches[best]:
+            name = names[best]
+    return name
+
+
+def main(n_ids: int = 10000, faces_per_frame: int = 4, frames: int = 20) -> None:
+    rng = np.random.default_rng(0)
+    base = rng.normal(0, 0.09, size=(n_ids, 128)).astype(np.float32)
+    names = [f"id{i}" for i in range(n_ids)]
+    truth = rng.integers(0, n_ids, size=(frames, faces_per_frame))
+    queries = base[truth] + rng.normal(0, 0.01, size=(frames, faces_per_frame, 128)).astype(np.float32)
+
+    known = [row.astype(np.float64) for row in base]
+    t0 = time.perf_counter()
+    for f in range(min(frames, 5)):
+        for q in queries[f]:
+            legacy_identify(known, names, q)
+    legacy_ms = (time.perf_counter() - t0) / min(frames, 5) * 1000
+
+    results = {}
+    for label, threshold in (("exact", n_ids + 1), ("ivf", 1)):
+        g = FaceGallery(ann_threshold=threshold)
+        g.set(names, base)
+        t_build = time.perf_counter()
+        g.identify(queries[0])  # warm-up / builds the IVF index
+        build_ms = (time.perf_counter() - t_build) * 1000
+        t0 = time.perf_counter()
+        hits = 0
+        for f in range(frames):
+            out = g.identify(queries[f])
+            hits += sum(o == names[t] for o, t in zip(out, truth[f]))
+        ms = (time.perf_counter() - t0) / frames * 1000
+        results[label] = (ms, hits / truth.size, build_ms)
+
+    print(f"{n_ids} identities, {faces_per_frame} faces/frame")
+    print(f"  legacy list       {legacy_ms:8.2f} ms/frame")
+    for label, (ms, recall, build_ms) in results.items():
+        print(f"  gallery {label:<9} {ms:8.2f} ms/frame  recall {recall:.3f}  (first call {build_ms:.0f} ms)")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10000)
@@ -0,0 +1,101 @@
+"""Micro-benchmark: per-box YOLO parsing vs vectorized post-processing.
+
+Uses numpy-backed stand-ins for ultralytics `Boxes` so it runs without a
+model. The stand-ins make per-box access far cheaper than real torch-backed
+`Boxes` (which build a new Boxes object and torch scalars per field), so the
+legacy column is a lower bound. Usage:
+python -m modules.vision_bridge.tools.bench_postprocess
+"""
+from __future__ import annotations
+
+import time
+
+import numpy as np
+
+from modules.vision_bridge.services.postprocess import from_ultralytics
+
+NAMES = {0: "person", 1: "bicycle", 2: "car", 56: "chair"}
+
+
+class _Box:
+    def __init__(self, cls, conf, xyxy):
+        self.cls, self.conf, self.xyxy = cls, conf, xyxy
+
+
+class _Boxes:
+    def __init__(self, n: int, rng: np.random.Generator) -> None:
+        self.cls = rng.choice(list(NAMES), size=n).astype(np.float32)
+        self.conf = rng.uniform(0.5, 1.0, size=n).astype(np.float32)
+        xy = rng.uniform(0, 600, size=(n, 2)).astype(np.float32)
+        wh = rng.uniform(10, 300, size=(n, 2)).astype(np.float32)
+        self.xyxy = np.hstack([xy, xy + wh])
+
+    def __len__(self) -> int:
+        return len(self.cls)
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield _Box(self.cls[i:i + 1], self.conf[i:i + 1], self.xyxy[i:i + 1])
+
+
+class _Result:
+    def __init__(self, boxes: _Boxes) -> None:
+        self.boxes = boxes
+
+
+def legacy(results, names):
+    """The original per-box loop plus the O(n*m) person->face remap."""
+    parsed, person_boxes = [], []
+    for r in results:
+        for box in r.boxes:
+            cls_id = int(box.cls[0])
+            label = names[cls_id]
+            conf = float(box.conf[0])
+            x1, y1, x2, y2 = box.xyxy[0].tolist()
+            distance = -1.0
+            if label == "person":
+                h = y2 - y1
+                if h > 0:
+                    distance = (1.7 * 600) / h
+                person_boxes.append((int(y1), int(x2), int(y2), int(x1)))
+            parsed.append({"label": label, "confidence": conf, "bbox": [x1, y1, x2, y2],
+                           "distance_m": round(distance, 2) if distance > 0 else None, "name": "Unknown"})
+    for i in range(len(person_boxes)):
+        person_idx = 0
+        for res in parsed:
+            if res["label"] == "person":
+                if person_idx == i:
+                    res["name"] = "Unknown"
+                    break
+                person_idx += 1
+    return parsed
+
+
+def vectorized(results, names):
+    dets = from_ultralytics(results, names)
+    parsed = dets.to_results()
+    dets.face_locations()
+    return parsed
+
+
+def _bench(fn, results, repeat: int) -> float:
+    fn(results, NAMES)  # warm-up (label table cache etc.)
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        fn(results, NAMES)
+    return (time.perf_counter() - t0) / repeat * 1e6
+
+
+def main() -> None:
+    rng = np.random.default_rng(0)
+    print(f"{'n':>5} {'legacy us':>12} {'vector us':>12} {'speedup':>8}")
+    for n in (5, 50, 300):
+        results = [_Result(_Boxes(n, rng))]
+        repeat = max(20, 20000 // n)
+        a = _bench(legacy, results, repeat)
+        b = _bench(vectorized, results, repeat)
+        print(f"{n:>5} {a:>12.1f} {b:>12.1f} {a / b:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()